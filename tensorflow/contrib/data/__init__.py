@@ -27,11 +27,13 @@ See @{$guide/datasets$Importing Data} for an overview.
 @@CsvDataset
 @@RandomDataset
 @@Reducer
+@@ShardedTFRecordWriter
 @@SqlDataset
 @@TFRecordWriter
 
 @@assert_element_shape
 @@batch_and_drop_remainder
+@@bounded_cache
 @@bucket_by_sequence_length
 @@choose_from_datasets
 @@copy_to_device
@@ -48,6 +50,7 @@ See @{$guide/datasets$Importing Data} for an overview.
 
 @@map_and_batch
 @@padded_batch_and_drop_remainder
+@@parallel_from_generator
 @@parallel_interleave
 @@prefetch_to_device
 @@read_batch_features
@@ -55,6 +58,7 @@ See @{$guide/datasets$Importing Data} for an overview.
 @@sample_from_datasets
 @@scan
 @@shuffle_and_repeat
+@@snapshot
 @@sliding_window_batch
 @@sloppy_interleave
 @@unbatch
@@ -73,9 +77,12 @@ from tensorflow.contrib.data.python.ops.batching import dense_to_sparse_batch
 from tensorflow.contrib.data.python.ops.batching import map_and_batch
 from tensorflow.contrib.data.python.ops.batching import padded_batch_and_drop_remainder
 from tensorflow.contrib.data.python.ops.batching import unbatch
+from tensorflow.contrib.data.python.ops.caching import bounded_cache
+from tensorflow.contrib.data.python.ops.caching import snapshot
 from tensorflow.contrib.data.python.ops.counter import Counter
 from tensorflow.contrib.data.python.ops.enumerate_ops import enumerate_dataset
 from tensorflow.contrib.data.python.ops.error_ops import ignore_errors
+from tensorflow.contrib.data.python.ops.generator_ops import parallel_from_generator
 from tensorflow.contrib.data.python.ops.get_single_element import get_single_element
 from tensorflow.contrib.data.python.ops.grouping import bucket_by_sequence_length
 from tensorflow.contrib.data.python.ops.grouping import group_by_reducer
@@ -100,6 +107,7 @@ from tensorflow.contrib.data.python.ops.scan_ops import scan
 from tensorflow.contrib.data.python.ops.shuffle_ops import shuffle_and_repeat
 from tensorflow.contrib.data.python.ops.sliding import sliding_window_batch
 from tensorflow.contrib.data.python.ops.unique import unique
+from tensorflow.contrib.data.python.ops.writers import ShardedTFRecordWriter
 from tensorflow.contrib.data.python.ops.writers import TFRecordWriter
 # pylint: enable=unused-import
 
@@ -107,4 +115,4 @@ from tensorflow.python.util.all_util import remove_undocumented
 remove_undocumented(__name__)
 
 # A constant that can be used to enable auto-tuning.
-AUTOTUNE = -1
+from tensorflow.contrib.data.python.ops.optimization import AUTOTUNE  # pylint: disable=g-import-not-at-top
@@ -0,0 +1,515 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include <list>
+#include <unordered_map>
+
+#include "tensorflow/core/framework/dataset.h"
+#include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/stats_aggregator.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/framework/tensor.pb.h"
+#include "tensorflow/core/lib/core/coding.h"
+#include "tensorflow/core/lib/io/path.h"
+#include "tensorflow/core/lib/random/random.h"
+#include "tensorflow/core/platform/env.h"
+
+namespace tensorflow {
+
+namespace {
+
+// See documentation in ../ops/dataset_ops.cc for a high-level
+// description of the following op.
+
+enum class EvictionPolicy { kFifo, kLru };
+
+// Stores the elements of a dataset by index, keeping at most `memory_budget`
+// bytes of them in memory. Elements evicted from memory are appended to a
+// local spill file (once), from which they are read back when requested.
+//
+// Under FIFO, the elements are admitted into memory in the order they are
+// added until the budget is full, and the later ones go straight to the
+// spill file. Under LRU, every element is admitted, and the least recently
+// used ones are evicted to make room.
+//
+// All methods are thread-safe.
+class BoundedCache {
+ public:
+  BoundedCache(Env* env, size_t num_components, int64 memory_budget,
+               string spill_filename, EvictionPolicy policy)
+      : env_(env),
+        num_components_(num_components),
+        memory_budget_(memory_budget),
+        spill_filename_(std::move(spill_filename)),
+        policy_(policy) {}
+
+  ~BoundedCache() {
+    if (spill_file_) {
+      spill_reader_.reset();
+      Status s = spill_file_->Close();
+      if (s.ok()) {
+        s = env_->DeleteFile(spill_filename_);
+      }
+      if (!s.ok()) {
+        LOG(WARNING) << "Failed to remove cache spill file "
+                     << spill_filename_ << ": " << s;
+      }
+    }
+  }
+
+  // Returns the number of elements added to the cache so far.
+  size_t size() {
+    mutex_lock l(mu_);
+    return spill_offsets_.size();
+  }
+
+  // Returns true once the input has been cached up to its end.
+  bool complete() {
+    mutex_lock l(mu_);
+    return complete_;
+  }
+
+  void MarkComplete() {
+    mutex_lock l(mu_);
+    complete_ = true;
+  }
+
+  // Appends `element` to the cache, spilling elements to disk if the memory
+  // budget is exceeded.
+  Status Add(const std::vector<Tensor>& element) {
+    mutex_lock l(mu_);
+    const size_t index = spill_offsets_.size();
+    spill_offsets_.push_back(kNotSpilled);
+    if (policy_ == EvictionPolicy::kFifo &&
+        memory_bytes_ + ElementBytes(element) > memory_budget_) {
+      TF_RETURN_IF_ERROR(Spill(index, element));
+      // Make the spilled element visible to `spill_reader_`.
+      return spill_file_->Flush();
+    }
+    Insert(index, element);
+    return EvictToBudget();
+  }
+
+  // Copies the element at `index` into `out_tensors`, reading it from the
+  // spill file if it is no longer in memory. Sets `*hit` to true if the
+  // element was found in memory.
+  Status Lookup(size_t index, std::vector<Tensor>* out_tensors, bool* hit) {
+    mutex_lock l(mu_);
+    auto it = entries_.find(index);
+    if (it != entries_.end()) {
+      *hit = true;
+      ++hits_;
+      if (policy_ == EvictionPolicy::kLru) {
+        order_.splice(order_.end(), order_, it->second.position);
+      }
+      *out_tensors = it->second.tensors;
+      return Status::OK();
+    }
+    *hit = false;
+    ++misses_;
+    TF_RETURN_IF_ERROR(ReadSpilled(index, out_tensors));
+    if (policy_ == EvictionPolicy::kLru) {
+      // Under LRU a spilled element that is read again moves back into
+      // memory; under FIFO the set of elements held in memory only changes
+      // while the cache is filled.
+      Insert(index, *out_tensors);
+      TF_RETURN_IF_ERROR(EvictToBudget());
+    }
+    return Status::OK();
+  }
+
+  // Returns the fraction of lookups that were served from memory.
+  float hit_rate() {
+    mutex_lock l(mu_);
+    const int64 lookups = hits_ + misses_;
+    return lookups == 0 ? 0.0f : static_cast<float>(hits_) / lookups;
+  }
+
+  int64 memory_bytes() {
+    mutex_lock l(mu_);
+    return memory_bytes_;
+  }
+
+  int64 spilled_bytes() {
+    mutex_lock l(mu_);
+    return spill_size_;
+  }
+
+ private:
+  struct Entry {
+    std::vector<Tensor> tensors;
+    int64 bytes;
+    // Position of this entry in `order_`.
+    std::list<size_t>::iterator position;
+  };
+
+  static constexpr int64 kNotSpilled = -1;
+
+  static int64 ElementBytes(const std::vector<Tensor>& element) {
+    int64 bytes = 0;
+    for (const Tensor& t : element) {
+      bytes += t.TotalBytes();
+    }
+    return bytes;
+  }
+
+  void Insert(size_t index, const std::vector<Tensor>& element)
+      EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    Entry& entry = entries_[index];
+    entry.tensors = element;
+    entry.bytes = ElementBytes(element);
+    entry.position = order_.insert(order_.end(), index);
+    memory_bytes_ += entry.bytes;
+  }
+
+  Status EvictToBudget() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    bool spilled = false;
+    while (memory_bytes_ > memory_budget_ && !order_.empty()) {
+      const size_t index = order_.front();
+      auto it = entries_.find(index);
+      DCHECK(it != entries_.end());
+      if (spill_offsets_[index] == kNotSpilled) {
+        TF_RETURN_IF_ERROR(Spill(index, it->second.tensors));
+        spilled = true;
+      }
+      order_.pop_front();
+      memory_bytes_ -= it->second.bytes;
+      entries_.erase(it);
+    }
+    if (spilled) {
+      // Make the spilled elements visible to `spill_reader_`.
+      TF_RETURN_IF_ERROR(spill_file_->Flush());
+    }
+    return Status::OK();
+  }
+
+  // Appends the element at `index` to the spill file. Each component is
+  // stored as a fixed64 length followed by a serialized `TensorProto`.
+  Status Spill(size_t index, const std::vector<Tensor>& element)
+      EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    if (!spill_file_) {
+      TF_RETURN_IF_ERROR(env_->RecursivelyCreateDir(
+          std::string(io::Dirname(spill_filename_))));
+      TF_RETURN_IF_ERROR(env_->NewWritableFile(spill_filename_, &spill_file_));
+    }
+    const int64 offset = spill_size_;
+    for (const Tensor& t : element) {
+      TensorProto proto;
+      t.AsProtoTensorContent(&proto);
+      string serialized;
+      if (!proto.SerializeToString(&serialized)) {
+        return errors::Internal("Failed to serialize element ", index,
+                                " for the cache spill file.");
+      }
+      char header[sizeof(uint64)];
+      core::EncodeFixed64(header, serialized.size());
+      TF_RETURN_IF_ERROR(
+          spill_file_->Append(StringPiece(header, sizeof(header))));
+      TF_RETURN_IF_ERROR(spill_file_->Append(serialized));
+      spill_size_ += sizeof(header) + serialized.size();
+    }
+    spill_offsets_[index] = offset;
+    return Status::OK();
+  }
+
+  Status ReadSpilled(size_t index, std::vector<Tensor>* out_tensors)
+      EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    if (index >= spill_offsets_.size() ||
+        spill_offsets_[index] == kNotSpilled) {
+      return errors::Internal("Element ", index,
+                              " is missing from the cache.");
+    }
+    if (!spill_reader_) {
+      TF_RETURN_IF_ERROR(
+          env_->NewRandomAccessFile(spill_filename_, &spill_reader_));
+    }
+    uint64 offset = spill_offsets_[index];
+    out_tensors->clear();
+    out_tensors->reserve(num_components_);
+    for (size_t i = 0; i < num_components_; ++i) {
+      char header[sizeof(uint64)];
+      StringPiece result;
+      TF_RETURN_IF_ERROR(
+          spill_reader_->Read(offset, sizeof(header), &result, header));
+      const uint64 length = core::DecodeFixed64(result.data());
+      offset += sizeof(header);
+      std::unique_ptr<char[]> scratch(new char[length]);
+      TF_RETURN_IF_ERROR(
+          spill_reader_->Read(offset, length, &result, scratch.get()));
+      offset += length;
+      TensorProto proto;
+      out_tensors->emplace_back();
+      if (!proto.ParseFromArray(result.data(), result.size()) ||
+          !out_tensors->back().FromProto(proto)) {
+        return errors::DataLoss("Corrupted element ", index,
+                                " in cache spill file ", spill_filename_);
+      }
+    }
+    return Status::OK();
+  }
+
+  Env* const env_;
+  const size_t num_components_;
+  const int64 memory_budget_;
+  const string spill_filename_;
+  const EvictionPolicy policy_;
+
+  mutex mu_;
+  bool complete_ GUARDED_BY(mu_) = false;
+  // The elements currently held in memory, keyed by index.
+  std::unordered_map<size_t, Entry> entries_ GUARDED_BY(mu_);
+  // Indices of the elements in memory, in eviction order (front first).
+  std::list<size_t> order_ GUARDED_BY(mu_);
+  int64 memory_bytes_ GUARDED_BY(mu_) = 0;
+  // Offset of each element in the spill file, or `kNotSpilled`.
+  std::vector<int64> spill_offsets_ GUARDED_BY(mu_);
+  int64 spill_size_ GUARDED_BY(mu_) = 0;
+  std::unique_ptr<WritableFile> spill_file_ GUARDED_BY(mu_);
+  std::unique_ptr<RandomAccessFile> spill_reader_ GUARDED_BY(mu_);
+  int64 hits_ GUARDED_BY(mu_) = 0;
+  int64 misses_ GUARDED_BY(mu_) = 0;
+};
+
+class BoundedCacheDatasetOp : public UnaryDatasetOpKernel {
+ public:
+  explicit BoundedCacheDatasetOp(OpKernelConstruction* ctx)
+      : UnaryDatasetOpKernel(ctx) {}
+
+  void MakeDataset(OpKernelContext* ctx, DatasetBase* input,
+                   DatasetBase** output) override {
+    int64 memory_budget;
+    OP_REQUIRES_OK(ctx, ParseScalarArgument<int64>(ctx, "memory_budget",
+                                                   &memory_budget));
+    OP_REQUIRES(
+        ctx, memory_budget >= 0,
+        errors::InvalidArgument("`memory_budget` must be >= 0, but got ",
+                                memory_budget, "."));
+
+    string spill_directory;
+    OP_REQUIRES_OK(ctx, ParseScalarArgument<string>(ctx, "spill_directory",
+                                                    &spill_directory));
+    if (spill_directory.empty()) {
+      std::vector<string> temp_directories;
+      ctx->env()->GetLocalTempDirectories(&temp_directories);
+      OP_REQUIRES(ctx, !temp_directories.empty(),
+                  errors::NotFound("No local temporary directory found to "
+                                   "spill the cache to."));
+      spill_directory = temp_directories[0];
+    }
+
+    string eviction_policy;
+    OP_REQUIRES_OK(ctx, ParseScalarArgument<string>(ctx, "eviction_policy",
+                                                    &eviction_policy));
+    EvictionPolicy policy;
+    if (eviction_policy == "fifo") {
+      policy = EvictionPolicy::kFifo;
+    } else if (eviction_policy == "lru") {
+      policy = EvictionPolicy::kLru;
+    } else {
+      ctx->CtxFailure(errors::InvalidArgument(
+          "`eviction_policy` must be \"fifo\" or \"lru\", but got \"",
+          eviction_policy, "\"."));
+      return;
+    }
+
+    string tag;
+    OP_REQUIRES_OK(ctx, ParseScalarArgument<string>(ctx, "tag", &tag));
+
+    *output = new Dataset(ctx->env(), input, memory_budget,
+                          io::JoinPath(spill_directory,
+                                       strings::StrCat("bounded_cache_",
+                                                       random::New64(),
+                                                       ".spill")),
+                          policy, std::move(tag));
+  }
+
+ private:
+  // Like `CacheDatasetOp::MemoryDataset`, the cached elements belong to the
+  // dataset: the first iterator fills the cache and later iterators read from
+  // it. If the filling iterator is destroyed before reaching the end of its
+  // input, its input iterator is kept so that the next iterator can serve the
+  // cached prefix and continue filling the cache from where it stopped.
+  class Dataset : public DatasetBase {
+   public:
+    Dataset(Env* env, const DatasetBase* input, int64 memory_budget,
+            string spill_filename, EvictionPolicy policy, string tag)
+        : input_(input),
+          tag_(std::move(tag)),
+          cache_(env, input->output_dtypes().size(), memory_budget,
+                 std::move(spill_filename), policy) {
+      input_->Ref();
+    }
+
+    ~Dataset() override { input_->Unref(); }
+
+    std::unique_ptr<IteratorBase> MakeIteratorInternal(
+        const string& prefix) const override {
+      if (cache_.complete()) {
+        return std::unique_ptr<IteratorBase>(new ReaderIterator(
+            {this, strings::StrCat(prefix, "::BoundedCacheReader")}));
+      }
+      mutex_lock l(mu_);
+      if (!writer_iterator_created_) {
+        writer_iterator_created_ = true;
+        return std::unique_ptr<IteratorBase>(new WriterIterator(
+            {this, strings::StrCat(prefix, "::BoundedCacheWriter")}));
+      }
+      return std::unique_ptr<IteratorBase>(new DuplicateWriterIterator(
+          {this, strings::StrCat(prefix, "::DuplicateWriter")}));
+    }
+
+    const DataTypeVector& output_dtypes() const override {
+      return input_->output_dtypes();
+    }
+
+    const std::vector<PartialTensorShape>& output_shapes() const override {
+      return input_->output_shapes();
+    }
+
+    string DebugString() const override {
+      return "BoundedCacheDatasetOp::Dataset";
+    }
+
+   private:
+    void RecordStats(IteratorContext* ctx) const {
+      auto stats_aggregator = ctx->stats_aggregator();
+      if (stats_aggregator) {
+        stats_aggregator->AddScalar(strings::StrCat(tag_, ":hit-rate"),
+                                    cache_.hit_rate());
+        stats_aggregator->AddScalar(strings::StrCat(tag_, ":memory-bytes"),
+                                    cache_.memory_bytes());
+        stats_aggregator->AddScalar(strings::StrCat(tag_, ":spilled-bytes"),
+                                    cache_.spilled_bytes());
+      }
+    }
+
+    // WriterIterator serves the elements already in the cache, then passes
+    // through and caches the remaining elements of the input dataset.
+    class WriterIterator : public DatasetIterator<Dataset> {
+     public:
+      explicit WriterIterator(const Params& params)
+          : DatasetIterator<Dataset>(params) {}
+
+      ~WriterIterator() override {
+        mutex_lock l(mu_);
+        mutex_lock l2(dataset()->mu_);
+        if (input_impl_ && !dataset()->cache_.complete()) {
+          dataset()->parked_input_impl_ = std::move(input_impl_);
+        }
+        dataset()->writer_iterator_created_ = false;
+      }
+
+      Status Initialize(IteratorContext* ctx) override {
+        mutex_lock l(mu_);
+        {
+          mutex_lock l2(dataset()->mu_);
+          input_impl_ = std::move(dataset()->parked_input_impl_);
+        }
+        if (input_impl_) {
+          return Status::OK();
+        }
+        return dataset()->input_->MakeIterator(ctx, prefix(), &input_impl_);
+      }
+
+      Status GetNextInternal(IteratorContext* ctx,
+                             std::vector<Tensor>* out_tensors,
+                             bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        if (index_ < dataset()->cache_.size()) {
+          bool hit;
+          TF_RETURN_IF_ERROR(
+              dataset()->cache_.Lookup(index_, out_tensors, &hit));
+          index_++;
+          *end_of_sequence = false;
+          dataset()->RecordStats(ctx);
+          return Status::OK();
+        }
+        if (!input_impl_) {
+          *end_of_sequence = true;
+          return Status::OK();
+        }
+        TF_RETURN_IF_ERROR(
+            input_impl_->GetNext(ctx, out_tensors, end_of_sequence));
+        if (*end_of_sequence) {
+          dataset()->cache_.MarkComplete();
+          input_impl_.reset();
+          return Status::OK();
+        }
+        TF_RETURN_IF_ERROR(dataset()->cache_.Add(*out_tensors));
+        index_++;
+        dataset()->RecordStats(ctx);
+        return Status::OK();
+      }
+
+     private:
+      mutex mu_;
+      size_t index_ GUARDED_BY(mu_) = 0;
+      std::unique_ptr<IteratorBase> input_impl_ GUARDED_BY(mu_);
+    };  // WriterIterator
+
+    class ReaderIterator : public DatasetIterator<Dataset> {
+     public:
+      explicit ReaderIterator(const Params& params)
+          : DatasetIterator<Dataset>(params) {}
+
+      Status GetNextInternal(IteratorContext* ctx,
+                             std::vector<Tensor>* out_tensors,
+                             bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        if (index_ >= dataset()->cache_.size()) {
+          *end_of_sequence = true;
+          return Status::OK();
+        }
+        bool hit;
+        TF_RETURN_IF_ERROR(dataset()->cache_.Lookup(index_, out_tensors, &hit));
+        index_++;
+        *end_of_sequence = false;
+        dataset()->RecordStats(ctx);
+        return Status::OK();
+      }
+
+     private:
+      mutex mu_;
+      size_t index_ GUARDED_BY(mu_) = 0;
+    };  // ReaderIterator
+
+    class DuplicateWriterIterator : public DatasetIterator<Dataset> {
+     public:
+      explicit DuplicateWriterIterator(const Params& params)
+          : DatasetIterator<Dataset>(params) {}
+
+      Status GetNextInternal(IteratorContext* ctx,
+                             std::vector<Tensor>* out_tensors,
+                             bool* end_of_sequence) override {
+        return errors::AlreadyExists(
+            "There appears to be a concurrent caching iterator running.");
+      }
+    };  // DuplicateWriterIterator
+
+    const DatasetBase* const input_;
+    const string tag_;
+    mutable BoundedCache cache_;
+    mutable mutex mu_;
+    mutable bool writer_iterator_created_ GUARDED_BY(mu_) = false;
+    // The input iterator of a writer that stopped before the end of the input.
+    mutable std::unique_ptr<IteratorBase> parked_input_impl_ GUARDED_BY(mu_);
+  };  // Dataset
+};
+
+REGISTER_KERNEL_BUILDER(Name("BoundedCacheDataset").Device(DEVICE_CPU),
+                        BoundedCacheDatasetOp);
+
+}  // namespace
+
+}  // namespace tensorflow
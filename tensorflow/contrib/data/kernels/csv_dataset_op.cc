@@ -103,10 +103,39 @@ class CSVDatasetOp : public DatasetOpKernel {
         ctx, select_cols.empty() || select_cols.front() >= 0,
         errors::InvalidArgument("select_cols should be non-negative indices"));
 
+    const Tensor* byte_ranges_tensor;
+    OP_REQUIRES_OK(ctx, ctx->input("byte_ranges", &byte_ranges_tensor));
+    OP_REQUIRES(ctx,
+                TensorShapeUtils::IsMatrix(byte_ranges_tensor->shape()) &&
+                    byte_ranges_tensor->dim_size(1) == 2,
+                errors::InvalidArgument(
+                    "`byte_ranges` must be a matrix with two columns."));
+    OP_REQUIRES(
+        ctx,
+        byte_ranges_tensor->dim_size(0) == 0 ||
+            byte_ranges_tensor->dim_size(0) ==
+                static_cast<int64>(filenames.size()),
+        errors::InvalidArgument(
+            "`byte_ranges` must be empty or have one row per file, but has ",
+            byte_ranges_tensor->dim_size(0), " rows for ", filenames.size(),
+            " files."));
+    std::vector<std::pair<int64, int64>> byte_ranges;
+    byte_ranges.reserve(byte_ranges_tensor->dim_size(0));
+    auto byte_ranges_matrix = byte_ranges_tensor->matrix<int64>();
+    for (int i = 0; i < byte_ranges_tensor->dim_size(0); ++i) {
+      const int64 start = byte_ranges_matrix(i, 0);
+      const int64 end = byte_ranges_matrix(i, 1);
+      OP_REQUIRES(ctx, start >= 0 && start <= end,
+                  errors::InvalidArgument("Invalid byte range [", start, ", ",
+                                          end, ") for file ", filenames[i]));
+      byte_ranges.emplace_back(start, end);
+    }
+
     *output = new Dataset(ctx, std::move(filenames), header, buffer_size,
                           output_types_, output_shapes_,
                           std::move(record_defaults), std::move(select_cols),
-                          use_quote_delim, delim[0], std::move(na_value));
+                          use_quote_delim, delim[0], std::move(na_value),
+                          std::move(byte_ranges));
   }
 
  private:
@@ -116,7 +145,8 @@ class CSVDatasetOp : public DatasetOpKernel {
             int64 buffer_size, const DataTypeVector& output_types,
             const std::vector<PartialTensorShape>& output_shapes,
             std::vector<Tensor> record_defaults, std::vector<int64> select_cols,
-            bool use_quote_delim, char delim, string na_value)
+            bool use_quote_delim, char delim, string na_value,
+            std::vector<std::pair<int64, int64>> byte_ranges)
         : GraphDatasetBase(ctx),
           filenames_(std::move(filenames)),
           header_(header),
@@ -127,7 +157,8 @@ class CSVDatasetOp : public DatasetOpKernel {
           select_cols_(std::move(select_cols)),
           use_quote_delim_(use_quote_delim),
           delim_(delim),
-          na_value_(std::move(na_value)) {}
+          na_value_(std::move(na_value)),
+          byte_ranges_(std::move(byte_ranges)) {}
 
     std::unique_ptr<IteratorBase> MakeIteratorInternal(
         const string& prefix) const override {
@@ -165,7 +196,8 @@ class CSVDatasetOp : public DatasetOpKernel {
         bool select_all = dataset()->select_cols_.empty();
         do {
           // We are currently processing a file, so try to read the next record
-          if (input_stream_) {
+          // unless it starts past the end of the file's byte range.
+          if (input_stream_ && !PastEndOfRangeLocked()) {
             Status s = ReadRecord(ctx, out_tensors, select_all,
                                   dataset()->select_cols_);
             if (s.ok()) {
@@ -184,6 +216,8 @@ class CSVDatasetOp : public DatasetOpKernel {
               *end_of_sequence = false;
               return s;
             }
+          }
+          if (input_stream_) {
             // We have reached the end of the current file, so maybe
             // move on to next file.
             ResetStreamsLocked();
@@ -679,7 +713,20 @@ class CSVDatasetOp : public DatasetOpKernel {
             new io::RandomAccessInputStream(file_.get(), false));
         buffer_.clear();
         pos_ = 0;
-        if (dataset()->header_) {
+        const int64 start =
+            dataset()->byte_ranges_.empty()
+                ? 0
+                : dataset()->byte_ranges_[current_file_index_].first;
+        if (start > 0) {
+          // The range starts with the first record that begins at or after
+          // `start`, i.e. after the first line break at or after `start - 1`.
+          // The header, if any, belongs to the range that starts at 0.
+          TF_RETURN_IF_ERROR(input_stream_->Seek(start - 1));
+          Status s = SkipToNextRecordLocked();
+          if (!s.ok() && !errors::IsOutOfRange(s)) {
+            return s;
+          }
+        } else if (dataset()->header_) {
           // Read one line, but don't include it. Pass nullptrs as dummy
           // pointers to objects that shouldn't be invoked anyway
           // We need to process this as a record here instead of just finding
@@ -694,6 +741,36 @@ class CSVDatasetOp : public DatasetOpKernel {
         return Status::OK();
       }
 
+      // Advances pos_ past the first line break at or after it, so that it is
+      // the index of the first character of the next record. Returns
+      // errors::OutOfRange if there is no line break before the end of file.
+      Status SkipToNextRecordLocked() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        while (true) {
+          if (pos_ >= buffer_.size()) {
+            pos_ = 0;
+            TF_RETURN_IF_ERROR(FillBuffer(&buffer_));
+          }
+          size_t found = buffer_.find_first_of("\r\n", pos_);
+          if (found != string::npos) {
+            pos_ = found + 1;
+            if (buffer_[found] == '\r') SkipNewLineIfNecessary();
+            return Status::OK();
+          }
+          pos_ = buffer_.size();
+        }
+      }
+
+      // Returns true if the next record of the current file starts at or
+      // after the end of the byte range to read of that file.
+      bool PastEndOfRangeLocked() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        if (dataset()->byte_ranges_.empty()) return false;
+        // `buffer_` holds the bytes that precede the stream position.
+        const int64 offset = input_stream_->Tell() -
+                             static_cast<int64>(buffer_.size()) +
+                             static_cast<int64>(pos_);
+        return offset >= dataset()->byte_ranges_[current_file_index_].second;
+      }
+
       // Resets all reader streams.
       void ResetStreamsLocked() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
         input_stream_.reset();
@@ -721,6 +798,8 @@ class CSVDatasetOp : public DatasetOpKernel {
     const bool use_quote_delim_;
     const char delim_;
     const string na_value_;
+    // If not empty, the `[start, end)` byte range to read of each file.
+    const std::vector<std::pair<int64, int64>> byte_ranges_;
   };  // class Dataset
 
   DataTypeVector output_types_;
@@ -0,0 +1,310 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include <deque>
+
+#include "tensorflow/core/framework/dataset.h"
+#include "tensorflow/core/framework/op_kernel.h"
+#include "tensorflow/core/lib/core/threadpool.h"
+#include "tensorflow/core/lib/io/path.h"
+#include "tensorflow/core/lib/io/record_writer.h"
+#include "tensorflow/core/lib/strings/stringprintf.h"
+#include "tensorflow/core/platform/env.h"
+
+namespace tensorflow {
+
+namespace {
+
+// See documentation in ../ops/dataset_ops.cc for a high-level
+// description of the following op.
+
+// The maximum number of records buffered for each shard writer.
+constexpr size_t kQueueCapacity = 64;
+
+// The number of bytes that the TFRecord format adds to each record: a length,
+// and a checksum each of the length and of the data.
+constexpr int64 kRecordOverheadBytes = sizeof(uint64) + 2 * sizeof(uint32);
+
+// Bounded queues of records, one per shard, that connect the thread reading
+// the input dataset to the shard writer threads.
+//
+// All methods are thread-safe.
+class ShardQueues {
+ public:
+  explicit ShardQueues(int64 num_shards) : queues_(num_shards) {}
+
+  // Appends `record` to the queue of `shard`, blocking while it is full.
+  // Returns false if writing has been cancelled.
+  bool Push(int64 shard, string record) {
+    mutex_lock l(mu_);
+    while (!cancelled_ && queues_[shard].size() >= kQueueCapacity) {
+      cond_var_.wait(l);
+    }
+    if (cancelled_) return false;
+    queues_[shard].push_back(std::move(record));
+    cond_var_.notify_all();
+    return true;
+  }
+
+  // Removes the next record of `shard` into `*record`, blocking while the
+  // queue is empty. Returns false once the queue has been closed and drained,
+  // or if writing has been cancelled.
+  bool Pop(int64 shard, string* record) {
+    mutex_lock l(mu_);
+    while (!cancelled_ && !closed_ && queues_[shard].empty()) {
+      cond_var_.wait(l);
+    }
+    if (cancelled_ || queues_[shard].empty()) return false;
+    *record = std::move(queues_[shard].front());
+    queues_[shard].pop_front();
+    cond_var_.notify_all();
+    return true;
+  }
+
+  // Signals that no more records will be pushed.
+  void Close() {
+    mutex_lock l(mu_);
+    closed_ = true;
+    cond_var_.notify_all();
+  }
+
+  // Stops all readers and writers of the queues because of the error `s`.
+  void Cancel(const Status& s) {
+    mutex_lock l(mu_);
+    status_.Update(s);
+    cancelled_ = true;
+    cond_var_.notify_all();
+  }
+
+  Status status() {
+    mutex_lock l(mu_);
+    return status_;
+  }
+
+ private:
+  mutex mu_;
+  condition_variable cond_var_;
+  std::vector<std::deque<string>> queues_ GUARDED_BY(mu_);
+  bool closed_ GUARDED_BY(mu_) = false;
+  bool cancelled_ GUARDED_BY(mu_) = false;
+  Status status_ GUARDED_BY(mu_);
+};
+
+// A file written by one shard writer, and the number of records in it.
+struct ShardFile {
+  string filename;
+  int64 num_records = 0;
+};
+
+class ToShardedTFRecordOp : public AsyncOpKernel {
+ public:
+  explicit ToShardedTFRecordOp(OpKernelConstruction* ctx)
+      : AsyncOpKernel(ctx),
+        thread_pool_(new thread::ThreadPool(
+            ctx->env(), ThreadOptions(), "to_sharded_tf_record_op",
+            1 /* num_threads */, false /* low_latency_hint */)) {}
+
+  template <typename T>
+  Status ParseScalarArgument(OpKernelContext* ctx,
+                             const StringPiece& argument_name, T* output) {
+    const Tensor* argument_t;
+    TF_RETURN_IF_ERROR(ctx->input(argument_name, &argument_t));
+    if (!TensorShapeUtils::IsScalar(argument_t->shape())) {
+      return errors::InvalidArgument(argument_name, " must be a scalar");
+    }
+    *output = argument_t->scalar<T>()();
+    return Status::OK();
+  }
+
+  void ComputeAsync(OpKernelContext* ctx, DoneCallback done) override {
+    // The call to `iterator->GetNext()` may block and depend on an
+    // inter-op thread pool thread, so we issue the call from the
+    // owned thread pool.
+    thread_pool_->Schedule([this, ctx, done]() {
+      string directory;
+      OP_REQUIRES_OK_ASYNC(
+          ctx, ParseScalarArgument<string>(ctx, "directory", &directory),
+          done);
+      string filename_prefix;
+      OP_REQUIRES_OK_ASYNC(ctx,
+                           ParseScalarArgument<string>(ctx, "filename_prefix",
+                                                       &filename_prefix),
+                           done);
+      int64 num_shards;
+      OP_REQUIRES_OK_ASYNC(
+          ctx, ParseScalarArgument<int64>(ctx, "num_shards", &num_shards),
+          done);
+      OP_REQUIRES_ASYNC(
+          ctx, num_shards > 0,
+          errors::InvalidArgument("`num_shards` must be > 0, but got ",
+                                  num_shards, "."),
+          done);
+      string compression_type;
+      OP_REQUIRES_OK_ASYNC(ctx,
+                           ParseScalarArgument<string>(ctx, "compression_type",
+                                                       &compression_type),
+                           done);
+      OP_REQUIRES_ASYNC(
+          ctx,
+          compression_type.empty() || compression_type == "ZLIB" ||
+              compression_type == "GZIP",
+          errors::InvalidArgument(
+              "`compression_type` must be \"\", \"ZLIB\" or \"GZIP\", but got "
+              "\"",
+              compression_type, "\"."),
+          done);
+      int64 max_shard_bytes;
+      OP_REQUIRES_OK_ASYNC(ctx,
+                           ParseScalarArgument<int64>(ctx, "max_shard_bytes",
+                                                      &max_shard_bytes),
+                           done);
+
+      DatasetBase* dataset;
+      OP_REQUIRES_OK_ASYNC(
+          ctx, GetDatasetFromVariantTensor(ctx->input(0), &dataset), done);
+      OP_REQUIRES_ASYNC(
+          ctx,
+          dataset->output_dtypes().size() == 1 &&
+              dataset->output_dtypes()[0] == DT_STRING,
+          errors::InvalidArgument(
+              "The input dataset must produce scalar strings, but produces ",
+              DataTypeVectorString(dataset->output_dtypes()), "."),
+          done);
+      OP_REQUIRES_OK_ASYNC(ctx, ctx->env()->RecursivelyCreateDir(directory),
+                           done);
+
+      IteratorContext iter_ctx = dataset::MakeIteratorContext(ctx);
+      std::unique_ptr<IteratorBase> iterator;
+      OP_REQUIRES_OK_ASYNC(ctx,
+                           dataset->MakeIterator(
+                               &iter_ctx, "ToShardedTFRecordOpIterator",
+                               &iterator),
+                           done);
+
+      ShardQueues queues(num_shards);
+      std::vector<std::vector<ShardFile>> shard_files(num_shards);
+      {
+        thread::ThreadPool writer_pool(ctx->env(), ThreadOptions(),
+                                       "sharded_tf_record_writer", num_shards,
+                                       false /* low_latency_hint */);
+        for (int64 i = 0; i < num_shards; ++i) {
+          writer_pool.Schedule([&, i]() {
+            Status s = WriteShard(ctx->env(), directory, filename_prefix, i,
+                                  compression_type, max_shard_bytes, &queues,
+                                  &shard_files[i]);
+            if (!s.ok()) {
+              queues.Cancel(s);
+            }
+          });
+        }
+
+        // Distribute the records round-robin across the shards.
+        std::vector<Tensor> components;
+        bool end_of_sequence = false;
+        for (int64 i = 0;; ++i) {
+          components.clear();
+          Status s = iterator->GetNext(&iter_ctx, &components, &end_of_sequence);
+          if (!s.ok()) {
+            queues.Cancel(s);
+            break;
+          }
+          if (end_of_sequence ||
+              !queues.Push(i % num_shards, components[0].scalar<string>()())) {
+            break;
+          }
+        }
+        queues.Close();
+        // Destroying `writer_pool` waits for the writers to finish.
+      }
+      OP_REQUIRES_OK_ASYNC(ctx, queues.status(), done);
+
+      string manifest;
+      for (const auto& files : shard_files) {
+        for (const ShardFile& file : files) {
+          strings::StrAppend(&manifest, file.filename, " ", file.num_records,
+                             "\n");
+        }
+      }
+      OP_REQUIRES_OK_ASYNC(
+          ctx,
+          WriteStringToFile(
+              ctx->env(),
+              io::JoinPath(directory,
+                           strings::StrCat(filename_prefix, ".manifest")),
+              manifest),
+          done);
+      done();
+    });
+  }
+
+ private:
+  // Writes the records that `queues` holds for `shard` to one or more files,
+  // starting a new file whenever the current one reaches `max_shard_bytes`
+  // (if positive). The written files are appended to `*files`.
+  static Status WriteShard(Env* env, const string& directory,
+                           const string& filename_prefix, int64 shard,
+                           const string& compression_type,
+                           int64 max_shard_bytes, ShardQueues* queues,
+                           std::vector<ShardFile>* files) {
+    const io::RecordWriterOptions options =
+        io::RecordWriterOptions::CreateRecordWriterOptions(compression_type);
+    std::unique_ptr<WritableFile> file;
+    std::unique_ptr<io::RecordWriter> writer;
+    int64 file_bytes = 0;
+    auto close_file = [&file, &writer]() {
+      Status s = writer->Close();
+      writer.reset();
+      s.Update(file->Close());
+      file.reset();
+      return s;
+    };
+    auto open_file = [&]() {
+      files->emplace_back();
+      files->back().filename = strings::Printf(
+          "%s-%05lld-%05zu.tfrecord", filename_prefix.c_str(), shard,
+          files->size() - 1);
+      TF_RETURN_IF_ERROR(env->NewWritableFile(
+          io::JoinPath(directory, files->back().filename), &file));
+      writer.reset(new io::RecordWriter(file.get(), options));
+      file_bytes = 0;
+      return Status::OK();
+    };
+
+    // Every shard has at least one (possibly empty) file.
+    TF_RETURN_IF_ERROR(open_file());
+    string record;
+    while (queues->Pop(shard, &record)) {
+      if (max_shard_bytes > 0 && file_bytes > 0 &&
+          file_bytes + static_cast<int64>(record.size()) +
+                  kRecordOverheadBytes >
+              max_shard_bytes) {
+        TF_RETURN_IF_ERROR(close_file());
+        TF_RETURN_IF_ERROR(open_file());
+      }
+      TF_RETURN_IF_ERROR(writer->WriteRecord(record));
+      file_bytes += record.size() + kRecordOverheadBytes;
+      ++files->back().num_records;
+    }
+    return close_file();
+  }
+
+  std::unique_ptr<thread::ThreadPool> thread_pool_;
+};
+
+REGISTER_KERNEL_BUILDER(Name("DatasetToShardedTFRecord").Device(DEVICE_CPU),
+                        ToShardedTFRecordOp);
+
+}  // namespace
+
+}  // namespace tensorflow
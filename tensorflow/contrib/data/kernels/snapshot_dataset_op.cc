@@ -0,0 +1,600 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include <deque>
+
+#include "tensorflow/core/framework/dataset.h"
+#include "tensorflow/core/framework/graph.pb.h"
+#include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/framework/tensor.pb.h"
+#include "tensorflow/core/lib/io/path.h"
+#include "tensorflow/core/lib/io/record_reader.h"
+#include "tensorflow/core/lib/io/record_writer.h"
+#include "tensorflow/core/lib/random/random.h"
+#include "tensorflow/core/lib/strings/numbers.h"
+#include "tensorflow/core/lib/strings/proto_serialization.h"
+#include "tensorflow/core/lib/strings/str_util.h"
+#include "tensorflow/core/lib/strings/stringprintf.h"
+#include "tensorflow/core/platform/env.h"
+#include "tensorflow/core/platform/fingerprint.h"
+
+namespace tensorflow {
+
+namespace {
+
+// See documentation in ../ops/dataset_ops.cc for a high-level
+// description of the following op.
+
+// The name of the file, in the snapshot directory, that lists the shards of a
+// completely written snapshot. A snapshot without a manifest is ignored.
+constexpr char kManifestFilename[] = "snapshot.manifest";
+
+// The maximum number of elements that each reader thread buffers.
+constexpr size_t kShardBufferSize = 8;
+
+// Describes a completely written snapshot.
+//
+// The manifest is a text file with one "key=value" entry per line:
+//
+//   compression=GZIP
+//   dtypes=float,int64
+//   shard=0123456789abcdef_00000.shard 1024
+//   shard=0123456789abcdef_00001.shard 1023
+//
+// Shard filenames are relative to the snapshot directory. Element `i` of the
+// snapshot is stored in shard `i % num_shards`, as one record per component
+// holding a serialized `TensorProto`.
+struct Manifest {
+  string compression_type;
+  DataTypeVector dtypes;
+  std::vector<string> shard_filenames;
+  std::vector<int64> shard_num_elements;
+
+  string Serialize() const {
+    std::vector<string> dtype_names;
+    for (DataType dtype : dtypes) {
+      dtype_names.push_back(DataTypeString(dtype));
+    }
+    string result = strings::StrCat(
+        "compression=", compression_type,
+        "\ndtypes=", str_util::Join(dtype_names, ","), "\n");
+    for (size_t i = 0; i < shard_filenames.size(); ++i) {
+      strings::StrAppend(&result, "shard=", shard_filenames[i], " ",
+                         shard_num_elements[i], "\n");
+    }
+    return result;
+  }
+
+  Status Parse(const string& filename, const string& contents) {
+    for (const string& line :
+         str_util::Split(contents, '\n', str_util::SkipEmpty())) {
+      const size_t separator = line.find('=');
+      if (separator == string::npos) {
+        return errors::DataLoss("Malformed line \"", line,
+                                "\" in snapshot manifest ", filename);
+      }
+      const StringPiece key(line.data(), separator);
+      const string value = line.substr(separator + 1);
+      if (key == "compression") {
+        compression_type = value;
+      } else if (key == "dtypes") {
+        for (const string& name : str_util::Split(value, ',')) {
+          DataType dtype;
+          if (!DataTypeFromString(name, &dtype)) {
+            return errors::DataLoss("Unknown dtype \"", name,
+                                    "\" in snapshot manifest ", filename);
+          }
+          dtypes.push_back(dtype);
+        }
+      } else if (key == "shard") {
+        std::vector<string> parts = str_util::Split(value, ' ');
+        int64 num_elements;
+        if (parts.size() != 2 ||
+            !strings::safe_strto64(parts[1], &num_elements)) {
+          return errors::DataLoss("Malformed line \"", line,
+                                  "\" in snapshot manifest ", filename);
+        }
+        shard_filenames.push_back(parts[0]);
+        shard_num_elements.push_back(num_elements);
+      }
+    }
+    if (shard_filenames.empty()) {
+      return errors::DataLoss("Snapshot manifest ", filename,
+                              " does not list any shards.");
+    }
+    return Status::OK();
+  }
+};
+
+// Returns a hexadecimal fingerprint of the serialized `GraphDef` in
+// `graph_def`. The graph is re-serialized deterministically, because the map
+// fields of a `GraphDef` (such as node attrs) otherwise serialize in an
+// arbitrary order.
+Status FingerprintGraph(const string& graph_def, string* fingerprint) {
+  GraphDef graph;
+  if (!graph.ParseFromString(graph_def)) {
+    return errors::InvalidArgument(
+        "Could not parse the graph of the input dataset.");
+  }
+  string canonical;
+  if (!SerializeToStringDeterministic(graph, &canonical)) {
+    return errors::Internal(
+        "Could not serialize the graph of the input dataset.");
+  }
+  const Fprint128 fp = Fingerprint128(canonical);
+  *fingerprint = strings::StrCat(strings::Hex(fp.high64, strings::ZERO_PAD_16),
+                                 strings::Hex(fp.low64, strings::ZERO_PAD_16));
+  return Status::OK();
+}
+
+class SnapshotDatasetOp : public UnaryDatasetOpKernel {
+ public:
+  explicit SnapshotDatasetOp(OpKernelConstruction* ctx)
+      : UnaryDatasetOpKernel(ctx) {}
+
+  void MakeDataset(OpKernelContext* ctx, DatasetBase* input,
+                   DatasetBase** output) override {
+    string path;
+    OP_REQUIRES_OK(ctx, ParseScalarArgument<string>(ctx, "path", &path));
+    OP_REQUIRES(ctx, !path.empty(),
+                errors::InvalidArgument("`path` must not be empty."));
+
+    string graph_def;
+    OP_REQUIRES_OK(ctx,
+                   ParseScalarArgument<string>(ctx, "graph_def", &graph_def));
+    string fingerprint;
+    OP_REQUIRES_OK(
+        ctx, ParseScalarArgument<string>(ctx, "fingerprint", &fingerprint));
+    string directory_name = fingerprint;
+    if (directory_name.empty()) {
+      OP_REQUIRES(ctx, !graph_def.empty(),
+                  errors::InvalidArgument(
+                      "One of `graph_def` and `fingerprint` must be set."));
+      OP_REQUIRES_OK(ctx, FingerprintGraph(graph_def, &directory_name));
+    }
+
+    int64 num_shards;
+    OP_REQUIRES_OK(
+        ctx, ParseScalarArgument<int64>(ctx, "num_shards", &num_shards));
+    OP_REQUIRES(ctx, num_shards > 0,
+                errors::InvalidArgument("`num_shards` must be > 0, but got ",
+                                        num_shards, "."));
+
+    string compression_type;
+    OP_REQUIRES_OK(ctx, ParseScalarArgument<string>(ctx, "compression_type",
+                                                    &compression_type));
+    OP_REQUIRES(ctx,
+                compression_type.empty() || compression_type == "ZLIB" ||
+                    compression_type == "GZIP",
+                errors::InvalidArgument(
+                    "`compression_type` must be \"\", \"ZLIB\" or \"GZIP\", "
+                    "but got \"",
+                    compression_type, "\"."));
+
+    for (DataType dtype : input->output_dtypes()) {
+      OP_REQUIRES(ctx, dtype != DT_VARIANT && dtype != DT_RESOURCE,
+                  errors::InvalidArgument(
+                      "Cannot snapshot a dataset with elements of type ",
+                      DataTypeString(dtype), "."));
+    }
+
+    *output = new Dataset(ctx, input, std::move(path), std::move(graph_def),
+                          std::move(fingerprint), std::move(directory_name),
+                          num_shards, std::move(compression_type));
+  }
+
+ private:
+  class Dataset : public GraphDatasetBase {
+   public:
+    Dataset(OpKernelContext* ctx, const DatasetBase* input, string path,
+            string graph_def, string fingerprint, string directory_name,
+            int64 num_shards, string compression_type)
+        : GraphDatasetBase(ctx),
+          input_(input),
+          env_(ctx->env()),
+          path_(std::move(path)),
+          graph_def_(std::move(graph_def)),
+          fingerprint_(std::move(fingerprint)),
+          directory_(io::JoinPath(path_, directory_name)),
+          num_shards_(num_shards),
+          compression_type_(std::move(compression_type)) {
+      input_->Ref();
+    }
+
+    ~Dataset() override { input_->Unref(); }
+
+    std::unique_ptr<IteratorBase> MakeIteratorInternal(
+        const string& prefix) const override {
+      if (env_->FileExists(ManifestFilename()).ok()) {
+        return std::unique_ptr<IteratorBase>(new ReaderIterator(
+            {this, strings::StrCat(prefix, "::SnapshotReader")}));
+      }
+      return std::unique_ptr<IteratorBase>(new WriterIterator(
+          {this, strings::StrCat(prefix, "::SnapshotWriter")}));
+    }
+
+    const DataTypeVector& output_dtypes() const override {
+      return input_->output_dtypes();
+    }
+
+    const std::vector<PartialTensorShape>& output_shapes() const override {
+      return input_->output_shapes();
+    }
+
+    string DebugString() const override { return "SnapshotDatasetOp::Dataset"; }
+
+   protected:
+    Status AsGraphDefInternal(OpKernelContext* ctx, DatasetGraphDefBuilder* b,
+                              Node** output) const override {
+      Node* input_graph_node = nullptr;
+      TF_RETURN_IF_ERROR(b->AddParentDataset(ctx, input_, &input_graph_node));
+      Node* path = nullptr;
+      TF_RETURN_IF_ERROR(b->AddScalar(path_, &path));
+      Node* graph_def = nullptr;
+      TF_RETURN_IF_ERROR(b->AddScalar(graph_def_, &graph_def));
+      Node* fingerprint = nullptr;
+      TF_RETURN_IF_ERROR(b->AddScalar(fingerprint_, &fingerprint));
+      Node* num_shards = nullptr;
+      TF_RETURN_IF_ERROR(b->AddScalar(num_shards_, &num_shards));
+      Node* compression_type = nullptr;
+      TF_RETURN_IF_ERROR(b->AddScalar(compression_type_, &compression_type));
+      TF_RETURN_IF_ERROR(b->AddDataset(
+          this,
+          {input_graph_node, path, graph_def, fingerprint, num_shards,
+           compression_type},
+          output));
+      return Status::OK();
+    }
+
+   private:
+    string ManifestFilename() const {
+      return io::JoinPath(directory_, kManifestFilename);
+    }
+
+    // WriterIterator passes through the elements of the input dataset and
+    // writes them, round-robin, to `num_shards` new shard files in the
+    // snapshot directory. Once the input is exhausted, it publishes the shards
+    // by writing the manifest. The shards of a writer that is destroyed before
+    // the end of its input are deleted.
+    //
+    // Several writers (e.g. in different jobs) may write the same snapshot
+    // concurrently: each writes its own shards, and the manifest is renamed
+    // into place atomically, so readers see exactly one complete snapshot.
+    class WriterIterator : public DatasetIterator<Dataset> {
+     public:
+      explicit WriterIterator(const Params& params)
+          : DatasetIterator<Dataset>(params) {}
+
+      ~WriterIterator() override {
+        mutex_lock l(mu_);
+        if (!finished_ && !shard_files_.empty()) {
+          Status s = CloseShards();
+          s.Update(DeleteShards());
+          if (!s.ok()) {
+            LOG(WARNING) << "Failed to remove incomplete snapshot shards in "
+                         << dataset()->directory_ << ": " << s;
+          }
+        }
+      }
+
+      Status Initialize(IteratorContext* ctx) override {
+        mutex_lock l(mu_);
+        Env* env = dataset()->env_;
+        TF_RETURN_IF_ERROR(env->RecursivelyCreateDir(dataset()->directory_));
+        const uint64 run_id = random::New64();
+        const io::RecordWriterOptions options =
+            io::RecordWriterOptions::CreateRecordWriterOptions(
+                dataset()->compression_type_);
+        for (int64 i = 0; i < dataset()->num_shards_; ++i) {
+          shard_filenames_.push_back(
+              strings::StrCat(strings::Hex(run_id, strings::ZERO_PAD_16), "_",
+                              strings::Printf("%05lld", i), ".shard"));
+          shard_files_.emplace_back();
+          TF_RETURN_IF_ERROR(env->NewWritableFile(
+              io::JoinPath(dataset()->directory_, shard_filenames_.back()),
+              &shard_files_.back()));
+          shard_writers_.emplace_back(
+              new io::RecordWriter(shard_files_.back().get(), options));
+        }
+        shard_num_elements_.resize(dataset()->num_shards_, 0);
+        return dataset()->input_->MakeIterator(ctx, prefix(), &input_impl_);
+      }
+
+      Status GetNextInternal(IteratorContext* ctx,
+                             std::vector<Tensor>* out_tensors,
+                             bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        if (finished_) {
+          *end_of_sequence = true;
+          return Status::OK();
+        }
+        TF_RETURN_IF_ERROR(
+            input_impl_->GetNext(ctx, out_tensors, end_of_sequence));
+        if (*end_of_sequence) {
+          finished_ = true;
+          input_impl_.reset();
+          return Finish();
+        }
+        const size_t shard = next_shard_;
+        next_shard_ = (next_shard_ + 1) % shard_writers_.size();
+        for (const Tensor& t : *out_tensors) {
+          TensorProto proto;
+          t.AsProtoTensorContent(&proto);
+          string record;
+          if (!proto.SerializeToString(&record)) {
+            return errors::Internal("Failed to serialize an element for the "
+                                    "snapshot in ",
+                                    dataset()->directory_);
+          }
+          TF_RETURN_IF_ERROR(shard_writers_[shard]->WriteRecord(record));
+        }
+        ++shard_num_elements_[shard];
+        return Status::OK();
+      }
+
+     private:
+      Status CloseShards() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        Status s;
+        for (auto& writer : shard_writers_) {
+          if (writer) s.Update(writer->Close());
+        }
+        shard_writers_.clear();
+        for (auto& file : shard_files_) {
+          if (file) s.Update(file->Close());
+        }
+        shard_files_.clear();
+        return s;
+      }
+
+      Status DeleteShards() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        Status s;
+        for (const string& filename : shard_filenames_) {
+          s.Update(dataset()->env_->DeleteFile(
+              io::JoinPath(dataset()->directory_, filename)));
+        }
+        return s;
+      }
+
+      // Publishes the shards written by this iterator, unless another writer
+      // has completed the snapshot in the meantime.
+      Status Finish() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        TF_RETURN_IF_ERROR(CloseShards());
+        Env* env = dataset()->env_;
+        const string manifest_filename = dataset()->ManifestFilename();
+        if (env->FileExists(manifest_filename).ok()) {
+          return DeleteShards();
+        }
+        Manifest manifest;
+        manifest.compression_type = dataset()->compression_type_;
+        manifest.dtypes = dataset()->output_dtypes();
+        manifest.shard_filenames = shard_filenames_;
+        manifest.shard_num_elements = shard_num_elements_;
+        const string temp_filename = strings::StrCat(
+            manifest_filename, ".tmp.", shard_filenames_[0]);
+        TF_RETURN_IF_ERROR(
+            WriteStringToFile(env, temp_filename, manifest.Serialize()));
+        return env->RenameFile(temp_filename, manifest_filename);
+      }
+
+      mutex mu_;
+      std::unique_ptr<IteratorBase> input_impl_ GUARDED_BY(mu_);
+      std::vector<string> shard_filenames_ GUARDED_BY(mu_);
+      std::vector<std::unique_ptr<WritableFile>> shard_files_ GUARDED_BY(mu_);
+      std::vector<std::unique_ptr<io::RecordWriter>> shard_writers_
+          GUARDED_BY(mu_);
+      std::vector<int64> shard_num_elements_ GUARDED_BY(mu_);
+      size_t next_shard_ GUARDED_BY(mu_) = 0;
+      bool finished_ GUARDED_BY(mu_) = false;
+    };  // WriterIterator
+
+    // ReaderIterator reads a complete snapshot, with one background thread
+    // per shard. Elements are consumed from the shards round-robin, so they
+    // are produced in the order in which they were written.
+    class ReaderIterator : public DatasetIterator<Dataset> {
+     public:
+      explicit ReaderIterator(const Params& params)
+          : DatasetIterator<Dataset>(params) {}
+
+      ~ReaderIterator() override { CancelThreads(); }
+
+      Status Initialize(IteratorContext* ctx) override {
+        mutex_lock l(mu_);
+        const string manifest_filename = dataset()->ManifestFilename();
+        string contents;
+        TF_RETURN_IF_ERROR(
+            ReadFileToString(dataset()->env_, manifest_filename, &contents));
+        TF_RETURN_IF_ERROR(manifest_.Parse(manifest_filename, contents));
+        if (manifest_.dtypes != dataset()->output_dtypes()) {
+          return errors::InvalidArgument(
+              "The snapshot in ", dataset()->directory_, " has elements of ",
+              "type ", DataTypeVectorString(manifest_.dtypes),
+              ", but the input dataset produces ",
+              DataTypeVectorString(dataset()->output_dtypes()), ".");
+        }
+        for (int64 n : manifest_.shard_num_elements) {
+          num_elements_ += n;
+        }
+        // Element `i` is stored in shard `i % num_shards`.
+        const int64 num_shards = manifest_.shard_num_elements.size();
+        for (int64 i = 0; i < num_shards; ++i) {
+          if (manifest_.shard_num_elements[i] !=
+              num_elements_ / num_shards + (i < num_elements_ % num_shards)) {
+            return errors::DataLoss("Inconsistent shard sizes in snapshot "
+                                    "manifest ",
+                                    manifest_filename);
+          }
+        }
+        return Status::OK();
+      }
+
+      Status GetNextInternal(IteratorContext* ctx,
+                             std::vector<Tensor>* out_tensors,
+                             bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        if (next_index_ >= num_elements_) {
+          *end_of_sequence = true;
+          return Status::OK();
+        }
+        EnsureThreadsStarted();
+        Shard& shard = shards_[next_index_ % shards_.size()];
+        while (shard.buffer.empty()) {
+          cond_var_.wait(l);
+        }
+        // A read error is the last element of its shard, so it is returned
+        // again by any later call.
+        TF_RETURN_IF_ERROR(shard.buffer.front().status);
+        *out_tensors = std::move(shard.buffer.front().value);
+        shard.buffer.pop_front();
+        ++next_index_;
+        cond_var_.notify_all();
+        *end_of_sequence = false;
+        return Status::OK();
+      }
+
+     protected:
+      Status SaveInternal(IteratorStateWriter* writer) override {
+        mutex_lock l(mu_);
+        return writer->WriteScalar(full_name("next_index"), next_index_);
+      }
+
+      Status RestoreInternal(IteratorContext* ctx,
+                             IteratorStateReader* reader) override {
+        CancelThreads();
+        mutex_lock l(mu_);
+        return reader->ReadScalar(full_name("next_index"), &next_index_);
+      }
+
+     private:
+      struct BufferElement {
+        Status status;
+        std::vector<Tensor> value;
+      };
+
+      struct Shard {
+        std::deque<BufferElement> buffer;
+        std::unique_ptr<Thread> thread;
+      };
+
+      void EnsureThreadsStarted() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        if (!shards_.empty()) return;
+        const int64 num_shards = manifest_.shard_filenames.size();
+        shards_.resize(num_shards);
+        for (int64 i = 0; i < num_shards; ++i) {
+          // Skip the elements of this shard that precede `next_index_`, which
+          // is nonzero after restoring from a checkpoint.
+          const int64 skip =
+              next_index_ > i ? (next_index_ - i + num_shards - 1) / num_shards
+                              : 0;
+          shards_[i].thread.reset(dataset()->env_->StartThread(
+              {}, "snapshot_reader_thread",
+              std::bind(&ReaderIterator::ReaderThread, this, i, skip)));
+        }
+      }
+
+      // Stops and joins the reader threads, and discards their buffers.
+      void CancelThreads() LOCKS_EXCLUDED(mu_) {
+        std::vector<std::unique_ptr<Thread>> threads;
+        {
+          mutex_lock l(mu_);
+          cancelled_ = true;
+          cond_var_.notify_all();
+          for (Shard& shard : shards_) {
+            threads.push_back(std::move(shard.thread));
+          }
+        }
+        // Join the threads without holding `mu_`, which they acquire.
+        threads.clear();
+        mutex_lock l(mu_);
+        shards_.clear();
+        cancelled_ = false;
+      }
+
+      // Reads the elements of shard `index`, skipping the first `skip`.
+      void ReaderThread(int64 index, int64 skip) {
+        Status s = ReadShard(index, skip);
+        if (!s.ok()) {
+          mutex_lock l(mu_);
+          if (!cancelled_) {
+            shards_[index].buffer.push_back({s, {}});
+            cond_var_.notify_all();
+          }
+        }
+      }
+
+      Status ReadShard(int64 index, int64 skip) {
+        const string filename = io::JoinPath(
+            dataset()->directory_, manifest_.shard_filenames[index]);
+        std::unique_ptr<RandomAccessFile> file;
+        TF_RETURN_IF_ERROR(dataset()->env_->NewRandomAccessFile(filename, &file));
+        io::SequentialRecordReader reader(
+            file.get(), io::RecordReaderOptions::CreateRecordReaderOptions(
+                            manifest_.compression_type));
+        const size_t num_components = manifest_.dtypes.size();
+        string record;
+        for (int64 i = 0; i < manifest_.shard_num_elements[index]; ++i) {
+          BufferElement element;
+          for (size_t j = 0; j < num_components; ++j) {
+            TF_RETURN_IF_ERROR(reader.ReadRecord(&record));
+            if (i < skip) continue;
+            TensorProto proto;
+            element.value.emplace_back();
+            if (!proto.ParseFromString(record) ||
+                !element.value.back().FromProto(proto) ||
+                element.value.back().dtype() != manifest_.dtypes[j]) {
+              return errors::DataLoss("Corrupted element in snapshot shard ",
+                                      filename);
+            }
+          }
+          if (i < skip) continue;
+          mutex_lock l(mu_);
+          while (!cancelled_ &&
+                 shards_[index].buffer.size() >= kShardBufferSize) {
+            cond_var_.wait(l);
+          }
+          if (cancelled_) {
+            return Status::OK();
+          }
+          shards_[index].buffer.push_back(std::move(element));
+          cond_var_.notify_all();
+        }
+        return Status::OK();
+      }
+
+      mutex mu_;
+      condition_variable cond_var_;
+      Manifest manifest_;
+      int64 num_elements_ = 0;
+      int64 next_index_ GUARDED_BY(mu_) = 0;
+      bool cancelled_ GUARDED_BY(mu_) = false;
+      std::vector<Shard> shards_ GUARDED_BY(mu_);
+    };  // ReaderIterator
+
+    const DatasetBase* const input_;
+    Env* const env_;
+    const string path_;
+    const string graph_def_;
+    const string fingerprint_;
+    const string directory_;
+    const int64 num_shards_;
+    const string compression_type_;
+  };  // Dataset
+};
+
+REGISTER_KERNEL_BUILDER(Name("SnapshotDataset").Device(DEVICE_CPU),
+                        SnapshotDatasetOp);
+
+}  // namespace
+
+}  // namespace tensorflow
@@ -192,6 +192,7 @@ class ThreadPoolDatasetOp : public UnaryDatasetOpKernel {
         params.lib = ctx->lib();
         params.function_library = ctx->function_library();
         params.allocator_getter = ctx->allocator_getter();
+        params.instrument_pipeline = ctx->instrument_pipeline();
         IteratorContext threadpool_ctx(params);
         return input_impl_->GetNext(&threadpool_ctx, out_tensors,
                                     end_of_sequence);
@@ -42,6 +42,7 @@ REGISTER_OP("CSVDataset")
     .Input("use_quote_delim: bool")
     .Input("na_value: string")
     .Input("select_cols: int64")
+    .Input("byte_ranges: int64")
     .Input("record_defaults: output_types")
     .Output("handle: variant")
     .Attr("output_types: list({float,double,int32,int64,string}) >= 1")
@@ -61,8 +62,13 @@ REGISTER_OP("CSVDataset")
       TF_RETURN_IF_ERROR(c->WithRank(c->input(5), 0, &unused));
       // `select_cols` must be a vector
       TF_RETURN_IF_ERROR(c->WithRank(c->input(6), 1, &unused));
+      // `byte_ranges` must be a matrix with two columns
+      TF_RETURN_IF_ERROR(c->WithRank(c->input(7), 2, &unused));
+      shape_inference::DimensionHandle unused_dim;
+      TF_RETURN_IF_ERROR(
+          c->WithValue(c->Dim(c->input(7), 1), 2, &unused_dim));
       // `record_defaults` must be a list of scalars...?
-      for (size_t i = 7; i < c->num_inputs(); ++i) {
+      for (size_t i = 8; i < c->num_inputs(); ++i) {
         TF_RETURN_IF_ERROR(c->WithRank(c->input(i), 1, &unused));
       }
       return shape_inference::ScalarShape(c);
@@ -88,6 +94,103 @@ REGISTER_OP("UniqueDataset")
 Creates a dataset that contains the unique elements of `input_dataset`.
 )doc");
 
+REGISTER_OP("BoundedCacheDataset")
+    .Input("input_dataset: variant")
+    .Input("memory_budget: int64")
+    .Input("spill_directory: string")
+    .Input("eviction_policy: string")
+    .Input("tag: string")
+    .Output("handle: variant")
+    .Attr("output_types: list(type) >= 1")
+    .Attr("output_shapes: list(shape) >= 1")
+    .SetShapeFn([](shape_inference::InferenceContext* c) {
+      shape_inference::ShapeHandle unused;
+      // `memory_budget`, `spill_directory`, `eviction_policy` and `tag` must
+      // all be scalars.
+      for (int i = 1; i < 5; ++i) {
+        TF_RETURN_IF_ERROR(c->WithRank(c->input(i), 0, &unused));
+      }
+      return shape_inference::ScalarShape(c);
+    })
+    .Doc(R"doc(
+Creates a dataset that caches elements from `input_dataset` in bounded memory.
+
+At most `memory_budget` bytes of elements are held in memory. Elements evicted
+from memory are written once to a spill file in `spill_directory` and read back
+from there when requested.
+
+memory_budget: The maximum number of bytes of elements to hold in memory.
+spill_directory: The local directory in which to create the spill file. If
+  empty, a temporary directory is used.
+eviction_policy: Either "fifo", which keeps the earliest cached elements in
+  memory, or "lru", which keeps the most recently read ones.
+tag: The prefix of the statistics recorded by the dataset.
+)doc");
+
+REGISTER_OP("SnapshotDataset")
+    .Input("input_dataset: variant")
+    .Input("path: string")
+    .Input("graph_def: string")
+    .Input("fingerprint: string")
+    .Input("num_shards: int64")
+    .Input("compression_type: string")
+    .Output("handle: variant")
+    .Attr("output_types: list(type) >= 1")
+    .Attr("output_shapes: list(shape) >= 1")
+    .SetShapeFn([](shape_inference::InferenceContext* c) {
+      shape_inference::ShapeHandle unused;
+      // `path`, `graph_def`, `fingerprint`, `num_shards` and
+      // `compression_type` must all be scalars.
+      for (int i = 1; i < 6; ++i) {
+        TF_RETURN_IF_ERROR(c->WithRank(c->input(i), 0, &unused));
+      }
+      return shape_inference::ScalarShape(c);
+    })
+    .Doc(R"doc(
+Creates a dataset that materializes `input_dataset` in sharded snapshot files.
+
+The snapshot is stored in a subdirectory of `path` named by a fingerprint of
+`input_dataset`. If that directory holds a complete snapshot, its elements are
+read back in parallel and `input_dataset` is not evaluated. Otherwise, the
+elements of `input_dataset` are passed through and written to `num_shards` new
+shard files, which are published when the input is exhausted.
+
+path: The directory in which snapshots are stored.
+graph_def: A serialized `GraphDef` of `input_dataset`, as produced by
+  `DatasetToGraph`, from which the fingerprint is computed. Ignored if
+  `fingerprint` is not empty.
+fingerprint: If not empty, the name of the snapshot subdirectory, used in
+  place of the fingerprint of `graph_def`.
+num_shards: The number of shard files to write.
+compression_type: One of "" (no compression), "ZLIB", or "GZIP".
+)doc");
+
+REGISTER_OP("DatasetToShardedTFRecord")
+    .Input("input_dataset: variant")
+    .Input("directory: string")
+    .Input("filename_prefix: string")
+    .Input("num_shards: int64")
+    .Input("compression_type: string")
+    .Input("max_shard_bytes: int64")
+    .SetShapeFn(shape_inference::NoOutputs)
+    .Doc(R"doc(
+Writes the scalar strings produced by `input_dataset` to sharded TFRecord files.
+
+Record `i` is written to shard `i % num_shards`, and each shard is written by
+its own thread. Shard `s` is stored in the files
+"<filename_prefix>-<s>-<part>.tfrecord" in `directory`; a new part is started
+whenever the current one would exceed `max_shard_bytes`. When all records have
+been written, the file "<filename_prefix>.manifest" lists each file with the
+number of records in it, one "<filename> <num_records>" pair per line.
+
+directory: The directory in which to write the files.
+filename_prefix: The prefix of the names of the written files.
+num_shards: The number of shards, and of writer threads.
+compression_type: One of "" (no compression), "ZLIB", or "GZIP".
+max_shard_bytes: The maximum number of (uncompressed) bytes to write to each
+  file, or 0 for no limit. A file always holds at least one record.
+)doc");
+
 REGISTER_OP("IteratorGetDevice")
     .Input("resource: resource")
     .Output("device: string")
@@ -24,6 +24,7 @@ from absl.testing import parameterized
 import numpy as np
 
 from tensorflow.contrib.data.python.ops import batching
+from tensorflow.contrib.data.python.ops import optimization
 from tensorflow.python.client import session
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.framework import constant_op
@@ -432,6 +433,8 @@ class BatchDatasetTest(test.TestCase, parameterized.TestCase):
       ("sequential_calls", 1, None),
       ("parallel_calls", 2, None),
       ("parallel_batches", None, 10),
+      ("autotune_calls", optimization.AUTOTUNE, None),
+      ("autotune_batches", None, optimization.AUTOTUNE),
   )
   def testMapAndBatch(self, num_parallel_calls, num_parallel_batches):
     """Test a dataset that maps a TF function across its input elements."""
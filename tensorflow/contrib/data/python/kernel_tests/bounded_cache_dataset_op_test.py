@@ -0,0 +1,170 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the experimental bounded-memory cache transformation."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorflow.contrib.data.python.ops import caching
+from tensorflow.contrib.data.python.ops import stats_ops
+from tensorflow.core.framework import summary_pb2
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.ops import array_ops
+from tensorflow.python.platform import test
+
+
+class BoundedCacheDatasetTest(test.TestCase):
+
+  def _testRepeatedEpochs(self, eviction_policy):
+    # Each element takes 80 bytes, so only a few fit in the memory budget and
+    # the rest are read back from the spill file.
+    dataset = dataset_ops.Dataset.range(20).map(
+        lambda x: array_ops.fill([10], x)).apply(
+            caching.bounded_cache(
+                memory_budget=300,
+                spill_directory=self.get_temp_dir(),
+                eviction_policy=eviction_policy)).repeat(3)
+    iterator = dataset.make_one_shot_iterator()
+    next_element = iterator.get_next()
+
+    with self.test_session() as sess:
+      for _ in range(3):
+        for i in range(20):
+          self.assertAllEqual(
+              np.full([10], i, dtype=np.int64), sess.run(next_element))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(next_element)
+
+  def testRepeatedEpochsFifo(self):
+    self._testRepeatedEpochs("fifo")
+
+  def testRepeatedEpochsLru(self):
+    self._testRepeatedEpochs("lru")
+
+  def _testResidentElements(self, eviction_policy, expected_hits):
+    stats_aggregator = stats_ops.StatsAggregator()
+    # Each element takes 80 bytes, so only 3 of them fit in the memory budget.
+    dataset = dataset_ops.Dataset.range(20).map(
+        lambda x: array_ops.fill([10], x)).apply(
+            caching.bounded_cache(
+                memory_budget=300,
+                spill_directory=self.get_temp_dir(),
+                eviction_policy=eviction_policy,
+                tag="cache")).repeat(2).apply(
+                    stats_ops.set_stats_aggregator(stats_aggregator))
+    iterator = dataset.make_one_shot_iterator()
+    next_element = iterator.get_next()
+    summary_t = stats_aggregator.get_summary()
+
+    with self.test_session() as sess:
+      for _ in range(20):
+        sess.run(next_element)
+      # Only the second pass looks elements up, so the hit rate after each of
+      # its reads tells whether that read was served from memory.
+      hits = []
+      num_hits = 0
+      for i in range(20):
+        sess.run(next_element)
+        summary_proto = summary_pb2.Summary()
+        summary_proto.ParseFromString(sess.run(summary_t))
+        values = {
+            value.tag: value.simple_value for value in summary_proto.value
+        }
+        self.assertEqual(240, values["cache:memory-bytes"])
+        new_num_hits = int(round(values["cache:hit-rate"] * (i + 1)))
+        if new_num_hits > num_hits:
+          hits.append(i)
+        num_hits = new_num_hits
+      self.assertEqual(expected_hits, hits)
+
+  def testResidentElementsFifo(self):
+    # The first 3 elements stay in memory.
+    self._testResidentElements("fifo", [0, 1, 2])
+
+  def testResidentElementsLru(self):
+    # The last 3 elements are in memory after the first pass, but each read of
+    # the second pass evicts one of them before it is reached.
+    self._testResidentElements("lru", [])
+
+  def testMultipleComponents(self):
+    dataset = dataset_ops.Dataset.range(10).map(
+        lambda x: (x, array_ops.fill([x], "s"))).apply(
+            caching.bounded_cache(memory_budget=0)).repeat(2)
+    iterator = dataset.make_one_shot_iterator()
+    next_element = iterator.get_next()
+
+    with self.test_session() as sess:
+      for _ in range(2):
+        for i in range(10):
+          index, strings = sess.run(next_element)
+          self.assertEqual(i, index)
+          self.assertAllEqual([b"s"] * i, strings)
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(next_element)
+
+  def testPartialPassIsReused(self):
+    num_calls = [0]
+
+    def generator():
+      for i in range(10):
+        num_calls[0] += 1
+        yield i
+
+    dataset = dataset_ops.Dataset.from_generator(
+        generator, output_types=dtypes.int64).apply(
+            caching.bounded_cache(memory_budget=16)).take(4).repeat(2)
+    iterator = dataset.make_one_shot_iterator()
+    next_element = iterator.get_next()
+
+    with self.test_session() as sess:
+      for _ in range(2):
+        for i in range(4):
+          self.assertEqual(i, sess.run(next_element))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(next_element)
+    # The second pass is served from the cache.
+    self.assertEqual(4, num_calls[0])
+
+  def testHitRateStats(self):
+    stats_aggregator = stats_ops.StatsAggregator()
+    dataset = dataset_ops.Dataset.range(10).apply(
+        caching.bounded_cache(memory_budget=1 << 20, tag="cache")).repeat(
+            2).apply(stats_ops.set_stats_aggregator(stats_aggregator))
+    iterator = dataset.make_one_shot_iterator()
+    next_element = iterator.get_next()
+    summary_t = stats_aggregator.get_summary()
+
+    with self.test_session() as sess:
+      for _ in range(20):
+        sess.run(next_element)
+      summary_proto = summary_pb2.Summary()
+      summary_proto.ParseFromString(sess.run(summary_t))
+      values = {value.tag: value.simple_value for value in summary_proto.value}
+      # Everything fits in memory, so every read of the second pass is a hit.
+      self.assertEqual(1.0, values["cache:hit-rate"])
+      self.assertEqual(80, values["cache:memory-bytes"])
+      self.assertEqual(0, values["cache:spilled-bytes"])
+
+  def testInvalidEvictionPolicy(self):
+    with self.assertRaisesRegexp(ValueError, "eviction_policy"):
+      caching.bounded_cache(memory_budget=100, eviction_policy="random")
+
+
+if __name__ == "__main__":
+  test.main()
@@ -523,6 +523,43 @@ class CsvDatasetOpTest(test.TestCase):
     self._test_dataset(
         inputs, expected, linebreak='\r\n', record_defaults=record_defaults)
 
+  def testCsvDataset_withByteRanges(self):
+    # Test that byte ranges which partition a file read each of its records
+    # exactly once, for all range sizes and line separators.
+    record_defaults = [['NA']] * 3
+    expected = [['abc', 'def', 'ghi'], ['0', '1', '2'], ['NA', 'NA', 'NA'],
+                ['x', 'yz', 'NA']]
+    for linebreak in ['\n', '\r', '\r\n']:
+      inputs = [['col1,col2,col3', 'abc,def,ghi', '0,1,2', ',,', 'x,yz,']]
+      filename = self.setup_files(inputs, linebreak)[0]
+      file_size = os.path.getsize(filename)
+      for split_size in range(1, file_size + 1):
+        byte_ranges = [[start, min(start + split_size, file_size)]
+                       for start in range(0, file_size, split_size)]
+        with ops.Graph().as_default() as g:
+          with self.test_session(graph=g) as sess:
+            dataset = readers.CsvDataset(
+                [filename] * len(byte_ranges),
+                record_defaults=record_defaults,
+                header=True,
+                byte_ranges=byte_ranges,
+                buffer_size=2)
+            self._verify_output_or_err(sess, dataset, expected)
+
+  def testCsvDataset_errorWithInvalidByteRanges(self):
+    record_defaults = [['NA']] * 3
+    inputs = [['abc,def,ghi', '0,1,2']]
+    self._test_dataset(
+        inputs,
+        expected_err_re='Invalid byte range',
+        record_defaults=record_defaults,
+        byte_ranges=[[5, 2]])
+    self._test_dataset(
+        inputs,
+        expected_err_re='one row per file',
+        record_defaults=record_defaults,
+        byte_ranges=[[0, 5], [5, 10]])
+
 
 class CsvDatasetBenchmark(test.Benchmark):
   """Benchmarks for the various ways of creating a dataset from CSV files.
@@ -25,6 +25,7 @@ import time
 from six.moves import zip_longest
 
 from tensorflow.contrib.data.python.ops import interleave_ops
+from tensorflow.contrib.data.python.ops import optimization
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
@@ -174,7 +175,8 @@ class ParallelInterleaveDatasetTest(test.TestCase):
     for i in range(4, 7):
       self.write_coordination_events[i].set()
 
-  def _testSingleThreaded(self, sloppy=False, prefetch_input_elements=0):
+  def _testSingleThreaded(self, sloppy=False, prefetch_input_elements=0,
+                          buffer_output_elements=1):
     # cycle_length=1,block_length=1 acts like `Dataset.interleave()` and
     # `Dataset.flat_map()` and is single-threaded. No synchronization required.
     with self.test_session() as sess:
@@ -186,7 +188,7 @@ class ParallelInterleaveDatasetTest(test.TestCase):
               self.cycle_length: 1,
               self.block_length: 1,
               self.sloppy: sloppy,
-              self.buffer_output_elements: 1,
+              self.buffer_output_elements: buffer_output_elements,
               self.prefetch_input_elements: prefetch_input_elements,
           })
 
@@ -210,6 +212,9 @@ class ParallelInterleaveDatasetTest(test.TestCase):
   def testSingleThreadedPrefetch1ItrSloppy(self):
     self._testSingleThreaded(prefetch_input_elements=1, sloppy=True)
 
+  def testSingleThreadedAutotuneBuffer(self):
+    self._testSingleThreaded(buffer_output_elements=optimization.AUTOTUNE)
+
   def testSingleThreadedRagged(self):
     # Tests a sequence with wildly different elements per iterator.
     with self.test_session() as sess:
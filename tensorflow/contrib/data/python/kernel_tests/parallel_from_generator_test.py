@@ -0,0 +1,116 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the experimental multi-process generator dataset."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorflow.contrib.data.python.ops import generator_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.platform import test
+from tensorflow.python.util import compat
+
+
+def _sharded_range(worker_index, num_workers):
+  for i in range(worker_index, 20, num_workers):
+    yield i, np.full([i], i, dtype=np.float32)
+
+
+def _uneven_range(worker_index, unused_num_workers):
+  # Worker 0 produces [0, 1], worker 1 produces [10, 11, 12, 13].
+  for i in range(2 + 2 * worker_index):
+    yield 10 * worker_index + i
+
+
+class ParallelFromGeneratorTest(test.TestCase):
+
+  def _getElements(self, dataset):
+    next_element = dataset.make_one_shot_iterator().get_next()
+    elements = []
+    with self.test_session() as sess:
+      while True:
+        try:
+          elements.append(sess.run(next_element))
+        except errors.OutOfRangeError:
+          return elements
+
+  def testDeterministicOrder(self):
+    dataset = generator_ops.parallel_from_generator(
+        _sharded_range, (dtypes.int64, dtypes.float32),
+        (tensor_shape.scalar(), tensor_shape.TensorShape([None])),
+        num_workers=3)
+    elements = self._getElements(dataset)
+    self.assertEqual(list(range(20)), [index for index, _ in elements])
+    for index, values in elements:
+      self.assertAllEqual(np.full([index], index, dtype=np.float32), values)
+
+  def testDeterministicOrderSkipsExhaustedWorkers(self):
+    dataset = generator_ops.parallel_from_generator(
+        _uneven_range, dtypes.int64, num_workers=2)
+    self.assertEqual([0, 10, 1, 11, 12, 13], self._getElements(dataset))
+
+  def testNonDeterministicOrder(self):
+    dataset = generator_ops.parallel_from_generator(
+        _sharded_range, (dtypes.int64, dtypes.float32),
+        num_workers=4, deterministic=False)
+    elements = self._getElements(dataset)
+    self.assertEqual(list(range(20)),
+                     sorted(index for index, _ in elements))
+
+  def testElementsLargerThanSlot(self):
+    # Elements that do not fit in shared memory are pickled instead.
+    dataset = generator_ops.parallel_from_generator(
+        _sharded_range, (dtypes.int64, dtypes.float32),
+        num_workers=2, slot_bytes=32)
+    elements = self._getElements(dataset)
+    self.assertEqual(list(range(20)), [index for index, _ in elements])
+    self.assertAllEqual(np.full([19], 19, dtype=np.float32), elements[-1][1])
+
+  def testStrings(self):
+
+    def generator(worker_index, num_workers):
+      for i in range(worker_index, 6, num_workers):
+        yield compat.as_bytes("element %d" % i)
+
+    dataset = generator_ops.parallel_from_generator(
+        generator, dtypes.string, num_workers=2)
+    self.assertEqual([compat.as_bytes("element %d" % i) for i in range(6)],
+                     self._getElements(dataset))
+
+  def testWorkerError(self):
+
+    def generator(worker_index, unused_num_workers):
+      yield worker_index
+      raise ValueError("Worker %d failed" % worker_index)
+
+    dataset = generator_ops.parallel_from_generator(
+        generator, dtypes.int64, num_workers=2)
+    with self.assertRaisesRegexp(errors.OpError, "Worker 0 failed"):
+      self._getElements(dataset)
+
+  def testInvalidArguments(self):
+    with self.assertRaises(TypeError):
+      generator_ops.parallel_from_generator(None, dtypes.int64)
+    with self.assertRaises(ValueError):
+      generator_ops.parallel_from_generator(
+          _uneven_range, dtypes.int64, num_workers=0)
+
+
+if __name__ == "__main__":
+  test.main()
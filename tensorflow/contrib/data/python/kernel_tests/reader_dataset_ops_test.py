@@ -667,6 +667,77 @@ class MakeCsvDatasetTest(test.TestCase):
               all_equal = all_equal and np.array_equal(batch1[i], batch2[i])
           self.assertFalse(all_equal)
 
+  def testMakeCSVDataset_withMaxSplitBytes(self):
+    # Splitting files into byte ranges of any size reads every record once,
+    # and in order when the ranges are read sequentially.
+    for max_split_bytes in [1, 16, 1 << 20]:
+      with ops.Graph().as_default() as g:
+        with self.test_session(graph=g) as sess:
+          dataset = readers.make_csv_dataset(
+              self._test_filenames,
+              batch_size=2,
+              column_names=self.COLUMNS,
+              column_defaults=self.DEFAULTS,
+              label_name=self.LABEL,
+              num_epochs=1,
+              shuffle=False,
+              max_split_bytes=max_split_bytes)
+          self._verify_records(
+              sess, dataset, range(self._num_files), batch_size=2)
+
+  def testMakeCSVDataset_withMaxSplitBytesAndParallelReads(self):
+    with ops.Graph().as_default() as g:
+      with self.test_session(graph=g) as sess:
+        dataset = readers.make_csv_dataset(
+            self._test_filenames,
+            batch_size=1,
+            column_names=self.COLUMNS,
+            column_defaults=self.DEFAULTS,
+            label_name=None,
+            num_epochs=1,
+            shuffle=False,
+            num_parallel_reads=4,
+            max_split_bytes=16)
+        features = dataset.make_one_shot_iterator().get_next()
+        records = []
+        while True:
+          try:
+            values = sess.run(features)
+          except errors.OutOfRangeError:
+            break
+          records.append((values["col0"][0], values["col1"][0]))
+    self.assertItemsEqual([(i, j)
+                           for i in range(self._num_files)
+                           for j in range(self._num_records)], records)
+
+  def testMakeCSVDataset_withInvalidMaxSplitBytes(self):
+    with self.assertRaises(ValueError):
+      readers.make_csv_dataset(
+          self._test_filenames,
+          batch_size=1,
+          column_defaults=self.DEFAULTS,
+          max_split_bytes=0)
+
+  def testMakeCSVDataset_withTypeInferenceSampledAcrossFiles(self):
+    # The inference sample is spread across files, so a float column is
+    # inferred even though the first rows of the first file are all ints.
+    filenames = [
+        self._write_file("ints.csv", [["col0"], [1], [2], [3]]),
+        self._write_file("floats.csv", [["col0"], [1.5]]),
+    ]
+    with ops.Graph().as_default() as g:
+      with self.test_session(graph=g) as sess:
+        dataset = readers.make_csv_dataset(
+            filenames,
+            batch_size=4,
+            label_name=None,
+            num_epochs=1,
+            shuffle=False,
+            num_rows_for_inference=2)
+        features = dataset.make_one_shot_iterator().get_next()
+        self.assertEqual(dtypes.float32, features["col0"].dtype)
+        self.assertAllEqual([1., 2., 3., 1.5], sess.run(features)["col0"])
+
 
 class MakeTFRecordDatasetTest(
     reader_dataset_ops_test_base.TFRecordDatasetTestBase):
@@ -0,0 +1,143 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the experimental snapshot transformation."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+from tensorflow.contrib.data.python.ops import caching
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.platform import test
+
+
+class SnapshotDatasetTest(test.TestCase):
+
+  def _readAll(self, dataset):
+    """Returns the elements of `dataset`, evaluated in a new graph."""
+    results = []
+    with ops.Graph().as_default() as g:
+      next_element = dataset().make_one_shot_iterator().get_next()
+      with self.test_session(graph=g) as sess:
+        while True:
+          try:
+            results.append(sess.run(next_element))
+          except errors.OutOfRangeError:
+            break
+    return results
+
+  def _snapshotDirectories(self, path):
+    return [
+        name for name in os.listdir(path)
+        if os.path.isdir(os.path.join(path, name))
+    ]
+
+  def testWriteThenRead(self):
+    path = self.get_temp_dir()
+    num_calls = [0]
+
+    def generator():
+      for i in range(10):
+        num_calls[0] += 1
+        yield i
+
+    dataset = dataset_ops.Dataset.from_generator(
+        generator, output_types=dtypes.int64).apply(
+            caching.snapshot(path, fingerprint="generator",
+                             num_shards=3)).repeat(2)
+    iterator = dataset.make_one_shot_iterator()
+    next_element = iterator.get_next()
+
+    with self.test_session() as sess:
+      for _ in range(2):
+        for i in range(10):
+          self.assertEqual(i, sess.run(next_element))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(next_element)
+    # The second epoch is read from the snapshot.
+    self.assertEqual(10, num_calls[0])
+
+    files = os.listdir(os.path.join(path, "generator"))
+    self.assertIn("snapshot.manifest", files)
+    self.assertEqual(3, len([f for f in files if f.endswith(".shard")]))
+
+  def testCompressionTypes(self):
+    for compression_type in ["", "ZLIB", "GZIP"]:
+      path = os.path.join(self.get_temp_dir(), compression_type or "none")
+
+      def dataset(path=path, compression_type=compression_type):
+        return dataset_ops.Dataset.range(20).map(
+            lambda x: (x, array_ops.fill([x], "s"))).apply(
+                caching.snapshot(path, num_shards=4,
+                                 compression_type=compression_type))
+
+      expected = [(i, [b"s"] * i) for i in range(20)]
+      for _ in range(2):
+        results = self._readAll(dataset)
+        self.assertEqual(20, len(results))
+        for (index, strings), (expected_index, expected_strings) in zip(
+            results, expected):
+          self.assertEqual(expected_index, index)
+          self.assertAllEqual(expected_strings, strings)
+      self.assertEqual(1, len(self._snapshotDirectories(path)))
+
+  def testSnapshotSharedBetweenIdenticalPipelines(self):
+    path = self.get_temp_dir()
+
+    def dataset():
+      return dataset_ops.Dataset.range(10).map(lambda x: x * x).apply(
+          caching.snapshot(path))
+
+    self.assertEqual([i * i for i in range(10)], self._readAll(dataset))
+    self.assertEqual([i * i for i in range(10)], self._readAll(dataset))
+    self.assertEqual(1, len(self._snapshotDirectories(path)))
+
+  def testDifferentPipelinesUseDifferentSnapshots(self):
+    path = self.get_temp_dir()
+
+    def squares():
+      return dataset_ops.Dataset.range(10).map(lambda x: x * x).apply(
+          caching.snapshot(path))
+
+    def cubes():
+      return dataset_ops.Dataset.range(10).map(lambda x: x * x * x).apply(
+          caching.snapshot(path))
+
+    self.assertEqual([i * i for i in range(10)], self._readAll(squares))
+    self.assertEqual([i * i * i for i in range(10)], self._readAll(cubes))
+    self.assertEqual(2, len(self._snapshotDirectories(path)))
+
+  def testIncompleteSnapshotIsDiscarded(self):
+    path = self.get_temp_dir()
+
+    def dataset():
+      return dataset_ops.Dataset.range(10).apply(
+          caching.snapshot(path, fingerprint="partial")).take(5)
+
+    self.assertEqual(list(range(5)), self._readAll(dataset))
+    self.assertEqual([], os.listdir(os.path.join(path, "partial")))
+
+  def testInvalidCompressionType(self):
+    with self.assertRaisesRegexp(ValueError, "compression_type"):
+      caching.snapshot(self.get_temp_dir(), compression_type="BZIP2")
+
+
+if __name__ == "__main__":
+  test.main()
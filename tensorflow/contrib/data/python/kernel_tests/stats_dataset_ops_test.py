@@ -195,6 +195,114 @@ class StatsDatasetTest(StatsDatasetTestBase):
         sess.run(next_element)
       self._assertSummaryHasCount(sess.run(summary_t), "record_latency", 200.0)
 
+  def testInstrumentPipeline(self):
+    stats_aggregator = stats_ops.StatsAggregator()
+    dataset = dataset_ops.Dataset.range(4).interleave(
+        lambda x: dataset_ops.Dataset.range(10), cycle_length=2).map(
+            lambda x: x * x, num_parallel_calls=2).prefetch(1).apply(
+                stats_ops.set_stats_aggregator(
+                    stats_aggregator, instrument_pipeline=True))
+    iterator = dataset.make_initializable_iterator()
+    next_element = iterator.get_next()
+    summary_t = stats_aggregator.get_summary()
+
+    with self.test_session() as sess:
+      sess.run(iterator.initializer)
+      for _ in range(40):
+        sess.run(next_element)
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(next_element)
+      summary_str = sess.run(summary_t)
+
+    prefix = "Iterator::SetStatsAggregator::Prefetch"
+    self._assertSummaryHasCount(summary_str, prefix + ":latency", 40.0)
+    self._assertSummaryHasCount(
+        summary_str, prefix + "::ParallelMap::Interleave:latency", 40.0)
+    self._assertSummaryHasCount(
+        summary_str, prefix + "::ParallelMap::Interleave::Range:latency", 4.0)
+    self._assertSummaryHasCount(
+        summary_str, prefix + "::ParallelMap::Interleave[]::Range:latency",
+        40.0)
+
+    report = stats_ops.pipeline_stats_report(summary_str)
+    self.assertEqual([
+        prefix, prefix + "::ParallelMap", prefix + "::ParallelMap::Interleave",
+        prefix + "::ParallelMap::Interleave::Range",
+        prefix + "::ParallelMap::Interleave[]::Range"
+    ], [stage.name for stage in report.stages])
+    stages = {stage.name: stage for stage in report.stages}
+    self.assertEqual(1, stages[prefix].buffer_capacity)
+    self.assertEqual(2, stages[prefix + "::ParallelMap"].buffer_capacity)
+    self.assertIsNone(
+        stages[prefix + "::ParallelMap::Interleave"].buffer_capacity)
+    self.assertIn(report.bottleneck, report.stages)
+    self.assertGreaterEqual(report.consumer_wait_time, 0.0)
+
+  def testNotInstrumentedByDefault(self):
+    stats_aggregator = stats_ops.StatsAggregator()
+    dataset = dataset_ops.Dataset.range(10).prefetch(1).apply(
+        stats_ops.set_stats_aggregator(stats_aggregator))
+    iterator = dataset.make_initializable_iterator()
+    next_element = iterator.get_next()
+    summary_t = stats_aggregator.get_summary()
+
+    with self.test_session() as sess:
+      sess.run(iterator.initializer)
+      for _ in range(10):
+        sess.run(next_element)
+      report = stats_ops.pipeline_stats_report(sess.run(summary_t))
+      self.assertEqual([], report.stages)
+      self.assertIsNone(report.bottleneck)
+      self.assertEqual(0.0, report.consumer_wait_time)
+
+  def testPipelineStatsReport(self):
+    summary = summary_pb2.Summary()
+
+    def add_histogram(tag, values):
+      histo = summary.value.add(tag=tag).histo
+      histo.num = len(values)
+      histo.sum = sum(values)
+      histo.min = min(values)
+      histo.max = max(values)
+      for value in sorted(values):
+        histo.bucket_limit.append(value)
+        histo.bucket.append(1.0)
+
+    # The consumer waits on "Prefetch", whose input "Map" does most of the
+    # work in the background.
+    add_histogram("Iterator::Prefetch:latency", [10.0] * 10)
+    add_histogram("Iterator::Prefetch::Map:latency",
+                  [100.0 * (i + 1) for i in range(10)])
+    add_histogram("Iterator::Prefetch::Map::Range:latency", [1.0] * 10)
+    add_histogram("Iterator::Prefetch:buffer_occupancy", [0.0, 1.0])
+    summary.value.add(tag="Iterator::Prefetch:buffer_capacity",
+                      simple_value=2.0)
+    add_histogram("user_tag", [1.0])
+
+    report = stats_ops.pipeline_stats_report(summary.SerializeToString())
+    self.assertEqual([
+        "Iterator::Prefetch", "Iterator::Prefetch::Map",
+        "Iterator::Prefetch::Map::Range"
+    ], [stage.name for stage in report.stages])
+    prefetch, map_stage, range_stage = report.stages
+
+    self.assertEqual(10, prefetch.num_elements)
+    self.assertEqual(10.0, prefetch.mean_latency)
+    self.assertEqual(0.0, prefetch.self_time)
+    self.assertEqual(0.5, prefetch.mean_buffer_occupancy)
+    self.assertEqual(2, prefetch.buffer_capacity)
+
+    self.assertEqual(550.0, map_stage.mean_latency)
+    self.assertEqual(500.0, map_stage.p50_latency)
+    self.assertAlmostEqual(990.0, map_stage.p99_latency)
+    self.assertEqual(5490.0, map_stage.self_time)
+    self.assertIsNone(map_stage.buffer_capacity)
+
+    self.assertEqual(10.0, range_stage.self_time)
+    self.assertEqual(100.0, report.consumer_wait_time)
+    self.assertEqual("Iterator::Prefetch::Map", report.bottleneck.name)
+    self.assertIn("bottleneck: Iterator::Prefetch::Map", str(report))
+
 
 class FeatureStatsDatasetTest(
     StatsDatasetTestBase,
@@ -23,9 +23,11 @@ from tensorflow.contrib.data.python.ops import writers
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.ops import readers
 from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
 from tensorflow.python.lib.io import python_io
 from tensorflow.python.lib.io import tf_record
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import string_ops
 from tensorflow.python.platform import test
 from tensorflow.python.util import compat
 
@@ -113,5 +115,90 @@ class TFRecordWriterTest(test.TestCase):
                              self.compression_type).write(input_dataset)
 
 
+class ShardedTFRecordWriterTest(test.TestCase):
+
+  def _record(self, i):
+    return compat.as_bytes("Record %d" % (i))
+
+  def _dataset(self, num_records):
+    return dataset_ops.Dataset.range(num_records).map(
+        lambda i: string_ops.string_join(["Record ", string_ops.as_string(i)]))
+
+  def _readManifest(self, directory, filename_prefix="part"):
+    with open(os.path.join(directory, filename_prefix + ".manifest")) as f:
+      return [(name, int(count)) for name, count in
+              (line.split() for line in f.read().splitlines())]
+
+  def _readRecords(self, directory, filename, options=None):
+    return list(
+        tf_record.tf_record_iterator(
+            os.path.join(directory, filename), options=options))
+
+  def testWrite(self):
+    directory = os.path.join(self.get_temp_dir(), "write")
+    write_op = writers.ShardedTFRecordWriter(directory, num_shards=3).write(
+        self._dataset(10))
+    with self.test_session() as sess:
+      sess.run(write_op)
+
+    manifest = self._readManifest(directory)
+    self.assertEqual([
+        ("part-00000-00000.tfrecord", 4),
+        ("part-00001-00000.tfrecord", 3),
+        ("part-00002-00000.tfrecord", 3),
+    ], manifest)
+    for shard, (filename, num_records) in enumerate(manifest):
+      records = self._readRecords(directory, filename)
+      self.assertEqual(num_records, len(records))
+      self.assertAllEqual(
+          [self._record(i) for i in range(shard, 10, 3)], records)
+
+  def testMaxShardBytes(self):
+    directory = os.path.join(self.get_temp_dir(), "max_shard_bytes")
+    # Each record takes 8 bytes plus 16 bytes of framing, so every file holds
+    # at most two records.
+    write_op = writers.ShardedTFRecordWriter(
+        directory, num_shards=2, max_shard_bytes=50,
+        filename_prefix="data").write(self._dataset(10))
+    with self.test_session() as sess:
+      sess.run(write_op)
+
+    manifest = self._readManifest(directory, "data")
+    self.assertEqual(6, len(manifest))
+    self.assertEqual(10, sum(num_records for _, num_records in manifest))
+    records = []
+    for filename, num_records in manifest:
+      self.assertLessEqual(num_records, 2)
+      records.extend(self._readRecords(directory, filename))
+    self.assertItemsEqual([self._record(i) for i in range(10)], records)
+
+  def testWriteGZIP(self):
+    directory = os.path.join(self.get_temp_dir(), "gzip")
+    options = tf_record.TFRecordOptions(tf_record.TFRecordCompressionType.GZIP)
+    write_op = writers.ShardedTFRecordWriter(
+        directory, num_shards=2, compression_type="GZIP").write(
+            self._dataset(6))
+    with self.test_session() as sess:
+      sess.run(write_op)
+
+    records = []
+    for filename, _ in self._readManifest(directory):
+      records.extend(self._readRecords(directory, filename, options))
+    self.assertItemsEqual([self._record(i) for i in range(6)], records)
+
+  def testFailDType(self):
+    input_dataset = dataset_ops.Dataset.from_tensors(10)
+    with self.assertRaises(TypeError):
+      writers.ShardedTFRecordWriter(self.get_temp_dir(),
+                                    num_shards=2).write(input_dataset)
+
+  def testFailNumShards(self):
+    write_op = writers.ShardedTFRecordWriter(
+        self.get_temp_dir(), num_shards=0).write(self._dataset(1))
+    with self.test_session() as sess:
+      with self.assertRaisesRegexp(errors.InvalidArgumentError, "num_shards"):
+        sess.run(write_op)
+
+
 if __name__ == "__main__":
   test.main()
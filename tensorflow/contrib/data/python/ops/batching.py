@@ -21,6 +21,7 @@ import numpy as np
 
 from tensorflow.contrib.data.python.ops import get_single_element
 from tensorflow.contrib.data.python.ops import grouping
+from tensorflow.contrib.data.python.ops import optimization
 from tensorflow.contrib.framework import with_shape
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.util import convert
@@ -797,14 +798,19 @@ def map_and_batch(map_func,
     num_parallel_batches: (Optional.) A `tf.int64` scalar `tf.Tensor`,
       representing the number of batches to create in parallel. On one hand,
       higher values can help mitigate the effect of stragglers. On the other
-      hand, higher values can increase contention if CPU is scarce.
+      hand, higher values can increase contention if CPU is scarce. If the
+      value `tf.contrib.data.AUTOTUNE` is used, the number of parallel calls
+      is tuned at runtime.
     drop_remainder: (Optional.) A `tf.bool` scalar `tf.Tensor`, representing
       whether the last batch should be dropped in case its size is smaller than
       desired; the default behavior is not to drop the smaller batch.
     num_parallel_calls: (Optional.) A `tf.int32` scalar `tf.Tensor`,
         representing the number of elements to process in parallel. If not
         specified, `batch_size * num_parallel_batches` elements will be
-        processed in parallel.
+        processed in parallel. If the value `tf.contrib.data.AUTOTUNE` is
+        used, the number of elements processed in parallel is tuned at
+        runtime, based on the measured throughput and within the number of
+        CPUs and a memory budget.
 
   Returns:
     A `Dataset` transformation function, which can be passed to
@@ -818,7 +824,10 @@ def map_and_batch(map_func,
   if num_parallel_batches is None and num_parallel_calls is None:
     num_parallel_calls = batch_size
   elif num_parallel_batches is not None and num_parallel_calls is None:
-    num_parallel_calls = batch_size * num_parallel_batches
+    if num_parallel_batches == optimization.AUTOTUNE:
+      num_parallel_calls = optimization.AUTOTUNE
+    else:
+      num_parallel_calls = batch_size * num_parallel_batches
   elif num_parallel_batches is not None and num_parallel_calls is not None:
     raise ValueError("The `num_parallel_batches` and `num_parallel_calls` "
                      "arguments are mutually exclusive.")
@@ -0,0 +1,243 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Caching and snapshot dataset transformations."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from tensorflow.contrib.data.python.ops import contrib_op_loader  # pylint: disable=unused-import
+from tensorflow.contrib.data.python.ops import gen_dataset_ops
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import gen_dataset_ops as core_gen_dataset_ops
+
+
+_EVICTION_POLICIES = ("fifo", "lru")
+_COMPRESSION_TYPES = ("", "ZLIB", "GZIP")
+
+
+def bounded_cache(memory_budget,
+                  spill_directory=None,
+                  eviction_policy="fifo",
+                  tag="bounded_cache"):
+  """Caches the elements of a `Dataset` using a bounded amount of memory.
+
+  Like @{tf.data.Dataset.cache}, the first pass over the resulting dataset
+  reads its input and caches each element, and later passes are served from
+  the cache. Unlike the in-memory cache, at most `memory_budget` bytes of
+  elements are held in memory; the elements evicted from memory are written
+  once to a spill file on local disk and read back from there when requested.
+  The spill file is deleted when the dataset is destroyed.
+
+  If the first pass stops early (e.g. because of a `take()`), the next pass
+  serves the cached prefix and then continues reading the input from where the
+  previous pass stopped.
+
+  ```python
+  dataset = tf.data.TFRecordDataset(filenames).map(parse_fn)
+  dataset = dataset.apply(tf.contrib.data.bounded_cache(
+      memory_budget=4 << 30, eviction_policy="fifo"))
+  dataset = dataset.shuffle(1000).repeat()
+  ```
+
+  When a @{tf.contrib.data.StatsAggregator} is attached to the pipeline, the
+  fraction of lookups served from memory and the number of bytes held in memory
+  and on disk are recorded as the scalars `<tag>:hit-rate`,
+  `<tag>:memory-bytes` and `<tag>:spilled-bytes`.
+
+  Args:
+    memory_budget: A `tf.int64` scalar `tf.Tensor`, representing the maximum
+      number of bytes of elements to hold in memory.
+    spill_directory: (Optional.) A `tf.string` scalar `tf.Tensor`, representing
+      the local directory in which to create the spill file. Defaults to a
+      temporary directory.
+    eviction_policy: (Optional.) Either `"fifo"`, which keeps the earliest
+      cached elements in memory and spills the later ones once the budget is
+      full, or `"lru"`, which evicts the least recently read element and moves
+      spilled elements back into memory when they are read. For repeated
+      sequential passes over data larger than the budget, `"fifo"` serves the
+      same prefix from memory on every pass, whereas under `"lru"` every read
+      misses. Defaults to `"fifo"`.
+    tag: (Optional.) A `tf.string` scalar `tf.Tensor`, the prefix of the
+      statistics recorded by the cache.
+
+  Returns:
+    A `Dataset` transformation function, which can be passed to
+    @{tf.data.Dataset.apply}.
+
+  Raises:
+    ValueError: If `eviction_policy` is not `"fifo"` or `"lru"`.
+  """
+  if eviction_policy not in _EVICTION_POLICIES:
+    raise ValueError("`eviction_policy` must be one of %s, but got %r." %
+                     (_EVICTION_POLICIES, eviction_policy))
+
+  def _apply_fn(dataset):
+    return _BoundedCacheDataset(dataset, memory_budget, spill_directory,
+                                eviction_policy, tag)
+
+  return _apply_fn
+
+
+class _BoundedCacheDataset(dataset_ops.Dataset):
+  """A `Dataset` that caches its input in bounded memory."""
+
+  def __init__(self, input_dataset, memory_budget, spill_directory,
+               eviction_policy, tag):
+    """See `bounded_cache()` for details."""
+    super(_BoundedCacheDataset, self).__init__()
+    self._input_dataset = input_dataset
+    self._memory_budget = ops.convert_to_tensor(
+        memory_budget, dtype=dtypes.int64, name="memory_budget")
+    if spill_directory is None:
+      spill_directory = ""
+    self._spill_directory = ops.convert_to_tensor(
+        spill_directory, dtype=dtypes.string, name="spill_directory")
+    self._eviction_policy = ops.convert_to_tensor(
+        eviction_policy, dtype=dtypes.string, name="eviction_policy")
+    self._tag = ops.convert_to_tensor(tag, dtype=dtypes.string, name="tag")
+
+  def _as_variant_tensor(self):
+    return gen_dataset_ops.bounded_cache_dataset(
+        self._input_dataset._as_variant_tensor(),  # pylint: disable=protected-access
+        self._memory_budget,
+        self._spill_directory,
+        self._eviction_policy,
+        self._tag,
+        **dataset_ops.flat_structure(self))
+
+  @property
+  def output_classes(self):
+    return self._input_dataset.output_classes
+
+  @property
+  def output_shapes(self):
+    return self._input_dataset.output_shapes
+
+  @property
+  def output_types(self):
+    return self._input_dataset.output_types
+
+
+def snapshot(path, fingerprint=None, num_shards=8, compression_type="GZIP"):
+  """Materializes the elements of a `Dataset` in a reusable on-disk snapshot.
+
+  The first time the resulting dataset is iterated over, it passes through the
+  elements of its input and writes them to `num_shards` compressed shard files
+  in a subdirectory of `path`. When the input is exhausted, the snapshot is
+  published, and later iterators, including iterators in other processes and
+  jobs, read the elements back from the shards in parallel, in the same order,
+  instead of evaluating the input.
+
+  Snapshots are keyed by a fingerprint of the definition of the input dataset,
+  so several pipelines that share the same preprocessing (e.g. trials that
+  only differ in their model hyperparameters) share one snapshot, and changing
+  the preprocessing writes a new one:
+
+  ```python
+  dataset = tf.data.TFRecordDataset(filenames).map(expensive_preprocessing)
+  dataset = dataset.apply(tf.contrib.data.snapshot("/path/to/snapshots"))
+  dataset = dataset.shuffle(10000).repeat().batch(batch_size)
+  ```
+
+  Unlike @{tf.data.Dataset.cache}, an iterator that stops before the end of its
+  input leaves no partial files behind, and several jobs may write the same
+  snapshot at once; the first to finish publishes it.
+
+  NOTE: The fingerprint covers the structure of the input dataset and the
+  values of the tensors it captures, but not the contents of the files that
+  it reads. Pass an explicit `fingerprint` if the input dataset cannot be
+  serialized (e.g. it uses `Dataset.from_generator()`), or to start a new
+  snapshot when the input files change.
+
+  Args:
+    path: A `tf.string` scalar `tf.Tensor`, representing the directory in which
+      snapshots are stored.
+    fingerprint: (Optional.) A `tf.string` scalar `tf.Tensor`, naming the
+      snapshot in place of the fingerprint of the input dataset.
+    num_shards: (Optional.) A `tf.int64` scalar `tf.Tensor`, representing the
+      number of shard files to write, which is also the number of threads used
+      to read the snapshot. Defaults to 8.
+    compression_type: (Optional.) One of `""` (no compression), `"ZLIB"`, or
+      `"GZIP"`. Defaults to `"GZIP"`.
+
+  Returns:
+    A `Dataset` transformation function, which can be passed to
+    @{tf.data.Dataset.apply}.
+
+  Raises:
+    ValueError: If `compression_type` is not `""`, `"ZLIB"` or `"GZIP"`.
+  """
+  if compression_type is None:
+    compression_type = ""
+  if compression_type not in _COMPRESSION_TYPES:
+    raise ValueError("`compression_type` must be one of %s, but got %r." %
+                     (_COMPRESSION_TYPES, compression_type))
+
+  def _apply_fn(dataset):
+    return _SnapshotDataset(dataset, path, fingerprint, num_shards,
+                            compression_type)
+
+  return _apply_fn
+
+
+class _SnapshotDataset(dataset_ops.Dataset):
+  """A `Dataset` that materializes its input in an on-disk snapshot."""
+
+  def __init__(self, input_dataset, path, fingerprint, num_shards,
+               compression_type):
+    """See `snapshot()` for details."""
+    super(_SnapshotDataset, self).__init__()
+    self._input_dataset = input_dataset
+    self._path = ops.convert_to_tensor(path, dtype=dtypes.string, name="path")
+    self._fingerprint = fingerprint
+    self._num_shards = ops.convert_to_tensor(
+        num_shards, dtype=dtypes.int64, name="num_shards")
+    self._compression_type = ops.convert_to_tensor(
+        compression_type, dtype=dtypes.string, name="compression_type")
+
+  def _as_variant_tensor(self):
+    input_resource = self._input_dataset._as_variant_tensor()  # pylint: disable=protected-access
+    if self._fingerprint is None:
+      graph_def = core_gen_dataset_ops.dataset_to_graph(input_resource)
+      fingerprint = ops.convert_to_tensor(
+          "", dtype=dtypes.string, name="fingerprint")
+    else:
+      # Avoid serializing the input dataset, which might not support it.
+      graph_def = ops.convert_to_tensor(
+          "", dtype=dtypes.string, name="graph_def")
+      fingerprint = ops.convert_to_tensor(
+          self._fingerprint, dtype=dtypes.string, name="fingerprint")
+    return gen_dataset_ops.snapshot_dataset(
+        input_resource,
+        self._path,
+        graph_def,
+        fingerprint,
+        self._num_shards,
+        self._compression_type,
+        **dataset_ops.flat_structure(self))
+
+  @property
+  def output_classes(self):
+    return self._input_dataset.output_classes
+
+  @property
+  def output_shapes(self):
+    return self._input_dataset.output_shapes
+
+  @property
+  def output_types(self):
+    return self._input_dataset.output_types
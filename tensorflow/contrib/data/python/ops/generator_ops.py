@@ -0,0 +1,314 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Multi-process generator dataset constructors."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import ctypes
+import multiprocessing
+import traceback
+
+import numpy as np
+from six.moves import queue as queue_lib
+
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.data.util import nest
+from tensorflow.python.framework import dtypes
+
+
+# Message kinds sent from the workers to the consumer.
+_ELEMENT = 0
+_PICKLED_ELEMENT = 1
+_DONE = 2
+_ERROR = 3
+
+# How long the consumer waits for a message before checking that the workers
+# are still alive.
+_POLL_INTERVAL_SECS = 1.0
+
+
+def parallel_from_generator(generator,
+                            output_types,
+                            output_shapes=None,
+                            num_workers=None,
+                            deterministic=True,
+                            buffer_size=4,
+                            slot_bytes=1 << 20):
+  """Creates a `Dataset` whose elements are generated in worker processes.
+
+  Unlike @{tf.data.Dataset.from_generator}, which runs `generator` on a single
+  thread of the calling process, this runs `num_workers` copies of `generator`
+  in separate processes so that Python element production is not serialized
+  behind the GIL. Each worker calls `generator(worker_index, num_workers)` and
+  should produce the `worker_index`-th shard of the elements, e.g.:
+
+  ```python
+  def gen(worker_index, num_workers):
+    for filename in filenames[worker_index::num_workers]:
+      yield extract_features(filename)
+
+  dataset = tf.contrib.data.parallel_from_generator(
+      gen, (tf.float32, tf.int64), num_workers=8)
+  ```
+
+  Each worker owns `buffer_size` slots of `slot_bytes` bytes in shared memory,
+  into which it copies the numeric components of the elements it produces, so
+  at most `buffer_size` elements per worker are in flight. Elements that do not
+  fit in a slot, or that have `tf.string` components, are pickled and sent
+  through a pipe instead.
+
+  The workers are started by `multiprocessing` each time an iterator over the
+  dataset is initialized, and are terminated when the iterator is destroyed or
+  the workers are exhausted. `generator` must not use TensorFlow, and on
+  platforms where `multiprocessing` does not fork, it must be picklable.
+
+  NOTE: This is built on @{tf.data.Dataset.from_generator} and inherits its
+  constraints on device placement and graph serialization.
+
+  Args:
+    generator: A callable object that takes a worker index and the number of
+      workers, and returns an object that supports the `iter()` protocol.
+    output_types: A nested structure of `tf.DType` objects corresponding to
+      each component of an element yielded by `generator`.
+    output_shapes: (Optional.) A nested structure of `tf.TensorShape`
+      objects corresponding to each component of an element yielded by
+      `generator`.
+    num_workers: (Optional.) The number of worker processes. Defaults to the
+      number of CPUs.
+    deterministic: (Optional.) If `True` (the default), the elements are
+      produced in round-robin order across the workers, skipping exhausted
+      workers. If `False`, elements are produced in the order in which the
+      workers produce them, which avoids waiting on slow workers.
+    buffer_size: (Optional.) The number of shared memory slots per worker.
+    slot_bytes: (Optional.) The size in bytes of each shared memory slot.
+
+  Returns:
+    Dataset: A `Dataset`.
+
+  Raises:
+    TypeError: If `generator` is not callable.
+    ValueError: If `num_workers`, `buffer_size` or `slot_bytes` is not
+      positive.
+  """
+  if not callable(generator):
+    raise TypeError("`generator` must be callable.")
+  if num_workers is None:
+    num_workers = multiprocessing.cpu_count()
+  if num_workers < 1:
+    raise ValueError("`num_workers` must be positive, but got %d." %
+                     num_workers)
+  if buffer_size < 1:
+    raise ValueError("`buffer_size` must be positive, but got %d." %
+                     buffer_size)
+  if slot_bytes < 1:
+    raise ValueError("`slot_bytes` must be positive, but got %d." % slot_bytes)
+
+  worker_pool = _WorkerPool(generator, output_types, num_workers,
+                            deterministic, buffer_size, slot_bytes)
+  return dataset_ops.Dataset.from_generator(worker_pool, output_types,
+                                            output_shapes)
+
+
+def _write_element(arrays, view, slot_offset, slot_bytes):
+  """Copies `arrays` into the slot of `view` starting at `slot_offset`.
+
+  Args:
+    arrays: A list of NumPy arrays.
+    view: A `np.uint8` array over the shared memory of the worker.
+    slot_offset: The offset of the slot in `view`.
+    slot_bytes: The size of the slot.
+
+  Returns:
+    A list of `(dtype, shape, offset)` tuples describing each array in the slot,
+    or `None` if `arrays` cannot be stored in the slot.
+  """
+  if sum(array.nbytes for array in arrays) > slot_bytes:
+    return None
+  if any(array.dtype.hasobject for array in arrays):
+    return None
+  metadata = []
+  offset = slot_offset
+  for array in arrays:
+    data = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+    view[offset:offset + data.size] = data
+    metadata.append((array.dtype.str, array.shape, offset))
+    offset += data.size
+  return metadata
+
+
+def _read_element(metadata, view):
+  """Copies the arrays described by `metadata` out of `view`."""
+  arrays = []
+  for dtype, shape, offset in metadata:
+    dtype = np.dtype(dtype)
+    nbytes = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+    arrays.append(
+        view[offset:offset + nbytes].view(dtype).reshape(shape).copy())
+  return arrays
+
+
+def _worker_main(generator, worker_index, num_workers, output_types,
+                 shared_buffer, slot_bytes, free_slots, results):
+  """Runs `generator` in a worker process and sends its elements to `results`.
+
+  Args:
+    generator: The generator callable passed to `parallel_from_generator()`.
+    worker_index: The index of this worker.
+    num_workers: The number of workers.
+    output_types: A nested structure of `tf.DType` objects.
+    shared_buffer: The shared memory of this worker.
+    slot_bytes: The size of each slot in `shared_buffer`.
+    free_slots: A queue of the indices of the slots this worker may write to.
+    results: The queue on which to send messages to the consumer.
+  """
+  try:
+    flat_types = [dtypes.as_dtype(dt) for dt in nest.flatten(output_types)]
+    view = np.ctypeslib.as_array(shared_buffer)
+    for element in generator(worker_index, num_workers):
+      try:
+        flat_values = nest.flatten_up_to(output_types, element)
+      except (TypeError, ValueError):
+        raise TypeError(
+            "`generator` yielded an element that did not match the expected "
+            "structure. The expected structure was %s, but the yielded "
+            "element was %s." % (output_types, element))
+      arrays = [
+          np.asarray(value, dtype=dtype.as_numpy_dtype)
+          for value, dtype in zip(flat_values, flat_types)
+      ]
+      # Waiting for a free slot bounds the number of elements in flight.
+      slot = free_slots.get()
+      metadata = _write_element(arrays, view, slot * slot_bytes, slot_bytes)
+      if metadata is None:
+        results.put((worker_index, _PICKLED_ELEMENT, (slot, arrays)))
+      else:
+        results.put((worker_index, _ELEMENT, (slot, metadata)))
+  except Exception:  # pylint: disable=broad-except
+    results.put((worker_index, _ERROR, traceback.format_exc()))
+  else:
+    results.put((worker_index, _DONE, None))
+
+
+class _WorkerPool(object):
+  """Runs the workers of a `parallel_from_generator()` dataset.
+
+  Each call returns a new Python generator, which starts the workers and yields
+  the elements they produce, so that each iterator over the dataset has its
+  own workers.
+  """
+
+  def __init__(self, generator, output_types, num_workers, deterministic,
+               buffer_size, slot_bytes):
+    self._generator = generator
+    self._output_types = output_types
+    self._num_workers = num_workers
+    self._deterministic = deterministic
+    self._buffer_size = buffer_size
+    self._slot_bytes = slot_bytes
+
+  def __call__(self):
+    return self._generate()
+
+  def _generate(self):
+    """Yields the elements produced by a new set of workers."""
+    results = multiprocessing.Queue()
+    shared_buffers = []
+    free_slots = []
+    processes = []
+    try:
+      for worker_index in range(self._num_workers):
+        shared_buffer = multiprocessing.RawArray(
+            ctypes.c_uint8, self._buffer_size * self._slot_bytes)
+        worker_free_slots = multiprocessing.Queue()
+        for slot in range(self._buffer_size):
+          worker_free_slots.put(slot)
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(self._generator, worker_index, self._num_workers,
+                  self._output_types, shared_buffer, self._slot_bytes,
+                  worker_free_slots, results))
+        process.daemon = True
+        process.start()
+        shared_buffers.append(np.ctypeslib.as_array(shared_buffer))
+        free_slots.append(worker_free_slots)
+        processes.append(process)
+
+      for worker_index, kind, payload in self._messages(results, processes):
+        if kind == _ELEMENT:
+          slot, metadata = payload
+          arrays = _read_element(metadata, shared_buffers[worker_index])
+        else:
+          slot, arrays = payload
+        free_slots[worker_index].put(slot)
+        yield nest.pack_sequence_as(self._output_types, arrays)
+    finally:
+      for process in processes:
+        if process.is_alive():
+          process.terminate()
+        process.join()
+      for worker_free_slots in free_slots:
+        worker_free_slots.cancel_join_thread()
+      results.cancel_join_thread()
+
+  def _messages(self, results, processes):
+    """Yields the element messages from the workers, in output order."""
+    active = list(range(self._num_workers))
+    # Workers that have sent their final message.
+    finished = set()
+    # Messages received ahead of their turn, when `self._deterministic`.
+    pending = [collections.deque() for _ in range(self._num_workers)]
+    position = 0
+    while active:
+      if self._deterministic:
+        worker_index = active[position]
+        while not pending[worker_index]:
+          message = self._receive(results, processes, finished)
+          pending[message[0]].append(message)
+        message = pending[worker_index].popleft()
+      else:
+        message = self._receive(results, processes, finished)
+        worker_index = message[0]
+      kind = message[1]
+      if kind == _ERROR:
+        raise RuntimeError("Generator worker %d failed:\n%s" %
+                           (worker_index, message[2]))
+      if kind == _DONE:
+        active.remove(worker_index)
+        if active:
+          position %= len(active)
+        continue
+      yield message
+      if self._deterministic:
+        position = (position + 1) % len(active)
+
+  def _receive(self, results, processes, finished):
+    """Returns the next message from `results`, checking worker liveness."""
+    while True:
+      try:
+        message = results.get(timeout=_POLL_INTERVAL_SECS)
+      except queue_lib.Empty:
+        # A worker that exits normally sends `_DONE` or `_ERROR` first, so an
+        # empty queue and a dead unfinished worker means that it crashed.
+        for worker_index, process in enumerate(processes):
+          if worker_index not in finished and not process.is_alive():
+            raise RuntimeError(
+                "Generator worker %d exited unexpectedly with code %s." %
+                (worker_index, process.exitcode))
+        continue
+      if message[1] in (_DONE, _ERROR):
+        finished.add(message[0])
+      return message
@@ -73,7 +73,8 @@ def parallel_interleave(map_func,
       elements in a non-deterministic order.
     buffer_output_elements: The number of elements each iterator being
       interleaved should buffer (similar to the `.prefetch()` transformation for
-      each interleaved iterator).
+      each interleaved iterator). If the value `tf.contrib.data.AUTOTUNE` is
+      used, the buffer size is tuned at runtime within a memory budget.
     prefetch_input_elements: The number of input elements to transform to
       iterators before they are needed for interleaving.
 
@@ -19,6 +19,7 @@ from __future__ import print_function
 
 import collections
 import csv
+import itertools
 
 import numpy as np
 
@@ -36,6 +37,7 @@ from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.lib.io import file_io
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import gen_dataset_ops
 from tensorflow.python.ops import parsing_ops
 from tensorflow.python.platform import gfile
@@ -106,7 +108,8 @@ def _infer_type(str_val, na_value, prev_type):
       return type_list[i]
 
 
-def _next_csv_row(filenames, num_cols, field_delim, use_quote_delim, header):
+def _next_csv_row(filenames, num_cols, field_delim, use_quote_delim, header,
+                  max_rows_per_file=None):
   """Generator that yields rows of CSV file(s) in order."""
   for fn in filenames:
     with file_io.FileIO(fn, "r") as f:
@@ -117,7 +120,7 @@ def _next_csv_row(filenames, num_cols, field_delim, use_quote_delim, header):
       if header:
         next(rdr)  # Skip header lines
 
-      for csv_row in rdr:
+      for csv_row in itertools.islice(rdr, max_rows_per_file):
         if len(csv_row) != num_cols:
           raise ValueError(
               "Problem inferring types: CSV row has different number of fields "
@@ -128,19 +131,30 @@ def _next_csv_row(filenames, num_cols, field_delim, use_quote_delim, header):
 def _infer_column_defaults(filenames, num_cols, field_delim, use_quote_delim,
                            na_value, header, num_rows_for_inference,
                            select_columns):
-  """Infers column types from the first N valid CSV records of files."""
+  """Infers column types from a sample of N valid CSV records of files.
+
+  The sample is spread evenly over the first rows of as many files as
+  possible, so that types which only show up in later files are still
+  inferred, and inference stops early once every column is a string.
+  """
   if select_columns is None:
     select_columns = range(num_cols)
   inferred_types = [None] * len(select_columns)
 
-  for i, csv_row in enumerate(
-      _next_csv_row(filenames, num_cols, field_delim, use_quote_delim, header)):
-    if num_rows_for_inference is not None and i >= num_rows_for_inference:
-      break
-
+  max_rows_per_file = None
+  if num_rows_for_inference is not None:
+    max_rows_per_file = max(
+        1, (num_rows_for_inference + len(filenames) - 1) // len(filenames))
+  csv_rows = itertools.islice(
+      _next_csv_row(filenames, num_cols, field_delim, use_quote_delim, header,
+                    max_rows_per_file), num_rows_for_inference)
+  for csv_row in csv_rows:
     for j, col_index in enumerate(select_columns):
       inferred_types[j] = _infer_type(csv_row[col_index], na_value,
                                       inferred_types[j])
+    if all(t == dtypes.string for t in inferred_types):
+      # No further row can change the inferred types.
+      break
 
   # Replace None's with a default type
   inferred_types = [t or dtypes.string for t in inferred_types]
@@ -215,6 +229,28 @@ def _maybe_shuffle_and_repeat(
   return dataset
 
 
+def _split_files(filenames, max_split_bytes):
+  """Splits files into `[start, end)` byte ranges of `max_split_bytes` bytes.
+
+  Args:
+    filenames: A list of file names.
+    max_split_bytes: The maximum size of a byte range.
+
+  Returns:
+    A pair of lists with one element per byte range: the name of the file
+    containing the range, and the range as a `[start, end)` pair.
+  """
+  split_filenames = []
+  byte_ranges = []
+  for filename in filenames:
+    file_size = gfile.Stat(filename).length
+    # Empty files still get one (empty) range.
+    for start in range(0, max(file_size, 1), max_split_bytes):
+      split_filenames.append(filename)
+      byte_ranges.append([start, min(start + max_split_bytes, file_size)])
+  return split_filenames, byte_ranges
+
+
 def make_tf_record_dataset(
     file_pattern,
     batch_size,
@@ -326,6 +362,7 @@ def make_csv_dataset(
     num_parallel_parser_calls=2,
     sloppy=False,
     num_rows_for_inference=100,
+    max_split_bytes=None,
 ):
   """Reads CSV files into a dataset.
 
@@ -387,8 +424,9 @@ def make_csv_dataset(
     prefetch_buffer_size: An int specifying the number of feature batches to
       prefetch for performance improvement. Recommended value is the number of
       batches consumed per training step.
-    num_parallel_reads: Number of threads used to read CSV records from files.
-      If >1, the results will be interleaved.
+    num_parallel_reads: Number of threads used to read CSV records from files
+      (or from byte ranges of files, see `max_split_bytes`). If >1, the
+      results will be interleaved.
     num_parallel_parser_calls: Number of parallel invocations of the CSV parsing
       function on CSV records.
     sloppy: If `True`, reading performance will be improved at
@@ -396,9 +434,16 @@ def make_csv_dataset(
       produced is deterministic prior to shuffling (elements are still
       randomized if `shuffle=True`. Note that if the seed is set, then order
       of elements after shuffling is deterministic). Defaults to `False`.
-    num_rows_for_inference: Number of rows of a file to use for type inference
-      if record_defaults is not provided. If None, reads all the rows of all
-      the files. Defaults to 100.
+    num_rows_for_inference: Number of rows to use for type inference if
+      record_defaults is not provided. The rows are sampled from the
+      beginnings of as many files as possible. If None, reads all the rows of
+      all the files. Defaults to 100.
+    max_split_bytes: (Optional.) If set, files are split into byte ranges of
+      at most this many bytes, which are read in parallel like separate files,
+      so that `num_parallel_reads` also speeds up reading a single large file.
+      A record belongs to the range in which it starts. Splitting requires
+      that records do not contain line breaks inside quoted fields. Defaults
+      to reading each file as a whole.
 
   Returns:
     A dataset, where each element is a (features, labels) tuple that corresponds
@@ -410,11 +455,21 @@ def make_csv_dataset(
   Raises:
     ValueError: If any of the arguments is malformed.
   """
-  # Create dataset of all matching filenames
+  # Create dataset of all matching filenames, or of byte ranges of them
   filenames = _get_file_names(file_pattern, False)
-  dataset = dataset_ops.Dataset.from_tensor_slices(filenames)
+  if max_split_bytes is None:
+    dataset = dataset_ops.Dataset.from_tensor_slices(filenames)
+    num_splits = len(filenames)
+  else:
+    if max_split_bytes <= 0:
+      raise ValueError("`max_split_bytes` must be positive, but got %d." %
+                       max_split_bytes)
+    split_filenames, byte_ranges = _split_files(filenames, max_split_bytes)
+    dataset = dataset_ops.Dataset.from_tensor_slices(
+        (split_filenames, np.array(byte_ranges, dtype=np.int64)))
+    num_splits = len(split_filenames)
   if shuffle:
-    dataset = dataset.shuffle(len(filenames), shuffle_seed)
+    dataset = dataset.shuffle(num_splits, shuffle_seed)
 
   # Clean arguments; figure out column names and defaults
 
@@ -453,7 +508,7 @@ def make_csv_dataset(
   if label_name is not None and label_name not in column_names:
     raise ValueError("`label_name` provided must be one of the columns.")
 
-  def filename_to_dataset(filename):
+  def filename_to_dataset(filename, byte_range=None):
     return CsvDataset(
         filename,
         record_defaults=column_defaults,
@@ -461,7 +516,9 @@ def make_csv_dataset(
         use_quote_delim=use_quote_delim,
         na_value=na_value,
         select_cols=select_columns,
-        header=header)
+        header=header,
+        byte_ranges=(None if byte_range is None else
+                     array_ops.expand_dims(byte_range, 0)))
 
   def map_fn(*columns):
     """Organizes columns into a features dictionary.
@@ -479,7 +536,8 @@ def make_csv_dataset(
       return features, label
     return features
 
-  # Read files sequentially (if num_parallel_reads=1) or in parallel
+  # Read files (or byte ranges) sequentially (if num_parallel_reads=1) or in
+  # parallel
   dataset = dataset.apply(
       interleave_ops.parallel_interleave(
           filename_to_dataset, cycle_length=num_parallel_reads, sloppy=sloppy))
@@ -510,7 +568,8 @@ class CsvDataset(dataset_ops.Dataset):
                field_delim=",",
                use_quote_delim=True,
                na_value="",
-               select_cols=None):
+               select_cols=None,
+               byte_ranges=None):
     """Creates a `CsvDataset` by reading and decoding CSV files.
 
     The elements of this dataset correspond to records from the file(s).
@@ -577,6 +636,12 @@ class CsvDataset(dataset_ops.Dataset):
       select_cols: (Optional.) A sorted list of column indices to select from
         the input data. If specified, only this subset of columns will be
         parsed. Defaults to parsing all columns.
+      byte_ranges: (Optional.) A `tf.int64` matrix with one `[start, end)` row
+        per file. If specified, only the records that start within the range
+        of each file are read, where a record starts after the first line
+        break at or after `start - 1`. Byte ranges that partition a file
+        therefore read each of its records exactly once, provided that no
+        quoted field contains a line break. Defaults to reading whole files.
     """
     super(CsvDataset, self).__init__()
     self._filenames = ops.convert_to_tensor(
@@ -603,6 +668,12 @@ class CsvDataset(dataset_ops.Dataset):
         argument_default=[],
         argument_dtype=dtypes.int64,
     )
+    self._byte_ranges = convert.optional_param_to_tensor(
+        "byte_ranges",
+        byte_ranges,
+        argument_default=np.zeros([0, 2], dtype=np.int64),
+        argument_dtype=dtypes.int64,
+    )
     self._output_shapes = tuple(
         tensor_shape.scalar() for _ in range(len(record_defaults)))
     self._output_types = tuple(d.dtype for d in self._record_defaults)
@@ -621,6 +692,7 @@ class CsvDataset(dataset_ops.Dataset):
         use_quote_delim=self._use_quote_delim,
         na_value=self._na_value,
         select_cols=self._select_cols,
+        byte_ranges=self._byte_ranges,
     )
 
   @property
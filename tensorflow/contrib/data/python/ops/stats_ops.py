@@ -17,6 +17,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+
+from tensorflow.core.framework import summary_pb2
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
@@ -88,15 +91,17 @@ class StatsAggregator(object):
 class _SetStatsAggregatorDataset(dataset_ops.Dataset):
   """A `Dataset` that acts as an identity, and sets given stats_aggregator."""
 
-  def __init__(self, input_dataset, stats_aggregator):
+  def __init__(self, input_dataset, stats_aggregator, instrument_pipeline):
     super(_SetStatsAggregatorDataset, self).__init__()
     self._input_dataset = input_dataset
     self._stats_aggregator = stats_aggregator
+    self._instrument_pipeline = instrument_pipeline
 
   def _as_variant_tensor(self):
     return gen_dataset_ops.set_stats_aggregator_dataset(
         self._input_dataset._as_variant_tensor(),  # pylint: disable=protected-access
         self._stats_aggregator._resource,  # pylint: disable=protected-access
+        instrument_pipeline=self._instrument_pipeline,
         **dataset_ops.flat_structure(self))
 
   @property
@@ -114,11 +119,31 @@ class _SetStatsAggregatorDataset(dataset_ops.Dataset):
 
 # TODO(b/38416882): Properly export in the `tf.contrib.data` API when stable
 # or make private / remove.
-def set_stats_aggregator(stats_aggregator):
+def set_stats_aggregator(stats_aggregator, instrument_pipeline=False):
   """Set the given stats_aggregator for aggregating the input dataset stats.
 
+  If `instrument_pipeline` is `True`, every transformation in the input
+  dataset records statistics without needing a `latency_stats()` stage of its
+  own: the latency of producing each element, and for buffered
+  transformations (such as `Dataset.prefetch()` and parallel
+  `Dataset.map()`), the number of ready elements in the buffer each time
+  an element is requested. Use `pipeline_stats_report()` to summarize them:
+
+  ```python
+  stats_aggregator = stats_ops.StatsAggregator()
+  dataset = dataset.apply(
+      stats_ops.set_stats_aggregator(stats_aggregator,
+                                     instrument_pipeline=True))
+  ...
+  report = stats_ops.pipeline_stats_report(
+      sess.run(stats_aggregator.get_summary()))
+  print(report)
+  ```
+
   Args:
     stats_aggregator: A `StatsAggregator` object.
+    instrument_pipeline: (Optional.) A boolean indicating whether to record
+      statistics for every transformation in the input dataset.
 
   Returns:
     A `Dataset` transformation function, which can be passed to
@@ -126,7 +151,8 @@ def set_stats_aggregator(stats_aggregator):
   """
 
   def _apply_fn(dataset):
-    return _SetStatsAggregatorDataset(dataset, stats_aggregator)
+    return _SetStatsAggregatorDataset(dataset, stats_aggregator,
+                                      instrument_pipeline)
 
   return _apply_fn
 
@@ -201,6 +227,193 @@ def feature_stats(tag):
   return _apply_fn
 
 
+_LATENCY_SUFFIX = ":latency"
+_BUFFER_OCCUPANCY_SUFFIX = ":buffer_occupancy"
+_BUFFER_CAPACITY_SUFFIX = ":buffer_capacity"
+
+
+class StageStats(
+    collections.namedtuple("StageStats", [
+        "name", "num_elements", "mean_latency", "p50_latency", "p90_latency",
+        "p99_latency", "self_time", "mean_buffer_occupancy", "buffer_capacity"
+    ])):
+  """Statistics about one stage of an instrumented input pipeline.
+
+  All times are in microseconds.
+
+  Attributes:
+    name: The iterator prefix that identifies the stage, e.g.
+      `"Iterator::Prefetch::Map"`.
+    num_elements: The number of elements that the stage produced.
+    mean_latency: The mean time taken to produce an element.
+    p50_latency: The median time taken to produce an element.
+    p90_latency: The 90th percentile of the time taken to produce an element.
+    p99_latency: The 99th percentile of the time taken to produce an element.
+    self_time: The total time spent producing elements, less the time spent
+      waiting for the stage's inputs on the same thread.
+    mean_buffer_occupancy: For buffered stages, the mean number of ready
+      elements when an element was requested; otherwise `None`.
+    buffer_capacity: For buffered stages, the most recent capacity of the
+      buffer; otherwise `None`.
+  """
+  pass
+
+
+class PipelineStatsReport(object):
+  """A per-stage summary of the statistics of an instrumented input pipeline.
+
+  See `pipeline_stats_report()`.
+  """
+
+  def __init__(self, stages):
+    self._stages = sorted(stages, key=lambda stage: stage.name)
+
+  @property
+  def stages(self):
+    """A list of `StageStats`, ordered from the consumer to the sources."""
+    return self._stages
+
+  @property
+  def consumer_wait_time(self):
+    """The total time that the consumer of the pipeline waited for elements.
+
+    Returns:
+      The total time in microseconds that calls to `Iterator.get_next()` spent
+      in the outermost stage, or 0.0 if no elements have been produced.
+    """
+    if not self._stages:
+      return 0.0
+    root = min(self._stages, key=lambda stage: stage.name.count("::"))
+    return root.mean_latency * root.num_elements
+
+  @property
+  def bottleneck(self):
+    """The `StageStats` of the stage with the largest `self_time`, or `None`.
+
+    Buffered stages absorb the latency of their inputs, so the stage that
+    spends the most time producing elements itself is the one most likely to
+    limit the throughput of the pipeline.
+    """
+    if not self._stages:
+      return None
+    return max(self._stages, key=lambda stage: stage.self_time)
+
+  def __str__(self):
+    lines = [
+        "%-60s %10s %10s %10s %10s %10s %12s %10s" %
+        ("stage", "elements", "mean(us)", "p50(us)", "p90(us)", "p99(us)",
+         "self(ms)", "buffer")
+    ]
+    for stage in self._stages:
+      if stage.buffer_capacity is None:
+        buffer_str = "-"
+      else:
+        buffer_str = "%.1f/%d" % (stage.mean_buffer_occupancy,
+                                  stage.buffer_capacity)
+      lines.append("%-60s %10d %10.1f %10.1f %10.1f %10.1f %12.1f %10s" %
+                   (stage.name, stage.num_elements, stage.mean_latency,
+                    stage.p50_latency, stage.p90_latency, stage.p99_latency,
+                    stage.self_time / 1000.0, buffer_str))
+    lines.append("consumer wait time: %.1f ms" %
+                 (self.consumer_wait_time / 1000.0))
+    if self.bottleneck is not None:
+      lines.append("bottleneck: %s" % self.bottleneck.name)
+    return "\n".join(lines)
+
+
+def _histogram_percentile(histo, p):
+  """Interpolates the `p`th percentile of a `HistogramProto`."""
+  # NOTE: This mirrors `tensorflow::histogram::Histogram::Percentile()`.
+  if histo.num == 0:
+    return 0.0
+  threshold = histo.num * (p / 100.0)
+  cumsum_prev = 0.0
+  for i, count in enumerate(histo.bucket):
+    cumsum = cumsum_prev + count
+    if cumsum >= threshold:
+      if cumsum == cumsum_prev:
+        continue
+      lhs = (histo.min if i == 0 or cumsum_prev == 0
+             else histo.bucket_limit[i - 1])
+      lhs = max(lhs, histo.min)
+      rhs = min(histo.bucket_limit[i], histo.max)
+      return lhs + (threshold - cumsum_prev) / (cumsum - cumsum_prev) * (
+          rhs - lhs)
+    cumsum_prev = cumsum
+  return histo.max
+
+
+def _is_input_stage(name, other_name):
+  """Returns true if `other_name` names an input of the stage `name`."""
+  # The inputs of a stage extend its prefix by exactly one component. Iterators
+  # created for each input element (e.g. by `Dataset.interleave()`) have an
+  # elided "[]" index between the two.
+  for separator in ("::", "[]::"):
+    if other_name.startswith(name + separator):
+      return "::" not in other_name[len(name) + len(separator):]
+  return False
+
+
+# TODO(b/38416882): Properly export in the `tf.contrib.data` API when stable
+# or make private / remove.
+def pipeline_stats_report(summary):
+  """Builds a `PipelineStatsReport` from the statistics of a pipeline.
+
+  The statistics must have been gathered by a `StatsAggregator` that was
+  associated with the pipeline using
+  `set_stats_aggregator(..., instrument_pipeline=True)`. All iterators
+  created for the same stage (e.g. one for each input element of
+  `Dataset.interleave()`) are reported as a single stage.
+
+  Args:
+    summary: A serialized `tf.summary.Summary` protocol buffer (e.g. the result
+      of evaluating `StatsAggregator.get_summary()`), or a `Summary` message.
+
+  Returns:
+    A `PipelineStatsReport`.
+  """
+  if not isinstance(summary, summary_pb2.Summary):
+    summary_proto = summary_pb2.Summary()
+    summary_proto.ParseFromString(summary)
+    summary = summary_proto
+
+  latencies = {}
+  occupancies = {}
+  capacities = {}
+  for value in summary.value:
+    # Instrumented stages are named by their iterator prefix, which always
+    # contains "::", so that user-provided tags are not mistaken for stages.
+    if "::" not in value.tag:
+      continue
+    if value.tag.endswith(_LATENCY_SUFFIX):
+      latencies[value.tag[:-len(_LATENCY_SUFFIX)]] = value.histo
+    elif value.tag.endswith(_BUFFER_OCCUPANCY_SUFFIX):
+      occupancies[value.tag[:-len(_BUFFER_OCCUPANCY_SUFFIX)]] = value.histo
+    elif value.tag.endswith(_BUFFER_CAPACITY_SUFFIX):
+      capacities[value.tag[:-len(_BUFFER_CAPACITY_SUFFIX)]] = int(
+          value.simple_value)
+
+  stages = []
+  for name, histo in latencies.items():
+    input_time = sum(
+        other.sum for other_name, other in latencies.items()
+        if _is_input_stage(name, other_name))
+    occupancy = occupancies.get(name)
+    stages.append(
+        StageStats(
+            name=name,
+            num_elements=int(histo.num),
+            mean_latency=histo.sum / histo.num if histo.num else 0.0,
+            p50_latency=_histogram_percentile(histo, 50.0),
+            p90_latency=_histogram_percentile(histo, 90.0),
+            p99_latency=_histogram_percentile(histo, 99.0),
+            self_time=max(histo.sum - input_time, 0.0),
+            mean_buffer_occupancy=(occupancy.sum / occupancy.num
+                                   if occupancy and occupancy.num else None),
+            buffer_capacity=capacities.get(name)))
+  return PipelineStatsReport(stages)
+
+
 class _StatsDataset(dataset_ops.Dataset):
   """A `Dataset` that acts as an identity, and also records statistics."""
 
@@ -17,6 +17,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from tensorflow.contrib.data.python.ops import contrib_op_loader  # pylint: disable=unused-import
+from tensorflow.contrib.data.python.ops import gen_dataset_ops as contrib_gen_dataset_ops
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.util import convert
 from tensorflow.python.framework import dtypes
@@ -46,13 +48,91 @@ class TFRecordWriter(object):
     Returns:
       A @{tf.Operation} that, when run, writes contents of `dataset` to a file.
     """
-    if not isinstance(dataset, dataset_ops.Dataset):
-      raise TypeError("`dataset` must be a `tf.data.Dataset` object.")
-    if (dataset.output_types != dtypes.string or
-        dataset.output_shapes != tensor_shape.scalar()):
-      raise TypeError(
-          "`dataset` must produce scalar `DT_STRING` tensors whereas it "
-          "produces shape {0} and types {1}".format(dataset.output_shapes,
-                                                    dataset.output_types))
+    _check_string_dataset(dataset)
     return gen_dataset_ops.dataset_to_tf_record(
         dataset._as_variant_tensor(), self._filename, self._compression_type)  # pylint: disable=protected-access
+
+
+def _check_string_dataset(dataset):
+  if not isinstance(dataset, dataset_ops.Dataset):
+    raise TypeError("`dataset` must be a `tf.data.Dataset` object.")
+  if (dataset.output_types != dtypes.string or
+      dataset.output_shapes != tensor_shape.scalar()):
+    raise TypeError(
+        "`dataset` must produce scalar `DT_STRING` tensors whereas it "
+        "produces shape {0} and types {1}".format(dataset.output_shapes,
+                                                  dataset.output_types))
+
+
+class ShardedTFRecordWriter(object):
+  """Writes data to sharded TFRecord files, with one writer thread per shard.
+
+  Record `i` of the dataset is written to shard `i % num_shards`. Shard `s` is
+  stored in the files `"<filename_prefix>-<s>-<part>.tfrecord"` in
+  `directory`, where a new part is started whenever the current one would
+  exceed `max_shard_bytes`. Once every record has been written, the file
+  `"<filename_prefix>.manifest"` lists each written file and the number of
+  records in it, as one `"<filename> <num_records>"` line per file.
+
+  ```python
+  dataset = tf.data.Dataset.from_tensor_slices(filenames).interleave(
+      read_raw_examples, cycle_length=8).map(serialize_example)
+  writer = tf.contrib.data.ShardedTFRecordWriter(
+      "/path/to/output", num_shards=16, compression_type="GZIP",
+      max_shard_bytes=256 << 20)
+  write_op = writer.write(dataset)
+  ```
+  """
+
+  def __init__(self,
+               directory,
+               num_shards,
+               compression_type=None,
+               max_shard_bytes=None,
+               filename_prefix="part"):
+    """Creates a `ShardedTFRecordWriter`.
+
+    Args:
+      directory: A `tf.string` scalar `tf.Tensor`, the directory in which to
+        write the files.
+      num_shards: A `tf.int64` scalar `tf.Tensor`, the number of shards, which
+        is also the number of writer threads.
+      compression_type: (Optional.) A `tf.string` scalar `tf.Tensor`, one of
+        `""` (no compression), `"ZLIB"`, or `"GZIP"`.
+      max_shard_bytes: (Optional.) A `tf.int64` scalar `tf.Tensor`, the
+        maximum number of uncompressed bytes to write to each file. Defaults
+        to no limit.
+      filename_prefix: (Optional.) A `tf.string` scalar `tf.Tensor`, the
+        prefix of the names of the written files. Defaults to `"part"`.
+    """
+    self._directory = ops.convert_to_tensor(
+        directory, dtypes.string, name="directory")
+    self._num_shards = ops.convert_to_tensor(
+        num_shards, dtypes.int64, name="num_shards")
+    self._compression_type = convert.optional_param_to_tensor(
+        "compression_type",
+        compression_type,
+        argument_default="",
+        argument_dtype=dtypes.string)
+    self._max_shard_bytes = convert.optional_param_to_tensor(
+        "max_shard_bytes", max_shard_bytes, argument_default=0)
+    self._filename_prefix = ops.convert_to_tensor(
+        filename_prefix, dtypes.string, name="filename_prefix")
+
+  def write(self, dataset):
+    """Returns a @{tf.Operation} to write a dataset to sharded files.
+
+    Args:
+      dataset: a @{tf.data.Dataset} whose elements are to be written to files
+
+    Returns:
+      A @{tf.Operation} that, when run, writes contents of `dataset` to files.
+    """
+    _check_string_dataset(dataset)
+    return contrib_gen_dataset_ops.dataset_to_sharded_tf_record(
+        dataset._as_variant_tensor(),  # pylint: disable=protected-access
+        self._directory,
+        self._filename_prefix,
+        self._num_shards,
+        self._compression_type,
+        self._max_shard_bytes)
@@ -15,6 +15,7 @@ limitations under the License.
 #include "tensorflow/core/framework/dataset.h"
 
 #include "tensorflow/core/framework/device_base.h"
+#include "tensorflow/core/framework/stats_aggregator.h"
 #include "tensorflow/core/graph/graph_def_builder.h"
 #include "tensorflow/core/graph/node_builder.h"
 
@@ -286,6 +287,46 @@ IteratorContext MakeIteratorContext(OpKernelContext* ctx) {
   return IteratorContext(params);
 }
 
+string PipelineStatsTag(const string& prefix, StringPiece name) {
+  string tag;
+  tag.reserve(prefix.size() + name.size() + 1);
+  bool in_index = false;
+  for (char c : prefix) {
+    if (c == '[') {
+      in_index = true;
+    } else if (c == ']') {
+      in_index = false;
+    } else if (in_index) {
+      continue;
+    }
+    tag.push_back(c);
+  }
+  strings::StrAppend(&tag, ":", name);
+  return tag;
+}
+
+void RecordPipelineLatency(IteratorContext* ctx, const string& prefix,
+                           uint64 latency_micros) {
+  auto stats_aggregator = ctx->stats_aggregator();
+  if (stats_aggregator) {
+    stats_aggregator->AddToHistogram(PipelineStatsTag(prefix, "latency"),
+                                     {static_cast<double>(latency_micros)});
+  }
+}
+
+void RecordBufferOccupancy(IteratorContext* ctx, const string& prefix,
+                           int64 size, int64 capacity) {
+  if (!ctx->instrument_pipeline()) return;
+  auto stats_aggregator = ctx->stats_aggregator();
+  if (stats_aggregator) {
+    stats_aggregator->AddToHistogram(
+        PipelineStatsTag(prefix, "buffer_occupancy"),
+        {static_cast<double>(size)});
+    stats_aggregator->AddScalar(PipelineStatsTag(prefix, "buffer_capacity"),
+                                static_cast<float>(capacity));
+  }
+}
+
 }  // namespace dataset
 
 }  // namespace tensorflow
@@ -275,6 +275,12 @@ class IteratorContext {
 
     // The Allocator to be used to allocate the output of an iterator.
     std::function<Allocator*(AllocatorAttributes)> allocator_getter = nullptr;
+
+    // If true, every `DatasetIterator` records the latency of its `GetNext()`
+    // calls (and buffered iterators record their buffer occupancy) to the
+    // current `StatsAggregator`, tagged by the iterator prefix. See
+    // `dataset::PipelineStatsTag()`.
+    bool instrument_pipeline = false;
   };
 
   explicit IteratorContext(Params params) : params_(std::move(params)) {}
@@ -313,10 +319,35 @@ class IteratorContext {
     return params_.stats_aggregator_getter;
   }
 
+  bool instrument_pipeline() const { return params_.instrument_pipeline; }
+
  private:
   Params params_;
 };
 
+namespace dataset {
+
+// Returns the name under which pipeline instrumentation records the statistic
+// `name` for the iterator with the given `prefix`. Per-element indices (e.g.
+// the "[3]" that interleave transformations append for each input element) are
+// elided to "[]", so that all iterators created for the same stage of a
+// pipeline share one tag, e.g. "Iterator::Interleave[]::TFRecord:latency".
+string PipelineStatsTag(const string& prefix, StringPiece name);
+
+// Records that one `GetNext()` call on the iterator with the given `prefix`
+// took `latency_micros`, if `ctx` has a `StatsAggregator`.
+void RecordPipelineLatency(IteratorContext* ctx, const string& prefix,
+                           uint64 latency_micros);
+
+// Records the number of elements buffered by the iterator with the given
+// `prefix` when its consumer asks for the next element, along with the
+// current `capacity` of the buffer, if `ctx` is instrumented and has a
+// `StatsAggregator`.
+void RecordBufferOccupancy(IteratorContext* ctx, const string& prefix,
+                           int64 size, int64 capacity);
+
+}  // namespace dataset
+
 // Represents the current position in a range of outputs, where the
 // range of outputs is typically represented by an `DatasetBase`,
 // defined below.
@@ -532,7 +563,13 @@ class DatasetIterator : public IteratorBase {
   Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
                  bool* end_of_sequence) final {
     tracing::ScopedActivity activity(params_.prefix);
+    const uint64 start_micros =
+        ctx->instrument_pipeline() ? ctx->env()->NowMicros() : 0;
     Status s = GetNextInternal(ctx, out_tensors, end_of_sequence);
+    if (ctx->instrument_pipeline() && s.ok() && !*end_of_sequence) {
+      dataset::RecordPipelineLatency(ctx, params_.prefix,
+                                     ctx->env()->NowMicros() - start_micros);
+    }
     if (TF_PREDICT_FALSE(errors::IsOutOfRange(s) && !*end_of_sequence)) {
       s = errors::Internal(
           "Iterator \"", params_.prefix,
@@ -15,6 +15,8 @@ limitations under the License.
 
 #include "tensorflow/core/kernels/data/dataset_utils.h"
 #include "tensorflow/core/common_runtime/device.h"
+#include "tensorflow/core/platform/mem.h"
+#include "tensorflow/core/util/env_var.h"
 
 namespace tensorflow {
 
@@ -45,6 +47,25 @@ Status MakeIteratorFromInputElement(
       ctx, strings::StrCat(prefix, "[", thread_index, "]"), out_iterator);
 }
 
+int64 AutotuneMemoryBudget() {
+  static const int64 memory_budget = [] {
+    int64 default_budget = 1LL << 30;
+    const int64 available_ram = port::AvailableRam();
+    if (available_ram != kint64max) {
+      default_budget = available_ram / 16;
+    }
+    int64 budget;
+    Status s = ReadInt64FromEnvVar("TF_DATA_AUTOTUNE_MEMORY_BUDGET",
+                                   default_budget, &budget);
+    if (!s.ok()) {
+      LOG(WARNING) << s;
+      budget = default_budget;
+    }
+    return budget;
+  }();
+  return memory_budget;
+}
+
 }  // namespace dataset
 
 }  // namespace tensorflow
@@ -28,6 +28,11 @@ Status MakeIteratorFromInputElement(
     int64 thread_index, CapturedFunction* captured_func, StringPiece prefix,
     std::unique_ptr<IteratorBase>* out_iterator);
 
+// Returns the memory budget, in bytes, for the buffers of each autotuned
+// iterator. The budget can be set with the TF_DATA_AUTOTUNE_MEMORY_BUDGET
+// environment variable, and defaults to a sixteenth of the available RAM.
+int64 AutotuneMemoryBudget();
+
 }  // namespace dataset
 
 }  // namespace tensorflow
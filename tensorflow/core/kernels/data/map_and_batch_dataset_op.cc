@@ -21,11 +21,14 @@ limitations under the License.
 #include "tensorflow/core/framework/tensor.h"
 #include "tensorflow/core/kernels/data/captured_function.h"
 #include "tensorflow/core/kernels/data/dataset.h"
+#include "tensorflow/core/kernels/data/dataset_utils.h"
+#include "tensorflow/core/kernels/data/parallelism_autotuner.h"
 #include "tensorflow/core/kernels/inplace_ops_functor.h"
 #include "tensorflow/core/lib/core/blocking_counter.h"
 #include "tensorflow/core/lib/gtl/cleanup.h"
 #include "tensorflow/core/lib/random/random.h"
 #include "tensorflow/core/lib/strings/strcat.h"
+#include "tensorflow/core/platform/cpu_info.h"
 #include "tensorflow/core/platform/tracing.h"
 
 namespace tensorflow {
@@ -69,6 +72,10 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
         int64 num_parallel_batches;
         OP_REQUIRES_OK(ctx, ParseScalarArgument(ctx, "num_parallel_batches",
                                                 &num_parallel_batches));
+        if (num_parallel_batches == ParallelismAutotuner::kAutoTune) {
+          num_parallel_calls = ParallelismAutotuner::kAutoTune;
+          break;
+        }
         num_parallel_calls = num_parallel_batches * batch_size;
         OP_REQUIRES(ctx, num_parallel_batches > 0,
                     errors::InvalidArgument(
@@ -77,9 +84,12 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
       case 2:
         OP_REQUIRES_OK(ctx, ParseScalarArgument(ctx, "num_parallel_calls",
                                                 &num_parallel_calls));
-        OP_REQUIRES(ctx, num_parallel_calls > 0,
-                    errors::InvalidArgument(
-                        "num_parallel_calls must be greater than zero."));
+        OP_REQUIRES(
+            ctx,
+            num_parallel_calls > 0 ||
+                num_parallel_calls == ParallelismAutotuner::kAutoTune,
+            errors::InvalidArgument(
+                "num_parallel_calls must be greater than zero."));
         break;
       default:
         OP_REQUIRES(ctx, false,
@@ -189,7 +199,10 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
     class Iterator : public DatasetIterator<Dataset> {
      public:
       explicit Iterator(const Params& params)
-          : DatasetIterator<Dataset>(params) {}
+          : DatasetIterator<Dataset>(params),
+            autotuner_(params.dataset->num_parallel_calls_,
+                       port::NumSchedulableCPUs(),
+                       dataset::AutotuneMemoryBudget()) {}
 
       ~Iterator() override {
         mutex_lock l(mu_);
@@ -210,18 +223,29 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
                              std::vector<Tensor>* out_tensors,
                              bool* end_of_sequence) override {
         std::shared_ptr<BatchResult> result;
+        bool waited = false;
         {
           mutex_lock l(mu_);
           EnsureRunnerThreadStarted(ctx);
+          if (ctx->instrument_pipeline()) {
+            RecordBufferOccupancy(ctx);
+          }
           while (batch_results_.empty() ||
                  batch_results_.front()->num_calls > 0) {
+            waited = true;
             cond_var_.wait(l);
           }
           std::swap(result, batch_results_.front());
           batch_results_.pop_front();
         }
         cond_var_.notify_all();
-        return ProcessResult(ctx, result, out_tensors, end_of_sequence);
+        Status s = ProcessResult(ctx, result, out_tensors, end_of_sequence);
+        if (dataset()->num_parallel_calls_ ==
+                ParallelismAutotuner::kAutoTune &&
+            s.ok() && !*end_of_sequence) {
+          RecordBatch(ctx, *out_tensors, waited);
+        }
+        return s;
       }
 
      protected:
@@ -419,11 +443,44 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
         result->output_allocated = true;
       }
 
+      // Updates the autotuned parallelism after the consumer received
+      // `batch`.
+      void RecordBatch(IteratorContext* ctx, const std::vector<Tensor>& batch,
+                       bool waited) LOCKS_EXCLUDED(mu_) {
+        // Each parallel call buffers about one batch element.
+        int64 bytes = 0;
+        for (const Tensor& t : batch) {
+          bytes += t.TotalBytes();
+        }
+        {
+          mutex_lock l(mu_);
+          autotuner_.RecordElement(ctx->env()->NowMicros(),
+                                   bytes / dataset()->batch_size_, waited);
+        }
+        // The runner thread may now schedule more calls.
+        cond_var_.notify_all();
+      }
+
+      int64 NumParallelCalls() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        return autotuner_.parallelism();
+      }
+
       int MaxBatchResults() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
-        return (dataset()->num_parallel_calls_ + dataset()->batch_size_ - 1) /
+        return (NumParallelCalls() + dataset()->batch_size_ - 1) /
                dataset()->batch_size_;
       }
 
+      // Records how many of the buffered batches have already completed.
+      void RecordBufferOccupancy(IteratorContext* ctx)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        int64 num_ready = 0;
+        for (const auto& result : batch_results_) {
+          if (result->num_calls == 0) ++num_ready;
+        }
+        dataset::RecordBufferOccupancy(ctx, prefix(), num_ready,
+                                       MaxBatchResults());
+      }
+
       Status ProcessResult(IteratorContext* ctx,
                            const std::shared_ptr<BatchResult>& result,
                            std::vector<Tensor>* out_tensors,
@@ -472,12 +529,11 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
       void RunnerThread(const std::shared_ptr<IteratorContext>& ctx)
           LOCKS_EXCLUDED(mu_) {
         std::vector<std::pair<std::shared_ptr<BatchResult>, int64>> new_calls;
-        new_calls.reserve(dataset()->num_parallel_calls_);
         while (true) {
           {
             mutex_lock l(mu_);
             while (!cancelled_ &&
-                   (num_calls_ >= dataset()->num_parallel_calls_ ||
+                   (num_calls_ >= NumParallelCalls() ||
                     batch_results_.size() > MaxBatchResults() ||
                     (batch_results_.size() == MaxBatchResults() &&
                      call_counter_ % dataset()->batch_size_ == 0))) {
@@ -488,7 +544,7 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
               return;
             }
 
-            while (num_calls_ < dataset()->num_parallel_calls_ &&
+            while (num_calls_ < NumParallelCalls() &&
                    (batch_results_.size() < MaxBatchResults() ||
                     (batch_results_.size() == MaxBatchResults() &&
                      call_counter_ % dataset()->batch_size_ != 0))) {
@@ -642,6 +698,9 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
       std::unique_ptr<IteratorBase> input_impl_;
       // Buffer for storing the (intermediate) batch results.
       std::deque<std::shared_ptr<BatchResult>> batch_results_ GUARDED_BY(mu_);
+      // Determines the number of parallel calls, which is fixed unless the
+      // dataset was created with `num_parallel_calls` set to `kAutoTune`.
+      ParallelismAutotuner autotuner_ GUARDED_BY(mu_);
       std::unique_ptr<Thread> runner_thread_ GUARDED_BY(mu_);
       bool cancelled_ GUARDED_BY(mu_) = false;
     };
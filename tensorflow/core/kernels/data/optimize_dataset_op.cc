@@ -151,6 +151,7 @@ class OptimizeDatasetOp : public UnaryDatasetOpKernel {
         params.lib = ctx->lib();
         params.function_library = dataset()->flib_def_;
         params.allocator_getter = ctx->allocator_getter();
+        params.instrument_pipeline = ctx->instrument_pipeline();
         IteratorContext iter_ctx(params);
         return input_impl_->GetNext(&iter_ctx, out_tensors, end_of_sequence);
       }
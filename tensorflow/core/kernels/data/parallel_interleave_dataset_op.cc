@@ -20,6 +20,7 @@ limitations under the License.
 #include "tensorflow/core/kernels/data/captured_function.h"
 #include "tensorflow/core/kernels/data/dataset.h"
 #include "tensorflow/core/kernels/data/dataset_utils.h"
+#include "tensorflow/core/kernels/data/prefetch_autotuner.h"
 #include "tensorflow/core/lib/core/error_codes.pb.h"
 #include "tensorflow/core/lib/gtl/cleanup.h"
 #include "tensorflow/core/lib/random/random.h"
@@ -70,7 +71,9 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
     OP_REQUIRES_OK(ctx, ParseScalarArgument(ctx, "buffer_output_elements",
                                             &buffer_output_elements));
     OP_REQUIRES(
-        ctx, buffer_output_elements > 0,
+        ctx,
+        buffer_output_elements > 0 ||
+            buffer_output_elements == PrefetchAutotuner::kAutoTune,
         errors::InvalidArgument("`buffer_output_elements` must be > 0"));
 
     int64 prefetch_input_elements = 0;
@@ -237,7 +240,10 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
       explicit Iterator(const Params& params)
           : DatasetIterator<Dataset>(params),
             workers_(dataset()->num_threads()),
-            worker_thread_states_(dataset()->num_threads()) {}
+            worker_thread_states_(dataset()->num_threads()),
+            autotuner_(dataset()->buffer_output_elements_,
+                       dataset::AutotuneMemoryBudget() /
+                           dataset()->num_threads()) {}
 
       ~Iterator() override {
         mutex_lock l(mu_);
@@ -276,6 +282,7 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
             can_produce_elements |= current_worker->MayHaveElements();
             if (!current_worker->outputs.empty()) {
               // We have an element!
+              autotuner_.RecordConsumption(current_worker->outputs.size());
               next_index_ = index;
               if (i == 0) {
                 block_count_++;
@@ -340,6 +347,7 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
           }
 
           if (must_wait_for_input) {
+            autotuner_.RecordEmpty();
             // Wait for elements to become available.
             if (dataset()->sloppy_) {
               sloppy_cond_var_.wait(l);
@@ -703,8 +711,8 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
           if (!iterator_creation_status.ok()) {
             mutex_lock l(mu_);
             // Wait for space in the prefetch queue.
-            while (!cancelled_ && workers_[thread_index].outputs.size() ==
-                                      dataset()->buffer_output_elements_) {
+            while (!cancelled_ && workers_[thread_index].outputs.size() >=
+                                      autotuner_.buffer_limit()) {
               workers_[thread_index].cond_var.wait(l);
             }
             if (cancelled_) return;
@@ -752,8 +760,8 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
                 mutex_lock l(mu_);
 
                 // Wait for space in the prefetch queue.
-                while (!cancelled_ && workers_[thread_index].outputs.size() ==
-                                          dataset()->buffer_output_elements_) {
+                while (!cancelled_ && workers_[thread_index].outputs.size() >=
+                                          autotuner_.buffer_limit()) {
                   workers_[thread_index].cond_var.wait(l);
                 }
                 if (cancelled_) return;
@@ -770,6 +778,12 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
                   worker_thread_states_[thread_index].input.clear();
                   worker_thread_states_[thread_index].end_of_sequence = false;
                 } else {
+                  int64 bytes = 0;
+                  for (const Tensor& t :
+                       worker_thread_states_[thread_index].output_elem.output) {
+                    bytes += t.TotalBytes();
+                  }
+                  autotuner_.RecordElementBytes(bytes);
                   workers_[thread_index].outputs.emplace_back(
                       worker_thread_states_[thread_index].output_elem.status);
                   workers_[thread_index].outputs.back().output.swap(
@@ -1026,6 +1040,11 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
       // Indices in `workers_` of prefetched iterators.
       std::deque<int64> staging_indices_ GUARDED_BY(mu_);
 
+      // Determines the number of elements buffered by each worker, which is
+      // fixed unless the dataset was created with `buffer_output_elements` set
+      // to `kAutoTune`.
+      PrefetchAutotuner autotuner_ GUARDED_BY(mu_);
+
       // The index into output_elements_ for next element to produce.
       size_t next_index_ GUARDED_BY(mu_) = 0;
       // The number of items produced so far within the block
@@ -19,8 +19,11 @@ limitations under the License.
 #include "tensorflow/core/framework/tensor.h"
 #include "tensorflow/core/kernels/data/captured_function.h"
 #include "tensorflow/core/kernels/data/dataset.h"
+#include "tensorflow/core/kernels/data/dataset_utils.h"
+#include "tensorflow/core/kernels/data/parallelism_autotuner.h"
 #include "tensorflow/core/lib/core/error_codes.pb.h"
 #include "tensorflow/core/lib/random/random.h"
+#include "tensorflow/core/platform/cpu_info.h"
 
 namespace tensorflow {
 
@@ -53,7 +56,9 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
     int32 num_parallel_calls;
     OP_REQUIRES_OK(ctx, ParseScalarArgument(ctx, "num_parallel_calls",
                                             &num_parallel_calls));
-    OP_REQUIRES(ctx, num_parallel_calls > 0,
+    OP_REQUIRES(ctx,
+                num_parallel_calls > 0 ||
+                    num_parallel_calls == ParallelismAutotuner::kAutoTune,
                 errors::InvalidArgument(
                     "num_parallel_calls must be greater than zero."));
 
@@ -151,7 +156,10 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
     class Iterator : public DatasetIterator<Dataset> {
      public:
       explicit Iterator(const Params& params)
-          : DatasetIterator<Dataset>(params) {}
+          : DatasetIterator<Dataset>(params),
+            autotuner_(params.dataset->num_parallel_calls_,
+                       port::NumSchedulableCPUs(),
+                       dataset::AutotuneMemoryBudget()) {}
 
       ~Iterator() override {
         // TODO(mrry): Replace this cancellation logic with a
@@ -177,17 +185,27 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
                              std::vector<Tensor>* out_tensors,
                              bool* end_of_sequence) override {
         std::shared_ptr<InvocationResult> result;
+        bool waited = false;
         {
           mutex_lock l(mu_);
           EnsureRunnerThreadStarted(ctx);
+          if (ctx->instrument_pipeline()) {
+            RecordBufferOccupancy(ctx);
+          }
           while (invocation_results_.empty()) {
+            waited = true;
             cond_var_.wait(l);
           }
           std::swap(result, invocation_results_.front());
           invocation_results_.pop_front();
         }
         cond_var_.notify_all();
+        waited |= !result->notification.HasBeenNotified();
         result->notification.WaitForNotification();
+        if (dataset()->num_parallel_calls_ ==
+            ParallelismAutotuner::kAutoTune) {
+          RecordElement(ctx, result, waited);
+        }
         return ProcessResult(result, out_tensors, end_of_sequence);
       }
 
@@ -315,7 +333,41 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
                                             &result->return_values, done);
       }
 
-      int64 MaxInvocationResults() { return dataset()->num_parallel_calls_; }
+      // Updates the autotuned parallelism after the consumer received
+      // `result`.
+      void RecordElement(IteratorContext* ctx,
+                         const std::shared_ptr<InvocationResult>& result,
+                         bool waited) LOCKS_EXCLUDED(mu_) {
+        int64 bytes = 0;
+        for (const Tensor& t : result->return_values) {
+          bytes += t.TotalBytes();
+        }
+        {
+          mutex_lock l(mu_);
+          autotuner_.RecordElement(ctx->env()->NowMicros(), bytes, waited);
+        }
+        // The runner thread may now schedule more calls.
+        cond_var_.notify_all();
+      }
+
+      // Records how many of the buffered calls have already completed.
+      void RecordBufferOccupancy(IteratorContext* ctx)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        int64 num_ready = 0;
+        for (const auto& result : invocation_results_) {
+          if (result->notification.HasBeenNotified()) ++num_ready;
+        }
+        dataset::RecordBufferOccupancy(ctx, prefix(), num_ready,
+                                       MaxInvocationResults());
+      }
+
+      int64 NumParallelCalls() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        return autotuner_.parallelism();
+      }
+
+      int64 MaxInvocationResults() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        return autotuner_.parallelism();
+      }
 
       Status ProcessResult(const std::shared_ptr<InvocationResult>& result,
                            std::vector<Tensor>* out_tensors,
@@ -337,19 +389,18 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
 
       void RunnerThread(const std::shared_ptr<IteratorContext>& ctx) {
         std::vector<std::shared_ptr<InvocationResult>> new_calls;
-        new_calls.reserve(dataset()->num_parallel_calls_);
         while (true) {
           {
             mutex_lock l(mu_);
             while (!cancelled_ &&
-                   (num_calls_ >= dataset()->num_parallel_calls_ ||
+                   (num_calls_ >= NumParallelCalls() ||
                     invocation_results_.size() >= MaxInvocationResults())) {
               cond_var_.wait(l);
             }
             if (cancelled_) {
               return;
             }
-            while (num_calls_ < dataset()->num_parallel_calls_ &&
+            while (num_calls_ < NumParallelCalls() &&
                    invocation_results_.size() < MaxInvocationResults()) {
               invocation_results_.emplace_back(new InvocationResult());
               new_calls.push_back(invocation_results_.back());
@@ -417,6 +468,9 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
       // Buffer for storing the invocation results.
       std::deque<std::shared_ptr<InvocationResult>> invocation_results_
           GUARDED_BY(mu_);
+      // Determines the number of parallel calls, which is fixed unless the
+      // dataset was created with `num_parallel_calls` set to `kAutoTune`.
+      ParallelismAutotuner autotuner_ GUARDED_BY(mu_);
       std::unique_ptr<Thread> runner_thread_ GUARDED_BY(mu_);
       bool cancelled_ GUARDED_BY(mu_) = false;
     };
@@ -0,0 +1,127 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#include "tensorflow/core/kernels/data/parallelism_autotuner.h"
+
+#include <algorithm>
+
+namespace tensorflow {
+
+namespace {
+
+// The minimum number of elements in a measurement window. Windows also span at
+// least a few elements per unit of parallelism, so that a window covers
+// several rounds of parallel work.
+constexpr int64 kMinWindowElements = 16;
+constexpr int64 kWindowElementsPerUnit = 4;
+
+// The iterator is considered a bottleneck if the consumer waited for at least
+// one in `kBottleneckWaitRatio` elements of a window.
+constexpr int64 kBottleneckWaitRatio = 10;
+
+// The relative throughput improvement required to keep a probed parallelism.
+constexpr double kMinImprovement = 0.05;
+
+// The number of windows after which the ceiling is lifted.
+constexpr int64 kWindowsBeforeReprobe = 64;
+
+}  // namespace
+
+ParallelismAutotuner::ParallelismAutotuner(int64 parallelism,
+                                           int64 max_parallelism,
+                                           int64 memory_budget)
+    : max_parallelism_(std::max<int64>(1, max_parallelism)),
+      memory_budget_(memory_budget),
+      parallelism_(parallelism),
+      ceiling_(max_parallelism_ + 1) {
+  if (parallelism == kAutoTune) {
+    mode_ = Mode::kSteady;
+    parallelism_ = 1;
+  }
+}
+
+void ParallelismAutotuner::RecordElement(uint64 now_micros, int64 bytes,
+                                         bool waited) {
+  if (mode_ == Mode::kDisabled) {
+    return;
+  }
+  if (window_start_micros_ == 0) {
+    // The first element starts the first window.
+    window_start_micros_ = now_micros;
+    return;
+  }
+  ++window_elements_;
+  window_bytes_ += bytes;
+  if (waited) {
+    ++window_waits_;
+  }
+  if (window_elements_ >=
+      std::max(kMinWindowElements, kWindowElementsPerUnit * parallelism_)) {
+    EndWindow(now_micros);
+  }
+}
+
+int64 ParallelismAutotuner::Limit() const {
+  int64 limit = std::min(max_parallelism_, ceiling_ - 1);
+  if (average_element_bytes_ > 0) {
+    limit = std::min(limit, static_cast<int64>(memory_budget_ /
+                                               average_element_bytes_));
+  }
+  return std::max<int64>(1, limit);
+}
+
+void ParallelismAutotuner::EndWindow(uint64 now_micros) {
+  const double elapsed_micros =
+      std::max<uint64>(1, now_micros - window_start_micros_);
+  const double throughput = window_elements_ * 1e6 / elapsed_micros;
+  const bool bottleneck =
+      window_waits_ * kBottleneckWaitRatio >= window_elements_;
+  average_element_bytes_ =
+      static_cast<double>(window_bytes_) / window_elements_;
+  window_start_micros_ = now_micros;
+  window_elements_ = 0;
+  window_waits_ = 0;
+  window_bytes_ = 0;
+
+  if (mode_ == Mode::kProbing) {
+    mode_ = Mode::kSteady;
+    if (throughput < previous_throughput_ * (1.0 + kMinImprovement)) {
+      // The probe did not pay off: revert it.
+      ceiling_ = parallelism_;
+      windows_since_ceiling_ = 0;
+      parallelism_ = previous_parallelism_;
+      return;
+    }
+  }
+
+  if (++windows_since_ceiling_ >= kWindowsBeforeReprobe) {
+    ceiling_ = max_parallelism_ + 1;
+    windows_since_ceiling_ = 0;
+  }
+
+  const int64 limit = Limit();
+  if (parallelism_ > limit) {
+    // The elements have grown beyond the memory budget.
+    parallelism_ = limit;
+  } else if (bottleneck && parallelism_ < limit) {
+    previous_parallelism_ = parallelism_;
+    previous_throughput_ = throughput;
+    parallelism_ =
+        std::min(limit, parallelism_ + std::max<int64>(1, parallelism_ / 2));
+    mode_ = Mode::kProbing;
+  }
+}
+
+}  // namespace tensorflow
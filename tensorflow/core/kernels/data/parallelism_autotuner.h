@@ -0,0 +1,98 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#ifndef TENSORFLOW_CORE_KERNELS_DATA_PARALLELISM_AUTOTUNER_H_
+#define TENSORFLOW_CORE_KERNELS_DATA_PARALLELISM_AUTOTUNER_H_
+
+#include "tensorflow/core/platform/types.h"
+
+namespace tensorflow {
+
+// ParallelismAutotuner dynamically adjusts the degree of parallelism (e.g. the
+// number of concurrent function invocations) of an iterator.
+//
+// ParallelismAutotuner measures the throughput of the iterator over windows of
+// consumed elements. When the consumer frequently had to wait for elements
+// during a window, the iterator is a bottleneck and the autotuner probes a
+// higher parallelism. If the next window does not show a throughput
+// improvement, the probe is reverted and the probed value becomes a ceiling,
+// which is lifted again after a while in case the load on the machine changes.
+//
+// The parallelism never exceeds `max_parallelism` (e.g. the number of
+// schedulable CPUs), nor the number of elements of the average recorded size
+// that fit in `memory_budget`, since an iterator buffers about one element per
+// unit of parallelism.
+//
+// ParallelismAutotuner is NOT thread safe.
+class ParallelismAutotuner {
+ public:
+  static const int64 kAutoTune = -1;
+
+  // If `parallelism` is `kAutoTune`, the autotuner starts at a parallelism of
+  // 1. Otherwise, the autotuner is disabled and `parallelism()` always returns
+  // `parallelism`.
+  ParallelismAutotuner(int64 parallelism, int64 max_parallelism,
+                       int64 memory_budget);
+
+  int64 parallelism() const { return parallelism_; }
+
+  // Records that the consumer of the iterator received an element of `bytes`
+  // bytes at `now_micros`. `waited` indicates whether the consumer had to wait
+  // for the element to be produced.
+  void RecordElement(uint64 now_micros, int64 bytes, bool waited);
+
+ private:
+  enum class Mode {
+    // Disables the autotuning.
+    kDisabled,
+
+    // The parallelism is kept as long as the iterator is not a bottleneck.
+    kSteady,
+
+    // We have increased the parallelism, and will revert the increase unless
+    // the throughput improves.
+    kProbing,
+  };
+
+  // Returns the highest parallelism that may currently be probed.
+  int64 Limit() const;
+
+  void EndWindow(uint64 now_micros);
+
+  const int64 max_parallelism_;
+  const int64 memory_budget_;
+  Mode mode_ = Mode::kDisabled;
+  int64 parallelism_;
+
+  // The parallelism and throughput (in elements per second) before the
+  // current probe.
+  int64 previous_parallelism_ = 0;
+  double previous_throughput_ = 0.0;
+  // The lowest parallelism found not to improve the throughput.
+  int64 ceiling_;
+  // The number of windows since the ceiling was last lowered.
+  int64 windows_since_ceiling_ = 0;
+  double average_element_bytes_ = 0.0;
+
+  // Statistics of the current window.
+  uint64 window_start_micros_ = 0;
+  int64 window_elements_ = 0;
+  int64 window_waits_ = 0;
+  int64 window_bytes_ = 0;
+};
+
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_CORE_KERNELS_DATA_PARALLELISM_AUTOTUNER_H_
@@ -0,0 +1,90 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+
+#include "tensorflow/core/kernels/data/parallelism_autotuner.h"
+
+#include <functional>
+
+#include "tensorflow/core/platform/test.h"
+
+namespace tensorflow {
+namespace {
+
+// Feeds `num_elements` elements of `bytes` bytes to `t`, where the consumer
+// waited for every element if `waited` is true. `micros_per_element` returns
+// the time to produce an element at a given parallelism.
+void Feed(ParallelismAutotuner* t, int num_elements, int64 bytes, bool waited,
+          const std::function<uint64(int64)>& micros_per_element,
+          uint64* now_micros) {
+  for (int i = 0; i < num_elements; ++i) {
+    *now_micros += micros_per_element(t->parallelism());
+    t->RecordElement(*now_micros, bytes, waited);
+  }
+}
+
+// Throughput grows linearly with the parallelism.
+uint64 Scalable(int64 parallelism) { return 1000 / parallelism; }
+
+// Throughput does not depend on the parallelism.
+uint64 NotScalable(int64 parallelism) { return 100; }
+
+TEST(ParallelismAutotuner, Disabled) {
+  ParallelismAutotuner t(4, 8, kint64max);
+  EXPECT_EQ(4, t.parallelism());
+  uint64 now_micros = 1;
+  Feed(&t, 1000, 8, true, Scalable, &now_micros);
+  EXPECT_EQ(4, t.parallelism());
+}
+
+TEST(ParallelismAutotuner, IncreasesUpToMaxParallelism) {
+  ParallelismAutotuner t(ParallelismAutotuner::kAutoTune, 8, kint64max);
+  EXPECT_EQ(1, t.parallelism());
+  uint64 now_micros = 1;
+  Feed(&t, 17, 8, true, Scalable, &now_micros);
+  EXPECT_EQ(2, t.parallelism());  // Expect a probe after the first window.
+  Feed(&t, 1000, 8, true, Scalable, &now_micros);
+  EXPECT_EQ(8, t.parallelism());
+}
+
+TEST(ParallelismAutotuner, RevertsProbeWithoutImprovement) {
+  ParallelismAutotuner t(ParallelismAutotuner::kAutoTune, 8, kint64max);
+  uint64 now_micros = 1;
+  Feed(&t, 17, 8, true, NotScalable, &now_micros);
+  EXPECT_EQ(2, t.parallelism());
+  Feed(&t, 16, 8, true, NotScalable, &now_micros);
+  EXPECT_EQ(1, t.parallelism());  // Expect the probe to be reverted.
+  Feed(&t, 500, 8, true, NotScalable, &now_micros);
+  EXPECT_EQ(1, t.parallelism());
+}
+
+TEST(ParallelismAutotuner, KeepsParallelismWhenNotBottleneck) {
+  ParallelismAutotuner t(ParallelismAutotuner::kAutoTune, 8, kint64max);
+  uint64 now_micros = 1;
+  Feed(&t, 1000, 8, false, Scalable, &now_micros);
+  EXPECT_EQ(1, t.parallelism());
+}
+
+TEST(ParallelismAutotuner, RespectsMemoryBudget) {
+  ParallelismAutotuner t(ParallelismAutotuner::kAutoTune, 8, 300);
+  uint64 now_micros = 1;
+  Feed(&t, 1000, 100, true, Scalable, &now_micros);
+  EXPECT_EQ(3, t.parallelism());
+  // Expect the parallelism to shrink when the elements grow.
+  Feed(&t, 100, 200, true, Scalable, &now_micros);
+  EXPECT_EQ(1, t.parallelism());
+}
+
+}  // namespace
+}  // namespace tensorflow
@@ -15,10 +15,20 @@ limitations under the License.
 
 #include "tensorflow/core/kernels/data/prefetch_autotuner.h"
 
+#include <algorithm>
+
 namespace tensorflow {
 
-PrefetchAutotuner::PrefetchAutotuner(int64 initial_buffer_size)
-    : buffer_limit_(initial_buffer_size) {
+namespace {
+
+// The weight of the most recent element in the average element size.
+constexpr double kElementBytesDecay = 0.1;
+
+}  // namespace
+
+PrefetchAutotuner::PrefetchAutotuner(int64 initial_buffer_size,
+                                     int64 memory_budget)
+    : buffer_limit_(initial_buffer_size), memory_budget_(memory_budget) {
   if (initial_buffer_size == kAutoTune) {
     mode_ = Mode::kUpswing;
     buffer_limit_ = 1;
@@ -36,11 +46,31 @@ void PrefetchAutotuner::RecordConsumption(size_t current_buffer_size) {
       return;
     case Mode::kDownswing:
       if (current_buffer_size == 0) {
-        buffer_limit_ *= 2;  // Increase the buffer size.
-        mode_ = Mode::kUpswing;
+        int64 max_buffer_limit = kint64max;
+        if (average_element_bytes_ > 0) {
+          max_buffer_limit = std::max<int64>(
+              1, static_cast<int64>(memory_budget_ / average_element_bytes_));
+        }
+        if (buffer_limit_ < max_buffer_limit) {
+          // Increase the buffer size.
+          buffer_limit_ = std::min(buffer_limit_ * 2, max_buffer_limit);
+          mode_ = Mode::kUpswing;
+        }
       }
       return;
   }
 }
 
+void PrefetchAutotuner::RecordElementBytes(int64 bytes) {
+  if (mode_ == Mode::kDisabled) {
+    return;
+  }
+  if (average_element_bytes_ == 0) {
+    average_element_bytes_ = bytes;
+  } else {
+    average_element_bytes_ +=
+        kElementBytesDecay * (bytes - average_element_bytes_);
+  }
+}
+
 }  // namespace tensorflow
@@ -32,6 +32,9 @@ namespace tensorflow {
 // if the prefetching thread is able to successfully fill the buffer at its
 // current size.
 //
+// The buffer_limit() is also bounded by the number of elements of the average
+// size recorded by RecordElementBytes() that fit in `memory_budget`.
+//
 // Note: in the current implementation, we never decrease the buffer_limit().
 // This should change in the future!
 //
@@ -40,13 +43,17 @@ class PrefetchAutotuner {
  public:
   static const int64 kAutoTune = -1;
 
-  explicit PrefetchAutotuner(int64 initial_buffer_size);
+  explicit PrefetchAutotuner(int64 initial_buffer_size,
+                             int64 memory_budget = kint64max);
 
   int64 buffer_limit() const { return buffer_limit_; }
 
   void RecordConsumption(size_t current_buffer_size);
   void RecordEmpty() { RecordConsumption(0); }
 
+  // Records the size of an element produced into the buffer.
+  void RecordElementBytes(int64 bytes);
+
  private:
   // PrefetchAutotuner operates as a state machine.
   enum class Mode {
@@ -63,6 +70,8 @@ class PrefetchAutotuner {
   };
 
   int64 buffer_limit_;
+  const int64 memory_budget_;
+  double average_element_bytes_ = 0.0;
   Mode mode_ = Mode::kDisabled;
 };
 
@@ -78,5 +78,20 @@ TEST(PrefetchAutotuner, EnabledSteady) {
   }
 }
 
+TEST(PrefetchAutotuner, MemoryBudget) {
+  PrefetchAutotuner t(PrefetchAutotuner::kAutoTune, 300);
+  EXPECT_EQ(1, t.buffer_limit());
+  t.RecordElementBytes(100);
+  t.RecordConsumption(1);
+  t.RecordConsumption(0);  // Expect buffer limit to increase.
+  EXPECT_EQ(2, t.buffer_limit());
+  t.RecordConsumption(2);
+  t.RecordConsumption(0);  // Expect buffer limit to reach the budget.
+  EXPECT_EQ(3, t.buffer_limit());
+  t.RecordConsumption(3);
+  t.RecordConsumption(0);  // Expect buffer limit to stay within the budget.
+  EXPECT_EQ(3, t.buffer_limit());
+}
+
 }  // namespace
 }  // namespace tensorflow
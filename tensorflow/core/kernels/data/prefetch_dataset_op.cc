@@ -17,6 +17,7 @@ limitations under the License.
 #include "tensorflow/core/framework/partial_tensor_shape.h"
 #include "tensorflow/core/framework/tensor.h"
 #include "tensorflow/core/kernels/data/dataset.h"
+#include "tensorflow/core/kernels/data/dataset_utils.h"
 #include "tensorflow/core/kernels/data/prefetch_autotuner.h"
 #include "tensorflow/core/lib/core/error_codes.pb.h"
 
@@ -87,7 +88,8 @@ class PrefetchDatasetOp : public UnaryDatasetOpKernel {
      public:
       explicit Iterator(const Params& params)
           : DatasetIterator<Dataset>(params),
-            auto_tuner_(params.dataset->buffer_size_) {}
+            auto_tuner_(params.dataset->buffer_size_,
+                        dataset::AutotuneMemoryBudget()) {}
 
       ~Iterator() override {
         // Signal the prefetch thread to terminate it. We will then
@@ -115,6 +117,8 @@ class PrefetchDatasetOp : public UnaryDatasetOpKernel {
         {
           mutex_lock l(mu_);
           TF_RETURN_IF_ERROR(EnsurePrefetchThreadStarted(ctx));
+          dataset::RecordBufferOccupancy(ctx, prefix(), buffer_.size(),
+                                         auto_tuner_.buffer_limit());
           // Wait until the next element in the buffer has been
           // produced, or we are shutting down.
           while (!cancelled_ && buffer_.empty() && !prefetch_thread_finished_ &&
@@ -292,6 +296,11 @@ class PrefetchDatasetOp : public UnaryDatasetOpKernel {
           // 3. Signal that the element has been produced.
           {
             mutex_lock l(mu_);
+            int64 bytes = 0;
+            for (const Tensor& t : buffer_element.value) {
+              bytes += t.TotalBytes();
+            }
+            auto_tuner_.RecordElementBytes(bytes);
             buffer_.push_back(std::move(buffer_element));
             cond_var_.notify_all();
           }
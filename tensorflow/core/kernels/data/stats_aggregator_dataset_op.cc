@@ -24,7 +24,10 @@ namespace {
 class SetStatsAggregatorDatasetOp : public UnaryDatasetOpKernel {
  public:
   explicit SetStatsAggregatorDatasetOp(OpKernelConstruction* ctx)
-      : UnaryDatasetOpKernel(ctx) {}
+      : UnaryDatasetOpKernel(ctx) {
+    OP_REQUIRES_OK(ctx,
+                   ctx->GetAttr("instrument_pipeline", &instrument_pipeline_));
+  }
 
   void MakeDataset(OpKernelContext* ctx, DatasetBase* input,
                    DatasetBase** output) override {
@@ -33,17 +36,20 @@ class SetStatsAggregatorDatasetOp : public UnaryDatasetOpKernel {
                                        &stats_aggregator_resource));
     core::ScopedUnref unref_stats_aggregator(stats_aggregator_resource);
 
-    *output = new Dataset(ctx, input, stats_aggregator_resource);
+    *output = new Dataset(ctx, input, stats_aggregator_resource,
+                          instrument_pipeline_);
   }
 
  private:
   class Dataset : public GraphDatasetBase {
    public:
     explicit Dataset(OpKernelContext* ctx, const DatasetBase* input,
-                     StatsAggregatorResource* stats_aggregator_resource)
+                     StatsAggregatorResource* stats_aggregator_resource,
+                     bool instrument_pipeline)
         : GraphDatasetBase(ctx),
           input_(input),
-          stats_aggregator_resource_(stats_aggregator_resource) {
+          stats_aggregator_resource_(stats_aggregator_resource),
+          instrument_pipeline_(instrument_pipeline) {
       input_->Ref();
       stats_aggregator_resource_->Ref();
     }
@@ -103,6 +109,8 @@ class SetStatsAggregatorDatasetOp : public UnaryDatasetOpKernel {
         params.lib = ctx->lib();
         params.function_library = ctx->function_library();
         params.allocator_getter = ctx->allocator_getter();
+        params.instrument_pipeline =
+            dataset()->instrument_pipeline_ || ctx->instrument_pipeline();
         IteratorContext set_stats_aggregator_ctx(params);
         return input_impl_->GetNext(&set_stats_aggregator_ctx, out_tensors,
                                     end_of_sequence);
@@ -129,7 +137,10 @@ class SetStatsAggregatorDatasetOp : public UnaryDatasetOpKernel {
 
     const DatasetBase* const input_;
     StatsAggregatorResource* stats_aggregator_resource_;
+    const bool instrument_pipeline_;
   };
+
+  bool instrument_pipeline_;
 };
 
 REGISTER_KERNEL_BUILDER(Name("SetStatsAggregatorDataset").Device(DEVICE_CPU),
@@ -184,6 +184,7 @@ REGISTER_OP("SetStatsAggregatorDataset")
     .Output("handle: variant")
     .Attr("output_types: list(type) >= 1")
     .Attr("output_shapes: list(shape) >= 1")
+    .Attr("instrument_pipeline: bool = false")
     .SetShapeFn(shape_inference::ScalarShape);
 
 REGISTER_OP("MapDataset")
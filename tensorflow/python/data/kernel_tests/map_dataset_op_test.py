@@ -180,8 +180,9 @@ class MapDatasetTest(test.TestCase):
                                                    results[i * 18 + j]):
               self.assertAllEqual(component[i]**2, result_component)
 
+      # A value of -1 autotunes the parallelism and the buffer size.
       for num_parallel_calls_val, output_buffer_size_val in [
-          (1, 1), (1, 2), (2, 2), (2, 4), (8, 8), (8, 16)]:
+          (1, 1), (1, 2), (2, 2), (2, 4), (8, 8), (8, 16), (-1, -1)]:
         do_test(num_parallel_calls_val, output_buffer_size_val)
 
   def testImplicitDisposeParallelMapDataset(self):
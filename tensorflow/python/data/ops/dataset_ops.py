@@ -607,7 +607,9 @@ class Dataset(object):
 
     Args:
       buffer_size: A `tf.int64` scalar `tf.Tensor`, representing the
-        maximum number of elements that will be buffered when prefetching.
+        maximum number of elements that will be buffered when prefetching. If
+        the value `tf.contrib.data.AUTOTUNE` is used, the buffer size is tuned
+        at runtime within a memory budget.
 
     Returns:
       Dataset: A `Dataset`.
@@ -977,7 +979,10 @@ class Dataset(object):
        `self.output_types`) to another nested structure of tensors.
       num_parallel_calls: (Optional.) A `tf.int32` scalar `tf.Tensor`,
         representing the number elements to process in parallel. If not
-        specified, elements will be processed sequentially.
+        specified, elements will be processed sequentially. If the value
+        `tf.contrib.data.AUTOTUNE` is used, the number of elements processed in
+        parallel is tuned at runtime, based on the measured throughput and
+        within the number of CPUs and a memory budget.
 
     Returns:
       Dataset: A `Dataset`.
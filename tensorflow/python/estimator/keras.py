@@ -36,12 +36,14 @@ from tensorflow.python.keras import optimizers
 from tensorflow.python.keras.engine.base_layer import Layer
 from tensorflow.python.keras.engine.network import Network
 from tensorflow.python.keras.utils.generic_utils import CustomObjectScope
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import check_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import metrics as metrics_module
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.saved_model import signature_constants
 from tensorflow.python.training import distribute as distribute_lib
+from tensorflow.python.training import monitored_session
 from tensorflow.python.training import saver as saver_lib
 from tensorflow.python.training import training_util
 from tensorflow.python.training.checkpointable import base as checkpointable
@@ -50,6 +52,8 @@ from tensorflow.python.training.checkpointable import data_structures
 
 _DEFAULT_SERVING_KEY = signature_constants.DEFAULT_SERVING_SIGNATURE_DEF_KEY
 
+_WEIGHTS_HANDOFF_MODES = ('checkpoint', 'memory', 'shared')
+
 
 def _cast_tensor_to_floatx(x):
   """Cast tensor to keras's floatx dtype if it is not already the same dtype."""
@@ -342,12 +346,72 @@ def _clone_and_build_model(mode,
   return model
 
 
-def _create_keras_model_fn(keras_model, custom_objects=None):
+def _layer_weights(model):
+  """Returns the weights of `model` in the order of `model.get_weights()`."""
+  return [weight for layer in model.layers for weight in layer.weights]
+
+
+def _read_keras_weights(keras_model):
+  """Reads the current weight values of `keras_model` from its session.
+
+  Args:
+    keras_model: An instance of compiled keras model.
+
+  Returns:
+    A flat list of Numpy arrays, in the order of `keras_model.get_weights()`.
+  """
+  weights = _layer_weights(keras_model)
+  if not weights:
+    return []
+  # The Estimator graph is the default graph when this is called, so make the
+  # Keras backend look up the session of the graph owning the Keras weights.
+  with weights[0].graph.as_default():
+    return K.batch_get_value(weights)
+
+
+def _create_weights_scaffold(model, weights_fn):
+  """Creates a `Scaffold` which sets the weights of `model` from memory.
+
+  The weights are fed to assign ops when the Estimator session is initialized,
+  which only happens when there is no checkpoint to restore from in
+  `model_dir`, so they never round-trip through disk.
+
+  Args:
+    model: The keras model built in the Estimator graph.
+    weights_fn: Callable returning a flat list of Numpy arrays matching the
+      output of `model.get_weights()`.
+
+  Returns:
+    A `Scaffold` whose `init_fn` assigns the weights returned by `weights_fn`.
+  """
+  placeholders = []
+  assign_ops = []
+  for weight in _layer_weights(model):
+    placeholder = array_ops.placeholder(
+        weight.dtype.base_dtype, shape=weight.get_shape())
+    placeholders.append(placeholder)
+    assign_ops.append(weight.assign(placeholder))
+
+  def init_fn(scaffold, session):
+    del scaffold  # Unused.
+    weights = weights_fn()
+    if len(weights) != len(placeholders):
+      raise ValueError(
+          'The Keras model has %d weights, but the Estimator model expects '
+          '%d.' % (len(weights), len(placeholders)))
+    session.run(assign_ops, feed_dict=dict(zip(placeholders, weights)))
+
+  return monitored_session.Scaffold(init_fn=init_fn)
+
+
+def _create_keras_model_fn(keras_model, custom_objects=None, weights_fn=None):
   """Creates model_fn for keras Estimator.
 
   Args:
     keras_model: an instance of compiled keras model.
     custom_objects: Dictionary for custom objects.
+    weights_fn: Optional callable returning a flat list of Numpy arrays used to
+      initialize the weights of the model when no checkpoint is restored.
 
   Returns:
     The model_fn for a keras Estimator.
@@ -408,6 +472,10 @@ def _create_keras_model_fn(keras_model, custom_objects=None):
     if mode is model_fn_lib.ModeKeys.TRAIN:
       train_op = model.train_function.updates_op
 
+    scaffold = None
+    if weights_fn is not None:
+      scaffold = _create_weights_scaffold(model, weights_fn)
+
     if not model._is_graph_network:
       # Reset model state to original state,
       # to avoid `model_fn` being destructive for the initial model argument.
@@ -418,6 +486,7 @@ def _create_keras_model_fn(keras_model, custom_objects=None):
         loss=loss,
         train_op=train_op,
         eval_metric_ops=eval_metric_ops,
+        scaffold=scaffold,
         export_outputs={
             _DEFAULT_SERVING_KEY:
             export_lib.export_output.PredictOutput(predictions)
@@ -465,7 +534,8 @@ def model_to_estimator(keras_model=None,
                        keras_model_path=None,
                        custom_objects=None,
                        model_dir=None,
-                       config=None):
+                       config=None,
+                       weights_handoff='checkpoint'):
   """Constructs an `Estimator` instance from given keras model.
 
   For usage example, please see
@@ -481,6 +551,20 @@ def model_to_estimator(keras_model=None,
     model_dir: Directory to save Estimator model parameters, graph, summary
       files for TensorBoard, etc.
     config: Configuration object.
+    weights_handoff: How the weights of an already initialized `keras_model`
+      are passed to the Estimator. One of:
+      - `'checkpoint'`: the weights are written to a checkpoint in `model_dir`,
+        from which the Estimator starts.
+      - `'memory'`: a copy of the weights is kept in memory and assigned to
+        the Estimator variables when its session is first initialized, without
+        writing a checkpoint.
+      - `'shared'`: like `'memory'`, but the weights are read from the Keras
+        session of `keras_model` at that time rather than copied up front, so
+        that session must still be alive.
+      With `'memory'` and `'shared'`, the weights are only used when
+      `model_dir` has no checkpoint yet, and `export_savedmodel` needs the
+      Estimator to have saved a checkpoint first. Both are only supported for
+      Sequential and functional models without a distribution strategy.
 
   Returns:
     An Estimator from given keras model.
@@ -490,7 +574,12 @@ def model_to_estimator(keras_model=None,
     ValueError: if both keras_model and keras_model_path was given.
     ValueError: if the keras_model_path is a GCS URI.
     ValueError: if keras_model has not been compiled.
+    ValueError: if weights_handoff is not supported for the given model.
   """
+  if weights_handoff not in _WEIGHTS_HANDOFF_MODES:
+    raise ValueError(
+        'Unknown `weights_handoff`: %s. Expected one of: %s' %
+        (weights_handoff, ', '.join(_WEIGHTS_HANDOFF_MODES)))
   if not (keras_model or keras_model_path):
     raise ValueError(
         'Either `keras_model` or `keras_model_path` needs to be provided.')
@@ -520,13 +609,35 @@ def model_to_estimator(keras_model=None,
   if isinstance(config, dict):
     config = run_config_lib.RunConfig(**config)
 
-  keras_model_fn = _create_keras_model_fn(keras_model, custom_objects)
+  if weights_handoff != 'checkpoint':
+    if not keras_model._is_graph_network:
+      raise ValueError(
+          '`weights_handoff=%r` is only supported for Sequential and '
+          'functional models.' % weights_handoff)
+    if config is not None and config.train_distribute is not None:
+      raise ValueError(
+          '`weights_handoff=%r` is not supported with a distribution '
+          'strategy.' % weights_handoff)
+
+  weights_fn = None
+  if weights_handoff != 'checkpoint' and _any_weight_initialized(keras_model):
+    if weights_handoff == 'shared':
+      weights_fn = lambda: _read_keras_weights(keras_model)
+    else:
+      # `keras_weights` is read below, before the Estimator can call this.
+      weights_fn = lambda: keras_weights
+
+  keras_model_fn = _create_keras_model_fn(
+      keras_model, custom_objects, weights_fn=weights_fn)
   estimator = estimator_lib.Estimator(
       keras_model_fn, model_dir=model_dir, config=config)
 
   # Check if we need to call get_weights:
   if _any_weight_initialized(keras_model):
-    keras_weights = keras_model.get_weights()
+    if weights_handoff == 'shared':
+      keras_weights = None
+    else:
+      keras_weights = keras_model.get_weights()
     # Warn if config passed to estimator tries to update GPUOptions. If a
     # session has already been created, the GPUOptions passed to the first
     # session sticks.
@@ -541,11 +652,12 @@ def model_to_estimator(keras_model=None,
     keras_weights = None
 
   if keras_model._is_graph_network:
-    # TODO(yifeif): move checkpoint initialization to scaffold.init_fn
-    _save_first_checkpoint(keras_model,
-                           estimator,
-                           custom_objects,
-                           keras_weights)
+    if weights_handoff == 'checkpoint':
+      # TODO(yifeif): move checkpoint initialization to scaffold.init_fn
+      _save_first_checkpoint(keras_model,
+                             estimator,
+                             custom_objects,
+                             keras_weights)
   elif keras_model.built:
     logging.warning('You are creating an Estimator from a Keras model '
                     'manually subclassed from `Model`, that was '
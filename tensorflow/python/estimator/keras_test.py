@@ -346,6 +346,52 @@ class TestKerasEstimator(test_util.TensorFlowTestCase):
       ]
     self.assertAllEqual(est_pred, keras_pred)
 
+  def test_predict_with_in_memory_weights(self):
+    for weights_handoff in ['memory', 'shared']:
+      keras_model, (x_train, y_train), (
+          x_test, _), _, pred_input_fn = get_resource_for_simple_model(
+              model_type='functional', is_evaluate=False)
+
+      with self.test_session():
+        keras_model.compile(
+            loss='categorical_crossentropy',
+            optimizer='adam',
+            metrics=['accuracy'])
+        keras_model.fit(x_train, y_train, epochs=1)
+        keras_pred = keras_model.predict(x_test)
+
+        keras_est = keras_lib.model_to_estimator(
+            keras_model=keras_model,
+            config=self._config,
+            weights_handoff=weights_handoff)
+        # The weights are not written to disk.
+        self.assertIsNone(keras_est.latest_checkpoint())
+        est_pred = [
+            y[keras_model.output_names[0]]
+            for y in keras_est.predict(input_fn=pred_input_fn)
+        ]
+      self.assertAllClose(est_pred, keras_pred, atol=1e-5)
+
+      writer_cache.FileWriterCache.clear()
+      gfile.DeleteRecursively(self._config.model_dir)
+
+  def test_invalid_weights_handoff(self):
+    keras_model, (_, _), (_, _), _, _ = get_resource_for_simple_model()
+    keras_model.compile(loss='categorical_crossentropy', optimizer='rmsprop')
+    with self.assertRaisesRegexp(ValueError, 'Unknown `weights_handoff`'):
+      keras_lib.model_to_estimator(
+          keras_model=keras_model,
+          config=self._config,
+          weights_handoff='disk')
+
+    keras_model = simple_subclassed_model()
+    keras_model.compile(loss='categorical_crossentropy', optimizer='rmsprop')
+    with self.assertRaisesRegexp(ValueError, 'only supported for Sequential'):
+      keras_lib.model_to_estimator(
+          keras_model=keras_model,
+          config=self._config,
+          weights_handoff='memory')
+
   def test_multi_inputs_multi_outputs(self):
     np.random.seed(_RANDOM_SEED)
     (a_train, c_train), (a_test, c_test) = testing_utils.get_test_data(
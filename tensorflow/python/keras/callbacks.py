@@ -26,12 +26,20 @@ import csv
 import json
 import math
 import os
+import struct
+import sys
+import threading
 import time
+import zlib
 
 import numpy as np
 import six
+from six.moves import queue
 
+from tensorflow.core.framework import summary_pb2
 from tensorflow.python.keras import backend as K
+from tensorflow.python.keras.engine import network
+from tensorflow.python.keras.engine import saving
 from tensorflow.python.keras.utils.generic_utils import Progbar
 from tensorflow.python.ops import array_ops
 from tensorflow.python.platform import tf_logging as logging
@@ -44,10 +52,75 @@ try:
 except ImportError:
   requests = None
 
+try:
+  import h5py
+except ImportError:
+  h5py = None
+
+
+class _BatchLogAccumulator(object):
+  """Accumulates batch logs for callbacks that are called every few batches.
+
+  Metrics are averaged over the accumulated batches, weighted by batch size,
+  except for stateful metrics and non-numeric entries, for which the last
+  value is kept. `size` is the total number of samples.
+  """
+
+  def __init__(self, frequency, stateful_metrics):
+    self.frequency = frequency
+    self.stateful_metrics = stateful_metrics
+    self.reset()
+
+  def reset(self):
+    self.num_batches = 0
+    self.size = 0
+    self.weight = 0
+    self.totals = {}
+    self.last_logs = {}
+
+  def add(self, logs):
+    size = logs.get('size', 0)
+    weight = size or 1
+    self.num_batches += 1
+    self.size += size
+    self.weight += weight
+    for k, v in logs.items():
+      if k in ('batch', 'size') or k in self.stateful_metrics:
+        continue
+      try:
+        self.totals[k] = self.totals.get(k, 0.) + v * weight
+      except TypeError:
+        pass
+    self.last_logs = logs
+
+  def is_due(self):
+    return self.frequency != 'epoch' and self.num_batches >= self.frequency
+
+  def logs(self):
+    logs = dict(self.last_logs)
+    logs['size'] = self.size
+    for k, total in self.totals.items():
+      logs[k] = total / self.weight
+    return logs
+
+
+def _overrides(callback, method_name):
+  """Whether `callback` implements `method_name` rather than inheriting it."""
+  if method_name in getattr(callback, '__dict__', {}):
+    # E.g. `LambdaCallback`, which sets its methods on the instance.
+    return True
+  method = getattr(type(callback), method_name)
+  return (six.get_unbound_function(method) is not
+          six.get_unbound_function(getattr(Callback, method_name)))
+
 
 class CallbackList(object):
   """Container abstracting a list of callbacks.
 
+  Batch-level methods are only dispatched to the callbacks that override
+  them, at the frequency given by each callback's `batch_frequency`, and
+  the time spent in each callback is recorded in `callback_times`.
+
   Arguments:
       callbacks: List of `Callback` instances.
       queue_length: Queue length for keeping
@@ -58,6 +131,8 @@ class CallbackList(object):
     callbacks = callbacks or []
     self.callbacks = [c for c in callbacks]
     self.queue_length = queue_length
+    self.callback_times = {}
+    self._stateful_metrics = set()
 
   def append(self, callback):
     self.callbacks.append(callback)
@@ -67,9 +142,76 @@ class CallbackList(object):
       callback.set_params(params)
 
   def set_model(self, model):
+    self._stateful_metrics = set(getattr(model, 'stateful_metric_names', []))
     for callback in self.callbacks:
       callback.set_model(model)
 
+  def _prepare_batch_dispatch(self):
+    """Lists, in order, the callbacks to call on batch begin and end.
+
+    Each one is paired with the `_BatchLogAccumulator` of its frequency, or
+    `None` if it is called on every batch.
+    """
+    accumulators = {}
+    self._batch_begin_callbacks = []
+    self._batch_end_callbacks = []
+    for callback in self.callbacks:
+      frequency = getattr(callback, 'batch_frequency', 1)
+      accumulator = None
+      if frequency != 1:
+        if frequency not in accumulators:
+          accumulators[frequency] = _BatchLogAccumulator(
+              frequency, self._stateful_metrics)
+        accumulator = accumulators[frequency]
+      if _overrides(callback, 'on_batch_begin'):
+        self._batch_begin_callbacks.append((callback, accumulator))
+      if _overrides(callback, 'on_batch_end'):
+        self._batch_end_callbacks.append((callback, accumulator))
+      self.callback_times.setdefault(callback, 0.)
+    self._accumulators = list(accumulators.values())
+    self._num_batches = 0
+
+  def _dispatch_batch_end(self, batch, logs, due=(), every_batch=True):
+    """Calls `on_batch_end` of the callbacks that are due, in list order.
+
+    Arguments:
+        batch: integer, index of batch within the current epoch.
+        logs: dictionary of logs of the current batch.
+        due: `_BatchLogAccumulator`s whose callbacks receive their
+            accumulated logs.
+        every_batch: whether to call the callbacks that are called on
+            every batch.
+    """
+    accumulated_logs = dict((id(a), a.logs()) for a in due)
+    for callback, accumulator in self._batch_end_callbacks:
+      if accumulator is None:
+        if not every_batch:
+          continue
+        callback_logs = logs
+      elif id(accumulator) in accumulated_logs:
+        callback_logs = accumulated_logs[id(accumulator)]
+      else:
+        continue
+      t_before_callback = time.time()
+      callback.on_batch_end(batch, callback_logs)
+      self.callback_times[callback] += time.time() - t_before_callback
+    for accumulator in due:
+      accumulator.reset()
+
+  def _warn_if_slow(self, method_name, delta_ts):
+    """Warns if batch callbacks are slow compared to the batch update."""
+    # Computing the median is not free either, so only do it once in a while.
+    if self._num_batches % self.queue_length:
+      return
+    delta_t_median = np.median(delta_ts)
+    if (self._delta_t_batch > 0. and self.callback_times and
+        delta_t_median > 0.95 * self._delta_t_batch and delta_t_median > 0.1):
+      slowest = max(self.callback_times, key=self.callback_times.get)
+      logging.warning('Method %s() is slow compared '
+                      'to the batch update (%f). Check your callbacks '
+                      '(slowest: %s).', method_name, delta_t_median,
+                      slowest.__class__.__name__)
+
   def on_epoch_begin(self, epoch, logs=None):
     """Called at the start of an epoch.
 
@@ -80,6 +222,7 @@ class CallbackList(object):
     logs = logs or {}
     for callback in self.callbacks:
       callback.on_epoch_begin(epoch, logs)
+    self._prepare_batch_dispatch()
     self._delta_t_batch = 0.
     self._delta_ts_batch_begin = deque([], maxlen=self.queue_length)
     self._delta_ts_batch_end = deque([], maxlen=self.queue_length)
@@ -87,11 +230,19 @@ class CallbackList(object):
   def on_epoch_end(self, epoch, logs=None):
     """Called at the end of an epoch.
 
+    Batch logs still accumulated for callbacks with a `batch_frequency`
+    other than 1 are delivered first.
+
     Arguments:
         epoch: integer, index of epoch.
         logs: dictionary of logs.
     """
     logs = logs or {}
+    if getattr(self, '_accumulators', None):
+      pending = [a for a in self._accumulators if a.num_batches]
+      if pending:
+        self._dispatch_batch_end(self._last_batch, None, pending,
+                                 every_batch=False)
     for callback in self.callbacks:
       callback.on_epoch_end(epoch, logs)
 
@@ -103,16 +254,20 @@ class CallbackList(object):
         logs: dictionary of logs.
     """
     logs = logs or {}
+    if not hasattr(self, '_batch_begin_callbacks'):
+      self._prepare_batch_dispatch()
+      self._delta_t_batch = 0.
+      self._delta_ts_batch_begin = deque([], maxlen=self.queue_length)
+      self._delta_ts_batch_end = deque([], maxlen=self.queue_length)
     t_before_callbacks = time.time()
-    for callback in self.callbacks:
-      callback.on_batch_begin(batch, logs)
+    for callback, accumulator in self._batch_begin_callbacks:
+      # Callbacks called every few batches see the first batch of each lot.
+      if accumulator is None or not accumulator.num_batches:
+        t_before_callback = time.time()
+        callback.on_batch_begin(batch, logs)
+        self.callback_times[callback] += time.time() - t_before_callback
     self._delta_ts_batch_begin.append(time.time() - t_before_callbacks)
-    delta_t_median = np.median(self._delta_ts_batch_begin)
-    if (self._delta_t_batch > 0. and
-        delta_t_median > 0.95 * self._delta_t_batch and delta_t_median > 0.1):
-      logging.warning('Method on_batch_begin() is slow compared '
-                      'to the batch update (%f). Check your callbacks.',
-                      delta_t_median)
+    self._warn_if_slow('on_batch_begin', self._delta_ts_batch_begin)
     self._t_enter_batch = time.time()
 
   def on_batch_end(self, batch, logs=None):
@@ -123,19 +278,23 @@ class CallbackList(object):
         logs: dictionary of logs.
     """
     logs = logs or {}
+    if not hasattr(self, '_batch_end_callbacks'):
+      self._prepare_batch_dispatch()
+      self._delta_ts_batch_end = deque([], maxlen=self.queue_length)
     if not hasattr(self, '_t_enter_batch'):
       self._t_enter_batch = time.time()
     self._delta_t_batch = time.time() - self._t_enter_batch
     t_before_callbacks = time.time()
-    for callback in self.callbacks:
-      callback.on_batch_end(batch, logs)
+    due = []
+    for accumulator in self._accumulators:
+      accumulator.add(logs)
+      if accumulator.is_due():
+        due.append(accumulator)
+    self._dispatch_batch_end(batch, logs, due)
+    self._last_batch = batch
+    self._num_batches += 1
     self._delta_ts_batch_end.append(time.time() - t_before_callbacks)
-    delta_t_median = np.median(self._delta_ts_batch_end)
-    if (self._delta_t_batch > 0. and
-        (delta_t_median > 0.95 * self._delta_t_batch and delta_t_median > 0.1)):
-      logging.warning('Method on_batch_end() is slow compared '
-                      'to the batch update (%f). Check your callbacks.',
-                      delta_t_median)
+    self._warn_if_slow('on_batch_end', self._delta_ts_batch_end)
 
   def on_train_begin(self, logs=None):
     """Called at the beginning of training.
@@ -187,8 +346,20 @@ class Callback(object):
           the number of samples in the current batch.
       on_batch_end: logs include `loss`, and optionally `acc`
           (if accuracy monitoring is enabled).
+
+  `batch_frequency` controls how often `on_batch_begin` and `on_batch_end`
+  are called: 1 (the default) calls them on every batch, an integer `N`
+  calls them every `N` batches and `'epoch'` once per epoch, right before
+  `on_epoch_end`. When called less often than every batch, `on_batch_begin`
+  is called before the first batch of each group and `on_batch_end` after
+  the last one, with `size` summed over the group and the other metrics
+  averaged over it, weighted by batch size (stateful metrics keep their
+  last value). Callbacks that do not override the batch-level methods are
+  not called on batches at all.
   """
 
+  batch_frequency = 1
+
   def __init__(self):
     self.validation_data = None
     self.model = None
@@ -231,6 +402,9 @@ class BaseLogger(Callback):
           All others will be averaged in `on_epoch_end`.
   """
 
+  # The accumulated batch logs are enough to compute the epoch averages.
+  batch_frequency = 'epoch'
+
   def __init__(self, stateful_metrics=None):
     super(BaseLogger, self).__init__()
     self.stateful_metrics = set(stateful_metrics or [])
@@ -305,6 +479,11 @@ class ProgbarLogger(Callback):
       raise ValueError('Unknown `count_mode`: ' + str(count_mode))
     self.stateful_metrics = set(stateful_metrics or [])
 
+  @property
+  def batch_frequency(self):
+    # Only the per-batch progress bar needs to see every batch.
+    return 1 if getattr(self, 'verbose', 1) == 1 else 'epoch'
+
   def on_train_begin(self, logs=None):
     self.verbose = self.params['verbose']
     self.epochs = self.params['epochs']
@@ -331,7 +510,7 @@ class ProgbarLogger(Callback):
     logs = logs or {}
     batch_size = logs.get('size', 0)
     if self.use_steps:
-      self.seen += 1
+      self.seen = batch + 1
     else:
       self.seen += batch_size
 
@@ -404,6 +583,17 @@ class ModelCheckpoint(Callback):
           saved (`model.save_weights(filepath)`), else the full model
           is saved (`model.save(filepath)`).
       period: Interval (number of epochs) between checkpoints.
+      async_save: if True, the weights are copied to host memory at the end
+          of the epoch and written to `filepath` on a background thread, so
+          that training resumes without waiting for the file to be written.
+          At most two copies are held at once: if the previous checkpoint is
+          still being written when the next one is due, the next copy is
+          queued, and the one after it waits. Each file is written under a
+          temporary name and renamed when complete. All pending checkpoints
+          are written by the end of `fit`, and errors from the background
+          thread are raised at the next checkpoint or at the end of `fit`.
+          Weights saved in TensorFlow format (`save_weights_only` with a
+          `filepath` not ending in `.h5`) are always saved synchronously.
   """
 
   def __init__(self,
@@ -413,7 +603,8 @@ class ModelCheckpoint(Callback):
                save_best_only=False,
                save_weights_only=False,
                mode='auto',
-               period=1):
+               period=1,
+               async_save=False):
     super(ModelCheckpoint, self).__init__()
     self.monitor = monitor
     self.verbose = verbose
@@ -422,6 +613,11 @@ class ModelCheckpoint(Callback):
     self.save_weights_only = save_weights_only
     self.period = period
     self.epochs_since_last_save = 0
+    self.async_save = async_save
+    self._save_queue = None
+    self._save_slots = None
+    self._save_thread = None
+    self._save_error = None
 
     if mode not in ['auto', 'min', 'max']:
       logging.warning('ModelCheckpoint mode %s is unknown, '
@@ -460,10 +656,7 @@ class ModelCheckpoint(Callback):
                     ' saving model to %s' % (epoch + 1, self.monitor, self.best,
                                              current, filepath))
             self.best = current
-            if self.save_weights_only:
-              self.model.save_weights(filepath, overwrite=True)
-            else:
-              self.model.save(filepath, overwrite=True)
+            self._save_model(filepath)
           else:
             if self.verbose > 0:
               print('\nEpoch %05d: %s did not improve from %0.5f' %
@@ -471,10 +664,77 @@ class ModelCheckpoint(Callback):
       else:
         if self.verbose > 0:
           print('\nEpoch %05d: saving model to %s' % (epoch + 1, filepath))
+        self._save_model(filepath)
+
+  def on_train_end(self, logs=None):
+    if self._save_thread is not None:
+      self._save_queue.put(None)
+      self._save_thread.join()
+      self._save_thread = None
+    self._raise_save_error()
+
+  def _save_model(self, filepath):
+    if self.async_save and (not self.save_weights_only or
+                            network._is_hdf5_filepath(filepath)):  # pylint: disable=protected-access
+      self._save_model_async(filepath)
+    elif self.save_weights_only:
+      self.model.save_weights(filepath, overwrite=True)
+    else:
+      self.model.save(filepath, overwrite=True)
+
+  def _save_model_async(self, filepath):
+    """Snapshots the model and queues it to be written to `filepath`."""
+    self._raise_save_error()
+    if self._save_thread is None:
+      self._save_queue = queue.Queue()
+      # One snapshot being written, and the next one.
+      self._save_slots = threading.Semaphore(2)
+      self._save_thread = threading.Thread(target=self._write_snapshots)
+      self._save_thread.daemon = True
+      self._save_thread.start()
+    self._save_slots.acquire()
+    # Everything that reads the model state, including the optimizer config
+    # (e.g. the learning rate), is captured here: the default graph and
+    # session are thread-local, and callbacks may change the state meanwhile.
+    weight_values = saving.snapshot_weights(
+        self.model, include_optimizer=not self.save_weights_only)
+    configs = None
+    if not self.save_weights_only:
+      configs = saving.snapshot_configs(self.model)
+    self._save_queue.put((filepath, weight_values, configs))
+
+  def _write_snapshots(self):
+    """Writes the queued snapshots, until `None` is dequeued."""
+    while True:
+      item = self._save_queue.get()
+      if item is None:
+        return
+      filepath, weight_values, configs = item
+      try:
+        tmp_filepath = filepath + '.tmp'
         if self.save_weights_only:
-          self.model.save_weights(filepath, overwrite=True)
+          if h5py is None:
+            raise ImportError('`save_weights` requires h5py.')
+          with h5py.File(tmp_filepath, 'w') as f:
+            saving.save_weights_to_hdf5_group(
+                f, self.model.layers, weight_values=weight_values)
         else:
-          self.model.save(filepath, overwrite=True)
+          saving._save_model(  # pylint: disable=protected-access
+              self.model,
+              tmp_filepath,
+              weight_values=weight_values,
+              configs=configs)
+        getattr(os, 'replace', os.rename)(tmp_filepath, filepath)
+      except Exception:  # pylint: disable=broad-except
+        if self._save_error is None:
+          self._save_error = sys.exc_info()
+      finally:
+        self._save_slots.release()
+
+  def _raise_save_error(self):
+    if self._save_error is not None:
+      error, self._save_error = self._save_error, None
+      six.reraise(*error)
 
 
 @tf_export('keras.callbacks.EarlyStopping')
@@ -658,6 +918,129 @@ class LearningRateScheduler(Callback):
             'rate to %s.' % (epoch + 1, lr))
 
 
+_HISTOGRAM_BUCKET_LIMITS = []
+
+
+def _histogram_bucket_limits():
+  """Returns the default bucket limits of the `HistogramSummary` op."""
+  if not _HISTOGRAM_BUCKET_LIMITS:
+    # Buckets grow by 10% from 1e-12 to 1e20, mirrored for negative values.
+    limits = []
+    v = 1e-12
+    while v < 1e20:
+      limits.append(v)
+      v *= 1.1
+    limits.append(np.finfo(np.float64).max)
+    _HISTOGRAM_BUCKET_LIMITS.extend([-l for l in reversed(limits)] + [0.] +
+                                    limits)
+  return _HISTOGRAM_BUCKET_LIMITS
+
+
+def _histogram_proto(values):
+  """Computes a `HistogramProto` of `values` as the `HistogramSummary` op does.
+
+  Arguments:
+      values: Numpy array of finite numbers.
+
+  Returns:
+      A `HistogramProto`.
+  """
+  values = np.asarray(values, dtype=np.float64).ravel()
+  limits = np.array(_histogram_bucket_limits())
+  counts = np.bincount(np.searchsorted(limits, values, side='right'),
+                       minlength=len(limits))[:len(limits)]
+  # Runs of empty buckets are collapsed into their last bucket.
+  nonzero = counts > 0
+  keep = nonzero | np.append(nonzero[1:], True)
+  histo = summary_pb2.HistogramProto(
+      min=values.min() if values.size else 0.,
+      max=values.max() if values.size else 0.,
+      num=values.size,
+      sum=values.sum(),
+      sum_squares=np.dot(values, values))
+  histo.bucket_limit.extend(limits[keep].tolist())
+  histo.bucket.extend(counts[keep].astype(np.float64).tolist())
+  return histo
+
+
+def _encode_png(image):
+  """Encodes a uint8 `(height, width, channels)` array as a PNG string."""
+  height, width, depth = image.shape
+  rows = np.concatenate(
+      [np.zeros((height, 1), np.uint8), image.reshape(height, -1)], axis=1)
+
+  def chunk(tag, data):
+    return (struct.pack('>I', len(data)) + tag + data +
+            struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+  header = struct.pack('>IIBBBBB', width, height, 8, {1: 0, 3: 2, 4: 6}[depth],
+                       0, 0, 0)
+  return b''.join([b'\x89PNG\r\n\x1a\n', chunk(b'IHDR', header),
+                   chunk(b'IDAT', zlib.compress(rows.tobytes())),
+                   chunk(b'IEND', b'')])
+
+
+def _image_summary_values(tag, images, max_outputs=3):
+  """Builds `Summary.Value`s of float images as the `ImageSummary` op does.
+
+  Each image is scaled to [0, 255] (or centered on 128 if it has negative
+  values) and non-finite pixels are set to red.
+
+  Arguments:
+      tag: Base tag of the images.
+      images: Float array of shape `(batch, height, width, channels)`.
+      max_outputs: Maximum number of images to write.
+
+  Returns:
+      A list of `Summary.Value`.
+  """
+  summary_values = []
+  for i, image in enumerate(images[:max_outputs]):
+    image = image.astype(np.float32)
+    finite = np.isfinite(image).all(axis=-1)
+    low = image[finite].min() if finite.any() else 0.
+    high = image[finite].max() if finite.any() else 0.
+    if low < 0:
+      max_val = max(abs(low), abs(high))
+      scale, offset = (0. if max_val < 1e-6 else 127. / max_val), 128.
+    else:
+      scale, offset = (0. if high < 1e-6 else 255. / high), 0.
+    image = (np.where(finite[..., None], image, 0.) * scale +
+             offset).astype(np.uint8)
+    image[~finite] = np.array([255, 0, 0, 255], np.uint8)[:image.shape[-1]]
+    summary_values.append(
+        tf_summary.Summary.Value(
+            tag='%s/image/%d' % (tag, i),
+            image=tf_summary.Summary.Image(
+                height=image.shape[0],
+                width=image.shape[1],
+                colorspace=image.shape[2],
+                encoded_image_string=_encode_png(image))))
+  return summary_values
+
+
+def _weight_image(weight, data_format):
+  """Reshapes a weight value to a batch of images, or returns `None`."""
+  w_img = np.squeeze(weight)
+  shape = w_img.shape
+  if len(shape) == 2:  # dense layer kernel case
+    if shape[0] > shape[1]:
+      w_img = w_img.T
+      shape = w_img.shape
+    return w_img.reshape((1, shape[0], shape[1], 1))
+  elif len(shape) == 3:  # convnet case
+    if data_format == 'channels_last':
+      # switch to channels_first to display
+      # every kernel as a separate image
+      w_img = np.transpose(w_img, (2, 0, 1))
+      shape = w_img.shape
+    return w_img.reshape((shape[0], shape[1], shape[2], 1))
+  elif len(shape) == 1:  # bias case
+    return w_img.reshape((1, shape[0], 1, 1))
+  # not possible to handle 3D convnets etc.
+  return None
+
+
 @tf_export('keras.callbacks.TensorBoard')
 class TensorBoard(Callback):
   # pylint: disable=line-too-long
@@ -705,6 +1088,15 @@ class TensorBoard(Callback):
           [details](https://www.tensorflow.org/how_tos/embedding_viz/#metadata_optional)
           about metadata files format. In case if the same metadata file is
           used for all embedding layers, string can be passed.
+      async_histograms: if True, the histogram and image summaries are not
+          computed in the graph: the validation steps only fetch the layer
+          outputs and gradients, the weights are copied once at the end of
+          the epoch, and the histograms and images are computed and written
+          on a background thread. At most two validation batches are queued
+          for the background thread; further batches wait. Weight summaries
+          are then written once per epoch, at step `epoch`, instead of once
+          per validation batch. Non-finite values are skipped with a
+          warning instead of failing the validation step.
   """
 
   # pylint: enable=line-too-long
@@ -715,7 +1107,8 @@ class TensorBoard(Callback):
                batch_size=32,
                write_graph=True,
                write_grads=False,
-               write_images=False):
+               write_images=False,
+               async_histograms=False):
     super(TensorBoard, self).__init__()
     self.log_dir = log_dir
     self.histogram_freq = histogram_freq
@@ -724,7 +1117,13 @@ class TensorBoard(Callback):
     self.write_grads = write_grads
     self.write_images = write_images
     self.batch_size = batch_size
+    self.async_histograms = async_histograms
     self._current_batch = 0
+    self._histogram_tensors = None
+    self._histogram_weights = None
+    self._summary_queue = None
+    self._summary_thread = None
+    self._summary_error = None
     # abstracted writer class to be able to stub for testing
     self._writer_class = tf_summary.FileWriter
 
@@ -733,8 +1132,12 @@ class TensorBoard(Callback):
 
     self.model = model
     self.sess = K.get_session()
+    if self.histogram_freq and self.async_histograms:
+      # only list the histogram tensors if it hasn't already been done
+      if self._histogram_tensors is None:
+        self._set_histogram_tensors()
     # only make histogram summary op if it hasn't already been made
-    if self.histogram_freq and self.merged is None:
+    elif self.histogram_freq and self.merged is None:
       for layer in self.model.layers:
         for weight in layer.weights:
           mapped_weight_name = weight.name.replace(':', '_')
@@ -786,6 +1189,99 @@ class TensorBoard(Callback):
     else:
       self.writer = self._writer_class(self.log_dir)
 
+  def _set_histogram_tensors(self):
+    """Lists the weights and tensors to summarize on a background thread."""
+    self._data_format = K.image_data_format()
+    self._histogram_weights = []
+    self._histogram_tensors = []
+    for layer in self.model.layers:
+      for weight in layer.weights:
+        mapped_weight_name = weight.name.replace(':', '_')
+        write_image = (self.write_images and
+                       len([d for d in K.int_shape(weight) if d != 1]) in
+                       (1, 2, 3))
+        self._histogram_weights.append((mapped_weight_name, weight,
+                                        write_image))
+
+      if self.write_grads:
+        for weight in layer.trainable_weights:
+          mapped_weight_name = weight.name.replace(':', '_')
+          grads = self.model.optimizer.get_gradients(self.model.total_loss,
+                                                     weight)
+          grads = [grad.values if type(grad).__name__ == 'IndexedSlices'
+                   else grad for grad in grads]
+          self._histogram_tensors.append(
+              ('{}_grad'.format(mapped_weight_name), array_ops.stack(grads)))
+
+      if hasattr(layer, 'output'):
+        output = layer.output
+        if isinstance(output, list):
+          output = array_ops.stack(output)
+        self._histogram_tensors.append(('{}_out'.format(layer.name), output))
+
+    self._histogram_fetches = [
+        array_ops.identity(tensor) for _, tensor in self._histogram_tensors]
+    self._histogram_fetch_callbacks = [
+        self._make_histogram_fetch_callback(i)
+        for i in range(len(self._histogram_fetches))]
+
+  def _make_histogram_fetch_callback(self, index):
+    """Returns the fetch callback of the `index`-th histogram tensor."""
+
+    def fetch_callback(value):
+      if index == 0:
+        self._batch_histogram_values = []
+      tag = self._histogram_tensors[index][0]
+      self._batch_histogram_values.append((tag, value, False))
+      if index == len(self._histogram_fetches) - 1:
+        self._queue_summaries(
+            self._epoch +
+            self._current_histogram_batch / self._validation_batches,
+            self._batch_histogram_values)
+        self._current_histogram_batch += 1
+
+    return fetch_callback
+
+  def _queue_summaries(self, step, values):
+    """Queues `(tag, value, write_image)` tuples to be written at `step`."""
+    self._raise_summary_error()
+    if self._summary_thread is None:
+      # One batch being written, and the next two.
+      self._summary_queue = queue.Queue(maxsize=2)
+      self._summary_thread = threading.Thread(target=self._write_summaries)
+      self._summary_thread.daemon = True
+      self._summary_thread.start()
+    self._summary_queue.put((step, values))
+
+  def _write_summaries(self):
+    """Writes the queued summaries, until `None` is dequeued."""
+    while True:
+      item = self._summary_queue.get()
+      if item is None:
+        return
+      step, values = item
+      try:
+        summary = tf_summary.Summary()
+        for tag, value, write_image in values:
+          if not np.isfinite(value).all():
+            logging.warning('Skipping the histogram of %s, which has '
+                            'non-finite values.', tag)
+          else:
+            summary.value.add(tag=tag, histo=_histogram_proto(value))
+          if write_image:
+            images = _weight_image(value, self._data_format)
+            if images is not None:
+              summary.value.extend(_image_summary_values(tag, images))
+        self.writer.add_summary(summary, step)
+      except Exception:  # pylint: disable=broad-except
+        if self._summary_error is None:
+          self._summary_error = sys.exc_info()
+
+  def _raise_summary_error(self):
+    if self._summary_error is not None:
+      error, self._summary_error = self._summary_error, None
+      six.reraise(*error)
+
   def _fetch_callback(self, summary):
     self.writer.add_summary(
         summary,
@@ -815,11 +1311,19 @@ class TensorBoard(Callback):
     if self.histogram_freq and epoch % self.histogram_freq == 0:
       self._epoch = epoch
       self._current_val_batch = 0
+      self._current_histogram_batch = 0
+      test_function = self.model.test_function
+      if self._histogram_tensors and (self._histogram_fetches[0] not in
+                                      test_function.fetches):
+        test_function.fetches.extend(self._histogram_fetches)
+        for fetch, fetch_callback in zip(self._histogram_fetches,
+                                         self._histogram_fetch_callbacks):
+          test_function.fetch_callbacks[fetch] = fetch_callback
       # add the histogram summary op if it should run this epoch
-      if self.merged not in self.model.test_function.fetches:
-        self.model.test_function.fetches.append(self.merged)
-        self.model.test_function.fetch_callbacks[
-            self.merged] = self._fetch_callback
+      if (self.merged is not None and
+          self.merged not in test_function.fetches):
+        test_function.fetches.append(self.merged)
+        test_function.fetch_callbacks[self.merged] = self._fetch_callback
 
   def on_epoch_end(self, epoch, logs=None):
     """Checks if summary ops should run next epoch, logs scalar summaries."""
@@ -828,6 +1332,18 @@ class TensorBoard(Callback):
 
     # pop the histogram summary op after each epoch
     if self.histogram_freq:
+      if self._histogram_tensors:
+        test_function = self.model.test_function
+        for fetch in self._histogram_fetches:
+          if fetch in test_function.fetches:
+            test_function.fetches.remove(fetch)
+          test_function.fetch_callbacks.pop(fetch, None)
+      if self._histogram_weights and epoch % self.histogram_freq == 0:
+        weight_values = K.batch_get_value(
+            [weight for _, weight, _ in self._histogram_weights])
+        self._queue_summaries(epoch, [
+            (tag, value, write_image) for (tag, _, write_image), value in zip(
+                self._histogram_weights, weight_values)])
       if self.merged in self.model.test_function.fetches:
         self.model.test_function.fetches.remove(self.merged)
       if self.merged in self.model.test_function.fetch_callbacks:
@@ -844,7 +1360,12 @@ class TensorBoard(Callback):
     self.writer.flush()
 
   def on_train_end(self, logs=None):
+    if self._summary_thread is not None:
+      self._summary_queue.put(None)
+      self._summary_thread.join()
+      self._summary_thread = None
     self.writer.close()
+    self._raise_summary_error()
 
 
 @tf_export('keras.callbacks.ReduceLROnPlateau')
@@ -32,6 +32,7 @@ from tensorflow.python import keras
 from tensorflow.python.keras import testing_utils
 from tensorflow.python.platform import test
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.summary import summary as tf_summary
 from tensorflow.python.summary.writer import writer_cache
 
 try:
@@ -221,6 +222,111 @@ class KerasCallbacksTest(test.TestCase):
           save_best_only=save_best_only,
           mode='unknown')
 
+  def test_ModelCheckpoint_async(self):
+    if h5py is None:
+      return  # Skip test if models cannot be saved.
+
+    with self.test_session():
+      np.random.seed(1337)
+
+      temp_dir = self.get_temp_dir()
+      self.addCleanup(shutil.rmtree, temp_dir)
+
+      (x_train, y_train), _ = testing_utils.get_test_data(
+          train_samples=TRAIN_SAMPLES,
+          test_samples=TEST_SAMPLES,
+          input_shape=(INPUT_DIM,),
+          num_classes=NUM_CLASSES)
+      y_train = keras.utils.to_categorical(y_train)
+      model = keras.models.Sequential()
+      model.add(
+          keras.layers.Dense(
+              NUM_HIDDEN, input_dim=INPUT_DIM, activation='relu'))
+      model.add(keras.layers.Dense(NUM_CLASSES, activation='softmax'))
+      model.compile(loss='categorical_crossentropy', optimizer='rmsprop')
+
+      model_path = os.path.join(temp_dir, 'model.{epoch:02d}.h5')
+      weights_path = os.path.join(temp_dir, 'weights.{epoch:02d}.h5')
+      cbks = [
+          keras.callbacks.ModelCheckpoint(
+              model_path, monitor='loss', async_save=True),
+          keras.callbacks.ModelCheckpoint(
+              weights_path,
+              monitor='loss',
+              save_weights_only=True,
+              async_save=True)
+      ]
+      model.fit(
+          x_train,
+          y_train,
+          batch_size=BATCH_SIZE,
+          callbacks=cbks,
+          epochs=3,
+          verbose=0)
+
+      # All the checkpoints have been written by the end of `fit`.
+      for epoch in range(1, 4):
+        self.assertTrue(os.path.exists(model_path.format(epoch=epoch)))
+        self.assertTrue(os.path.exists(weights_path.format(epoch=epoch)))
+      self.assertEqual(
+          [f for f in os.listdir(temp_dir) if f.endswith('.tmp')], [])
+
+      # The last checkpoints hold the final weights.
+      loaded_model = keras.models.load_model(model_path.format(epoch=3))
+      for w, loaded_w in zip(model.get_weights(), loaded_model.get_weights()):
+        self.assertAllClose(w, loaded_w)
+      loaded_model = keras.models.load_model(model_path.format(epoch=1))
+      loaded_model.load_weights(weights_path.format(epoch=3))
+      for w, loaded_w in zip(model.get_weights(), loaded_model.get_weights()):
+        self.assertAllClose(w, loaded_w)
+
+  def test_ModelCheckpoint_async_with_learning_rate_schedule(self):
+    if h5py is None:
+      return  # Skip test if models cannot be saved.
+
+    with self.test_session():
+      np.random.seed(1337)
+
+      temp_dir = self.get_temp_dir()
+      self.addCleanup(shutil.rmtree, temp_dir)
+
+      (x_train, y_train), _ = testing_utils.get_test_data(
+          train_samples=TRAIN_SAMPLES,
+          test_samples=TEST_SAMPLES,
+          input_shape=(INPUT_DIM,),
+          num_classes=NUM_CLASSES)
+      y_train = keras.utils.to_categorical(y_train)
+      model = keras.models.Sequential()
+      model.add(
+          keras.layers.Dense(
+              NUM_HIDDEN, input_dim=INPUT_DIM, activation='relu'))
+      model.add(keras.layers.Dense(NUM_CLASSES, activation='softmax'))
+      model.compile(loss='categorical_crossentropy', optimizer='sgd')
+
+      model_path = os.path.join(temp_dir, 'model.{epoch:02d}.h5')
+      cbks = [
+          keras.callbacks.LearningRateScheduler(lambda x: 1. / (1. + x)),
+          keras.callbacks.ModelCheckpoint(
+              model_path,
+              monitor='loss',
+              save_weights_only=False,
+              async_save=True)
+      ]
+      model.fit(
+          x_train,
+          y_train,
+          batch_size=BATCH_SIZE,
+          callbacks=cbks,
+          epochs=3,
+          verbose=0)
+
+      # Each checkpoint holds the learning rate of the epoch it was saved at,
+      # although the next epoch already changed it.
+      for epoch in range(1, 4):
+        loaded_model = keras.models.load_model(model_path.format(epoch=epoch))
+        self.assertAllClose(
+            keras.backend.get_value(loaded_model.optimizer.lr), 1. / epoch)
+
   def test_EarlyStopping(self):
     with self.test_session():
       np.random.seed(123)
@@ -645,6 +751,47 @@ class KerasCallbacksTest(test.TestCase):
       assert len(loss) == 1
       assert loss[0] == np.inf
 
+  def test_callback_batch_frequency(self):
+    calls = []
+
+    class EveryBatch(keras.callbacks.Callback):
+
+      def on_batch_end(self, batch, logs=None):
+        calls.append(('every', batch, logs['size']))
+
+    class EveryThreeBatches(keras.callbacks.Callback):
+      batch_frequency = 3
+
+      def on_batch_begin(self, batch, logs=None):
+        calls.append(('begin_3', batch, None))
+
+      def on_batch_end(self, batch, logs=None):
+        calls.append(('end_3', batch, logs['size'], logs['loss']))
+
+    class EveryEpoch(keras.callbacks.Callback):
+      batch_frequency = 'epoch'
+
+      def on_batch_end(self, batch, logs=None):
+        calls.append(('end_epoch', batch, logs['size'], logs['loss']))
+
+    cbks = keras.callbacks.CallbackList(
+        [EveryThreeBatches(), EveryBatch(), EveryEpoch()])
+    cbks.set_params({'metrics': ['loss']})
+    cbks.on_epoch_begin(0)
+    for batch, size in enumerate([4, 4, 4, 4, 2]):
+      cbks.on_batch_begin(batch, {'batch': batch, 'size': size})
+      cbks.on_batch_end(batch, {'batch': batch, 'size': size,
+                                'loss': float(batch)})
+    cbks.on_epoch_end(0, {'loss': 0.})
+
+    self.assertEqual(
+        [c for c in calls if c[0] != 'every'],
+        [('begin_3', 0, None), ('end_3', 2, 12, 1.),
+         ('begin_3', 3, None), ('end_3', 4, 6, (3. * 4 + 4. * 2) / 6),
+         ('end_epoch', 4, 18, (0. + 4 + 8 + 12 + 8) / 18)])
+    self.assertEqual(len([c for c in calls if c[0] == 'every']), 5)
+    self.assertEqual(len(cbks.callback_times), 3)
+
   def test_TensorBoard(self):
     np.random.seed(1337)
 
@@ -961,6 +1108,91 @@ class KerasCallbacksTest(test.TestCase):
 
       self.assertAllEqual(tsb.writer.steps_seen, [0, 0.5, 1, 1.5, 2, 2.5])
 
+  def test_Tensorboard_async_histograms(self):
+
+    class FileWriterStub(object):
+
+      def __init__(self, logdir, graph=None):
+        self.logdir = logdir
+        self.graph = graph
+        self.steps_seen = []
+        self.tags_seen = set()
+
+      def add_summary(self, summary, global_step):
+        if isinstance(summary, bytes):
+          summary = summary_pb2.Summary.FromString(summary)
+        if len(summary.value) > 1:
+          self.steps_seen.append(global_step)
+        self.tags_seen.update(value.tag for value in summary.value)
+
+      def flush(self):
+        pass
+
+      def close(self):
+        pass
+
+    np.random.seed(1337)
+    tmpdir = self.get_temp_dir()
+    self.addCleanup(shutil.rmtree, tmpdir)
+    (x_train, y_train), (x_test, y_test) = testing_utils.get_test_data(
+        train_samples=TRAIN_SAMPLES,
+        test_samples=TEST_SAMPLES,
+        input_shape=(INPUT_DIM,),
+        num_classes=NUM_CLASSES)
+    y_test = keras.utils.to_categorical(y_test)
+    y_train = keras.utils.to_categorical(y_train)
+
+    with self.test_session() as sess:
+      model = keras.models.Sequential()
+      model.add(
+          keras.layers.Dense(
+              NUM_HIDDEN, input_dim=INPUT_DIM, activation='relu',
+              name='dense_a'))
+      model.add(keras.layers.Dense(NUM_CLASSES, activation='softmax',
+                                   name='dense_b'))
+      model.compile(
+          loss='categorical_crossentropy',
+          optimizer='sgd',
+          metrics=['accuracy'])
+      tsb = keras.callbacks.TensorBoard(
+          log_dir=tmpdir,
+          histogram_freq=1,
+          write_images=True,
+          write_grads=True,
+          batch_size=5,
+          async_histograms=True)
+      tsb._writer_class = FileWriterStub
+
+      model.fit(
+          x_train,
+          y_train,
+          batch_size=BATCH_SIZE,
+          validation_data=(x_test, y_test),
+          callbacks=[tsb],
+          epochs=3,
+          verbose=0)
+
+      # One summary per validation batch, and one of the weights per epoch.
+      self.assertAllEqual(sorted(tsb.writer.steps_seen),
+                          [0, 0, 0.5, 1, 1, 1.5, 2, 2, 2.5])
+      for tag in ['dense_a_out', 'dense_a/kernel_0',
+                  'dense_a/kernel_0/image/0', 'dense_a/kernel_0_grad']:
+        self.assertIn(tag, tsb.writer.tags_seen)
+      self.assertFalse(model.test_function.fetches)
+
+      # The histograms match those of the `HistogramSummary` op.
+      values = np.random.randn(100).astype(np.float32)
+      expected = summary_pb2.Summary.FromString(
+          sess.run(tf_summary.histogram('h', values)))
+      expected = expected.value[0].histo
+      histo = keras.callbacks._histogram_proto(values)
+      self.assertEqual(histo.bucket_limit, expected.bucket_limit)
+      self.assertEqual(histo.bucket, expected.bucket)
+      self.assertAllClose(
+          [histo.min, histo.max, histo.num, histo.sum, histo.sum_squares],
+          [expected.min, expected.max, expected.num, expected.sum,
+           expected.sum_squares])
+
   def test_Tensorboard_histogram_summaries_with_generator(self):
     np.random.seed(1337)
     tmpdir = self.get_temp_dir()
@@ -24,6 +24,7 @@ import numpy as np
 
 from tensorflow.python.keras import backend as K
 from tensorflow.python.keras.datasets.cifar import load_batch
+from tensorflow.python.keras.utils.data_utils import _load_npy_cache
 from tensorflow.python.keras.utils.data_utils import get_file
 from tensorflow.python.util.tf_export import tf_export
 
@@ -34,23 +35,33 @@ def load_data():
 
   Returns:
       Tuple of Numpy arrays: `(x_train, y_train), (x_test, y_test)`.
+      The batches are unpickled once, and later calls memory-map the arrays
+      from a `.npy` cache.
   """
   dirname = 'cifar-10-batches-py'
-  origin = 'https://www.cs.toronto.edu/~kriz/cifar-10-python.tar.gz'
-  path = get_file(dirname, origin=origin, untar=True)
 
-  num_train_samples = 50000
+  def parse_batches():
+    origin = 'https://www.cs.toronto.edu/~kriz/cifar-10-python.tar.gz'
+    path = get_file(dirname, origin=origin, untar=True)
 
-  x_train = np.empty((num_train_samples, 3, 32, 32), dtype='uint8')
-  y_train = np.empty((num_train_samples,), dtype='uint8')
+    num_train_samples = 50000
 
-  for i in range(1, 6):
-    fpath = os.path.join(path, 'data_batch_' + str(i))
-    (x_train[(i - 1) * 10000:i * 10000, :, :, :],
-     y_train[(i - 1) * 10000:i * 10000]) = load_batch(fpath)
+    x_train = np.empty((num_train_samples, 3, 32, 32), dtype='uint8')
+    y_train = np.empty((num_train_samples,), dtype='uint8')
 
-  fpath = os.path.join(path, 'test_batch')
-  x_test, y_test = load_batch(fpath)
+    for i in range(1, 6):
+      fpath = os.path.join(path, 'data_batch_' + str(i))
+      (x_train[(i - 1) * 10000:i * 10000, :, :, :],
+       y_train[(i - 1) * 10000:i * 10000]) = load_batch(fpath)
+
+    fpath = os.path.join(path, 'test_batch')
+    x_test, y_test = load_batch(fpath)
+    return {'x_train': x_train, 'y_train': y_train,
+            'x_test': x_test, 'y_test': np.array(y_test)}
+
+  arrays = _load_npy_cache(dirname, parse_batches)
+  x_train, y_train = arrays['x_train'], arrays['y_train']
+  x_test, y_test = arrays['x_test'], arrays['y_test']
 
   y_train = np.reshape(y_train, (len(y_train), 1))
   y_test = np.reshape(y_test, (len(y_test), 1))
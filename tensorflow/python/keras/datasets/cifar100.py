@@ -24,6 +24,7 @@ import numpy as np
 
 from tensorflow.python.keras import backend as K
 from tensorflow.python.keras.datasets.cifar import load_batch
+from tensorflow.python.keras.utils.data_utils import _load_npy_cache
 from tensorflow.python.keras.utils.data_utils import get_file
 from tensorflow.python.util.tf_export import tf_export
 
@@ -37,6 +38,8 @@ def load_data(label_mode='fine'):
 
   Returns:
       Tuple of Numpy arrays: `(x_train, y_train), (x_test, y_test)`.
+      The data is unpickled once per `label_mode`, and later calls
+      memory-map the arrays from a `.npy` cache.
 
   Raises:
       ValueError: in case of invalid `label_mode`.
@@ -45,14 +48,22 @@ def load_data(label_mode='fine'):
     raise ValueError('`label_mode` must be one of `"fine"`, `"coarse"`.')
 
   dirname = 'cifar-100-python'
-  origin = 'https://www.cs.toronto.edu/~kriz/cifar-100-python.tar.gz'
-  path = get_file(dirname, origin=origin, untar=True)
 
-  fpath = os.path.join(path, 'train')
-  x_train, y_train = load_batch(fpath, label_key=label_mode + '_labels')
+  def parse_batches():
+    origin = 'https://www.cs.toronto.edu/~kriz/cifar-100-python.tar.gz'
+    path = get_file(dirname, origin=origin, untar=True)
 
-  fpath = os.path.join(path, 'test')
-  x_test, y_test = load_batch(fpath, label_key=label_mode + '_labels')
+    fpath = os.path.join(path, 'train')
+    x_train, y_train = load_batch(fpath, label_key=label_mode + '_labels')
+
+    fpath = os.path.join(path, 'test')
+    x_test, y_test = load_batch(fpath, label_key=label_mode + '_labels')
+    return {'x_train': x_train, 'y_train': np.array(y_train),
+            'x_test': x_test, 'y_test': np.array(y_test)}
+
+  arrays = _load_npy_cache(dirname + '-' + label_mode, parse_batches)
+  x_train, y_train = arrays['x_train'], arrays['y_train']
+  x_test, y_test = arrays['x_test'], arrays['y_test']
 
   y_train = np.reshape(y_train, (len(y_train), 1))
   y_test = np.reshape(y_test, (len(y_test), 1))
@@ -23,6 +23,7 @@ import os
 
 import numpy as np
 
+from tensorflow.python.keras.utils.data_utils import _load_npy_cache
 from tensorflow.python.keras.utils.data_utils import get_file
 from tensorflow.python.util.tf_export import tf_export
 
@@ -32,7 +33,8 @@ def load_data():
   """Loads the Fashion-MNIST dataset.
 
   Returns:
-      Tuple of Numpy arrays: `(x_train, y_train), (x_test, y_test)`.
+      Tuple of Numpy arrays: `(x_train, y_train), (x_test, y_test)`,
+      memory-mapped from a `.npy` copy of the dataset made on the first call.
 
   License:
       The copyright for Fashion-MNIST is held by Zalando SE.
@@ -41,28 +43,37 @@ def load_data():
 
   """
   dirname = os.path.join('datasets', 'fashion-mnist')
-  base = 'https://storage.googleapis.com/tensorflow/tf-keras-datasets/'
-  files = [
-      'train-labels-idx1-ubyte.gz', 'train-images-idx3-ubyte.gz',
-      't10k-labels-idx1-ubyte.gz', 't10k-images-idx3-ubyte.gz'
-  ]
 
-  paths = []
-  for fname in files:
-    paths.append(get_file(fname, origin=base + fname, cache_subdir=dirname))
+  def parse_files():
+    base = 'https://storage.googleapis.com/tensorflow/tf-keras-datasets/'
+    files = [
+        'train-labels-idx1-ubyte.gz', 'train-images-idx3-ubyte.gz',
+        't10k-labels-idx1-ubyte.gz', 't10k-images-idx3-ubyte.gz'
+    ]
 
-  with gzip.open(paths[0], 'rb') as lbpath:
-    y_train = np.frombuffer(lbpath.read(), np.uint8, offset=8)
+    paths = []
+    for fname in files:
+      paths.append(get_file(fname, origin=base + fname, cache_subdir=dirname))
 
-  with gzip.open(paths[1], 'rb') as imgpath:
-    x_train = np.frombuffer(
-        imgpath.read(), np.uint8, offset=16).reshape(len(y_train), 28, 28)
+    with gzip.open(paths[0], 'rb') as lbpath:
+      y_train = np.frombuffer(lbpath.read(), np.uint8, offset=8)
 
-  with gzip.open(paths[2], 'rb') as lbpath:
-    y_test = np.frombuffer(lbpath.read(), np.uint8, offset=8)
+    with gzip.open(paths[1], 'rb') as imgpath:
+      x_train = np.frombuffer(
+          imgpath.read(), np.uint8, offset=16).reshape(len(y_train), 28, 28)
 
-  with gzip.open(paths[3], 'rb') as imgpath:
-    x_test = np.frombuffer(
-        imgpath.read(), np.uint8, offset=16).reshape(len(y_test), 28, 28)
+    with gzip.open(paths[2], 'rb') as lbpath:
+      y_test = np.frombuffer(lbpath.read(), np.uint8, offset=8)
+
+    with gzip.open(paths[3], 'rb') as imgpath:
+      x_test = np.frombuffer(
+          imgpath.read(), np.uint8, offset=16).reshape(len(y_test), 28, 28)
+
+    return {'x_train': x_train, 'y_train': y_train,
+            'x_test': x_test, 'y_test': y_test}
+
+  arrays = _load_npy_cache('fashion-mnist', parse_files, cache_subdir=dirname)
+  x_train, y_train = arrays['x_train'], arrays['y_train']
+  x_test, y_test = arrays['x_test'], arrays['y_test']
 
   return (x_train, y_train), (x_test, y_test)
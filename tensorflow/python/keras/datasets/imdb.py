@@ -22,7 +22,9 @@ import json
 
 import numpy as np
 
-from tensorflow.python.keras.preprocessing.sequence import _remove_long_seq
+from tensorflow.python.keras.preprocessing.sequence import _index_sequences
+from tensorflow.python.keras.preprocessing.sequence import _pack_sequences
+from tensorflow.python.keras.utils.data_utils import _load_npy_cache
 from tensorflow.python.keras.utils.data_utils import get_file
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util.tf_export import tf_export
@@ -77,54 +79,50 @@ def load_data(path='imdb.npz',
   if kwargs:
     raise TypeError('Unrecognized keyword arguments: ' + str(kwargs))
 
-  origin_folder = 'https://storage.googleapis.com/tensorflow/tf-keras-datasets/'
-  path = get_file(
-      path,
-      origin=origin_folder + 'imdb.npz',
-      file_hash='599dadb1135973df5b59232a0e9a887c')
-  with np.load(path) as f:
-    x_train, labels_train = f['x_train'], f['y_train']
-    x_test, labels_test = f['x_test'], f['y_test']
+  def parse_npz():
+    origin_folder = (
+        'https://storage.googleapis.com/tensorflow/tf-keras-datasets/')
+    npz_path = get_file(
+        path,
+        origin=origin_folder + 'imdb.npz',
+        file_hash='599dadb1135973df5b59232a0e9a887c')
+    with np.load(npz_path) as f:
+      arrays = {'y_train': f['y_train'], 'y_test': f['y_test']}
+      (arrays['x_train_values'],
+       arrays['x_train_lengths']) = _pack_sequences(f['x_train'])
+      (arrays['x_test_values'],
+       arrays['x_test_lengths']) = _pack_sequences(f['x_test'])
+    return arrays
+
+  arrays = _load_npy_cache(path, parse_npz)
+  labels_train, labels_test = arrays['y_train'], arrays['y_test']
 
   np.random.seed(seed)
-  indices = np.arange(len(x_train))
-  np.random.shuffle(indices)
-  x_train = x_train[indices]
-  labels_train = labels_train[indices]
-
-  indices = np.arange(len(x_test))
-  np.random.shuffle(indices)
-  x_test = x_test[indices]
-  labels_test = labels_test[indices]
-
-  xs = np.concatenate([x_train, x_test])
-  labels = np.concatenate([labels_train, labels_test])
-
-  if start_char is not None:
-    xs = [[start_char] + [w + index_from for w in x] for x in xs]
-  elif index_from:
-    xs = [[w + index_from for w in x] for x in xs]
-
-  if maxlen:
-    xs, labels = _remove_long_seq(maxlen, xs, labels)
-    if not xs:
-      raise ValueError('After filtering for sequences shorter than maxlen=' +
-                       str(maxlen) + ', no sequence was kept. '
-                       'Increase maxlen.')
-  if not num_words:
-    num_words = max([max(x) for x in xs])
-
-  # by convention, use 2 as OOV word
-  # reserve 'index_from' (=3 by default) characters:
-  # 0 (padding), 1 (start), 2 (OOV)
-  if oov_char is not None:
-    xs = [
-        [w if (skip_top <= w < num_words) else oov_char for w in x] for x in xs
-    ]
-  else:
-    xs = [[w for w in x if skip_top <= w < num_words] for x in xs]
-
-  idx = len(x_train)
+  indices_train = np.arange(len(labels_train))
+  np.random.shuffle(indices_train)
+  indices_test = np.arange(len(labels_test))
+  np.random.shuffle(indices_test)
+
+  labels = np.concatenate(
+      [labels_train[indices_train], labels_test[indices_test]])
+  xs, kept = _index_sequences(
+      np.concatenate([arrays['x_train_values'], arrays['x_test_values']]),
+      np.concatenate([arrays['x_train_lengths'], arrays['x_test_lengths']]),
+      order=np.concatenate(
+          [indices_train, len(labels_train) + indices_test]),
+      num_words=num_words,
+      skip_top=skip_top,
+      maxlen=maxlen,
+      start_char=start_char,
+      oov_char=oov_char,
+      index_from=index_from)
+  labels = labels[kept]
+  if maxlen and not xs:
+    raise ValueError('After filtering for sequences shorter than maxlen=' +
+                     str(maxlen) + ', no sequence was kept. '
+                     'Increase maxlen.')
+
+  idx = len(labels_train)
   x_train, y_train = np.array(xs[:idx]), np.array(labels[:idx])
   x_test, y_test = np.array(xs[idx:]), np.array(labels[idx:])
 
@@ -20,6 +20,7 @@ from __future__ import print_function
 
 import numpy as np
 
+from tensorflow.python.keras.utils.data_utils import _load_npy_cache
 from tensorflow.python.keras.utils.data_utils import get_file
 from tensorflow.python.util.tf_export import tf_export
 
@@ -34,6 +35,8 @@ def load_data(path='mnist.npz'):
 
   Returns:
       Tuple of Numpy arrays: `(x_train, y_train), (x_test, y_test)`.
+      The arrays are memory-mapped from a copy of the dataset cached in
+      the `.npy` format.
 
   License:
       Yann LeCun and Corinna Cortes hold the copyright of MNIST dataset,
@@ -42,13 +45,19 @@ def load_data(path='mnist.npz'):
       [Creative Commons Attribution-Share Alike 3.0 license.](
       https://creativecommons.org/licenses/by-sa/3.0/)
   """
-  origin_folder = 'https://storage.googleapis.com/tensorflow/tf-keras-datasets/'
-  path = get_file(
-      path,
-      origin=origin_folder + 'mnist.npz',
-      file_hash='8a61469f7ea1b51cbae51d4f78837e45')
-  with np.load(path) as f:
-    x_train, y_train = f['x_train'], f['y_train']
-    x_test, y_test = f['x_test'], f['y_test']
-
-    return (x_train, y_train), (x_test, y_test)
+
+  def parse_npz():
+    origin_folder = (
+        'https://storage.googleapis.com/tensorflow/tf-keras-datasets/')
+    npz_path = get_file(
+        path,
+        origin=origin_folder + 'mnist.npz',
+        file_hash='8a61469f7ea1b51cbae51d4f78837e45')
+    with np.load(npz_path) as f:
+      return dict(f.items())
+
+  arrays = _load_npy_cache(path, parse_npz)
+  x_train, y_train = arrays['x_train'], arrays['y_train']
+  x_test, y_test = arrays['x_test'], arrays['y_test']
+
+  return (x_train, y_train), (x_test, y_test)
@@ -22,7 +22,9 @@ import json
 
 import numpy as np
 
-from tensorflow.python.keras.preprocessing.sequence import _remove_long_seq
+from tensorflow.python.keras.preprocessing.sequence import _index_sequences
+from tensorflow.python.keras.preprocessing.sequence import _pack_sequences
+from tensorflow.python.keras.utils.data_utils import _load_npy_cache
 from tensorflow.python.keras.utils.data_utils import get_file
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util.tf_export import tf_export
@@ -75,38 +77,36 @@ def load_data(path='reuters.npz',
   if kwargs:
     raise TypeError('Unrecognized keyword arguments: ' + str(kwargs))
 
-  origin_folder = 'https://storage.googleapis.com/tensorflow/tf-keras-datasets/'
-  path = get_file(
-      path,
-      origin=origin_folder + 'reuters.npz',
-      file_hash='87aedbeb0cb229e378797a632c1997b6')
-  with np.load(path) as f:
-    xs, labels = f['x'], f['y']
+  def parse_npz():
+    origin_folder = (
+        'https://storage.googleapis.com/tensorflow/tf-keras-datasets/')
+    npz_path = get_file(
+        path,
+        origin=origin_folder + 'reuters.npz',
+        file_hash='87aedbeb0cb229e378797a632c1997b6')
+    with np.load(npz_path) as f:
+      arrays = {'y': f['y']}
+      arrays['x_values'], arrays['x_lengths'] = _pack_sequences(f['x'])
+    return arrays
+
+  arrays = _load_npy_cache(path, parse_npz)
 
   np.random.seed(seed)
-  indices = np.arange(len(xs))
+  indices = np.arange(len(arrays['y']))
   np.random.shuffle(indices)
-  xs = xs[indices]
-  labels = labels[indices]
-
-  if start_char is not None:
-    xs = [[start_char] + [w + index_from for w in x] for x in xs]
-  elif index_from:
-    xs = [[w + index_from for w in x] for x in xs]
-
-  if maxlen:
-    xs, labels = _remove_long_seq(maxlen, xs, labels)
-
-  if not num_words:
-    num_words = max([max(x) for x in xs])
-
-  # by convention, use 2 as OOV word
-  # reserve 'index_from' (=3 by default) characters:
-  # 0 (padding), 1 (start), 2 (OOV)
-  if oov_char is not None:
-    xs = [[w if skip_top <= w < num_words else oov_char for w in x] for x in xs]
-  else:
-    xs = [[w for w in x if skip_top <= w < num_words] for x in xs]
+  labels = arrays['y'][indices]
+
+  xs, kept = _index_sequences(
+      arrays['x_values'],
+      arrays['x_lengths'],
+      order=indices,
+      num_words=num_words,
+      skip_top=skip_top,
+      maxlen=maxlen,
+      start_char=start_char,
+      oov_char=oov_char,
+      index_from=index_from)
+  labels = labels[kept]
 
   idx = int(len(xs) * (1 - test_split))
   x_train, y_train = np.array(xs[:idx]), np.array(labels[:idx])
@@ -1277,7 +1277,8 @@ class Network(base_layer.Layer):
     from tensorflow.python.keras.models import save_model  # pylint: disable=g-import-not-at-top
     save_model(self, filepath, overwrite, include_optimizer)
 
-  def save_weights(self, filepath, overwrite=True, save_format=None):
+  def save_weights(self, filepath, overwrite=True, save_format=None,
+                   num_shards=1):
     """Saves all layer weights.
 
     Either saves in HDF5 or in TensorFlow format based on the `save_format`
@@ -1313,6 +1314,10 @@ class Network(base_layer.Layer):
         save_format: Either 'tf' or 'h5'. A `filepath` ending in '.h5' or
             '.keras' will default to HDF5 if `save_format` is `None`. Otherwise
             `None` defaults to 'tf'.
+        num_shards: When saving in HDF5 format, the number of files to split
+            the layer weights across. The shards are written next to
+            `filepath`, which links to them, and must be kept in the same
+            directory.
 
     Raises:
         ImportError: If h5py is not available when attempting to save in HDF5
@@ -1356,7 +1361,7 @@ class Network(base_layer.Layer):
         return
     if save_format == 'h5':
       with h5py.File(filepath, 'w') as f:
-        saving.save_weights_to_hdf5_group(f, self.layers)
+        saving.save_weights_to_hdf5_group(f, self.layers, num_shards)
     else:
       if context.executing_eagerly():
         session = None
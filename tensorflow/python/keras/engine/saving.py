@@ -21,8 +21,12 @@ from __future__ import print_function
 
 import json
 import os
+import sys
+import threading
 
 import numpy as np
+import six
+from six.moves import queue
 from six.moves import zip  # pylint: disable=redefined-builtin
 
 from tensorflow.python.keras import backend as K
@@ -46,6 +50,10 @@ except ImportError:
   yaml = None
 # pylint: enable=g-import-not-at-top
 
+# Weight values are assigned to the model in batches of at most this many
+# bytes, so that loading a model never holds all of its weights in memory.
+_MAX_ASSIGN_BATCH_BYTES = 256 * 1024 * 1024
+
 
 @tf_export('keras.models.save_model')
 def save_model(model, filepath, overwrite=True, include_optimizer=True):
@@ -73,10 +81,37 @@ def save_model(model, filepath, overwrite=True, include_optimizer=True):
   Raises:
       ImportError: if h5py is not available.
   """
+  _save_model(model, filepath, overwrite, include_optimizer)
+
+
+def _save_model(model,
+                filepath,
+                overwrite=True,
+                include_optimizer=True,
+                weight_values=None,
+                configs=None):
+  """Implements `save_model`, optionally from a snapshot of the model.
+
+  Arguments:
+      model: Keras model instance to be saved.
+      filepath: String path or `h5py.File` object, see `save_model`.
+      overwrite: see `save_model`.
+      include_optimizer: see `save_model`.
+      weight_values: Optional snapshot of the weight values, as returned by
+          `snapshot_weights`, to save instead of the current values.
+      configs: Optional snapshot of the model and training configs, as
+          returned by `snapshot_configs`, to save instead of the current ones.
 
+  Raises:
+      ImportError: if h5py is not available.
+  """
   if h5py is None:
     raise ImportError('`save_model` requires h5py.')
 
+  if configs is None:
+    configs = snapshot_configs(model, include_optimizer)
+  model_config, training_config = configs
+
   from tensorflow.python.keras import __version__ as keras_version  # pylint: disable=g-import-not-at-top
 
   if not isinstance(filepath, h5py.File):
@@ -96,15 +131,12 @@ def save_model(model, filepath, overwrite=True, include_optimizer=True):
     f.attrs['keras_version'] = str(keras_version).encode('utf8')
     f.attrs['backend'] = K.backend().encode('utf8')
     f.attrs['model_config'] = json.dumps(
-        {
-            'class_name': model.__class__.__name__,
-            'config': model.get_config()
-        },
-        default=serialization.get_json_type).encode('utf8')
+        model_config, default=serialization.get_json_type).encode('utf8')
 
     model_weights_group = f.create_group('model_weights')
     model_layers = model.layers
-    save_weights_to_hdf5_group(model_weights_group, model_layers)
+    save_weights_to_hdf5_group(
+        model_weights_group, model_layers, weight_values=weight_values)
 
     if include_optimizer and model.optimizer:
       if isinstance(model.optimizer, optimizers.TFOptimizer):
@@ -120,29 +152,21 @@ def save_model(model, filepath, overwrite=True, include_optimizer=True):
             '(see keras.io/optimizers).')
       else:
         f.attrs['training_config'] = json.dumps(
-            {
-                'optimizer_config': {
-                    'class_name': model.optimizer.__class__.__name__,
-                    'config': model.optimizer.get_config()
-                },
-                'loss': model.loss,
-                'metrics': model.metrics,
-                'sample_weight_mode': model.sample_weight_mode,
-                'loss_weights': model.loss_weights,
-            },
+            training_config,
             default=serialization.get_json_type).encode('utf8')
 
         # Save optimizer weights.
         symbolic_weights = getattr(model.optimizer, 'weights')
         if symbolic_weights:
           optimizer_weights_group = f.create_group('optimizer_weights')
-          weight_values = K.batch_get_value(symbolic_weights)
+          optimizer_weight_values = _get_weight_values(symbolic_weights,
+                                                       weight_values)
           weight_names = []
-          for w, val in zip(symbolic_weights, weight_values):
+          for w in symbolic_weights:
             name = str(w.name)
             weight_names.append(name.encode('utf8'))
           optimizer_weights_group.attrs['weight_names'] = weight_names
-          for name, val in zip(weight_names, weight_values):
+          for name, val in zip(weight_names, optimizer_weight_values):
             param_dset = optimizer_weights_group.create_dataset(
                 name, val.shape, dtype=val.dtype)
             if not val.shape:
@@ -704,12 +728,88 @@ def _convert_rnn_weights(layer, weights):
   return weights
 
 
-def save_weights_to_hdf5_group(f, layers):
+def snapshot_weights(model, include_optimizer=True):
+  """Copies the current values of the weights of a model to host memory.
+
+  The snapshot can then be written out with `save_weights_to_hdf5_group` or
+  `_save_model` (e.g. from another thread) while the model keeps training.
+
+  Arguments:
+      model: Keras model instance.
+      include_optimizer: Whether to also snapshot the optimizer's weights.
+
+  Returns:
+      A dict mapping the `id` of each weight to its value.
+  """
+  weights = list(model.weights)
+  if (include_optimizer and getattr(model, 'optimizer', None) and
+      not isinstance(model.optimizer, optimizers.TFOptimizer)):
+    weights += getattr(model.optimizer, 'weights')
+  return dict(zip([id(w) for w in weights], K.batch_get_value(weights)))
+
+
+def snapshot_configs(model, include_optimizer=True):
+  """Gets the model config and training config of a model.
+
+  Getting the optimizer config reads the current values of its
+  hyperparameters (e.g. the learning rate), so, like `snapshot_weights`, this
+  should be called from the thread that trains the model before handing the
+  result to `_save_model` on another thread.
+
+  Arguments:
+      model: Keras model instance.
+      include_optimizer: Whether to also get the training config.
+
+  Returns:
+      A tuple `(model_config, training_config)`. `training_config` is `None`
+      if the optimizer is not included, or is a TensorFlow optimizer.
+  """
+  model_config = {
+      'class_name': model.__class__.__name__,
+      'config': model.get_config()
+  }
+  training_config = None
+  if (include_optimizer and getattr(model, 'optimizer', None) and
+      not isinstance(model.optimizer, optimizers.TFOptimizer)):
+    training_config = {
+        'optimizer_config': {
+            'class_name': model.optimizer.__class__.__name__,
+            'config': model.optimizer.get_config()
+        },
+        'loss': model.loss,
+        'metrics': model.metrics,
+        'sample_weight_mode': model.sample_weight_mode,
+        'loss_weights': model.loss_weights,
+    }
+  return model_config, training_config
+
+
+def _get_weight_values(weights, weight_values=None):
+  """Reads `weights`, or looks them up in a `snapshot_weights` snapshot."""
+  if weight_values is None:
+    return K.batch_get_value(weights)
+  return [weight_values[id(w)] for w in weights]
+
+
+def _get_shard_filename(filename, shard_index, num_shards):
+  root, ext = os.path.splitext(filename)
+  return '%s-%05d-of-%05d%s' % (root, shard_index, num_shards, ext)
+
+
+def save_weights_to_hdf5_group(f, layers, num_shards=1, weight_values=None):
   """Saves the weights of a list of layers to a HDF5 group.
 
+  With `num_shards > 1`, the layer groups are written to `num_shards` files
+  next to the file of `f`, named `<name>-<index>-of-<num_shards><ext>` and
+  balanced by size, and `f` holds external links to them. Reading `f` is
+  unchanged, as long as the shard files stay in the same directory.
+
   Arguments:
       f: HDF5 group.
       layers: List of layer instances.
+      num_shards: Number of files to split the weights across.
+      weight_values: Optional snapshot of the weight values, as returned by
+          `snapshot_weights`, to save instead of the current values.
   """
   from tensorflow.python.keras import __version__ as keras_version  # pylint: disable=g-import-not-at-top
 
@@ -718,30 +818,61 @@ def save_weights_to_hdf5_group(f, layers):
   f.attrs['backend'] = K.backend().encode('utf8')
   f.attrs['keras_version'] = str(keras_version).encode('utf8')
 
-  for layer in layers:
+  shards = []
+  shard_bytes = []
+  try:
+    if num_shards > 1:
+      for i in range(num_shards):
+        shards.append(
+            h5py.File(_get_shard_filename(f.file.filename, i, num_shards), 'w'))
+        shard_bytes.append(0)
+    for layer in layers:
+      _save_layer_weights_to_hdf5_group(f, layer, shards, shard_bytes,
+                                        weight_values)
+  finally:
+    for shard in shards:
+      shard.close()
+
+
+def _save_layer_weights_to_hdf5_group(f, layer, shards, shard_bytes,
+                                      weight_values=None):
+  """Saves the weights of `layer` to `f`, or to the smallest of `shards`."""
+  if shards:
+    shard_index = shard_bytes.index(min(shard_bytes))
+    shard = shards[shard_index]
+    g = shard.create_group(layer.name)
+    f[layer.name] = h5py.ExternalLink(
+        os.path.basename(shard.filename), g.name)
+  else:
     g = f.create_group(layer.name)
-    symbolic_weights = layer.weights
-    weight_values = K.batch_get_value(symbolic_weights)
-    weight_names = []
-    for i, (w, val) in enumerate(zip(symbolic_weights, weight_values)):
-      if hasattr(w, 'name') and w.name:
-        name = str(w.name)
-      else:
-        name = 'param_' + str(i)
-      weight_names.append(name.encode('utf8'))
-    save_attributes_to_hdf5_group(g, 'weight_names', weight_names)
-    for name, val in zip(weight_names, weight_values):
-      param_dset = g.create_dataset(name, val.shape, dtype=val.dtype)
-      if not val.shape:
-        # scalar
-        param_dset[()] = val
-      else:
-        param_dset[:] = val
+  symbolic_weights = layer.weights
+  weight_values = _get_weight_values(symbolic_weights, weight_values)
+  weight_names = []
+  for i, w in enumerate(symbolic_weights):
+    if hasattr(w, 'name') and w.name:
+      name = str(w.name)
+    else:
+      name = 'param_' + str(i)
+    weight_names.append(name.encode('utf8'))
+  save_attributes_to_hdf5_group(g, 'weight_names', weight_names)
+  if shards:
+    shard_bytes[shard_index] += sum(val.nbytes for val in weight_values)
+  for name, val in zip(weight_names, weight_values):
+    param_dset = g.create_dataset(name, val.shape, dtype=val.dtype)
+    if not val.shape:
+      # scalar
+      param_dset[()] = val
+    else:
+      param_dset[:] = val
 
 
 def load_weights_from_hdf5_group(f, layers):
   """Implements topological (order-based) weight loading.
 
+  Layers are read one at a time, ahead of their assignment, and assigned in
+  batches of bounded size, so an error on a layer may leave the previous
+  layers loaded.
+
   Arguments:
       f: A pointer to a HDF5 group.
       layers: a list of target layers.
@@ -779,13 +910,14 @@ def load_weights_from_hdf5_group(f, layers):
                      ' layers into a model with ' + str(len(filtered_layers)) +
                      ' layers.')
 
-  # We batch weight value assignments in a single backend call
-  # which provides a speedup in TensorFlow.
+  # We batch weight value assignments in backend calls of bounded size
+  # which provides a speedup in TensorFlow, and read the weights of the next
+  # layers from the file while assigning the previous ones.
   weight_value_tuples = []
-  for k, name in enumerate(layer_names):
-    g = f[name]
-    weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
-    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
+  weight_value_bytes = 0
+  for k, weight_values in enumerate(
+      _prefetch(_read_layer_weights(f, name) for name in layer_names)):
+    name = layer_names[k]
     layer = filtered_layers[k]
     symbolic_weights = layer.weights
     weight_values = preprocess_weights_for_loading(
@@ -799,9 +931,72 @@ def load_weights_from_hdf5_group(f, layers):
                        ' weights, but the saved weights have ' +
                        str(len(weight_values)) + ' elements.')
     weight_value_tuples += zip(symbolic_weights, weight_values)
+    weight_value_bytes += sum(np.asarray(v).nbytes for v in weight_values)
+    if weight_value_bytes >= _MAX_ASSIGN_BATCH_BYTES:
+      K.batch_set_value(weight_value_tuples)
+      weight_value_tuples = []
+      weight_value_bytes = 0
   K.batch_set_value(weight_value_tuples)
 
 
+def _read_layer_weights(f, name):
+  """Reads the weight values of the layer group `name` of `f`."""
+  g = f[name]
+  weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
+  return [np.asarray(g[weight_name]) for weight_name in weight_names]
+
+
+def _prefetch(iterator, buffer_size=2):
+  """Runs `iterator` on a background thread, up to `buffer_size` items ahead.
+
+  Arguments:
+      iterator: An iterator, e.g. reading from a file.
+      buffer_size: Maximum number of items read ahead of the consumer.
+
+  Yields:
+      The items of `iterator`, in order. Exceptions raised by `iterator` are
+      re-raised in the consumer.
+  """
+  items = queue.Queue(buffer_size)
+  stop_event = threading.Event()
+  end = object()
+
+  def put(item):
+    while not stop_event.is_set():
+      try:
+        items.put(item, timeout=0.1)
+        return True
+      except queue.Full:
+        pass
+    return False
+
+  def produce():
+    try:
+      for item in iterator:
+        if not put((True, item)):
+          return
+    except Exception:  # pylint: disable=broad-except
+      put((False, sys.exc_info()))
+      return
+    put((True, end))
+
+  thread = threading.Thread(target=produce)
+  thread.daemon = True
+  thread.start()
+  try:
+    while True:
+      success, item = items.get()
+      if not success:
+        six.reraise(*item)
+      if item is end:
+        return
+      yield item
+  finally:
+    # Stop reading (e.g. if the consumer raised) before the file is closed.
+    stop_event.set()
+    thread.join()
+
+
 def load_weights_from_hdf5_group_by_name(f, layers):
   """Implements name-based weight loading.
 
@@ -248,6 +248,38 @@ class TestWeightSavingAndLoading(test.TestCase, parameterized.TestCase):
 
       self.assertAllClose(y, ref_y)
 
+  def test_sharded_weight_loading(self):
+    if h5py is None:
+      return
+
+    temp_dir = self.get_temp_dir()
+    self.addCleanup(shutil.rmtree, temp_dir)
+    h5_path = os.path.join(temp_dir, 'test.h5')
+
+    with self.test_session():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(5, input_dim=3))
+      model.add(keras.layers.Dense(4))
+      model.add(keras.layers.Dense(2))
+
+      x = np.random.random((5, 3))
+      ref_y = model.predict(x)
+
+      model.save_weights(h5_path, num_shards=2)
+      self.assertTrue(
+          os.path.exists(os.path.join(temp_dir, 'test-00000-of-00002.h5')))
+      self.assertTrue(
+          os.path.exists(os.path.join(temp_dir, 'test-00001-of-00002.h5')))
+
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(5, input_dim=3))
+      model.add(keras.layers.Dense(4))
+      model.add(keras.layers.Dense(2))
+      model.load_weights(h5_path)
+      y = model.predict(x)
+
+      self.assertAllClose(y, ref_y)
+
   def test_sequential_weight_loading_group_name_with_incorrect_length(self):
     if h5py is None:
       return
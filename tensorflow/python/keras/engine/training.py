@@ -125,6 +125,7 @@ class Model(Network):
               sample_weight_mode=None,
               weighted_metrics=None,
               target_tensors=None,
+              use_defun=False,
               **kwargs):
     """Configures the model for training.
 
@@ -168,6 +169,11 @@ class Model(Network):
             can specify them via the `target_tensors` argument. It can be
             a single tensor (for a single-output model), a list of tensors,
             or a dict mapping output names to target tensors.
+        use_defun: Only used in Eager mode. If True, the per-batch steps of
+            `fit`, `evaluate`, `predict` and the `*_on_batch` methods are
+            traced into graph functions with `tfe.defun` instead of being
+            executed op by op. A new graph is only traced when a batch with a
+            new input signature (shapes and dtypes) is seen.
         **kwargs: These arguments are passed to `tf.Session.run`.
 
     Raises:
@@ -197,6 +203,10 @@ class Model(Network):
     if context.executing_eagerly() and target_tensors is not None:
       raise ValueError('target_tensors is not supported in Eager mode.')
     self.target_tensors = target_tensors
+    self._use_defun = use_defun
+    # Traced step functions depend on the optimizer, losses and metrics, so
+    # they are dropped on every call to `compile`.
+    self._step_functions = {}
 
     if not self.built:
       # Model is not compilable because it does not know its number of inputs
@@ -838,7 +848,8 @@ class Model(Network):
                      loss=self.loss,
                      metrics=self.metrics,
                      loss_weights=self.loss_weights,
-                     target_tensors=target_tensors)
+                     target_tensors=target_tensors,
+                     use_defun=self._use_defun)
 
     # In graph mode, if we had just set inputs and targets as symbolic tensors
     # by invoking build and compile on the model respectively, we do not have to
@@ -1205,6 +1216,9 @@ class Model(Network):
             before each epoch) or str (for 'batch').
             'batch' is a special option for dealing with the
             limitations of HDF5 data; it shuffles in batch-sized chunks.
+            Since each batch is then a contiguous range of samples, it is
+            sliced without being copied, which also makes 'batch' the
+            cheapest option for large or memory-mapped NumPy arrays.
             Has no effect when `steps_per_epoch` is not `None`.
         class_weight: Optional dictionary mapping class indices (integers)
             to a weight (float) value, used for weighting the loss function
@@ -1445,7 +1459,7 @@ class Model(Network):
           self, inputs=x, targets=y, sample_weights=sample_weights,
           batch_size=batch_size, verbose=verbose, steps=steps)
 
-  def predict(self, x, batch_size=None, verbose=0, steps=None):
+  def predict(self, x, batch_size=None, verbose=0, steps=None, out=None):
     """Generates output predictions for the input samples.
 
     Computation is done in batches.
@@ -1467,9 +1481,15 @@ class Model(Network):
         steps: Total number of steps (batches of samples)
             before declaring the prediction round finished.
             Ignored with the default value of `None`.
+        out: Optional Numpy array (or list of arrays, one per output)
+            with room for all the predictions. Each batch of predictions is
+            written into it as soon as it is computed, instead of being
+            accumulated in memory. Passing `np.memmap` arrays keeps peak
+            memory proportional to one batch.
 
     Returns:
-        Numpy array(s) of predictions.
+        Numpy array(s) of predictions. If `out` is given, these are
+        views of the part of `out` that was written.
 
     Raises:
         ValueError: In case of mismatch between the provided
@@ -1487,10 +1507,12 @@ class Model(Network):
 
     if context.executing_eagerly():
       return training_eager.predict_loop(
-          self, x, batch_size=batch_size, verbose=verbose, steps=steps)
+          self, x, batch_size=batch_size, verbose=verbose, steps=steps,
+          out=out)
     else:
       return training_arrays.predict_loop(
-          self, x, batch_size=batch_size, verbose=verbose, steps=steps)
+          self, x, batch_size=batch_size, verbose=verbose, steps=steps,
+          out=out)
 
   def train_on_batch(self, x, y=None, sample_weight=None, class_weight=None):
     """Runs a single gradient update on a single batch of data.
@@ -1666,7 +1688,9 @@ class Model(Network):
                     workers=1,
                     use_multiprocessing=False,
                     shuffle=True,
-                    initial_epoch=0):
+                    initial_epoch=0,
+                    shared_buffer_size=None,
+                    sharded=False):
     """Fits the model on data yielded batch-by-batch by a Python generator.
 
     The generator is run in parallel to the model, for efficiency.
@@ -1735,6 +1759,17 @@ class Model(Network):
             Has no effect when `steps_per_epoch` is not `None`.
         initial_epoch: Epoch at which to start training
             (useful for resuming a previous training run)
+        shared_buffer_size: Integer or `None`. Only used with instances of
+            `Sequence` and `use_multiprocessing=True`: size in bytes of the
+            shared-memory buffers into which workers write batches instead of
+            pickling them (see `keras.utils.OrderedEnqueuer`). Batches that
+            do not fit are pickled. If unspecified, every batch is pickled.
+        sharded: Boolean. Only used when `generator` is not a `Sequence`.
+            If `True`, `generator` is a function
+            `generator(worker_index, num_workers)` that every worker calls
+            once to create its own generator, so that workers can produce
+            disjoint shards of the data (see `keras.utils.GeneratorEnqueuer`).
+            With `workers=0`, it is called as `generator(0, 1)`.
 
     Returns:
         A `History` object.
@@ -1776,7 +1811,9 @@ class Model(Network):
         workers=workers,
         use_multiprocessing=use_multiprocessing,
         shuffle=shuffle,
-        initial_epoch=initial_epoch)
+        initial_epoch=initial_epoch,
+        shared_buffer_size=shared_buffer_size,
+        sharded=sharded)
 
   def evaluate_generator(self,
                          generator,
@@ -1784,7 +1821,9 @@ class Model(Network):
                          max_queue_size=10,
                          workers=1,
                          use_multiprocessing=False,
-                         verbose=0):
+                         verbose=0,
+                         shared_buffer_size=None,
+                         sharded=False):
     """Evaluates the model on a data generator.
 
     The generator should return the same kind of data
@@ -1812,6 +1851,17 @@ class Model(Network):
             you should not pass non-picklable arguments to the generator
             as they can't be passed easily to children processes.
         verbose: Verbosity mode, 0 or 1.
+        shared_buffer_size: Integer or `None`. Only used with instances of
+            `Sequence` and `use_multiprocessing=True`: size in bytes of the
+            shared-memory buffers into which workers write batches instead of
+            pickling them (see `keras.utils.OrderedEnqueuer`). Batches that
+            do not fit are pickled. If unspecified, every batch is pickled.
+        sharded: Boolean. Only used when `generator` is not a `Sequence`.
+            If `True`, `generator` is a function
+            `generator(worker_index, num_workers)` that every worker calls
+            once to create its own generator, so that workers can produce
+            disjoint shards of the data (see `keras.utils.GeneratorEnqueuer`).
+            With `workers=0`, it is called as `generator(0, 1)`.
 
     Returns:
         Scalar test loss (if the model has a single output and no metrics)
@@ -1837,7 +1887,9 @@ class Model(Network):
         max_queue_size=max_queue_size,
         workers=workers,
         use_multiprocessing=use_multiprocessing,
-        verbose=verbose)
+        verbose=verbose,
+        shared_buffer_size=shared_buffer_size,
+        sharded=sharded)
 
   def predict_generator(self,
                         generator,
@@ -1845,7 +1897,10 @@ class Model(Network):
                         max_queue_size=10,
                         workers=1,
                         use_multiprocessing=False,
-                        verbose=0):
+                        verbose=0,
+                        out=None,
+                        shared_buffer_size=None,
+                        sharded=False):
     """Generates predictions for the input samples from a data generator.
 
     The generator should return the same kind of data as accepted by
@@ -1872,9 +1927,24 @@ class Model(Network):
             you should not pass non-picklable arguments to the generator
             as they can't be passed easily to children processes.
         verbose: verbosity mode, 0 or 1.
+        out: Optional Numpy array (or list of arrays, one per output)
+            with room for all the predictions, into which each batch of
+            predictions is written as soon as it is computed. See `predict`.
+        shared_buffer_size: Integer or `None`. Only used with instances of
+            `Sequence` and `use_multiprocessing=True`: size in bytes of the
+            shared-memory buffers into which workers write batches instead of
+            pickling them (see `keras.utils.OrderedEnqueuer`). Batches that
+            do not fit are pickled. If unspecified, every batch is pickled.
+        sharded: Boolean. Only used when `generator` is not a `Sequence`.
+            If `True`, `generator` is a function
+            `generator(worker_index, num_workers)` that every worker calls
+            once to create its own generator, so that workers can produce
+            disjoint shards of the data (see `keras.utils.GeneratorEnqueuer`).
+            With `workers=0`, it is called as `generator(0, 1)`.
 
     Returns:
-        Numpy array(s) of predictions.
+        Numpy array(s) of predictions. If `out` is given, these are
+        views of the part of `out` that was written.
 
     Raises:
         ValueError: In case the generator yields data in an invalid format.
@@ -1890,4 +1960,7 @@ class Model(Network):
         max_queue_size=max_queue_size,
         workers=workers,
         use_multiprocessing=use_multiprocessing,
-        verbose=verbose)
+        verbose=verbose,
+        out=out,
+        shared_buffer_size=shared_buffer_size,
+        sharded=sharded)
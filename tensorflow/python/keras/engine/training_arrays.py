@@ -38,6 +38,26 @@ except ImportError:
   issparse = None
 
 
+def _slice_batch(ins, start, stop=None):
+  """Slices a batch out of `ins`, leaving the learning phase flag untouched.
+
+  Arguments:
+      ins: List of input arrays, optionally followed by the learning phase.
+      start: Either an array of sample indices, which are gathered (making a
+          copy of the batch), or the integer start of the range of samples
+          `[start, stop)`, which is sliced (making no copy of NumPy arrays,
+          including memory-mapped ones).
+      stop: Integer end of the range of samples, if `start` is an integer.
+
+  Returns:
+      List of batch arrays.
+  """
+  if ins and isinstance(ins[-1], int):
+    # Do not slice the training phase flag.
+    return slice_arrays(ins[:-1], start, stop) + [ins[-1]]
+  return slice_arrays(ins, start, stop)
+
+
 def fit_loop(model,
              inputs,
              targets,
@@ -245,11 +265,12 @@ def fit_loop(model,
       for batch_index, (batch_start, batch_end) in enumerate(batches):
         batch_ids = index_array[batch_start:batch_end]
         try:
-          if isinstance(ins[-1], int):
-            # Do not slice the training phase flag.
-            ins_batch = slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
+          if shuffle and shuffle != 'batch':
+            ins_batch = _slice_batch(ins, batch_ids)
           else:
-            ins_batch = slice_arrays(ins, batch_ids)
+            # Unshuffled and batch-shuffled batches are ranges of consecutive
+            # samples, which are sliced without copying the data.
+            ins_batch = _slice_batch(ins, batch_ids[0], batch_ids[-1] + 1)
         except TypeError:
           raise TypeError('TypeError while preparing batch. '
                           'If using HDF5 input data, '
@@ -292,7 +313,8 @@ def fit_loop(model,
   return model.history
 
 
-def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
+def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None,
+                 out=None):
   """Abstract method to loop over some data in batches.
 
   Arguments:
@@ -303,11 +325,15 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
       steps: Total number of steps (batches of samples)
           before declaring `_predict_loop` finished.
           Ignored with the default value of `None`.
+      out: Optional array (or list of arrays, one per output) into which
+          predictions are written as they are computed, instead of being
+          accumulated in memory.
 
   Returns:
       Array of predictions (if the model has a single output)
       or list of arrays of predictions
       (if the model has multiple outputs).
+      If `out` is given, these are views of the written part of `out`.
   """
   model._make_predict_function()
   f = model.predict_function
@@ -339,17 +365,24 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
     # Instead, we store one array per batch seen
     # and concatenate them upon returning.
     unconcatenated_outs = []
+    num_written = 0
     for step in range(steps):
       batch_outs = f(ins)
       if not isinstance(batch_outs, list):
         batch_outs = [batch_outs]
-      if step == 0:
-        for batch_out in batch_outs:
-          unconcatenated_outs.append([])
-      for i, batch_out in enumerate(batch_outs):
-        unconcatenated_outs[i].append(batch_out)
+      if out is not None:
+        num_written = training_utils.write_batch_predictions(
+            out, batch_outs, num_written)
+      else:
+        if step == 0:
+          for batch_out in batch_outs:
+            unconcatenated_outs.append([])
+        for i, batch_out in enumerate(batch_outs):
+          unconcatenated_outs[i].append(batch_out)
       if verbose == 1:
         progbar.update(step + 1)
+    if out is not None:
+      return training_utils.slice_written_predictions(out, num_written)
     if len(unconcatenated_outs) == 1:
       return np.concatenate(unconcatenated_outs[0], axis=0)
     return [
@@ -360,29 +393,28 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
     # Sample-based predictions.
     outs = []
     batches = make_batches(num_samples, batch_size)
-    index_array = np.arange(num_samples)
     for batch_index, (batch_start, batch_end) in enumerate(batches):
-      batch_ids = index_array[batch_start:batch_end]
-      if ins and isinstance(ins[-1], int):
-        # Do not slice the training phase flag.
-        ins_batch = slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
-      else:
-        ins_batch = slice_arrays(ins, batch_ids)
+      ins_batch = _slice_batch(ins, batch_start, batch_end)
       for i in indices_for_conversion_to_dense:
         ins_batch[i] = ins_batch[i].toarray()
 
       batch_outs = f(ins_batch)
       if not isinstance(batch_outs, list):
         batch_outs = [batch_outs]
-      if batch_index == 0:
-        # Pre-allocate the results arrays.
-        for batch_out in batch_outs:
-          shape = (num_samples,) + batch_out.shape[1:]
-          outs.append(np.zeros(shape, dtype=batch_out.dtype))
-      for i, batch_out in enumerate(batch_outs):
-        outs[i][batch_start:batch_end] = batch_out
+      if out is not None:
+        training_utils.write_batch_predictions(out, batch_outs, batch_start)
+      else:
+        if batch_index == 0:
+          # Pre-allocate the results arrays.
+          for batch_out in batch_outs:
+            shape = (num_samples,) + batch_out.shape[1:]
+            outs.append(np.zeros(shape, dtype=batch_out.dtype))
+        for i, batch_out in enumerate(batch_outs):
+          outs[i][batch_start:batch_end] = batch_out
       if verbose == 1:
         progbar.update(batch_end)
+    if out is not None:
+      return training_utils.slice_written_predictions(out, num_samples)
     if len(outs) == 1:
       return outs[0]
     return outs
@@ -470,14 +502,9 @@ def test_loop(model, inputs, targets,
         outs[i] /= steps
   else:
     batches = make_batches(num_samples, batch_size)
-    index_array = np.arange(num_samples)
     for batch_index, (batch_start, batch_end) in enumerate(batches):
-      batch_ids = index_array[batch_start:batch_end]
-      if isinstance(ins[-1], int):
-        # Do not slice the training phase flag.
-        ins_batch = slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
-      else:
-        ins_batch = slice_arrays(ins, batch_ids)
+      ins_batch = _slice_batch(ins, batch_start, batch_end)
+      num_batch_samples = batch_end - batch_start
       for i in indices_for_conversion_to_dense:
         ins_batch[i] = ins_batch[i].toarray()
 
@@ -491,11 +518,11 @@ def test_loop(model, inputs, targets,
           if i in stateful_metric_indices:
             outs[i] = batch_out
           else:
-            outs[i] += batch_out * len(batch_ids)
+            outs[i] += batch_out * num_batch_samples
       else:
         if batch_index == 0:
           outs.append(0.)
-        outs[0] += batch_outs * len(batch_ids)
+        outs[0] += batch_outs * num_batch_samples
       if verbose == 1:
         progbar.update(batch_end)
     for i in range(len(outs)):
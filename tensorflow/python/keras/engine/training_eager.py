@@ -24,6 +24,7 @@ import copy
 import numpy as np
 
 from tensorflow.python.data.ops import iterator_ops
+from tensorflow.python.eager import function
 from tensorflow.python.eager.backprop import GradientTape
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import ops
@@ -230,6 +231,7 @@ def iterator_fit_loop(model,
         expectations of the model.
   """
   assert isinstance(inputs, iterator_ops.EagerIterator)
+  train_step = _get_step_function(model, 'train')
   for step_index in range(steps_per_epoch):
     batch_logs = {}
     batch_logs['batch'] = step_index
@@ -279,17 +281,12 @@ def iterator_fit_loop(model,
           'metrics': callback_metrics or [],
       })
 
-    # Train model.
-    outs, loss, loss_metrics = _process_single_batch(
-        model, x, y, sample_weights=sample_weights, training=True)
-    if not isinstance(outs, list):
-      outs = [outs]
+    # Train model and calculate metrics.
+    outs, loss, loss_metrics, metrics_results = train_step(
+        x, y, sample_weights)
 
-    # Calculate metrics.
     for l, o in zip(out_labels, outs):
       batch_logs[l] = o
-    # Required for eager execution
-    metrics_results = _eager_metrics_fn(model, outs, y)
     batch_logs['loss'] = tensor_util.constant_value(backend.mean(loss))
 
     for k, v in zip(model.metrics_names,
@@ -361,6 +358,7 @@ def batch_fit_loop(model,
     np.random.shuffle(index_array)
 
   batches = generic_utils.make_batches(num_train_samples, batch_size)
+  train_step = _get_step_function(model, 'train')
 
   for batch_index, (batch_start, batch_end) in enumerate(batches):
     batch_ids = index_array[batch_start:batch_end]
@@ -391,20 +389,11 @@ def batch_fit_loop(model,
           if val is not None else None for val in sample_weights_batch
       ]
 
-    outs, loss, loss_metrics = _process_single_batch(
-        model,
-        inputs_batch,
-        targets_batch,
-        sample_weights=sample_weights_batch,
-        training=True)
-
-    if not isinstance(outs, list):
-      outs = [outs]
+    outs, loss, loss_metrics, metrics_results = train_step(
+        inputs_batch, targets_batch, sample_weights_batch)
 
     for l, o in zip(out_labels, outs):
       batch_logs[l] = o
-    # Required for eager execution
-    metrics_results = _eager_metrics_fn(model, outs, targets_batch)
     batch_logs['loss'] = tensor_util.constant_value(backend.mean(loss))
 
     for k, v in zip(model.metrics_names,
@@ -455,6 +444,7 @@ def iterator_test_loop(model, inputs, steps, verbose=0):
   num_samples = 0
   if verbose == 1:
     progbar = generic_utils.Progbar(target=steps)
+  test_step = _get_step_function(model, 'test')
   for step_index in range(steps):
     # Get data from the iterator.
     try:
@@ -475,11 +465,14 @@ def iterator_test_loop(model, inputs, steps, verbose=0):
     x, y, sample_weights = model._standardize_user_data(x, y)
     x = training_utils.cast_if_floating_dtype(x)
     y = training_utils.cast_if_floating_dtype(y)
+    if sample_weights:
+      sample_weights = [
+          ops.convert_to_tensor(val, dtype=backend.floatx())
+          if val is not None else None for val in sample_weights
+      ]
 
     # Calculate model output, loss values.
-    loss_outs, loss, loss_metrics = _model_loss(
-        model, x, y, sample_weights=sample_weights, training=False)
-    metrics_results = _eager_metrics_fn(model, loss_outs, y)
+    _, loss, loss_metrics, metrics_results = test_step(x, y, sample_weights)
     batch_outs = []
     for _, v in zip(model.metrics_names,
                     [backend.mean(loss)] + loss_metrics + metrics_results):
@@ -544,6 +537,7 @@ def batch_test_loop(model,
     progbar = generic_utils.Progbar(target=num_samples)
   batches = generic_utils.make_batches(num_samples, batch_size)
   index_array = np.arange(num_samples)
+  test_step = _get_step_function(model, 'test')
   for batch_index, (batch_start, batch_end) in enumerate(batches):
     batch_ids = index_array[batch_start:batch_end]
     inputs_batch = slice_arrays(inputs, batch_ids)
@@ -567,13 +561,8 @@ def batch_test_loop(model,
           if val is not None else None for val in sample_weights_batch
       ]
 
-    loss_outs, loss, loss_metrics = _model_loss(
-        model,
-        inputs_batch,
-        targets_batch,
-        sample_weights=sample_weights_batch,
-        training=False)
-    metrics_results = _eager_metrics_fn(model, loss_outs, targets_batch)
+    _, loss, loss_metrics, metrics_results = test_step(
+        inputs_batch, targets_batch, sample_weights_batch)
     batch_outs = []
     for _, v in zip(model.metrics_names,
                     [backend.mean(loss)] + loss_metrics + metrics_results):
@@ -600,7 +589,7 @@ def batch_test_loop(model,
   return outs
 
 
-def iterator_predict_loop(model, inputs, steps, verbose=0):
+def iterator_predict_loop(model, inputs, steps, verbose=0, out=None):
   """Predict function for eager execution when input is dataset iterator.
 
   Arguments:
@@ -609,6 +598,7 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
       steps: Total number of steps (batches of samples) before declaring
           `_predict_loop` finished.
       verbose: Verbosity mode.
+      out: Optional array (or list of arrays) to write the predictions into.
 
   Returns:
       Array of predictions (if the model has a single output)
@@ -620,8 +610,10 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
   """
   assert isinstance(inputs, iterator_ops.EagerIterator)
   outs = []
+  num_written = 0
   if verbose == 1:
     progbar = generic_utils.Progbar(target=steps)
+  predict_step = _get_step_function(model, 'predict')
   for step_index in range(steps):
     # Get data from the iterator.
     try:
@@ -645,32 +637,34 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
     x, _, _ = model._standardize_user_data(x)
     x = training_utils.cast_if_floating_dtype(x)
 
-    if model._expects_training_arg:
-      batch_outs = model.call(x[0] if len(x) == 1 else x, training=False)
-    else:
-      batch_outs = model.call(x[0] if len(x) == 1 else x)
-    if not isinstance(batch_outs, list):
-      batch_outs = [batch_outs]
+    batch_outs = predict_step(x)
 
-    # We collect the results from every step and then concatenate them once
-    # in the end. This is an expensive process. We are doing this because we
-    # do not know the number of samples beforehand.
-    if step_index == 0:
-      for _ in batch_outs:
-        outs.append([])
-    for i, batch_out in enumerate(batch_outs):
-      outs[i].append(backend.get_value(batch_out))
+    if out is not None:
+      num_written = training_utils.write_batch_predictions(
+          out, [backend.get_value(batch_out) for batch_out in batch_outs],
+          num_written)
+    else:
+      # We collect the results from every step and then concatenate them once
+      # in the end. This is an expensive process. We are doing this because we
+      # do not know the number of samples beforehand.
+      if step_index == 0:
+        for _ in batch_outs:
+          outs.append([])
+      for i, batch_out in enumerate(batch_outs):
+        outs[i].append(backend.get_value(batch_out))
 
     if verbose == 1:
       progbar.update(step_index + 1)
-  for i, out in enumerate(outs):
-    outs[i] = np.concatenate(tuple(out), axis=0)
+  if out is not None:
+    return training_utils.slice_written_predictions(out, num_written)
+  for i, step_outs in enumerate(outs):
+    outs[i] = np.concatenate(tuple(step_outs), axis=0)
   if len(outs) == 1:
     return outs[0]
   return outs
 
 
-def batch_predict_loop(model, inputs, batch_size, verbose=0):
+def batch_predict_loop(model, inputs, batch_size, verbose=0, out=None):
   """Predict function for eager execution when input is arrays or tensors.
 
   Arguments:
@@ -678,6 +672,7 @@ def batch_predict_loop(model, inputs, batch_size, verbose=0):
       inputs: List of input arrays.
       batch_size: Integer batch size.
       verbose: Verbosity mode.
+      out: Optional array (or list of arrays) to write the predictions into.
 
   Returns:
       Array of predictions (if the model has a single output)
@@ -689,6 +684,7 @@ def batch_predict_loop(model, inputs, batch_size, verbose=0):
     progbar = generic_utils.Progbar(target=num_samples)
   batches = generic_utils.make_batches(num_samples, batch_size)
   index_array = np.arange(num_samples)
+  predict_step = _get_step_function(model, 'predict')
   for batch_index, (batch_start, batch_end) in enumerate(batches):
     batch_ids = index_array[batch_start:batch_end]
     inputs_batch = slice_arrays(inputs, batch_ids)
@@ -698,31 +694,24 @@ def batch_predict_loop(model, inputs, batch_size, verbose=0):
         for val in inputs_batch
     ]
 
-    if len(inputs_batch) == 1:
-      if model._expects_training_arg:
-        batch_outs = model.call(inputs_batch[0], training=False)
-      else:
-        batch_outs = model.call(inputs_batch[0])
+    batch_outs = predict_step(inputs_batch)
+    if out is not None:
+      training_utils.write_batch_predictions(out, batch_outs, batch_start)
     else:
-      if model._expects_training_arg:
-        batch_outs = model.call(inputs_batch, training=False)
-      else:
-        batch_outs = model.call(inputs_batch)
-
-    if not isinstance(batch_outs, list):
-      batch_outs = [batch_outs]
-    if batch_index == 0:
-      # Pre-allocate the results arrays.
-      for batch_out in batch_outs:
-        dims = batch_out.shape[1:].dims
-        dims_list = [d.value for d in dims]
-        shape = (num_samples,) + tuple(dims_list)
-        outs.append(np.zeros(shape, dtype=batch_out.dtype.as_numpy_dtype))
-    for i, batch_out in enumerate(batch_outs):
-      outs[i][batch_start:batch_end] = batch_out
+      if batch_index == 0:
+        # Pre-allocate the results arrays.
+        for batch_out in batch_outs:
+          dims = batch_out.shape[1:].dims
+          dims_list = [d.value for d in dims]
+          shape = (num_samples,) + tuple(dims_list)
+          outs.append(np.zeros(shape, dtype=batch_out.dtype.as_numpy_dtype))
+      for i, batch_out in enumerate(batch_outs):
+        outs[i][batch_start:batch_end] = batch_out
     if verbose == 1:
       progbar.update(batch_end)
 
+  if out is not None:
+    return training_utils.slice_written_predictions(out, num_samples)
   if len(outs) == 1:
     return outs[0]
   return outs
@@ -807,6 +796,76 @@ def _process_single_batch(model,
     return outs, loss, loss_metrics
 
 
+def _train_step(model, inputs, targets, sample_weights=None):
+  """Runs one training step and returns the outputs, losses and metrics."""
+  outs, loss, loss_metrics = _process_single_batch(
+      model, inputs, targets, sample_weights=sample_weights, training=True)
+  if not isinstance(outs, list):
+    outs = [outs]
+  metrics_results = _eager_metrics_fn(model, outs, targets)
+  return outs, loss, loss_metrics, metrics_results
+
+
+def _test_step(model, inputs, targets, sample_weights=None):
+  """Runs one evaluation step and returns the outputs, losses and metrics."""
+  with backend.learning_phase_scope(0):
+    outs, loss, loss_metrics = _model_loss(
+        model, inputs, targets, sample_weights=sample_weights, training=False)
+    if not isinstance(outs, list):
+      outs = [outs]
+    metrics_results = _eager_metrics_fn(model, outs, targets)
+  return outs, loss, loss_metrics, metrics_results
+
+
+def _predict_step(model, inputs):
+  """Runs the model in inference mode on one batch of inputs."""
+  with backend.learning_phase_scope(0):
+    inputs = inputs[0] if len(inputs) == 1 else inputs
+    if model._expects_training_arg:
+      outs = model.call(inputs, training=False)
+    else:
+      outs = model.call(inputs)
+  if not isinstance(outs, list):
+    outs = [outs]
+  return outs
+
+
+_STEP_FUNCTIONS = {
+    'train': _train_step,
+    'test': _test_step,
+    'predict': _predict_step,
+}
+
+
+def _get_step_function(model, mode):
+  """Returns the per-batch step function of `model` for `mode`.
+
+  When the model was compiled with `use_defun=True`, the step is traced into a
+  graph function with `defun` the first time it is requested. The traced
+  function is cached on the model until it is recompiled, and a new graph is
+  only traced when the step is called with a new input signature (e.g. for a
+  smaller final batch).
+
+  Arguments:
+      model: Instance of `Model`.
+      mode: One of `'train'`, `'test'` or `'predict'`.
+
+  Returns:
+      A callable taking the batch inputs (and, except in `'predict'` mode,
+      the targets and sample weights).
+  """
+  step_function = _STEP_FUNCTIONS[mode]
+
+  def step(*args):
+    return step_function(model, *args)
+
+  if not getattr(model, '_use_defun', False):
+    return step
+  if mode not in model._step_functions:
+    model._step_functions[mode] = function.defun(step)
+  return model._step_functions[mode]
+
+
 def train_on_batch(model, inputs, targets, sample_weights=None):
   """Calculates the loss and gradient updates for one input batch.
 
@@ -835,11 +894,8 @@ def train_on_batch(model, inputs, targets, sample_weights=None):
         if val is not None else None for val in sample_weights
     ]
 
-  outs, loss, _ = _process_single_batch(
-      model, inputs, targets, sample_weights=sample_weights, training=True)
-  if not isinstance(outs, list):
-    outs = [outs]
-  metrics_results = _eager_metrics_fn(model, outs, targets)
+  _, loss, _, metrics_results = _get_step_function(model, 'train')(
+      inputs, targets, sample_weights)
   if not isinstance(loss, list):
     loss = [loss]
   return loss + metrics_results
@@ -872,11 +928,8 @@ def test_on_batch(model, inputs, targets, sample_weights=None):
         ops.convert_to_tensor(val, dtype=backend.floatx())
         if val is not None else None for val in sample_weights
     ]
-  outs, loss, loss_metrics = _model_loss(
-      model, inputs, targets, sample_weights=sample_weights, training=False)
-  if not isinstance(outs, list):
-    outs = [outs]
-  metrics_results = _eager_metrics_fn(model, outs, targets)
+  _, loss, loss_metrics, metrics_results = _get_step_function(model, 'test')(
+      inputs, targets, sample_weights)
   if not isinstance(loss, list):
     loss = [loss]
   return loss + loss_metrics + metrics_results
@@ -1103,7 +1156,8 @@ def test_loop(model, inputs, targets,
 def predict_loop(model, inputs,
                  batch_size=32,
                  verbose=0,
-                 steps=None):
+                 steps=None,
+                 out=None):
   """Predict function for eager execution.
 
   Arguments:
@@ -1114,6 +1168,8 @@ def predict_loop(model, inputs,
       steps: Total number of steps (batches of samples)
           before declaring `_predict_loop` finished.
           Ignored with the default value of `None`.
+      out: Optional array (or list of arrays, one per output) into which
+          predictions are written as they are computed.
 
   Returns:
       Array of predictions (if the model has a single output)
@@ -1122,7 +1178,8 @@ def predict_loop(model, inputs,
   """
   with backend.learning_phase_scope(0):
     if steps is not None:
-      return iterator_predict_loop(model, inputs, steps, verbose=verbose)
+      return iterator_predict_loop(
+          model, inputs, steps, verbose=verbose, out=out)
     else:
       return batch_predict_loop(
-          model, inputs, batch_size=batch_size, verbose=verbose)
+          model, inputs, batch_size=batch_size, verbose=verbose, out=out)
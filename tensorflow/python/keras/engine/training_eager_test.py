@@ -403,6 +403,54 @@ class TrainingTest(test.TestCase):
     model.train_on_batch(inputs, targets)
     model.test_on_batch(inputs, targets)
 
+  def test_model_methods_with_defun(self):
+
+    def get_model(use_defun):
+      model = keras.Sequential()
+      model.add(keras.layers.Dense(3, activation='relu', input_dim=4,
+                                   kernel_initializer='ones'))
+      model.add(keras.layers.Dense(2, activation='softmax',
+                                   kernel_initializer='ones'))
+      model.compile(loss='categorical_crossentropy',
+                    metrics=['acc'],
+                    optimizer=RMSPropOptimizer(learning_rate=0.001),
+                    use_defun=use_defun)
+      return model
+
+    np.random.seed(1337)
+    x = np.random.random((100, 4)).astype(np.float32)
+    y = keras.utils.to_categorical(np.random.randint(0, 2, size=(100,)), 2)
+
+    eager_model = get_model(use_defun=False)
+    defun_model = get_model(use_defun=True)
+    eager_history = eager_model.fit(x, y, batch_size=32, epochs=2,
+                                    shuffle=False, verbose=0)
+    defun_history = defun_model.fit(x, y, batch_size=32, epochs=2,
+                                    shuffle=False, verbose=0)
+    self.assertAllClose(eager_history.history['loss'],
+                        defun_history.history['loss'], atol=1e-5)
+    self.assertAllClose(eager_history.history['acc'],
+                        defun_history.history['acc'], atol=1e-5)
+
+    # The final partial batch is the only new input signature.
+    self.assertEqual(
+        len(defun_model._step_functions['train']._arguments_to_functions), 2)
+
+    self.assertAllClose(eager_model.evaluate(x, y, batch_size=32),
+                        defun_model.evaluate(x, y, batch_size=32), atol=1e-5)
+    self.assertAllClose(eager_model.predict(x, batch_size=32),
+                        defun_model.predict(x, batch_size=32), atol=1e-5)
+    self.assertAllClose(eager_model.train_on_batch(x[:32], y[:32]),
+                        defun_model.train_on_batch(x[:32], y[:32]), atol=1e-5)
+    self.assertAllClose(eager_model.test_on_batch(x[:32], y[:32]),
+                        defun_model.test_on_batch(x[:32], y[:32]), atol=1e-5)
+
+    # Recompiling drops the traced steps.
+    defun_model.compile(loss='mse',
+                        optimizer=RMSPropOptimizer(learning_rate=0.001),
+                        use_defun=True)
+    self.assertFalse(defun_model._step_functions)
+
   def test_generator_methods(self):
     model = keras.Sequential()
     model.add(keras.layers.Dense(4, input_shape=(3,)))
@@ -421,6 +469,24 @@ class TrainingTest(test.TestCase):
     out = model.predict_generator(iterator(), steps=3)
     self.assertEqual(out.shape, (30, 4))
 
+  def test_predict_on_iterator_with_out(self):
+    model = keras.Sequential()
+    model.add(keras.layers.Dense(4, input_shape=(3,)))
+    optimizer = RMSPropOptimizer(learning_rate=0.001)
+    model.compile(optimizer, 'mse')
+
+    x = np.random.random((10, 3)).astype(np.float32)
+    y = np.random.random((10, 4)).astype(np.float32)
+    dataset = dataset_ops.Dataset.from_tensor_slices((x, y)).batch(4)
+    expected = model.predict(dataset.make_one_shot_iterator(), steps=3)
+
+    out = np.zeros((12, 4), dtype=np.float32)
+    predictions = model.predict(
+        dataset.make_one_shot_iterator(), steps=3, out=out)
+    self.assertEqual(predictions.shape, (10, 4))
+    self.assertAllClose(expected, predictions)
+    self.assertAllClose(expected, out[:10])
+
 
 class LossWeightingTest(test.TestCase):
 
@@ -23,6 +23,7 @@ import numpy as np
 
 from tensorflow.python.keras import backend as K
 from tensorflow.python.keras import callbacks as cbks
+from tensorflow.python.keras.engine import training_utils
 from tensorflow.python.keras.utils.data_utils import GeneratorEnqueuer
 from tensorflow.python.keras.utils.data_utils import OrderedEnqueuer
 from tensorflow.python.keras.utils.data_utils import Sequence
@@ -43,7 +44,9 @@ def fit_generator(model,
                   workers=1,
                   use_multiprocessing=False,
                   shuffle=True,
-                  initial_epoch=0):
+                  initial_epoch=0,
+                  shared_buffer_size=None,
+                  sharded=False):
   """See docstring for `Model.fit_generator`."""
   wait_time = 0.01  # in seconds
   epoch = initial_epoch
@@ -51,7 +54,8 @@ def fit_generator(model,
   do_validation = bool(validation_data)
 
   is_sequence = isinstance(generator, Sequence)
-  if not is_sequence and use_multiprocessing and workers > 1:
+  if (not is_sequence and not sharded and use_multiprocessing and
+      workers > 1):
     logging.warning(
         UserWarning('Using a generator with `use_multiprocessing=True`'
                     ' and multiple workers may duplicate your data.'
@@ -145,19 +149,21 @@ def fit_generator(model,
         enqueuer = OrderedEnqueuer(
             generator,
             use_multiprocessing=use_multiprocessing,
-            shuffle=shuffle)
+            shuffle=shuffle,
+            shared_buffer_size=shared_buffer_size)
       else:
         enqueuer = GeneratorEnqueuer(
             generator,
             use_multiprocessing=use_multiprocessing,
-            wait_time=wait_time)
+            wait_time=wait_time,
+            sharded=sharded)
       enqueuer.start(workers=workers, max_queue_size=max_queue_size)
       output_generator = enqueuer.get()
     else:
       if is_sequence:
         output_generator = iter(generator)
       else:
-        output_generator = generator
+        output_generator = generator(0, 1) if sharded else generator
 
     callback_model.stop_training = False
     # validation_data must be set before on_train_begin() is called
@@ -222,7 +228,8 @@ def fit_generator(model,
                 validation_steps,
                 workers=workers,
                 use_multiprocessing=use_multiprocessing,
-                max_queue_size=max_queue_size)
+                max_queue_size=max_queue_size,
+                shared_buffer_size=shared_buffer_size)
           else:
             # No need for try/except because
             # data has already been validated.
@@ -264,7 +271,9 @@ def evaluate_generator(model,
                        max_queue_size=10,
                        workers=1,
                        use_multiprocessing=False,
-                       verbose=0):
+                       verbose=0,
+                       shared_buffer_size=None,
+                       sharded=False):
   """See docstring for `Model.evaluate_generator`."""
   stateful_metric_indices = []
   if hasattr(model, 'metrics'):
@@ -281,7 +290,8 @@ def evaluate_generator(model,
   all_outs = []
   batch_sizes = []
   is_sequence = isinstance(generator, Sequence)
-  if not is_sequence and use_multiprocessing and workers > 1:
+  if (not is_sequence and not sharded and use_multiprocessing and
+      workers > 1):
     logging.warning(
         UserWarning('Using a generator with `use_multiprocessing=True`'
                     ' and multiple workers may duplicate your data.'
@@ -301,19 +311,22 @@ def evaluate_generator(model,
     if workers > 0:
       if is_sequence:
         enqueuer = OrderedEnqueuer(
-            generator, use_multiprocessing=use_multiprocessing)
+            generator,
+            use_multiprocessing=use_multiprocessing,
+            shared_buffer_size=shared_buffer_size)
       else:
         enqueuer = GeneratorEnqueuer(
             generator,
             use_multiprocessing=use_multiprocessing,
-            wait_time=wait_time)
+            wait_time=wait_time,
+            sharded=sharded)
       enqueuer.start(workers=workers, max_queue_size=max_queue_size)
       output_generator = enqueuer.get()
     else:
       if is_sequence:
         output_generator = iter(generator)
       else:
-        output_generator = generator
+        output_generator = generator(0, 1) if sharded else generator
 
     if verbose == 1:
       progbar = Progbar(target=steps)
@@ -374,13 +387,18 @@ def predict_generator(model,
                       max_queue_size=10,
                       workers=1,
                       use_multiprocessing=False,
-                      verbose=0):
+                      verbose=0,
+                      out=None,
+                      shared_buffer_size=None,
+                      sharded=False):
   """See docstring for `Model.predict_generator`."""
   steps_done = 0
+  num_written = 0
   wait_time = 0.01
   all_outs = []
   is_sequence = isinstance(generator, Sequence)
-  if not is_sequence and use_multiprocessing and workers > 1:
+  if (not is_sequence and not sharded and use_multiprocessing and
+      workers > 1):
     logging.warning(
         UserWarning('Using a generator with `use_multiprocessing=True`'
                     ' and multiple workers may duplicate your data.'
@@ -400,19 +418,22 @@ def predict_generator(model,
     if workers > 0:
       if is_sequence:
         enqueuer = OrderedEnqueuer(
-            generator, use_multiprocessing=use_multiprocessing)
+            generator,
+            use_multiprocessing=use_multiprocessing,
+            shared_buffer_size=shared_buffer_size)
       else:
         enqueuer = GeneratorEnqueuer(
             generator,
             use_multiprocessing=use_multiprocessing,
-            wait_time=wait_time)
+            wait_time=wait_time,
+            sharded=sharded)
       enqueuer.start(workers=workers, max_queue_size=max_queue_size)
       output_generator = enqueuer.get()
     else:
       if is_sequence:
         output_generator = iter(generator)
       else:
-        output_generator = generator
+        output_generator = generator(0, 1) if sharded else generator
 
     if verbose == 1:
       progbar = Progbar(target=steps)
@@ -439,12 +460,16 @@ def predict_generator(model,
       if not isinstance(outs, list):
         outs = [outs]
 
-      if not all_outs:
-        for out in outs:
-          all_outs.append([])
+      if out is not None:
+        num_written = training_utils.write_batch_predictions(
+            out, outs, num_written)
+      else:
+        if not all_outs:
+          for _ in outs:
+            all_outs.append([])
 
-      for i, out in enumerate(outs):
-        all_outs[i].append(out)
+        for i, batch_out in enumerate(outs):
+          all_outs[i].append(batch_out)
       steps_done += 1
       if verbose == 1:
         progbar.update(steps_done)
@@ -453,6 +478,8 @@ def predict_generator(model,
     if enqueuer is not None:
       enqueuer.stop()
 
+  if out is not None:
+    return training_utils.slice_written_predictions(out, num_written)
   if len(all_outs) == 1:
     if steps_done == 1:
       return all_outs[0][0]
@@ -321,6 +321,18 @@ class TrainingTest(test.TestCase):
       })
       self.assertEqual(len(out), 2)
 
+      # Test predict into caller-supplied arrays
+      expected = model.predict([input_a_np, input_b_np], batch_size=3)
+      buffers = [np.zeros((10, 4), dtype=np.float32) for _ in range(2)]
+      out = model.predict(
+          [input_a_np, input_b_np], batch_size=3, out=buffers)
+      self.assertEqual(len(out), 2)
+      self.assertTrue(np.may_share_memory(out[0], buffers[0]))
+      self.assertAllClose(buffers[0], expected[0])
+      with self.assertRaises(ValueError):
+        model.predict([input_a_np, input_b_np], batch_size=3,
+                      out=[np.zeros((8, 4), dtype=np.float32)] * 2)
+
   def test_invalid_loss_or_metrics(self):
     num_classes = 5
     train_samples = 1000
@@ -957,6 +969,12 @@ class TestGeneratorMethods(test.TestCase):
                                 steps=5,
                                 max_queue_size=10,
                                 workers=0)
+        out = np.zeros((50, 1), dtype=np.float32)
+        self.assertEqual(
+            model.predict_generator(custom_generator(),
+                                    steps=5,
+                                    max_queue_size=10,
+                                    out=out).shape, (50, 1))
         model.evaluate_generator(custom_generator(),
                                  steps=5,
                                  max_queue_size=10,
@@ -1102,6 +1120,81 @@ class TestGeneratorMethods(test.TestCase):
                         workers=0,
                         use_multiprocessing=False)
 
+  @unittest.skipIf(
+      os.name == 'nt',
+      'use_multiprocessing=True does not work on windows properly.')
+  def test_sequence_methods_with_shared_buffers(self):
+
+    class DummySequence(keras.utils.Sequence):
+
+      def __getitem__(self, idx):
+        return np.full([10, 2], idx, dtype=np.float32), np.ones([10])
+
+      def __len__(self):
+        return 5
+
+    with self.test_session():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(1, input_shape=(2,)))
+      model.compile(loss='mse', optimizer='sgd')
+
+      # Batches of 10 * 2 float32 inputs and 10 float64 targets fit in the
+      # buffers.
+      model.fit_generator(DummySequence(),
+                          epochs=1,
+                          validation_data=DummySequence(),
+                          workers=2,
+                          use_multiprocessing=True,
+                          shared_buffer_size=1024)
+      model.evaluate_generator(DummySequence(),
+                               workers=2,
+                               use_multiprocessing=True,
+                               shared_buffer_size=1024)
+      predictions = model.predict_generator(DummySequence(),
+                                            workers=2,
+                                            use_multiprocessing=True,
+                                            shared_buffer_size=1024)
+      self.assertAllClose(
+          predictions,
+          model.predict(np.repeat(np.arange(5, dtype=np.float32), 20)
+                        .reshape((50, 2))))
+
+  def test_generator_methods_with_sharded_generator(self):
+
+    def make_generator(worker_index, num_workers):
+      # Every worker yields the batches whose index falls in its own shard.
+      while True:
+        for idx in range(worker_index, 4, num_workers):
+          yield np.full([10, 2], idx, dtype=np.float32), np.ones([10])
+
+    with self.test_session():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(1, input_shape=(2,)))
+      model.compile(loss='mse', optimizer='sgd')
+
+      for workers in (0, 2):
+        model.fit_generator(make_generator,
+                            steps_per_epoch=4,
+                            epochs=1,
+                            workers=workers,
+                            sharded=True)
+        model.evaluate_generator(make_generator,
+                                 steps=4,
+                                 workers=workers,
+                                 sharded=True)
+        predictions = model.predict_generator(make_generator,
+                                              steps=4,
+                                              workers=workers,
+                                              sharded=True)
+        self.assertEqual(predictions.shape, (40, 1))
+
+      with self.assertRaises(ValueError):
+        model.fit_generator(make_generator(0, 1),
+                            steps_per_epoch=4,
+                            epochs=1,
+                            workers=2,
+                            sharded=True)
+
 
 class TestTrainingUtils(test.TestCase):
 
@@ -1136,6 +1229,21 @@ class TestTrainingUtils(test.TestCase):
     slice_arrays(input_a, 0, 1)
     slice_arrays(input_a, stop=2)
 
+  def test_slice_batch(self):
+    input_a = np.random.random((10, 3))
+    input_b = np.random.random((10, 2))
+    # Ranges of samples are sliced without copies.
+    batch = keras.engine.training_arrays._slice_batch([input_a, input_b, 1],
+                                                      2, 6)
+    self.assertEqual(batch[2], 1)
+    self.assertTrue(np.may_share_memory(batch[0], input_a))
+    self.assertAllEqual(batch[1], input_b[2:6])
+    # Arrays of indices are gathered.
+    batch = keras.engine.training_arrays._slice_batch([input_a, input_b],
+                                                      np.array([5, 1]))
+    self.assertFalse(np.may_share_memory(batch[0], input_a))
+    self.assertAllEqual(batch[1], input_b[[5, 1]])
+
 
 class TestTrainingWithDataTensors(test.TestCase):
 
@@ -722,3 +722,42 @@ def cast_if_floating_dtype(x):
         for val in x
     ]
   return math_ops.cast(x, dtype=K.floatx()) if x.dtype.is_floating else x
+
+
+def write_batch_predictions(out, batch_outs, start):
+  """Writes the predictions of one batch into caller-supplied arrays.
+
+  Arguments:
+    out: Array, or list of arrays (one per model output), to write into. These
+      can be `np.memmap` arrays, so that predictions never need to fit in
+      memory at once.
+    batch_outs: List of the model outputs for the batch.
+    start: Index of the first sample of the batch.
+
+  Returns:
+    Index following the last sample of the batch.
+
+  Raises:
+    ValueError: if `out` does not match the model outputs or is too short.
+  """
+  if not isinstance(out, list):
+    out = [out]
+  if len(out) != len(batch_outs):
+    raise ValueError('`out` should contain one array per model output (%d), '
+                     'got %d arrays.' % (len(batch_outs), len(out)))
+  end = start + int(batch_outs[0].shape[0])
+  for array, batch_out in zip(out, batch_outs):
+    if end > len(array):
+      raise ValueError('`out` has room for %d samples, but more samples were '
+                       'predicted.' % len(array))
+    array[start:end] = batch_out
+  return end
+
+
+def slice_written_predictions(out, num_samples):
+  """Returns the first `num_samples` predictions written into `out`."""
+  if isinstance(out, list):
+    if len(out) == 1:
+      return out[0][:num_samples]
+    return [array[:num_samples] for array in out]
+  return out[:num_samples]
@@ -35,7 +35,8 @@ except Exception:  # pylint: disable=broad-except
                               keras_model_path=None,
                               custom_objects=None,
                               model_dir=None,
-                              config=None):
+                              config=None,
+                              weights_handoff='checkpoint'):
     raise NotImplementedError(
         'tf.keras.estimator.model_to_estimator function not available in your '
         'installation.')
@@ -74,13 +74,34 @@ class GRULayerTest(test.TestCase):
     timesteps = 3
     embedding_dim = 4
     units = 2
-    for mode in [0, 1, 2]:
+    for mode in [0, 1, 2, 3]:
       testing_utils.layer_test(
           keras.layers.GRU,
           kwargs={'units': units,
                   'implementation': mode},
           input_shape=(num_samples, timesteps, embedding_dim))
 
+  @tf_test_util.run_in_graph_and_eager_modes
+  def test_precomputed_input_projection_GRU(self):
+    num_samples = 2
+    timesteps = 3
+    embedding_dim = 4
+    units = 2
+    x = np.random.random((num_samples, timesteps, embedding_dim))
+    x[0, 2:] = 0.
+    for reset_after in [False, True]:
+      models = []
+      for mode in [2, 3]:
+        model = keras.models.Sequential()
+        model.add(keras.layers.Masking(
+            input_shape=(timesteps, embedding_dim)))
+        model.add(keras.layers.GRU(units, implementation=mode,
+                                   reset_after=reset_after,
+                                   return_sequences=True))
+        models.append(model)
+      models[1].set_weights(models[0].get_weights())
+      self.assertAllClose(models[0].predict(x), models[1].predict(x))
+
   def test_statefulness_GRU(self):
     num_samples = 2
     timesteps = 3
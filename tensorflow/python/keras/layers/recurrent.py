@@ -615,6 +615,14 @@ class RNN(Layer):
     if generic_utils.has_arg(self.cell.call, 'training'):
       kwargs['training'] = training
 
+    cell_call = self.cell.call
+    if (getattr(self.cell, 'implementation', None) == 3 and
+        hasattr(self.cell, '_project_inputs')):
+      # Project the inputs of all timesteps at once, so that each step only
+      # computes the recurrent part.
+      inputs = self.cell._project_inputs(inputs, training=training)  # pylint: disable=protected-access
+      cell_call = self.cell._call_projected  # pylint: disable=protected-access
+
     if constants:
       if not generic_utils.has_arg(self.cell.call, 'constants'):
         raise ValueError('RNN cell does not support constants')
@@ -622,11 +630,11 @@ class RNN(Layer):
       def step(inputs, states):
         constants = states[-self._num_constants:]  # pylint: disable=invalid-unary-operand-type
         states = states[:-self._num_constants]  # pylint: disable=invalid-unary-operand-type
-        return self.cell.call(inputs, states, constants=constants, **kwargs)
+        return cell_call(inputs, states, constants=constants, **kwargs)
     else:
 
       def step(inputs, states):
-        return self.cell.call(inputs, states, **kwargs)
+        return cell_call(inputs, states, **kwargs)
 
     last_output, outputs, states = K.rnn(
         step,
@@ -1194,12 +1202,15 @@ class GRUCell(Layer):
       recurrent_dropout: Float between 0 and 1.
           Fraction of the units to drop for
           the linear transformation of the recurrent state.
-      implementation: Implementation mode, either 1 or 2.
+      implementation: Implementation mode, either 1, 2 or 3.
           Mode 1 will structure its operations as a larger number of
           smaller dot products and additions, whereas mode 2 will
-          batch them into fewer, larger operations. These modes will
-          have different performance profiles on different hardware and
-          for different applications.
+          batch them into fewer, larger operations. Mode 3 is mode 2
+          where, when run by an `RNN` layer, the inputs of all timesteps
+          are multiplied by the input kernel in one dot product before
+          the recurrence, which only computes the recurrent part.
+          These modes will have different performance profiles on
+          different hardware and for different applications.
       reset_after: GRU convention (whether to apply reset gate after or
           before matrix multiplication). False = "before" (default),
           True = "after" (CuDNN compatible).
@@ -1365,44 +1376,93 @@ class GRUCell(Layer):
 
       hh = self.activation(x_h + recurrent_h)
     else:
-      if 0. < self.dropout < 1.:
-        inputs *= dp_mask[0]
+      return self._call_projected(
+          self._project_inputs(inputs, training=training),
+          states,
+          training=training)
+    # previous and candidate state mixed by update gate
+    h = z * h_tm1 + (1 - z) * hh
+    if 0 < self.dropout + self.recurrent_dropout:
+      if training is None and not context.executing_eagerly():
+        # This would be harmless to set in eager mode, but eager tensors
+        # disallow setting arbitrary attributes.
+        h._uses_learning_phase = True
 
-      # inputs projected by all gate matrices at once
-      matrix_x = K.dot(inputs, self.kernel)
-      if self.use_bias:
-        # biases: bias_z_i, bias_r_i, bias_h_i
-        matrix_x = K.bias_add(matrix_x, self.input_bias)
+    return h, [h]
 
-      x_z = matrix_x[:, :self.units]
-      x_r = matrix_x[:, self.units: 2 * self.units]
-      x_h = matrix_x[:, 2 * self.units:]
+  def _project_inputs(self, inputs, training=None):
+    """Projects the inputs by all gate matrices at once.
 
-      if 0. < self.recurrent_dropout < 1.:
-        h_tm1 *= rec_dp_mask[0]
+    Arguments:
+        inputs: Input tensor of shape `(samples, input_dim)`, or
+            `(samples, timesteps, input_dim)` to project all timesteps in
+            one dot product.
+        training: Python boolean indicating whether the layer should behave
+            in training mode or in inference mode.
 
-      if self.reset_after:
-        # hidden state projected by all gate matrices at once
-        matrix_inner = K.dot(h_tm1, self.recurrent_kernel)
-        if self.use_bias:
-          matrix_inner = K.bias_add(matrix_inner, self.recurrent_bias)
-      else:
-        # hidden state projected separately for update/reset and new
-        matrix_inner = K.dot(h_tm1, self.recurrent_kernel[:, :2 * self.units])
+    Returns:
+        The projected inputs, with a last dimension of `3 * units`.
+    """
+    if 0. < self.dropout < 1.:
+      step_inputs = inputs[:, 0] if K.ndim(inputs) == 3 else inputs
+      if self._dropout_mask is None:
+        self._dropout_mask = _generate_dropout_mask(
+            array_ops.ones_like(step_inputs),
+            self.dropout,
+            training=training,
+            count=3)
+      dp_mask = self._dropout_mask[0]
+      if K.ndim(inputs) == 3:
+        dp_mask = array_ops.expand_dims(dp_mask, 1)
+      inputs = inputs * dp_mask
+
+    matrix_x = K.dot(inputs, self.kernel)
+    if self.use_bias:
+      # biases: bias_z_i, bias_r_i, bias_h_i
+      matrix_x = K.bias_add(matrix_x, self.input_bias)
+    return matrix_x
 
-      recurrent_z = matrix_inner[:, :self.units]
-      recurrent_r = matrix_inner[:, self.units:2 * self.units]
+  def _call_projected(self, matrix_x, states, training=None):
+    """Runs a step on inputs projected by `_project_inputs`."""
+    h_tm1 = states[0]  # previous memory
 
-      z = self.recurrent_activation(x_z + recurrent_z)
-      r = self.recurrent_activation(x_r + recurrent_r)
+    if (0 < self.recurrent_dropout < 1 and
+        self._recurrent_dropout_mask is None):
+      self._recurrent_dropout_mask = _generate_dropout_mask(
+          array_ops.ones_like(h_tm1),
+          self.recurrent_dropout,
+          training=training,
+          count=3)
 
-      if self.reset_after:
-        recurrent_h = r * matrix_inner[:, 2 * self.units:]
-      else:
-        recurrent_h = K.dot(r * h_tm1,
-                            self.recurrent_kernel[:, 2 * self.units:])
+    x_z = matrix_x[:, :self.units]
+    x_r = matrix_x[:, self.units: 2 * self.units]
+    x_h = matrix_x[:, 2 * self.units:]
 
-      hh = self.activation(x_h + recurrent_h)
+    if 0. < self.recurrent_dropout < 1.:
+      h_tm1 *= self._recurrent_dropout_mask[0]
+
+    if self.reset_after:
+      # hidden state projected by all gate matrices at once
+      matrix_inner = K.dot(h_tm1, self.recurrent_kernel)
+      if self.use_bias:
+        matrix_inner = K.bias_add(matrix_inner, self.recurrent_bias)
+    else:
+      # hidden state projected separately for update/reset and new
+      matrix_inner = K.dot(h_tm1, self.recurrent_kernel[:, :2 * self.units])
+
+    recurrent_z = matrix_inner[:, :self.units]
+    recurrent_r = matrix_inner[:, self.units:2 * self.units]
+
+    z = self.recurrent_activation(x_z + recurrent_z)
+    r = self.recurrent_activation(x_r + recurrent_r)
+
+    if self.reset_after:
+      recurrent_h = r * matrix_inner[:, 2 * self.units:]
+    else:
+      recurrent_h = K.dot(r * h_tm1,
+                          self.recurrent_kernel[:, 2 * self.units:])
+
+    hh = self.activation(x_h + recurrent_h)
     # previous and candidate state mixed by update gate
     h = z * h_tm1 + (1 - z) * hh
     if 0 < self.dropout + self.recurrent_dropout:
@@ -1490,12 +1550,15 @@ class GRU(RNN):
       recurrent_dropout: Float between 0 and 1.
           Fraction of the units to drop for
           the linear transformation of the recurrent state.
-      implementation: Implementation mode, either 1 or 2.
+      implementation: Implementation mode, either 1, 2 or 3.
           Mode 1 will structure its operations as a larger number of
           smaller dot products and additions, whereas mode 2 will
-          batch them into fewer, larger operations. These modes will
-          have different performance profiles on different hardware and
-          for different applications.
+          batch them into fewer, larger operations. Mode 3 is mode 2
+          where, when run by an `RNN` layer, the inputs of all timesteps
+          are multiplied by the input kernel in one dot product before
+          the recurrence, which only computes the recurrent part.
+          These modes will have different performance profiles on
+          different hardware and for different applications.
       return_sequences: Boolean. Whether to return the last output
           in the output sequence, or the full sequence.
       return_state: Boolean. Whether to return the last state
@@ -1742,12 +1805,15 @@ class LSTMCell(Layer):
       recurrent_dropout: Float between 0 and 1.
           Fraction of the units to drop for
           the linear transformation of the recurrent state.
-      implementation: Implementation mode, either 1 or 2.
+      implementation: Implementation mode, either 1, 2 or 3.
           Mode 1 will structure its operations as a larger number of
           smaller dot products and additions, whereas mode 2 will
-          batch them into fewer, larger operations. These modes will
-          have different performance profiles on different hardware and
-          for different applications.
+          batch them into fewer, larger operations. Mode 3 is mode 2
+          where, when run by an `RNN` layer, the inputs of all timesteps
+          are multiplied by the input kernel in one dot product before
+          the recurrence, which only computes the recurrent part.
+          These modes will have different performance profiles on
+          different hardware and for different applications.
   """
 
   def __init__(self,
@@ -1897,24 +1963,76 @@ class LSTMCell(Layer):
       o = self.recurrent_activation(
           x_o + K.dot(h_tm1_o, self.recurrent_kernel[:, self.units * 3:]))
     else:
-      if 0. < self.dropout < 1.:
-        inputs *= dp_mask[0]
-      z = K.dot(inputs, self.kernel)
-      if 0. < self.recurrent_dropout < 1.:
-        h_tm1 *= rec_dp_mask[0]
-      z += K.dot(h_tm1, self.recurrent_kernel)
-      if self.use_bias:
-        z = K.bias_add(z, self.bias)
+      return self._call_projected(
+          self._project_inputs(inputs, training=training),
+          states,
+          training=training)
+
+    h = o * self.activation(c)
+    if 0 < self.dropout + self.recurrent_dropout:
+      if training is None and not context.executing_eagerly():
+        # This would be harmless to set in eager mode, but eager tensors
+        # disallow setting arbitrary attributes.
+        h._uses_learning_phase = True
+    return h, [h, c]
+
+  def _project_inputs(self, inputs, training=None):
+    """Projects the inputs by all gate matrices at once.
+
+    Arguments:
+        inputs: Input tensor of shape `(samples, input_dim)`, or
+            `(samples, timesteps, input_dim)` to project all timesteps in
+            one dot product.
+        training: Python boolean indicating whether the layer should behave
+            in training mode or in inference mode.
+
+    Returns:
+        The projected inputs, with a last dimension of `4 * units`.
+    """
+    if 0. < self.dropout < 1.:
+      step_inputs = inputs[:, 0] if K.ndim(inputs) == 3 else inputs
+      if self._dropout_mask is None:
+        self._dropout_mask = _generate_dropout_mask(
+            array_ops.ones_like(step_inputs),
+            self.dropout,
+            training=training,
+            count=4)
+      dp_mask = self._dropout_mask[0]
+      if K.ndim(inputs) == 3:
+        dp_mask = array_ops.expand_dims(dp_mask, 1)
+      inputs = inputs * dp_mask
+
+    z = K.dot(inputs, self.kernel)
+    if self.use_bias:
+      z = K.bias_add(z, self.bias)
+    return z
+
+  def _call_projected(self, z, states, training=None):
+    """Runs a step on inputs projected by `_project_inputs`."""
+    h_tm1 = states[0]  # previous memory state
+    c_tm1 = states[1]  # previous carry state
+
+    if (0 < self.recurrent_dropout < 1 and
+        self._recurrent_dropout_mask is None):
+      self._recurrent_dropout_mask = _generate_dropout_mask(
+          array_ops.ones_like(h_tm1),
+          self.recurrent_dropout,
+          training=training,
+          count=4)
+
+    if 0. < self.recurrent_dropout < 1.:
+      h_tm1 *= self._recurrent_dropout_mask[0]
+    z += K.dot(h_tm1, self.recurrent_kernel)
 
-      z0 = z[:, :self.units]
-      z1 = z[:, self.units:2 * self.units]
-      z2 = z[:, 2 * self.units:3 * self.units]
-      z3 = z[:, 3 * self.units:]
+    z0 = z[:, :self.units]
+    z1 = z[:, self.units:2 * self.units]
+    z2 = z[:, 2 * self.units:3 * self.units]
+    z3 = z[:, 3 * self.units:]
 
-      i = self.recurrent_activation(z0)
-      f = self.recurrent_activation(z1)
-      c = f * c_tm1 + i * self.activation(z2)
-      o = self.recurrent_activation(z3)
+    i = self.recurrent_activation(z0)
+    f = self.recurrent_activation(z1)
+    c = f * c_tm1 + i * self.activation(z2)
+    o = self.recurrent_activation(z3)
 
     h = o * self.activation(c)
     if 0 < self.dropout + self.recurrent_dropout:
@@ -2010,12 +2128,15 @@ class LSTM(RNN):
       recurrent_dropout: Float between 0 and 1.
           Fraction of the units to drop for
           the linear transformation of the recurrent state.
-      implementation: Implementation mode, either 1 or 2.
+      implementation: Implementation mode, either 1, 2 or 3.
           Mode 1 will structure its operations as a larger number of
           smaller dot products and additions, whereas mode 2 will
-          batch them into fewer, larger operations. These modes will
-          have different performance profiles on different hardware and
-          for different applications.
+          batch them into fewer, larger operations. Mode 3 is mode 2
+          where, when run by an `RNN` layer, the inputs of all timesteps
+          are multiplied by the input kernel in one dot product before
+          the recurrence, which only computes the recurrent part.
+          These modes will have different performance profiles on
+          different hardware and for different applications.
       return_sequences: Boolean. Whether to return the last output.
           in the output sequence, or the full sequence.
       return_state: Boolean. Whether to return the last state
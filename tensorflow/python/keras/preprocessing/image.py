@@ -22,13 +22,18 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 from functools import partial
+import hashlib
+import json
 import multiprocessing.pool
 import os
 import re
+import tempfile
 import threading
 
 import numpy as np
+import six
 from tensorflow.python.keras import backend as K
 from tensorflow.python.keras.utils.data_utils import Sequence
 from tensorflow.python.platform import tf_logging as logging
@@ -319,6 +324,78 @@ def flip_axis(x, axis):
   return x
 
 
+def _map_coordinates_to_range(idx, size, fill_mode):
+  """Maps integer sampling coordinates into `[0, size)` for `fill_mode`."""
+  if fill_mode == 'reflect':
+    idx = np.mod(idx, 2 * size)
+    return np.where(idx >= size, 2 * size - 1 - idx, idx)
+  if fill_mode == 'wrap':
+    return np.mod(idx, size)
+  # 'nearest' repeats the edge; 'constant' is masked by the caller.
+  return np.clip(idx, 0, size - 1)
+
+
+def _apply_transform_batch(x, transform_matrices, fill_mode='nearest', cval=0.):
+  """Applies one affine transformation per image to a batch of images.
+
+  This is the vectorized counterpart of `apply_transform`: every output
+  pixel of every image is mapped back into its source image and sampled
+  with bilinear interpolation (the same as `order=1` in
+  `scipy.ndimage.affine_transform`), using a handful of numpy gathers for
+  the whole batch instead of one scipy call per image and channel.
+
+  Arguments:
+      x: 4D numpy array of images, in `channels_last` format.
+      transform_matrices: Numpy array of shape `(samples, 3, 3)`, mapping
+          output `(row, col)` coordinates to input coordinates.
+      fill_mode: Points outside the boundaries of the input
+          are filled according to the given mode
+          (one of `{'constant', 'nearest', 'reflect', 'wrap'}`).
+      cval: Value used for points outside the boundaries
+          of the input if `mode='constant'`.
+
+  Returns:
+      The transformed batch, with the same shape and dtype as `x`.
+
+  Raises:
+      ValueError: if `fill_mode` is not supported.
+  """
+  if fill_mode not in {'constant', 'nearest', 'reflect', 'wrap'}:
+    raise ValueError('Invalid `fill_mode`: ' + str(fill_mode) + '. '
+                     'Expected one of "constant", "nearest", "reflect" or '
+                     '"wrap".')
+  num_samples, h, w, channels = x.shape
+  rows, cols = np.meshgrid(np.arange(h), np.arange(w), indexing='ij')
+  grid = np.stack([rows.ravel(), cols.ravel()]).astype(np.float64)
+  coords = (np.matmul(transform_matrices[:, :2, :2], grid) +
+            transform_matrices[:, :2, 2:])
+  src_rows, src_cols = coords[:, 0], coords[:, 1]
+
+  row0 = np.floor(src_rows)
+  col0 = np.floor(src_cols)
+  row_frac = (src_rows - row0)[..., np.newaxis]
+  col_frac = (src_cols - col0)[..., np.newaxis]
+  row0 = row0.astype(np.int64)
+  col0 = col0.astype(np.int64)
+  row1 = _map_coordinates_to_range(row0 + 1, h, fill_mode)
+  col1 = _map_coordinates_to_range(col0 + 1, w, fill_mode)
+  row0 = _map_coordinates_to_range(row0, h, fill_mode)
+  col0 = _map_coordinates_to_range(col0, w, fill_mode)
+
+  sample_index = np.arange(num_samples)[:, np.newaxis]
+  top = (x[sample_index, row0, col0] * (1 - col_frac) +
+         x[sample_index, row0, col1] * col_frac)
+  bottom = (x[sample_index, row1, col0] * (1 - col_frac) +
+            x[sample_index, row1, col1] * col_frac)
+  out = top * (1 - row_frac) + bottom * row_frac
+
+  if fill_mode == 'constant':
+    outside = ((src_rows < 0) | (src_rows > h - 1) |
+               (src_cols < 0) | (src_cols > w - 1))
+    out[outside] = cval
+  return out.reshape((num_samples, h, w, channels)).astype(x.dtype)
+
+
 @tf_export('keras.preprocessing.image.array_to_img')
 def array_to_img(x, data_format=None, scale=True):
   """Converts a 3D Numpy array to a PIL Image instance.
@@ -421,6 +498,11 @@ def load_img(path, grayscale=False, target_size=None, interpolation='nearest'):
           supported. If PIL version 3.4.0 or newer is installed, "box" and
           "hamming" are also supported. By default, "nearest" is used.
 
+  When `target_size` is given and the file is a JPEG at least twice as large
+  as `target_size`, it is decoded directly at a reduced scale (1/2, 1/4 or
+  1/8, the smallest one that is still at least `target_size`) before being
+  resized, which is much faster than decoding it at full resolution.
+
   Returns:
       A PIL Image instance.
 
@@ -432,6 +514,10 @@ def load_img(path, grayscale=False, target_size=None, interpolation='nearest'):
     raise ImportError('Could not import PIL.Image. '
                       'The use of `array_to_img` requires PIL.')
   img = pil_image.open(path)
+  if target_size is not None and img.format == 'JPEG':
+    # Lets the JPEG decoder downscale in the DCT domain; this is a no-op
+    # unless the image is at least twice as large as `target_size`.
+    img.draft('L' if grayscale else 'RGB', (target_size[1], target_size[0]))
   if grayscale:
     if img.mode != 'L':
       img = img.convert('L')
@@ -770,7 +856,10 @@ class ImageDataGenerator(object):
                           save_format='png',
                           follow_links=False,
                           subset=None,
-                          interpolation='nearest'):
+                          interpolation='nearest',
+                          index_file=None,
+                          cache_dir=None,
+                          cache_size=None):
     """Generates batches of augmented/normalized data given directory path.
 
     Arguments:
@@ -823,6 +912,13 @@ class ImageDataGenerator(object):
             If PIL version 1.1.3 or newer is installed, `"lanczos"` is also
             supported. If PIL version 3.4.0 or newer is installed, `"box"` and
             `"hamming"` are also supported. By default, `"nearest"` is used.
+        index_file: optional path of a file in which to persist the listing
+            of `directory`, so that only the subdirectories that changed are
+            listed again on later runs.
+        cache_dir: optional directory in which to cache decoded and resized
+            images across epochs and runs.
+        cache_size: maximum size of `cache_dir` in bytes, beyond which the
+            least recently used images are evicted (default: no bound).
 
     Returns:
         A DirectoryIterator yielding tuples of `(x, y)` where `x` is a
@@ -846,7 +942,10 @@ class ImageDataGenerator(object):
         save_format=save_format,
         follow_links=follow_links,
         subset=subset,
-        interpolation=interpolation)
+        interpolation=interpolation,
+        index_file=index_file,
+        cache_dir=cache_dir,
+        cache_size=cache_size)
 
   def standardize(self, x):
     """Apply the normalization configuration to a batch of inputs.
@@ -1006,6 +1105,141 @@ class ImageDataGenerator(object):
 
     return x
 
+  def _random_shift_batch(self, shift_range, num_samples, axis_size):
+    """Samples `num_samples` shifts, in pixels, like `random_transform`."""
+    try:  # 1-D array-like or int
+      shifts = np.random.choice(shift_range, num_samples).astype(np.float64)
+      shifts *= np.random.choice([-1, 1], num_samples)
+    except ValueError:  # floating point
+      shifts = np.random.uniform(-shift_range, shift_range, num_samples)
+    if np.max(shift_range) < 1:
+      shifts *= axis_size
+    return shifts
+
+  def random_transform_batch(self, x, seed=None):
+    """Randomly augment a batch of image tensors.
+
+    Applies the same family of transformations as `random_transform`, but
+    samples the parameters of the whole batch at once and applies them with
+    vectorized numpy operations rather than image by image, which is much
+    cheaper for the small images typically fed through `flow`. The random
+    draws are made in a different order than in `random_transform`, so for
+    a given seed the two do not produce the same augmentations.
+
+    If `random_transform` has been overridden in a subclass, it is applied
+    to each image in turn instead, so that custom augmentations are kept.
+
+    Arguments:
+        x: 4D tensor, batch of images.
+        seed: random seed.
+
+    Returns:
+        A randomly transformed version of the input (same shape).
+    """
+    if seed is not None:
+      np.random.seed(seed)
+    # Compare the underlying functions: on Python 2, each access to a method
+    # on a class creates a new unbound method object.
+    if (six.get_unbound_function(type(self).random_transform) is not
+        six.get_unbound_function(ImageDataGenerator.random_transform)):
+      return np.stack([self.random_transform(xi) for xi in x])
+
+    x = np.array(x, dtype=K.floatx())
+    if self.data_format == 'channels_first':
+      x = np.transpose(x, (0, 2, 3, 1))
+    num_samples, h, w, _ = x.shape
+
+    # use composition of homographies, one per image,
+    # to generate the final transforms that need to be applied
+    transform_matrices = np.tile(np.eye(3), (num_samples, 1, 1))
+    transformed = False
+    if self.rotation_range:
+      theta = np.deg2rad(
+          np.random.uniform(-self.rotation_range, self.rotation_range,
+                            num_samples))
+      rotation_matrices = np.tile(np.eye(3), (num_samples, 1, 1))
+      rotation_matrices[:, 0, 0] = np.cos(theta)
+      rotation_matrices[:, 0, 1] = -np.sin(theta)
+      rotation_matrices[:, 1, 0] = np.sin(theta)
+      rotation_matrices[:, 1, 1] = np.cos(theta)
+      transform_matrices = np.matmul(transform_matrices, rotation_matrices)
+      transformed = True
+
+    if self.height_shift_range or self.width_shift_range:
+      shift_matrices = np.tile(np.eye(3), (num_samples, 1, 1))
+      if self.height_shift_range:
+        shift_matrices[:, 0, 2] = self._random_shift_batch(
+            self.height_shift_range, num_samples, h)
+      if self.width_shift_range:
+        shift_matrices[:, 1, 2] = self._random_shift_batch(
+            self.width_shift_range, num_samples, w)
+      transform_matrices = np.matmul(transform_matrices, shift_matrices)
+      transformed = True
+
+    if self.shear_range:
+      shear = np.deg2rad(
+          np.random.uniform(-self.shear_range, self.shear_range, num_samples))
+      shear_matrices = np.tile(np.eye(3), (num_samples, 1, 1))
+      shear_matrices[:, 0, 1] = -np.sin(shear)
+      shear_matrices[:, 1, 1] = np.cos(shear)
+      transform_matrices = np.matmul(transform_matrices, shear_matrices)
+      transformed = True
+
+    if self.zoom_range[0] != 1 or self.zoom_range[1] != 1:
+      zoom = np.random.uniform(self.zoom_range[0], self.zoom_range[1],
+                               (2, num_samples))
+      zoom_matrices = np.tile(np.eye(3), (num_samples, 1, 1))
+      zoom_matrices[:, 0, 0] = zoom[0]
+      zoom_matrices[:, 1, 1] = zoom[1]
+      transform_matrices = np.matmul(transform_matrices, zoom_matrices)
+      transformed = True
+
+    if transformed:
+      o_x = float(h) / 2 + 0.5
+      o_y = float(w) / 2 + 0.5
+      offset_matrix = np.array([[1, 0, o_x], [0, 1, o_y], [0, 0, 1]])
+      reset_matrix = np.array([[1, 0, -o_x], [0, 1, -o_y], [0, 0, 1]])
+      transform_matrices = np.matmul(
+          np.matmul(offset_matrix, transform_matrices), reset_matrix)
+      x = _apply_transform_batch(
+          x, transform_matrices, fill_mode=self.fill_mode, cval=self.cval)
+
+    if self.channel_shift_range != 0:
+      min_x = np.min(x, axis=(1, 2, 3), keepdims=True)
+      max_x = np.max(x, axis=(1, 2, 3), keepdims=True)
+      shifts = np.random.uniform(-self.channel_shift_range,
+                                 self.channel_shift_range,
+                                 (num_samples, 1, 1, x.shape[3]))
+      x = np.clip(x + shifts, min_x, max_x)
+
+    if self.horizontal_flip:
+      flip = np.random.random(num_samples) < 0.5
+      x[flip] = x[flip, :, ::-1]
+
+    if self.vertical_flip:
+      flip = np.random.random(num_samples) < 0.5
+      x[flip] = x[flip, ::-1]
+
+    if self.brightness_range is not None:
+      if len(self.brightness_range) != 2:
+        raise ValueError('`brightness_range should be tuple or list of two '
+                         'floats. Received arg: ', self.brightness_range)
+      # Mirrors `random_brightness`: `array_to_img` shifts each image only if
+      # it has negative values and rescales it to [0, 255], and PIL truncates
+      # the enhanced values to integers.
+      x = x + np.maximum(-np.min(x, axis=(1, 2, 3), keepdims=True), 0)
+      max_x = np.max(x, axis=(1, 2, 3), keepdims=True)
+      x /= np.where(max_x == 0, 1, max_x)
+      x = np.floor(x * 255)
+      brightness = np.random.uniform(self.brightness_range[0],
+                                     self.brightness_range[1],
+                                     (num_samples, 1, 1, 1)).astype(x.dtype)
+      x = np.floor(np.clip(x * brightness, 0, 255)).astype(K.floatx())
+
+    if self.data_format == 'channels_first':
+      x = np.transpose(x, (0, 3, 1, 2))
+    return x
+
   def fit(self, x, augment=False, rounds=1, seed=None):
     """Computes the internal data statistics based on an array of sample data.
 
@@ -1251,13 +1485,10 @@ class NumpyArrayIterator(Iterator):
                                              seed)
 
   def _get_batches_of_transformed_samples(self, index_array):
-    batch_x = np.zeros(
-        tuple([len(index_array)] + list(self.x.shape)[1:]), dtype=K.floatx())
-    for i, j in enumerate(index_array):
-      x = self.x[j]
-      x = self.image_data_generator.random_transform(x.astype(K.floatx()))
-      x = self.image_data_generator.standardize(x)
-      batch_x[i] = x
+    batch_x = self.image_data_generator.random_transform_batch(
+        self.x[index_array])
+    for i in range(len(batch_x)):
+      batch_x[i] = self.image_data_generator.standardize(batch_x[i])
     if self.save_to_dir:
       for i, j in enumerate(index_array):
         img = array_to_img(batch_x[i], self.data_format, scale=True)
@@ -1287,7 +1518,196 @@ class NumpyArrayIterator(Iterator):
     return self._get_batches_of_transformed_samples(index_array)
 
 
-def _iter_valid_files(directory, white_list_formats, follow_links):
+class _FileIndex(object):
+  """Persistent listing of the files below a directory.
+
+  The listing of each directory is stored together with the directory's
+  modification time, so that on later runs a directory whose mtime did not
+  change is reused with a single `stat` instead of being listed again (and
+  its files `stat`-ed again). Files rewritten in place, which does not touch
+  the mtime of their directory, are therefore not noticed.
+
+  Arguments:
+      root: directory that the indexed paths are relative to.
+      path: path of the index file. It is read if it exists, and written by
+          `save` if anything changed.
+      follow_links: whether to follow symlinks to directories.
+  """
+
+  _VERSION = 1
+
+  def __init__(self, root, path, follow_links=False):
+    self.root = root
+    self.path = path
+    self.follow_links = follow_links
+    self._dirs = {}
+    self._dirty = False
+    self._lock = threading.Lock()
+    if os.path.exists(path):
+      try:
+        with open(path, 'r') as f:
+          index = json.load(f)
+        if (index.get('version') == self._VERSION and
+            index.get('follow_links') == follow_links):
+          self._dirs = index['dirs']
+      except (IOError, OSError, ValueError, KeyError):
+        logging.warning('Ignoring unreadable file index ' + path)
+
+  def _list_directory(self, path):
+    """Returns the (validated) index entry of a directory."""
+    key = os.path.relpath(path, self.root)
+    try:
+      mtime = os.stat(path).st_mtime
+    except OSError:
+      return {'mtime': None, 'dirs': [], 'files': {}}
+    with self._lock:
+      entry = self._dirs.get(key)
+    if entry is not None and entry['mtime'] == mtime:
+      return entry
+
+    dirs = []
+    files = {}
+    for name in os.listdir(path):
+      full_path = os.path.join(path, name)
+      if os.path.isdir(full_path):
+        if self.follow_links or not os.path.islink(full_path):
+          dirs.append(name)
+        continue
+      try:
+        stat = os.stat(full_path)
+      except OSError:
+        continue
+      files[name] = [stat.st_size, stat.st_mtime]
+    entry = {'mtime': mtime, 'dirs': sorted(dirs), 'files': files}
+    with self._lock:
+      self._dirs[key] = entry
+      self._dirty = True
+    return entry
+
+  def walk(self, directory):
+    """Lists `directory` recursively, like a sorted `os.walk`.
+
+    Arguments:
+        directory: directory below `root` to list.
+
+    Returns:
+        List of `(dirpath, filenames)` tuples sorted by `dirpath`.
+    """
+    results = []
+    pending = [directory]
+    while pending:
+      path = pending.pop()
+      entry = self._list_directory(path)
+      results.append((path, sorted(entry['files'])))
+      pending.extend(os.path.join(path, name) for name in entry['dirs'])
+    return sorted(results, key=lambda x: x[0])
+
+  def file_stat(self, path):
+    """Returns the indexed `(size, mtime)` of a file, or `None`."""
+    dirpath, fname = os.path.split(path)
+    with self._lock:
+      entry = self._dirs.get(os.path.relpath(dirpath, self.root))
+    if entry is None or fname not in entry['files']:
+      return None
+    return tuple(entry['files'][fname])
+
+  def save(self):
+    """Writes the index back to `path` if it changed."""
+    with self._lock:
+      if not self._dirty:
+        return
+      index = {
+          'version': self._VERSION,
+          'follow_links': self.follow_links,
+          'dirs': self._dirs
+      }
+      tmp_path = '%s.tmp-%d' % (self.path, os.getpid())
+      with open(tmp_path, 'w') as f:
+        json.dump(index, f)
+      getattr(os, 'replace', os.rename)(tmp_path, self.path)
+      self._dirty = False
+
+
+class _DecodedImageCache(object):
+  """Size-bounded on-disk cache of decoded images.
+
+  Every entry is a `.npy` file named after its key, read back memory-mapped.
+  When the cache grows beyond `max_bytes`, the least recently used entries
+  are evicted; entries found on disk at construction are ordered by
+  modification time. Several processes may share a cache directory: entries
+  evicted by another process are simply decoded again.
+
+  Arguments:
+      cache_dir: directory holding the cached arrays. Created if needed.
+      max_bytes: maximum total size of the cached arrays, or `None` for no
+          bound.
+  """
+
+  def __init__(self, cache_dir, max_bytes=None):
+    if not os.path.exists(cache_dir):
+      try:
+        os.makedirs(cache_dir)
+      except OSError:
+        if not os.path.isdir(cache_dir):
+          raise
+    self.cache_dir = cache_dir
+    self.max_bytes = max_bytes
+    self._lock = threading.Lock()
+    entries = []
+    for name in os.listdir(cache_dir):
+      if name.endswith('.npy'):
+        stat = os.stat(os.path.join(cache_dir, name))
+        entries.append((stat.st_mtime, name[:-len('.npy')], stat.st_size))
+    self._entries = collections.OrderedDict(
+        (key, size) for _, key, size in sorted(entries))
+    self._total_bytes = sum(self._entries.values())
+    self._evict()
+
+  def _path(self, key):
+    return os.path.join(self.cache_dir, key + '.npy')
+
+  def _evict(self):
+    # Must be called with `self._lock` held (or before sharing the cache).
+    while (self.max_bytes is not None and self._entries and
+           self._total_bytes > self.max_bytes):
+      key, size = self._entries.popitem(last=False)
+      self._total_bytes -= size
+      try:
+        os.remove(self._path(key))
+      except OSError:
+        pass
+
+  def get(self, key):
+    """Returns the cached array for `key`, or `None`."""
+    with self._lock:
+      size = self._entries.pop(key, None)
+      if size is None:
+        return None
+      self._entries[key] = size
+    try:
+      return np.load(self._path(key), mmap_mode='r')
+    except (IOError, OSError, ValueError):
+      with self._lock:
+        if self._entries.pop(key, None) is not None:
+          self._total_bytes -= size
+      return None
+
+  def put(self, key, x):
+    """Stores array `x` under `key`, evicting older entries if needed."""
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+    with os.fdopen(fd, 'wb') as f:
+      np.save(f, x)
+    path = self._path(key)
+    getattr(os, 'replace', os.rename)(tmp_path, path)
+    size = os.path.getsize(path)
+    with self._lock:
+      self._total_bytes += size - self._entries.pop(key, 0)
+      self._entries[key] = size
+      self._evict()
+
+
+def _iter_valid_files(directory, white_list_formats, follow_links,
+                      file_index=None):
   """Count files with extension in `white_list_formats` contained in directory.
 
   Arguments:
@@ -1296,16 +1716,19 @@ def _iter_valid_files(directory, white_list_formats, follow_links):
       white_list_formats: set of strings containing allowed extensions for
           the files to be counted.
       follow_links: boolean.
+      file_index: optional `_FileIndex` to list the directory through.
 
   Yields:
       tuple of (root, filename) with extension in `white_list_formats`.
   """
 
   def _recursive_list(subpath):
-    return sorted(
-        os.walk(subpath, followlinks=follow_links), key=lambda x: x[0])
+    if file_index is not None:
+      return file_index.walk(subpath)
+    return [(root, files) for root, _, files in sorted(
+        os.walk(subpath, followlinks=follow_links), key=lambda x: x[0])]
 
-  for root, _, files in _recursive_list(directory):
+  for root, files in _recursive_list(directory):
     for fname in sorted(files):
       for extension in white_list_formats:
         if fname.lower().endswith('.tiff'):
@@ -1317,7 +1740,7 @@ def _iter_valid_files(directory, white_list_formats, follow_links):
 
 
 def _count_valid_files_in_directory(directory, white_list_formats, split,
-                                    follow_links):
+                                    follow_links, file_index=None):
   """Count files with extension in `white_list_formats` contained in directory.
 
   Arguments:
@@ -1330,13 +1753,16 @@ def _count_valid_files_in_directory(directory, white_list_formats, split,
           E.g.: `segment=(0.6, 1.0)` would only account for last 40 percent
           of images in each directory.
       follow_links: boolean.
+      file_index: optional `_FileIndex` to list the directory through.
 
   Returns:
       the count of files with extension in `white_list_formats` contained in
       the directory.
   """
   num_files = len(
-      list(_iter_valid_files(directory, white_list_formats, follow_links)))
+      list(
+          _iter_valid_files(directory, white_list_formats, follow_links,
+                            file_index)))
   if split:
     start, stop = int(split[0] * num_files), int(split[1] * num_files)
   else:
@@ -1344,8 +1770,12 @@ def _count_valid_files_in_directory(directory, white_list_formats, split,
   return stop - start
 
 
-def _list_valid_filenames_in_directory(directory, white_list_formats, split,
-                                       class_indices, follow_links):
+def _list_valid_filenames_in_directory(directory,
+                                       white_list_formats,
+                                       split,
+                                       class_indices,
+                                       follow_links,
+                                       file_index=None):
   """List paths of files in `subdir` with extensions in `white_list_formats`.
 
   Arguments:
@@ -1360,6 +1790,7 @@ def _list_valid_filenames_in_directory(directory, white_list_formats, split,
           of images in each directory.
       class_indices: dictionary mapping a class name to its index.
       follow_links: boolean.
+      file_index: optional `_FileIndex` to list the directory through.
 
   Returns:
       classes: a list of class indices
@@ -1368,15 +1799,13 @@ def _list_valid_filenames_in_directory(directory, white_list_formats, split,
           the filenames will be ["class1/file1.jpg", "class1/file2.jpg", ...]).
   """
   dirname = os.path.basename(directory)
+  valid_files = _iter_valid_files(directory, white_list_formats, follow_links,
+                                  file_index)
   if split:
-    num_files = len(
-        list(_iter_valid_files(directory, white_list_formats, follow_links)))
+    valid_files = list(valid_files)
+    num_files = len(valid_files)
     start, stop = int(split[0] * num_files), int(split[1] * num_files)
-    valid_files = list(
-        _iter_valid_files(directory, white_list_formats,
-                          follow_links))[start:stop]
-  else:
-    valid_files = _iter_valid_files(directory, white_list_formats, follow_links)
+    valid_files = valid_files[start:stop]
 
   classes = []
   filenames = []
@@ -1434,6 +1863,14 @@ class DirectoryIterator(Iterator):
           If PIL version 1.1.3 or newer is installed, "lanczos" is also
           supported. If PIL version 3.4.0 or newer is installed, "box" and
           "hamming" are also supported. By default, "nearest" is used.
+      index_file: Optional path of a file in which to persist the listing
+          of `directory` (file names, sizes and modification times). On
+          later runs only the subdirectories that changed are listed again.
+      cache_dir: Optional directory in which to cache the decoded and
+          resized images, so that they are not decoded again on later
+          epochs (or runs). Cached images are read back memory-mapped.
+      cache_size: Maximum size in bytes of `cache_dir`; the least recently
+          used images are evicted beyond it. `None` means no bound.
   """
 
   def __init__(self,
@@ -1452,7 +1889,10 @@ class DirectoryIterator(Iterator):
                save_format='png',
                follow_links=False,
                subset=None,
-               interpolation='nearest'):
+               interpolation='nearest',
+               index_file=None,
+               cache_dir=None,
+               cache_size=None):
     if data_format is None:
       data_format = K.image_data_format()
     self.directory = directory
@@ -1511,12 +1951,22 @@ class DirectoryIterator(Iterator):
     self.num_classes = len(classes)
     self.class_indices = dict(zip(classes, range(len(classes))))
 
+    if index_file is not None:
+      self._file_index = _FileIndex(directory, index_file, follow_links)
+    else:
+      self._file_index = None
+    if cache_dir is not None:
+      self._decoded_cache = _DecodedImageCache(cache_dir, cache_size)
+    else:
+      self._decoded_cache = None
+
     pool = multiprocessing.pool.ThreadPool()
     function_partial = partial(
         _count_valid_files_in_directory,
         white_list_formats=white_list_formats,
         follow_links=follow_links,
-        split=split)
+        split=split,
+        file_index=self._file_index)
     self.samples = sum(
         pool.map(function_partial,
                  (os.path.join(directory, subdir) for subdir in classes)))
@@ -1534,7 +1984,8 @@ class DirectoryIterator(Iterator):
       results.append(
           pool.apply_async(_list_valid_filenames_in_directory,
                            (dirpath, white_list_formats, split,
-                            self.class_indices, follow_links)))
+                            self.class_indices, follow_links,
+                            self._file_index)))
     for res in results:
       classes, filenames = res.get()
       self.classes[i:i + len(classes)] = classes
@@ -1543,24 +1994,50 @@ class DirectoryIterator(Iterator):
 
     pool.close()
     pool.join()
+    if self._file_index is not None:
+      self._file_index.save()
     super(DirectoryIterator, self).__init__(self.samples, batch_size, shuffle,
                                             seed)
 
+  def _decoded_cache_key(self, path):
+    """Returns the key of an image in the decoded image cache."""
+    stat = None
+    if self._file_index is not None:
+      stat = self._file_index.file_stat(path)
+    if stat is None:
+      os_stat = os.stat(path)
+      stat = (os_stat.st_size, os_stat.st_mtime)
+    key = repr((os.path.relpath(path, self.directory), stat, self.target_size,
+                self.color_mode, self.interpolation, self.data_format))
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+  def _load_image(self, j):
+    """Loads image `j` as an array, going through the decoded image cache."""
+    path = os.path.join(self.directory, self.filenames[j])
+    if self._decoded_cache is not None:
+      key = self._decoded_cache_key(path)
+      x = self._decoded_cache.get(key)
+      if x is not None:
+        return x
+    img = load_img(
+        path,
+        grayscale=self.color_mode == 'grayscale',
+        target_size=self.target_size,
+        interpolation=self.interpolation)
+    x = img_to_array(img, data_format=self.data_format)
+    if self._decoded_cache is not None:
+      # `load_img` always yields 8-bit images, so this is lossless.
+      self._decoded_cache.put(key, x.astype(np.uint8))
+    return x
+
   def _get_batches_of_transformed_samples(self, index_array):
     batch_x = np.zeros((len(index_array),) + self.image_shape, dtype=K.floatx())
-    grayscale = self.color_mode == 'grayscale'
     # build batch of image data
     for i, j in enumerate(index_array):
-      fname = self.filenames[j]
-      img = load_img(
-          os.path.join(self.directory, fname),
-          grayscale=grayscale,
-          target_size=self.target_size,
-          interpolation=self.interpolation)
-      x = img_to_array(img, data_format=self.data_format)
-      x = self.image_data_generator.random_transform(x)
-      x = self.image_data_generator.standardize(x)
-      batch_x[i] = x
+      batch_x[i] = self._load_image(j)
+    batch_x = self.image_data_generator.random_transform_batch(batch_x)
+    for i in range(len(batch_x)):
+      batch_x[i] = self.image_data_generator.standardize(batch_x[i])
     # optionally save augmented images to disk for debugging purposes
     if self.save_to_dir:
       for i, j in enumerate(index_array):
@@ -278,6 +278,58 @@ class TestImage(test.TestCase):
     x1, y1 = dir_seq[5]
     self.assertTrue((x1 == 0).all())
 
+  def test_directory_iterator_index_and_cache(self):
+    if PIL is None:
+      return  # Skip test if PIL is not available.
+
+    temp_dir = self.get_temp_dir()
+    image_dir = os.path.join(temp_dir, 'images')
+    index_file = os.path.join(temp_dir, 'index.json')
+    cache_dir = os.path.join(temp_dir, 'cache')
+    self.addCleanup(shutil.rmtree, temp_dir)
+    for path in ['class-0', 'class-1', os.path.join('class-1', 'subfolder')]:
+      os.makedirs(os.path.join(image_dir, path))
+
+    rgb_images = _generate_test_images()[0]
+    for i, im in enumerate(rgb_images[:6]):
+      path = ['class-0', 'class-1', os.path.join('class-1', 'subfolder')][i % 3]
+      im.save(os.path.join(image_dir, path, 'image-{}.png'.format(i)))
+
+    generator = keras.preprocessing.image.ImageDataGenerator()
+    kwargs = dict(target_size=(10, 10), shuffle=False, batch_size=6)
+    reference = generator.flow_from_directory(image_dir, **kwargs)
+    dir_seq = generator.flow_from_directory(
+        image_dir, index_file=index_file, cache_dir=cache_dir, **kwargs)
+    self.assertEqual(dir_seq.filenames, reference.filenames)
+    self.assertTrue(os.path.exists(index_file))
+    x_ref, y_ref = reference[0]
+    for _ in range(2):  # Decodes, then reads back from the cache.
+      x, y = dir_seq[0]
+      self.assertAllEqual(x, x_ref)
+      self.assertAllEqual(y, y_ref)
+    self.assertEqual(len(os.listdir(cache_dir)), 6)
+
+    # New files are picked up through the index.
+    rgb_images[6].save(os.path.join(image_dir, 'class-0', 'image-6.png'))
+    # Do not depend on the resolution of the file system's timestamps.
+    stat = os.stat(os.path.join(image_dir, 'class-0'))
+    os.utime(os.path.join(image_dir, 'class-0'),
+             (stat.st_atime, stat.st_mtime + 1))
+    dir_seq = generator.flow_from_directory(
+        image_dir, index_file=index_file, **kwargs)
+    reference = generator.flow_from_directory(image_dir, **kwargs)
+    self.assertEqual(dir_seq.filenames, reference.filenames)
+    self.assertEqual(len(dir_seq.filenames), 7)
+
+    # The cache is kept under `cache_size`.
+    entry_size = os.path.getsize(
+        os.path.join(cache_dir, os.listdir(cache_dir)[0]))
+    dir_seq = generator.flow_from_directory(
+        image_dir, cache_dir=cache_dir, cache_size=3 * entry_size, **kwargs)
+    x, _ = dir_seq[0]
+    self.assertAllEqual(x, reference[0][0])
+    self.assertEqual(len(os.listdir(cache_dir)), 3)
+
   def directory_iterator_with_validation_split_test_helper(
       self, validation_split):
     if PIL is None:
@@ -385,6 +437,28 @@ class TestImage(test.TestCase):
     x = keras.preprocessing.image.img_to_array(img, data_format='channels_last')
     self.assertEqual(x.shape, (height, width, 1))
 
+  def test_load_img_reduced_jpeg_decoding(self):
+    if PIL is None:
+      return  # Skip test if PIL is not available.
+
+    temp_dir = self.get_temp_dir()
+    fname = os.path.join(temp_dir, 'large.jpg')
+    x = np.zeros((160, 120, 3))
+    x[:80] = 255.
+    keras.preprocessing.image.array_to_img(x, scale=False).save(fname)
+
+    img = keras.preprocessing.image.load_img(fname, target_size=(20, 30))
+    self.assertEqual(img.size, (30, 20))
+    self.assertEqual(img.mode, 'RGB')
+    x = keras.preprocessing.image.img_to_array(img)
+    self.assertGreater(x[:8].mean(), 200)
+    self.assertLess(x[-8:].mean(), 50)
+
+    img = keras.preprocessing.image.load_img(
+        fname, grayscale=True, target_size=(20, 30))
+    self.assertEqual(img.size, (30, 20))
+    self.assertEqual(img.mode, 'L')
+
   def test_batch_standardize(self):
     if PIL is None:
       return  # Skip test if PIL is not available.
@@ -420,6 +494,135 @@ class TestImage(test.TestCase):
         transformed[i] = generator.random_transform(im)
       transformed = generator.standardize(transformed)
 
+  def test_random_transform_batch(self):
+    x = np.random.random((5, 12, 10, 3)).astype(np.float32)
+    for data_format in ['channels_last', 'channels_first']:
+      images = x if data_format == 'channels_last' else np.transpose(
+          x, (0, 3, 1, 2))
+      generator = keras.preprocessing.image.ImageDataGenerator(
+          rotation_range=90.,
+          width_shift_range=0.1,
+          height_shift_range=2,
+          shear_range=0.5,
+          zoom_range=0.2,
+          channel_shift_range=0.5,
+          brightness_range=(1, 5),
+          horizontal_flip=True,
+          vertical_flip=True,
+          data_format=data_format)
+      original = np.copy(images)
+      transformed = generator.random_transform_batch(images)
+      self.assertEqual(transformed.shape, images.shape)
+      self.assertAllEqual(images, original)
+
+    # Without augmentation the batch goes through untouched.
+    generator = keras.preprocessing.image.ImageDataGenerator()
+    self.assertAllClose(generator.random_transform_batch(x), x)
+
+    # Flips are sampled per image.
+    generator = keras.preprocessing.image.ImageDataGenerator(
+        horizontal_flip=True)
+    transformed = generator.random_transform_batch(x, seed=1)
+    for image, flipped in zip(x, transformed):
+      self.assertTrue(np.allclose(flipped, image) or
+                      np.allclose(flipped, image[:, ::-1]))
+
+    # A one pixel shift moves every row up, repeating the last one.
+    matrices = np.tile(np.eye(3), (5, 1, 1))
+    matrices[:, 0, 2] = 1
+    shifted = keras.preprocessing.image._apply_transform_batch(x, matrices)
+    self.assertAllClose(shifted[:, :-1], x[:, 1:])
+    self.assertAllClose(shifted[:, -1], x[:, -1])
+    shifted = keras.preprocessing.image._apply_transform_batch(
+        x, matrices, fill_mode='constant', cval=-1.)
+    self.assertAllClose(shifted[:, -1], -np.ones_like(x[:, -1]))
+
+  def test_random_transform_batch_matches_random_transform(self):
+    if PIL is None:
+      return  # Skip test if PIL is not available.
+
+    num_samples, h, w = 4, 12, 10
+    # Non-negative images whose minimum is not 0, which `random_brightness`
+    # does not shift.
+    x = np.random.uniform(10, 200, (num_samples, h, w, 3)).astype(np.float32)
+    seed = 1
+
+    def apply_transforms(matrices):
+      return np.stack([
+          keras.preprocessing.image.apply_transform(
+              image,
+              keras.preprocessing.image.transform_matrix_offset_center(
+                  matrix, h, w),
+              channel_axis=2) for image, matrix in zip(x, matrices)
+      ])
+
+    # The same parameters are drawn for the whole batch as `random_transform`
+    # would draw for each image.
+    generator = keras.preprocessing.image.ImageDataGenerator(
+        rotation_range=90.)
+    np.random.seed(seed)
+    theta = np.deg2rad(np.random.uniform(-90., 90., num_samples))
+    expected = apply_transforms(
+        [np.array([[np.cos(t), -np.sin(t), 0], [np.sin(t), np.cos(t), 0],
+                   [0, 0, 1]]) for t in theta])
+    self.assertAllClose(
+        generator.random_transform_batch(x, seed=seed), expected,
+        rtol=1e-4, atol=1e-3)
+
+    generator = keras.preprocessing.image.ImageDataGenerator(shear_range=30.)
+    np.random.seed(seed)
+    shear = np.deg2rad(np.random.uniform(-30., 30., num_samples))
+    expected = apply_transforms(
+        [np.array([[1, -np.sin(s), 0], [0, np.cos(s), 0], [0, 0, 1]])
+         for s in shear])
+    self.assertAllClose(
+        generator.random_transform_batch(x, seed=seed), expected,
+        rtol=1e-4, atol=1e-3)
+
+    generator = keras.preprocessing.image.ImageDataGenerator(zoom_range=0.3)
+    np.random.seed(seed)
+    zoom = np.random.uniform(0.7, 1.3, (2, num_samples))
+    expected = apply_transforms(
+        [np.array([[zx, 0, 0], [0, zy, 0], [0, 0, 1]])
+         for zx, zy in zip(zoom[0], zoom[1])])
+    self.assertAllClose(
+        generator.random_transform_batch(x, seed=seed), expected,
+        rtol=1e-4, atol=1e-3)
+
+    generator = keras.preprocessing.image.ImageDataGenerator(
+        brightness_range=(0.5, 1.5))
+    np.random.seed(seed)
+    brightness = np.random.uniform(0.5, 1.5, num_samples)
+    expected = np.stack([
+        keras.preprocessing.image.ImageDataGenerator(
+            brightness_range=(u, u)).random_transform(image)
+        for image, u in zip(x, brightness)
+    ])
+    self.assertAllClose(
+        generator.random_transform_batch(x, seed=seed), expected, atol=1.)
+
+  def test_random_transform_batch_dispatch(self):
+    x = np.random.random((5, 12, 10, 3)).astype(np.float32)
+
+    def fail(*unused_args, **unused_kwargs):
+      raise AssertionError('random_transform should not be called.')
+
+    # A plain generator takes the vectorized path, which never calls
+    # `random_transform`.
+    generator = keras.preprocessing.image.ImageDataGenerator(
+        horizontal_flip=True)
+    generator.random_transform = fail
+    self.assertEqual(generator.random_transform_batch(x).shape, x.shape)
+
+    # A subclass overriding `random_transform` has it applied to each image.
+    class CustomGenerator(keras.preprocessing.image.ImageDataGenerator):
+
+      def random_transform(self, x, seed=None):
+        return -x
+
+    generator = CustomGenerator(horizontal_flip=True)
+    self.assertAllClose(generator.random_transform_batch(x), -x)
+
   def test_img_transforms(self):
     x = np.random.random((3, 200, 200))
     _ = keras.preprocessing.image.random_rotation(x, 20)
@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import itertools
 import random
 
 import numpy as np
@@ -91,6 +92,20 @@ def pad_sequences(sequences,
       sample_shape = np.asarray(s).shape[1:]
       break
 
+  if not sample_shape:
+    # Sequences of scalars: flatten them all at once and scatter the values
+    # into place, falling back to the loop below to report invalid entries.
+    try:
+      values = np.fromiter(
+          itertools.chain.from_iterable(sequences),
+          dtype=dtype,
+          count=sum(lengths))
+    except (TypeError, ValueError):
+      values = None
+    if values is not None:
+      return _pad_flat_sequences(values, lengths, maxlen, dtype, padding,
+                                 truncating, value)
+
   x = (np.ones((num_samples, maxlen) + sample_shape) * value).astype(dtype)
   for idx, s in enumerate(sequences):
     if not len(s):  # pylint: disable=g-explicit-length-test
@@ -118,6 +133,45 @@ def pad_sequences(sequences,
   return x
 
 
+def _pad_flat_sequences(values, lengths, maxlen, dtype, padding, truncating,
+                        value):
+  """Pads sequences given as concatenated values and per-sequence lengths.
+
+  Arguments:
+      values: 1D Numpy array, the concatenation of all the sequences.
+      lengths: List or 1D Numpy array of the lengths of the sequences.
+      maxlen: Int, length of the padded sequences.
+      dtype: Type of the output sequences.
+      padding: String, 'pre' or 'post'.
+      truncating: String, 'pre' or 'post'.
+      value: Padding value.
+
+  Returns:
+      Numpy array with shape `(len(lengths), maxlen)`.
+
+  Raises:
+      ValueError: In case of invalid values for `truncating` or `padding`.
+  """
+  if truncating not in ('pre', 'post'):
+    raise ValueError('Truncating type "%s" not understood' % truncating)
+  if padding not in ('pre', 'post'):
+    raise ValueError('Padding type "%s" not understood' % padding)
+  lengths = np.asarray(lengths, dtype=np.int64)
+  kept = np.minimum(lengths, maxlen)
+  src_start = np.cumsum(lengths) - lengths
+  if truncating == 'pre':
+    src_start += lengths - kept
+  dst_start = maxlen - kept if padding == 'pre' else np.zeros_like(kept)
+
+  # For every kept value: its row, and its position within the kept part.
+  rows = np.repeat(np.arange(len(lengths)), kept)
+  positions = np.arange(rows.size) - np.repeat(np.cumsum(kept) - kept, kept)
+
+  x = np.full((len(lengths), maxlen), value, dtype=dtype)
+  x[rows, dst_start[rows] + positions] = values[src_start[rows] + positions]
+  return x
+
+
 @tf_export('keras.preprocessing.sequence.make_sampling_table')
 def make_sampling_table(size, sampling_factor=1e-5):
   """Generates a word rank-based probabilistic sampling table.
@@ -207,50 +261,51 @@ def skipgrams(sequence,
       By convention, index 0 in the vocabulary is
       a non-word and will be skipped.
   """
-  couples = []
-  labels = []
-  for i, wi in enumerate(sequence):
-    if not wi:
-      continue
-    if sampling_table is not None:
-      if sampling_table[wi] < random.random():
-        continue
-
-    window_start = max(0, i - window_size)
-    window_end = min(len(sequence), i + window_size + 1)
-    for j in range(window_start, window_end):
-      if j != i:
-        wj = sequence[j]
-        if not wj:
-          continue
-        couples.append([wi, wj])
-        if categorical:
-          labels.append([0, 1])
-        else:
-          labels.append(1)
-
-  if negative_samples > 0:
-    num_negative_samples = int(len(labels) * negative_samples)
-    words = [c[0] for c in couples]
-    random.shuffle(words)
-
-    couples += [[words[i % len(words)],
-                 random.randint(1, vocabulary_size - 1)]
-                for i in range(num_negative_samples)]
-    if categorical:
-      labels += [[1, 0]] * num_negative_samples
-    else:
-      labels += [0] * num_negative_samples
-
+  # All the randomness below is drawn from `rng`, itself seeded from the
+  # `random` module so that seeding the latter keeps results reproducible.
+  rng = np.random.RandomState(random.randint(0, 2**31 - 1))
+  sequence = np.asarray(sequence, dtype=np.int64).reshape(-1)
+
+  centers = np.nonzero(sequence)[0]
+  if sampling_table is not None:
+    sampling_table = np.asarray(sampling_table)
+    keep = sampling_table[sequence[centers]] >= rng.random_sample(
+        len(centers))
+    centers = centers[keep]
+
+  # Context positions of every center word, in the same order as a scan
+  # of each window from left to right.
+  offsets = np.concatenate(
+      [np.arange(-window_size, 0),
+       np.arange(1, window_size + 1)])
+  contexts = centers[:, np.newaxis] + offsets[np.newaxis, :]
+  valid = (contexts >= 0) & (contexts < len(sequence))
+  valid[valid] = sequence[contexts[valid]] != 0
+  pairs = np.stack(
+      [np.repeat(sequence[centers], valid.sum(axis=1)),
+       sequence[contexts[valid]]], axis=1)
+  num_positive_samples = len(pairs)
+
+  if negative_samples > 0 and num_positive_samples:
+    num_negative_samples = int(num_positive_samples * negative_samples)
+    words = rng.permutation(pairs[:, 0])
+    negatives = np.stack(
+        [np.resize(words, num_negative_samples),
+         rng.randint(1, vocabulary_size, size=num_negative_samples)], axis=1)
+    pairs = np.concatenate([pairs, negatives])
+
+  labels = np.zeros(len(pairs), dtype=np.int64)
+  labels[:num_positive_samples] = 1
   if shuffle:
     if seed is None:
       seed = random.randint(0, 10e6)
-    random.seed(seed)
-    random.shuffle(couples)
-    random.seed(seed)
-    random.shuffle(labels)
+    permutation = np.random.RandomState(seed).permutation(len(pairs))
+    pairs = pairs[permutation]
+    labels = labels[permutation]
+  if categorical:
+    labels = np.stack([1 - labels, labels], axis=1)
 
-  return couples, labels
+  return pairs.tolist(), labels.tolist()
 
 
 def _remove_long_seq(maxlen, seq, label):
@@ -272,6 +327,75 @@ def _remove_long_seq(maxlen, seq, label):
   return new_seq, new_label
 
 
+def _pack_sequences(seqs):
+  """Concatenates sequences of integers into `(values, lengths)` arrays."""
+  lengths = np.array([len(x) for x in seqs], dtype='int64')
+  values = np.fromiter(
+      itertools.chain.from_iterable(seqs), dtype='int64',
+      count=int(lengths.sum()))
+  return values, lengths
+
+
+def _index_sequences(values, lengths, order=None, num_words=None,
+                     skip_top=0, maxlen=None, start_char=1, oov_char=2,
+                     index_from=3):
+  """Prepares the word index sequences of the text datasets.
+
+  This is the vectorized equivalent of the preprocessing of
+  `keras.datasets.imdb.load_data` and `keras.datasets.reuters.load_data`,
+  applied to sequences packed by `_pack_sequences`.
+
+  Arguments:
+      values: Int array, the concatenated sequences.
+      lengths: Int array, the length of each sequence.
+      order: Indices of the sequences to keep, in order, or `None` for all.
+      num_words: Only words with an index lower than `num_words` are kept.
+          Defaults to the largest index.
+      skip_top: Words with an index lower than `skip_top` are not kept.
+      maxlen: Sequences of `maxlen` or more words are removed.
+      start_char: Index prepended to each sequence, or `None`.
+      oov_char: Index replacing the words that are not kept, or `None` to
+          remove them.
+      index_from: Offset added to the word indices.
+
+  Returns:
+      The list of sequences (lists of ints), and a boolean array telling
+      which of the sequences of `order` were kept.
+  """
+  values = np.asarray(values, dtype='int64')
+  lengths = np.asarray(lengths, dtype='int64')
+  if order is not None:
+    starts = np.cumsum(lengths) - lengths
+    lengths = lengths[order]
+    new_starts = np.cumsum(lengths) - lengths
+    values = values[np.arange(lengths.sum()) +
+                    np.repeat(starts[order] - new_starts, lengths)]
+  if start_char is not None or index_from:
+    values = values + index_from
+  if start_char is not None:
+    values = np.insert(values, np.cumsum(lengths) - lengths, start_char)
+    lengths = lengths + 1
+
+  kept = np.ones(len(lengths), dtype=bool)
+  if maxlen:
+    kept = lengths < maxlen
+    values = values[np.repeat(kept, lengths)]
+    lengths = lengths[kept]
+
+  if not num_words:
+    num_words = values.max()
+  in_range = (skip_top <= values) & (values < num_words)
+  if oov_char is not None:
+    values = np.where(in_range, values, oov_char)
+  else:
+    sequence_ids = np.repeat(np.arange(len(lengths)), lengths)
+    values = values[in_range]
+    lengths = np.bincount(sequence_ids[in_range], minlength=len(lengths))
+
+  seqs = np.split(values, np.cumsum(lengths)[:-1]) if len(lengths) else []
+  return [x.tolist() for x in seqs], kept
+
+
 @tf_export('keras.preprocessing.sequence.TimeseriesGenerator')
 class TimeseriesGenerator(Sequence):
   """Utility class for generating batches of temporal data.
@@ -306,6 +430,10 @@ class TimeseriesGenerator(Sequence):
       batch_size: Number of timeseries samples in each batch
           (except maybe the last one).
 
+  When `data` is a Numpy array, the samples of a batch are read through
+  a strided view of `data`; unless `shuffle` is set, the batches are
+  themselves read-only views of `data` with its dtype, and are not copied.
+
   Returns:
       A [Sequence](/utils/#sequence) instance.
 
@@ -376,6 +504,21 @@ class TimeseriesGenerator(Sequence):
     targets_shape.extend(self.targets.shape[1:])
     return np.empty(samples_shape), np.empty(targets_shape)
 
+  def _windows(self):
+    """Returns a read-only view of `data` with one sample per current step.
+
+    Entry `k` of the view is the sample whose current step is `k + length`.
+    """
+    num_steps = len(range(0, self.length, self.sampling_rate))
+    return np.lib.stride_tricks.as_strided(
+        self.data,
+        shape=(max(len(self.data) - self.length, 0), num_steps) +
+        self.data.shape[1:],
+        strides=(self.data.strides[0],
+                 self.data.strides[0] * self.sampling_rate) +
+        self.data.strides[1:],
+        writeable=False)
+
   def __getitem__(self, index):
     if self.shuffle:
       rows = np.random.randint(
@@ -386,11 +529,20 @@ class TimeseriesGenerator(Sequence):
           i, min(i + self.batch_size * self.stride, self.end_index + 1),
           self.stride)
 
-    samples, targets = self._empty_batch(len(rows))
-    for j in range(len(rows)):
-      indices = range(rows[j] - self.length, rows[j], self.sampling_rate)
-      samples[j] = self.data[indices]
-      targets[j] = self.targets[rows[j]]
+    if isinstance(self.data, np.ndarray):
+      windows = self._windows()
+      if self.shuffle or not len(rows):  # pylint: disable=g-explicit-length-test
+        samples = windows[rows - self.length]
+      else:
+        samples = windows[rows[0] - self.length:rows[-1] - self.length + 1:
+                          self.stride]
+      targets = self.targets[rows]
+    else:
+      samples, targets = self._empty_batch(len(rows))
+      for j in range(len(rows)):
+        indices = range(rows[j] - self.length, rows[j], self.sampling_rate)
+        samples[j] = self.data[indices]
+        targets[j] = self.targets[rows[j]]
     if self.reverse:
       return samples[:, ::-1, ...], targets
     return samples, targets
@@ -49,6 +49,22 @@ class TestSequence(test.TestCase):
     b = keras.preprocessing.sequence.pad_sequences(a, maxlen=3, value=1)
     self.assertAllClose(b, [[1, 1, 1], [1, 1, 2], [1, 2, 3]])
 
+  def test_pad_sequences_ragged(self):
+    a = [[], [1, 2, 3, 4, 5], [6], np.array([7, 8, 9])]
+    b = keras.preprocessing.sequence.pad_sequences(
+        a, maxlen=3, padding='post', truncating='pre', value=-1)
+    self.assertAllEqual(b, [[-1, -1, -1], [3, 4, 5], [6, -1, -1], [7, 8, 9]])
+    b = keras.preprocessing.sequence.pad_sequences(
+        a, padding='pre', truncating='post', dtype='float32')
+    self.assertEqual(b.dtype, np.float32)
+    self.assertAllEqual(b, [[0, 0, 0, 0, 0], [1, 2, 3, 4, 5], [0, 0, 0, 0, 6],
+                            [0, 0, 7, 8, 9]])
+
+    with self.assertRaises(ValueError):
+      keras.preprocessing.sequence.pad_sequences([[1], [[1, 2]]])
+    with self.assertRaises(ValueError):
+      keras.preprocessing.sequence.pad_sequences([[1]], padding='middle')
+
   def test_pad_sequences_vector(self):
     a = [[[1, 1]], [[2, 1], [2, 2]], [[3, 1], [3, 2], [3, 3]]]
 
@@ -97,6 +113,35 @@ class TestSequence(test.TestCase):
     for l in labels:
       self.assertEqual(len(l), 2)
 
+    # test the order of positive couples and the number of negative ones
+    couples, labels = keras.preprocessing.sequence.skipgrams(
+        [1, 2, 0, 3], vocabulary_size=4, window_size=2, negative_samples=0,
+        shuffle=False)
+    self.assertEqual(couples, [[1, 2], [2, 1], [2, 3], [3, 2]])
+    self.assertEqual(labels, [1, 1, 1, 1])
+    couples, labels = keras.preprocessing.sequence.skipgrams(
+        [1, 2, 0, 3], vocabulary_size=4, window_size=2, negative_samples=2.)
+    self.assertEqual(len(couples), 12)
+    self.assertEqual(sum(labels), 4)
+
+  def test_index_sequences(self):
+    seqs = [[4, 1, 7], [2], [9, 9, 3, 5], [6, 8]]
+    values, lengths = keras.preprocessing.sequence._pack_sequences(seqs)
+    self.assertAllEqual(values, [4, 1, 7, 2, 9, 9, 3, 5, 6, 8])
+    self.assertAllEqual(lengths, [3, 1, 4, 2])
+
+    xs, kept = keras.preprocessing.sequence._index_sequences(
+        values, lengths, order=[3, 0, 2, 1], num_words=10, skip_top=5,
+        start_char=1, oov_char=2, index_from=2)
+    self.assertEqual(xs, [[2, 8, 2], [2, 6, 2, 9], [2, 2, 2, 5, 7], [2, 2]])
+    self.assertAllEqual(kept, [True] * 4)
+
+    xs, kept = keras.preprocessing.sequence._index_sequences(
+        values, lengths, maxlen=4, skip_top=5, start_char=None,
+        oov_char=None, index_from=0)
+    self.assertEqual(xs, [[7], [], [6]])
+    self.assertAllEqual(kept, [True, True, False, True])
+
   def test_TimeseriesGenerator(self):
     data = np.array([[i] for i in range(50)])
     targets = np.array([[i] for i in range(50)])
@@ -177,6 +222,18 @@ class TestSequence(test.TestCase):
     error = str(context.exception)
     self.assertIn('`start_index+length=50 > end_index=49` is disallowed', error)
 
+  def test_TimeseriesGenerator_returns_views(self):
+    data = np.arange(100).reshape((50, 2))
+    targets = np.arange(50)
+    data_gen = keras.preprocessing.sequence.TimeseriesGenerator(
+        data, targets, length=6, sampling_rate=3, stride=2, batch_size=4)
+    x, y = data_gen[2]
+    rows = [22, 24, 26, 28]
+    self.assertEqual(x.dtype, data.dtype)
+    self.assertFalse(x.flags.writeable)
+    self.assertAllEqual(x, [data[r - 6:r:3] for r in rows])
+    self.assertAllEqual(y, rows)
+
   def test_TimeSeriesGenerator_doesnt_miss_any_sample(self):
     x = np.array([[i] for i in range(10)])
 
@@ -18,8 +18,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from collections import deque
 from collections import OrderedDict
 from hashlib import md5
+import itertools
+import multiprocessing
 import string
 import sys
 
@@ -149,6 +152,82 @@ def hashing_trick(text,
   return [(hash_function(w) % (n - 1) + 1) for w in seq]
 
 
+def _count_words(texts, word_counts, word_docs, filters, lower, split,
+                 char_level, max_tracked_words=None):
+  """Adds the word and document counts of `texts` to the given dicts.
+
+  Arguments:
+      texts: iterable of strings or of lists of tokens.
+      word_counts: `OrderedDict` mapping words to their number of
+          occurrences, updated in place unless it gets pruned.
+      word_docs: dict mapping words to the number of texts they occur in,
+          updated in place unless it gets pruned.
+      filters: see `Tokenizer`.
+      lower: see `Tokenizer`.
+      split: see `Tokenizer`.
+      char_level: see `Tokenizer`.
+      max_tracked_words: see `Tokenizer`.
+
+  Returns:
+      Tuple `(word_counts, word_docs, document_count)`.
+  """
+  document_count = 0
+  for text in texts:
+    document_count += 1
+    if char_level or isinstance(text, list):
+      seq = text
+    else:
+      seq = text_to_word_sequence(text, filters, lower, split)
+    for w in seq:
+      if w in word_counts:
+        word_counts[w] += 1
+      else:
+        word_counts[w] = 1
+    for w in set(seq):
+      if w in word_docs:
+        word_docs[w] += 1
+      else:
+        word_docs[w] = 1
+    if max_tracked_words and len(word_counts) > 2 * max_tracked_words:
+      word_counts, word_docs = _prune_word_counts(word_counts, word_docs,
+                                                  max_tracked_words)
+  return word_counts, word_docs, document_count
+
+
+def _count_words_in_chunk(args):
+  """Counts the words of a chunk of texts, in a worker process."""
+  texts, config = args
+  return _count_words(texts, OrderedDict(), {}, **config)
+
+
+def _prune_word_counts(word_counts, word_docs, max_tracked_words):
+  """Shrinks the word counts to at most `max_tracked_words` words.
+
+  This is the pruning step of the Misra-Gries frequent items summary: the
+  `max_tracked_words + 1`-th largest count is subtracted from every count,
+  and the words left with no occurrences are dropped. The remaining counts
+  underestimate the true ones by at most the total number of words
+  counted divided by `max_tracked_words + 1`, so frequent words are never
+  lost.
+
+  Arguments:
+      word_counts: `OrderedDict` mapping words to their counts.
+      word_docs: dict mapping words to their document counts.
+      max_tracked_words: maximum number of words to keep.
+
+  Returns:
+      Tuple `(word_counts, word_docs)` of pruned dicts.
+  """
+  if len(word_counts) <= max_tracked_words:
+    return word_counts, word_docs
+  threshold = sorted(word_counts.values(), reverse=True)[max_tracked_words]
+  word_counts = OrderedDict((w, c - threshold)
+                            for w, c in word_counts.items()
+                            if c > threshold)
+  word_docs = dict((w, word_docs[w]) for w in word_counts if w in word_docs)
+  return word_counts, word_docs
+
+
 @tf_export('keras.preprocessing.text.Tokenizer')
 class Tokenizer(object):
   """Text tokenization utility class.
@@ -170,6 +249,12 @@ class Tokenizer(object):
       char_level: if True, every character will be treated as a token.
       oov_token: if given, it will be added to word_index and used to
           replace out-of-vocabulary words during text_to_sequence calls
+      max_tracked_words: if given, bounds the number of distinct words whose
+          counts are kept in memory while fitting. Counts are then
+          approximate: rare words may be dropped and the counts of the
+          others underestimated, but any word making up more than
+          `1 / (max_tracked_words + 1)` of all the words is kept. Should be
+          comfortably larger than `num_words`.
 
   By default, all punctuation is removed, turning the texts into
   space-separated sequences of words
@@ -186,6 +271,7 @@ class Tokenizer(object):
                split=' ',
                char_level=False,
                oov_token=None,
+               max_tracked_words=None,
                **kwargs):
     # Legacy support
     if 'nb_words' in kwargs:
@@ -204,9 +290,18 @@ class Tokenizer(object):
     self.document_count = 0
     self.char_level = char_level
     self.oov_token = oov_token
+    self.max_tracked_words = max_tracked_words
     self.index_docs = {}
 
-  def fit_on_texts(self, texts):
+  def _count_config(self):
+    return dict(
+        filters=self.filters,
+        lower=self.lower,
+        split=self.split,
+        char_level=self.char_level,
+        max_tracked_words=self.max_tracked_words)
+
+  def fit_on_texts(self, texts, workers=1, chunk_size=10000):
     """Updates internal vocabulary based on a list of texts.
 
     In the case where texts contains lists, we assume each entry of the lists
@@ -218,24 +313,69 @@ class Tokenizer(object):
         texts: can be a list of strings,
             a generator of strings (for memory-efficiency),
             or a list of list of strings.
+        workers: number of processes to count words with. If greater than 1,
+            `texts` is consumed in chunks of `chunk_size` texts which are
+            counted in parallel and merged in order, so the result is the
+            same as with a single process.
+        chunk_size: number of texts sent to a worker process at a time.
     """
-    for text in texts:
-      self.document_count += 1
-      if self.char_level or isinstance(text, list):
-        seq = text
-      else:
-        seq = text_to_word_sequence(text, self.filters, self.lower, self.split)
-      for w in seq:
-        if w in self.word_counts:
-          self.word_counts[w] += 1
-        else:
-          self.word_counts[w] = 1
-      for w in set(seq):
-        if w in self.word_docs:
-          self.word_docs[w] += 1
-        else:
-          self.word_docs[w] = 1
+    if workers > 1:
+      self._fit_on_texts_parallel(texts, workers, chunk_size)
+    else:
+      self.word_counts, self.word_docs, document_count = _count_words(
+          texts, self.word_counts, self.word_docs, **self._count_config())
+      self.document_count += document_count
+    self._update_word_index()
+
+  def _fit_on_texts_parallel(self, texts, workers, chunk_size):
+    """Counts `texts` in chunks, using a pool of `workers` processes."""
+    config = self._count_config()
+    texts = iter(texts)
+    pool = multiprocessing.Pool(workers)
+    try:
+      # Bound the number of chunks in flight so that `texts` is streamed.
+      pending = deque()
+      while True:
+        chunk = list(itertools.islice(texts, chunk_size))
+        if not chunk:
+          break
+        pending.append(pool.apply_async(_count_words_in_chunk,
+                                        ((chunk, config),)))
+        if len(pending) > 2 * workers:
+          self._merge_counts(*pending.popleft().get())
+      while pending:
+        self._merge_counts(*pending.popleft().get())
+    finally:
+      pool.terminate()
+      pool.join()
+
+  def _merge_counts(self, word_counts, word_docs, document_count):
+    """Adds partial word and document counts to the tokenizer's."""
+    for w, c in word_counts.items():
+      self.word_counts[w] = self.word_counts.get(w, 0) + c
+    for w, c in word_docs.items():
+      self.word_docs[w] = self.word_docs.get(w, 0) + c
+    self.document_count += document_count
+    if self.max_tracked_words:
+      self.word_counts, self.word_docs = _prune_word_counts(
+          self.word_counts, self.word_docs, self.max_tracked_words)
+
+  def merge(self, other):
+    """Merges the counts of another `Tokenizer` into this one.
+
+    This allows fitting tokenizers on separate shards of a corpus (e.g. on
+    different machines) and combining them afterwards. Both tokenizers
+    should use the same text splitting settings.
 
+    Arguments:
+        other: a `Tokenizer` fit on other texts.
+    """
+    self._merge_counts(other.word_counts, other.word_docs,
+                       other.document_count)
+    self._update_word_index()
+
+  def _update_word_index(self):
+    """Rebuilds `word_index` and `index_docs` from the word counts."""
     wcounts = list(self.word_counts.items())
     wcounts.sort(key=lambda x: x[1], reverse=True)
     sorted_voc = [wc[0] for wc in wcounts]
@@ -324,6 +464,64 @@ class Tokenizer(object):
             vect.append(i)
       yield vect
 
+  def texts_to_padded_sequences(self,
+                                texts,
+                                maxlen=None,
+                                dtype='int32',
+                                padding='pre',
+                                truncating='pre',
+                                value=0):
+    """Transforms texts into a padded Numpy array of word indices.
+
+    Equivalent to `pad_sequences(texts_to_sequences(texts), ...)`, but each
+    sequence is written straight into the output array instead of
+    building a list of lists first.
+
+    Arguments:
+        texts: A list of texts (strings).
+        maxlen: Int, maximum length of the sequences. If `None`, the length
+            of the longest sequence is used.
+        dtype: Type of the output array.
+        padding: String, 'pre' or 'post': pad either before or after each
+            sequence.
+        truncating: String, 'pre' or 'post': remove values from sequences
+            larger than `maxlen`, either at the beginning or at the end of
+            the sequences.
+        value: Int, padding value.
+
+    Returns:
+        Numpy array with shape `(len(texts), maxlen)`.
+
+    Raises:
+        ValueError: In case of invalid values for `truncating` or `padding`.
+    """
+    if padding not in ('pre', 'post'):
+      raise ValueError('Padding type "%s" not understood' % padding)
+    if truncating not in ('pre', 'post'):
+      raise ValueError('Truncating type "%s" not understood' % truncating)
+    sequences = self.texts_to_sequences_generator(texts)
+    if maxlen is None or not hasattr(texts, '__len__'):
+      sequences = list(sequences)
+      num_samples = len(sequences)
+      if maxlen is None:
+        maxlen = max([len(seq) for seq in sequences] + [0])
+    else:
+      num_samples = len(texts)
+
+    x = np.full((num_samples, maxlen), value, dtype=dtype)
+    for i, seq in enumerate(sequences):
+      if truncating == 'pre':
+        trunc = seq[max(len(seq) - maxlen, 0):]
+      else:
+        trunc = seq[:maxlen]
+      if not trunc:
+        continue
+      if padding == 'post':
+        x[i, :len(trunc)] = trunc
+      else:
+        x[i, -len(trunc):] = trunc
+    return x
+
   def texts_to_matrix(self, texts, mode='binary'):
     """Convert a list of texts to a Numpy matrix.
 
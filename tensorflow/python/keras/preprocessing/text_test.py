@@ -109,6 +109,56 @@ class TestText(test.TestCase):
     tokenizer.texts_to_matrix(texts)
     tokenizer.texts_to_matrix(word_sequences)
 
+  def test_tokenizer_parallel_fit_and_merge(self):
+    texts = [
+        'The cat sat on the mat.', 'The dog sat on the log.',
+        'Dogs and cats living together.'
+    ] * 10
+    tokenizer = keras.preprocessing.text.Tokenizer()
+    tokenizer.fit_on_texts(texts)
+
+    parallel_tokenizer = keras.preprocessing.text.Tokenizer()
+    parallel_tokenizer.fit_on_texts(iter(texts), workers=2, chunk_size=4)
+    self.assertEqual(parallel_tokenizer.word_counts, tokenizer.word_counts)
+    self.assertEqual(parallel_tokenizer.word_docs, tokenizer.word_docs)
+    self.assertEqual(parallel_tokenizer.word_index, tokenizer.word_index)
+    self.assertEqual(parallel_tokenizer.document_count, 30)
+
+    merged_tokenizer = keras.preprocessing.text.Tokenizer()
+    merged_tokenizer.fit_on_texts(texts[:10])
+    other_tokenizer = keras.preprocessing.text.Tokenizer()
+    other_tokenizer.fit_on_texts(texts[10:])
+    merged_tokenizer.merge(other_tokenizer)
+    self.assertEqual(merged_tokenizer.word_counts, tokenizer.word_counts)
+    self.assertEqual(merged_tokenizer.word_index, tokenizer.word_index)
+    self.assertEqual(merged_tokenizer.document_count, 30)
+
+  def test_tokenizer_max_tracked_words(self):
+    texts = ['the cat', 'the dog', 'the bird', 'the cow', 'the fox'] * 5
+    tokenizer = keras.preprocessing.text.Tokenizer(max_tracked_words=2)
+    tokenizer.fit_on_texts(texts)
+    self.assertLessEqual(len(tokenizer.word_counts), 4)
+    self.assertEqual(tokenizer.word_index['the'], 1)
+
+  def test_texts_to_padded_sequences(self):
+    texts = ['The cat sat on the mat.', 'The dog.', '']
+    tokenizer = keras.preprocessing.text.Tokenizer()
+    tokenizer.fit_on_texts(texts)
+    sequences = tokenizer.texts_to_sequences(texts)
+    for maxlen in [None, 3]:
+      for padding in ['pre', 'post']:
+        for truncating in ['pre', 'post']:
+          expected = keras.preprocessing.sequence.pad_sequences(
+              sequences,
+              maxlen=maxlen,
+              padding=padding,
+              truncating=truncating)
+          padded = tokenizer.texts_to_padded_sequences(
+              texts, maxlen=maxlen, padding=padding, truncating=truncating)
+          self.assertAllEqual(padded, expected)
+    with self.assertRaises(ValueError):
+      tokenizer.texts_to_padded_sequences(texts, padding='middle')
+
   def test_text_to_word_sequence(self):
     text = 'hello! ? world!'
     seq = keras.preprocessing.text.text_to_word_sequence(text)
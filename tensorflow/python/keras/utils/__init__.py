@@ -22,6 +22,7 @@ from tensorflow.python.keras.utils.data_utils import GeneratorEnqueuer
 from tensorflow.python.keras.utils.data_utils import get_file
 from tensorflow.python.keras.utils.data_utils import OrderedEnqueuer
 from tensorflow.python.keras.utils.data_utils import Sequence
+from tensorflow.python.keras.utils.data_utils import sequence_to_dataset
 from tensorflow.python.keras.utils.data_utils import SequenceEnqueuer
 from tensorflow.python.keras.utils.generic_utils import custom_object_scope
 from tensorflow.python.keras.utils.generic_utils import CustomObjectScope
@@ -21,6 +21,7 @@ from __future__ import print_function
 from abc import abstractmethod
 from contextlib import closing
 import hashlib
+import json
 import multiprocessing
 from multiprocessing.pool import ThreadPool
 import os
@@ -28,6 +29,7 @@ import random
 import shutil
 import sys
 import tarfile
+import tempfile
 import threading
 import time
 import traceback
@@ -39,7 +41,13 @@ from six.moves.urllib.error import HTTPError
 from six.moves.urllib.error import URLError
 from six.moves.urllib.request import urlopen
 
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.data.util import nest
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import tensor_shape
 from tensorflow.python.keras.utils.generic_utils import Progbar
+from tensorflow.python.ops import script_ops
+from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util.tf_export import tf_export
 
 
@@ -139,6 +147,68 @@ def _extract_archive(file_path, path='.', archive_format='auto'):
   return False
 
 
+def _get_datadir(cache_subdir='datasets', cache_dir=None):
+  """Returns (and creates) the directory where `get_file` stores files."""
+  if cache_dir is None:
+    cache_dir = os.path.join(os.path.expanduser('~'), '.keras')
+  datadir_base = os.path.expanduser(cache_dir)
+  if not os.access(datadir_base, os.W_OK):
+    datadir_base = os.path.join('/tmp', '.keras')
+  datadir = os.path.join(datadir_base, cache_subdir)
+  if not os.path.exists(datadir):
+    os.makedirs(datadir)
+  return datadir
+
+
+def _load_npy_cache(name, build_arrays, cache_subdir='datasets'):
+  """Loads arrays from a memory-mapped `.npy` cache, building it on first use.
+
+  The arrays are saved as `.npy` files in the directory `name + '-npy'` of
+  the `get_file` cache directory, and loaded with `mmap_mode='c'`: loading
+  is almost free, the pages are shared by all the processes using the
+  cache, and writing to an array only modifies a private copy. The cache is
+  written to a temporary directory and renamed, so processes building it
+  concurrently do not see partial caches. Delete the directory to rebuild
+  the cache.
+
+  Arguments:
+      name: Name of the cache (relative to the cache directory).
+      build_arrays: Function returning a dictionary mapping names to
+          numeric Numpy arrays, called if the cache does not exist.
+      cache_subdir: Subdirectory of the Keras cache directory.
+
+  Returns:
+      A dictionary mapping names to arrays.
+  """
+  datadir = _get_datadir(cache_subdir)
+  path = os.path.join(datadir, name + '-npy')
+  manifest = os.path.join(path, 'arrays.json')
+  if not os.path.exists(manifest):
+    arrays = build_arrays()
+    try:
+      tmp_path = tempfile.mkdtemp(dir=os.path.dirname(path),
+                                  prefix='.tmp-' + os.path.basename(path))
+      try:
+        for key, value in arrays.items():
+          np.save(os.path.join(tmp_path, key + '.npy'), value,
+                  allow_pickle=False)
+        with open(os.path.join(tmp_path, 'arrays.json'), 'w') as f:
+          json.dump(sorted(arrays), f)
+        os.rename(tmp_path, path)
+      finally:
+        if os.path.exists(tmp_path):
+          # Another process created the cache first, or writing failed.
+          shutil.rmtree(tmp_path, ignore_errors=True)
+    except (IOError, OSError) as e:
+      if not os.path.exists(manifest):
+        logging.warning('Could not cache the arrays in %s: %s', path, e)
+        return arrays
+  with open(manifest) as f:
+    keys = json.load(f)
+  return dict((key, np.load(os.path.join(path, key + '.npy'), mmap_mode='c'))
+              for key in keys)
+
+
 @tf_export('keras.utils.get_file')
 def get_file(fname,
              origin,
@@ -190,17 +260,10 @@ def get_file(fname,
   Returns:
       Path to the downloaded file
   """
-  if cache_dir is None:
-    cache_dir = os.path.join(os.path.expanduser('~'), '.keras')
   if md5_hash is not None and file_hash is None:
     file_hash = md5_hash
     hash_algorithm = 'md5'
-  datadir_base = os.path.expanduser(cache_dir)
-  if not os.access(datadir_base, os.W_OK):
-    datadir_base = os.path.join('/tmp', '.keras')
-  datadir = os.path.join(datadir_base, cache_subdir)
-  if not os.path.exists(datadir):
-    os.makedirs(datadir)
+  datadir = _get_datadir(cache_subdir, cache_dir)
 
   if untar:
     untar_fpath = os.path.join(datadir, fname)
@@ -404,15 +467,109 @@ class Sequence(object):
         yield item
 
 
+def _lists_to_tuples(structure):
+  """Converts the lists of a batch into tuples, which `tf.data` nests into."""
+  if isinstance(structure, dict):
+    return {k: _lists_to_tuples(v) for k, v in structure.items()}
+  if isinstance(structure, (list, tuple)):
+    return tuple(_lists_to_tuples(v) for v in structure)
+  return structure
+
+
+@tf_export('keras.utils.sequence_to_dataset')
+def sequence_to_dataset(sequence,
+                        shuffle=False,
+                        num_parallel_calls=None,
+                        prefetch_buffer_size=1,
+                        cache=False):
+  """Creates a `tf.data.Dataset` yielding the batches of a `Sequence`.
+
+  Batch indices are mapped to batches with `sequence.__getitem__`, in
+  parallel if `num_parallel_calls` is set, and batches are prefetched so that
+  preparing the next batches overlaps with the training step. The resulting
+  dataset repeats indefinitely and can be passed directly to `Model.fit`,
+  `Model.evaluate` and `Model.predict`, with `steps=len(sequence)`:
+
+  ```python
+      dataset = sequence_to_dataset(seq, shuffle=True, num_parallel_calls=4)
+      model.fit(dataset, epochs=10, steps_per_epoch=len(seq))
+  ```
+
+  The dtypes and shapes of the dataset are inferred from `sequence[0]`:
+  every batch must have the same structure and dtypes, and may only differ
+  in its first (batch) dimension. Lists in the batch structure are returned
+  as tuples. `sequence.on_epoch_end` is not called.
+
+  NOTE: `__getitem__` is run with @{tf.py_func} and inherits the same
+  constraints. In particular, the dataset must be placed on a device in the
+  same process as the Python program that created it.
+
+  Arguments:
+      sequence: A `keras.utils.Sequence` instance.
+      shuffle: Whether to shuffle the order of the batches at every epoch.
+      num_parallel_calls: Number of batches to prepare in parallel. If None,
+          batches are prepared sequentially.
+      prefetch_buffer_size: Number of batches to prefetch.
+      cache: Whether to cache the batches after the first epoch: False,
+          True to cache them in memory, or a filename prefix to cache them
+          on disk. Cannot be combined with `shuffle`.
+
+  Returns:
+      A `tf.data.Dataset` of batches.
+
+  Raises:
+      ValueError: if both `shuffle` and `cache` are set.
+  """
+  if shuffle and cache:
+    raise ValueError('`shuffle` and `cache` cannot be used together: a cached '
+                     'dataset replays the batch order of the first epoch.')
+  first_batch = _lists_to_tuples(sequence[0])
+  output_types = nest.map_structure(
+      lambda x: dtypes.as_dtype(np.asarray(x).dtype), first_batch)
+  output_shapes = nest.map_structure(
+      lambda x: tensor_shape.TensorShape([None] + list(np.shape(x)[1:])),
+      first_batch)
+  flat_types = nest.flatten(output_types)
+
+  def get_batch(index):
+    batch = nest.flatten(_lists_to_tuples(sequence[index]))
+    return [
+        np.asarray(x, dtype=dtype.as_numpy_dtype)
+        for x, dtype in zip(batch, flat_types)
+    ]
+
+  def index_to_batch(index):
+    flat_batch = script_ops.py_func(get_batch, [index], flat_types)
+    for tensor, shape in zip(flat_batch, nest.flatten(output_shapes)):
+      tensor.set_shape(shape)
+    return nest.pack_sequence_as(output_types, flat_batch)
+
+  dataset = dataset_ops.Dataset.range(len(sequence))
+  if shuffle:
+    dataset = dataset.shuffle(len(sequence), reshuffle_each_iteration=True)
+  dataset = dataset.map(index_to_batch, num_parallel_calls=num_parallel_calls)
+  if cache:
+    dataset = dataset.cache('' if cache is True else cache)
+  return dataset.repeat().prefetch(prefetch_buffer_size)
+
+
 # Global variables to be shared across processes
 _SHARED_SEQUENCES = {}
+# Shared-memory batch buffers, keyed by Sequence uid (see `OrderedEnqueuer`).
+_SHARED_BUFFERS = {}
 # We use a Value to provide unique id to different processes.
 _SEQUENCE_COUNTER = None
 
+# Byte alignment of every array written into a shared-memory buffer.
+_SHARED_BUFFER_ALIGNMENT = 64
+
 
-def init_pool(seqs):
+def init_pool(seqs, buffers=None):
   global _SHARED_SEQUENCES
+  global _SHARED_BUFFERS
   _SHARED_SEQUENCES = seqs
+  if buffers is not None:
+    _SHARED_BUFFERS = buffers
 
 
 def get_index(uid, i):
@@ -432,6 +589,96 @@ def get_index(uid, i):
   return _SHARED_SEQUENCES[uid][i]
 
 
+class _SharedArraySpec(object):
+  """Location of a NumPy array written into a shared-memory buffer."""
+
+  def __init__(self, offset, dtype, shape):
+    self.offset = offset
+    self.dtype = dtype
+    self.shape = shape
+
+
+def _map_batch_structure(fn, structure):
+  """Applies `fn` to every leaf of a (nested) tuple, list or dict batch."""
+  if isinstance(structure, dict):
+    return {k: _map_batch_structure(fn, v) for k, v in structure.items()}
+  if isinstance(structure, (list, tuple)):
+    return type(structure)(_map_batch_structure(fn, v) for v in structure)
+  return fn(structure)
+
+
+def _aligned_nbytes(arr):
+  return -(-arr.nbytes // _SHARED_BUFFER_ALIGNMENT) * _SHARED_BUFFER_ALIGNMENT
+
+
+def _write_batch_to_buffer(batch, buf):
+  """Copies the arrays of `batch` into the shared-memory buffer `buf`.
+
+  Arguments:
+      batch: A batch as returned by `Sequence.__getitem__`, i.e. NumPy arrays
+          nested in tuples, lists or dicts.
+      buf: A `multiprocessing.RawArray` of bytes.
+
+  Returns:
+      A tuple `(in_buffer, payload)`. If the batch fits in `buf`, `in_buffer`
+      is True and `payload` is the batch structure with every array replaced
+      by a `_SharedArraySpec`. Otherwise `in_buffer` is False and `payload`
+      is the batch itself, which is then pickled as usual.
+  """
+  arrays = []
+  _map_batch_structure(
+      lambda x: arrays.append(x) if isinstance(x, np.ndarray) else None, batch)
+  if any(arr.dtype.hasobject for arr in arrays):
+    return False, batch
+  if sum(_aligned_nbytes(arr) for arr in arrays) > len(buf):
+    return False, batch
+
+  offsets = [0]
+
+  def write(x):
+    if not isinstance(x, np.ndarray):
+      return x
+    offset = offsets[0]
+    if x.size:
+      view = np.frombuffer(buf, dtype=x.dtype, count=x.size, offset=offset)
+      view.reshape(x.shape)[...] = x
+    offsets[0] += _aligned_nbytes(x)
+    return _SharedArraySpec(offset, x.dtype.str, x.shape)
+
+  return True, _map_batch_structure(write, batch)
+
+
+def _read_batch_from_buffer(payload, buf):
+  """Rebuilds a batch written by `_write_batch_to_buffer` as views of `buf`."""
+
+  def read(x):
+    if not isinstance(x, _SharedArraySpec):
+      return x
+    dtype = np.dtype(x.dtype)
+    count = int(np.prod(x.shape))
+    if not count:
+      return np.empty(x.shape, dtype=dtype)
+    return np.frombuffer(
+        buf, dtype=dtype, count=count, offset=x.offset).reshape(x.shape)
+
+  return _map_batch_structure(read, payload)
+
+
+def get_index_into_buffer(uid, i, slot):
+  """Writes the value of the Sequence `uid` at index `i` into shared memory.
+
+  Arguments:
+      uid: int, Sequence identifier
+      i: index
+      slot: index of the shared-memory buffer to write into.
+
+  Returns:
+      The output of `_write_batch_to_buffer`.
+  """
+  return _write_batch_to_buffer(_SHARED_SEQUENCES[uid][i],
+                                _SHARED_BUFFERS[uid][slot])
+
+
 @tf_export('keras.utils.SequenceEnqueuer')
 class SequenceEnqueuer(object):
   """Base class to enqueue inputs.
@@ -499,15 +746,34 @@ class OrderedEnqueuer(SequenceEnqueuer):
 
   Used in `fit_generator`, `evaluate_generator`, `predict_generator`.
 
+  When `use_multiprocessing=True` and `shared_buffer_size` is set, workers
+  write each batch into one of a ring of pre-allocated shared-memory buffers
+  instead of pickling it back through the pool. Only the index of the buffer
+  travels between processes, and `get()` yields NumPy views of that buffer.
+  A view stays valid until the next batch is requested from `get()`, after
+  which its buffer is recycled; copy it if it must outlive the step.
+  Batches that do not fit in a buffer, or that hold non-NumPy or object
+  arrays, fall back to the regular pickled transport.
+
   Arguments:
       sequence: A `keras.utils.data_utils.Sequence` object.
       use_multiprocessing: use multiprocessing if True, otherwise threading
       shuffle: whether to shuffle the data at the beginning of each epoch
+      shared_buffer_size: size in bytes of each shared-memory batch buffer,
+          or None to pickle batches. Only used with `use_multiprocessing`.
   """
 
-  def __init__(self, sequence, use_multiprocessing=False, shuffle=False):
+  def __init__(self,
+               sequence,
+               use_multiprocessing=False,
+               shuffle=False,
+               shared_buffer_size=None):
     self.sequence = sequence
     self.use_multiprocessing = use_multiprocessing
+    if shared_buffer_size is not None and shared_buffer_size <= 0:
+      raise ValueError('`shared_buffer_size` must be a positive number of '
+                       'bytes, got: ' + str(shared_buffer_size))
+    self.shared_buffer_size = shared_buffer_size
 
     global _SEQUENCE_COUNTER
     if _SEQUENCE_COUNTER is None:
@@ -534,10 +800,14 @@ class OrderedEnqueuer(SequenceEnqueuer):
     self.queue = None
     self.run_thread = None
     self.stop_signal = None
+    self._free_buffers = None
 
   def is_running(self):
     return self.stop_signal is not None and not self.stop_signal.is_set()
 
+  def _use_shared_buffers(self):
+    return self.use_multiprocessing and self.shared_buffer_size is not None
+
   def start(self, workers=1, max_queue_size=10):
     """Start the handler's workers.
 
@@ -546,9 +816,19 @@ class OrderedEnqueuer(SequenceEnqueuer):
         max_queue_size: queue size
             (when full, workers could block on `put()`)
     """
+    if self._use_shared_buffers():
+      # One buffer per queued batch, plus the one held by the consumer.
+      num_buffers = max_queue_size + 1
+      _SHARED_BUFFERS[self.uid] = [
+          multiprocessing.RawArray('b', self.shared_buffer_size)
+          for _ in range(num_buffers)
+      ]
+      self._free_buffers = queue.Queue()
+      for slot in range(num_buffers):
+        self._free_buffers.put(slot)
     if self.use_multiprocessing:
       self.executor_fn = lambda seqs: multiprocessing.Pool(  # pylint: disable=g-long-lambda
-          workers, initializer=init_pool, initargs=(seqs,))
+          workers, initializer=init_pool, initargs=(seqs, _SHARED_BUFFERS))
     else:
        # We do not need the init since it's threads.
       self.executor_fn = lambda _: ThreadPool(workers)
@@ -578,8 +858,18 @@ class OrderedEnqueuer(SequenceEnqueuer):
         for i in sequence:
           if self.stop_signal.is_set():
             return
-          self.queue.put(
-              executor.apply_async(get_index, (self.uid, i)), block=True)
+          if self._free_buffers is not None:
+            slot = self._acquire_buffer()
+            if slot is None:
+              return
+            self.queue.put(
+                (executor.apply_async(get_index_into_buffer,
+                                      (self.uid, i, slot)), slot),
+                block=True)
+          else:
+            self.queue.put(
+                (executor.apply_async(get_index, (self.uid, i)), None),
+                block=True)
 
         # Done with the current epoch, waiting for the final batches
         self._wait_queue()
@@ -592,6 +882,19 @@ class OrderedEnqueuer(SequenceEnqueuer):
       self.sequence.on_epoch_end()
       self._send_sequence()  # Update the pool
 
+  def _acquire_buffer(self):
+    """Blocks until a shared-memory buffer is free, or the enqueuer stops.
+
+    Returns:
+        The index of the free buffer, or None if the enqueuer was stopped.
+    """
+    while not self.stop_signal.is_set():
+      try:
+        return self._free_buffers.get(block=True, timeout=0.1)
+      except queue.Empty:
+        pass
+    return None
+
   def get(self):
     """Creates a generator to extract data from the queue.
 
@@ -602,10 +905,24 @@ class OrderedEnqueuer(SequenceEnqueuer):
         `(inputs, targets)` or
         `(inputs, targets, sample_weights)`.
     """
+    held_slot = None
     try:
       while self.is_running():
-        inputs = self.queue.get(block=True).get()
+        future, slot = self.queue.get(block=True)
+        inputs = future.get()
         self.queue.task_done()
+        if held_slot is not None:
+          # The consumer is done with the previous batch: recycle its buffer.
+          self._free_buffers.put(held_slot)
+          held_slot = None
+        if slot is not None:
+          in_buffer, inputs = inputs
+          if in_buffer:
+            inputs = _read_batch_from_buffer(inputs,
+                                             _SHARED_BUFFERS[self.uid][slot])
+            held_slot = slot
+          else:
+            self._free_buffers.put(slot)
         if inputs is not None:
           yield inputs
     except Exception as e:  # pylint: disable=broad-except
@@ -632,6 +949,7 @@ class OrderedEnqueuer(SequenceEnqueuer):
       self.queue.not_full.notify()
     self.run_thread.join(timeout)
     _SHARED_SEQUENCES[self.uid] = None
+    _SHARED_BUFFERS.pop(self.uid, None)
 
 
 @tf_export('keras.utils.GeneratorEnqueuer')
@@ -643,19 +961,37 @@ class GeneratorEnqueuer(SequenceEnqueuer):
 
   Used in `fit_generator`, `evaluate_generator`, `predict_generator`.
 
+  Workers push their outputs into a bounded queue and block while it is full,
+  so a slow consumer applies backpressure to the workers instead of having
+  them poll.
+
+  With `sharded=True`, `generator` is a function
+  `generator(worker_index, num_workers)` returning an iterator. Every worker
+  calls it once and runs its own iterator, so each worker can produce a
+  disjoint shard of the data (e.g. by striding over file indices or seeding
+  its augmentations with `worker_index`). Unlike a single shared generator,
+  shards neither serialize on a lock in threading mode nor duplicate data
+  in multiprocessing mode.
+
   Arguments:
-      generator: a generator function which yields data
+      generator: a generator function which yields data, or with
+          `sharded=True`, a function of `(worker_index, num_workers)`
+          returning such a generator.
       use_multiprocessing: use multiprocessing if True, otherwise threading
-      wait_time: time to sleep in-between calls to `put()`
+      wait_time: interval at which blocked workers and consumers check
+          whether the enqueuer was stopped.
       random_seed: Initial seed for workers,
           will be incremented by one for each worker.
+      sharded: whether `generator` is a function creating one generator
+          per worker.
   """
 
   def __init__(self,
                generator,
                use_multiprocessing=False,
                wait_time=0.05,
-               seed=None):
+               seed=None,
+               sharded=False):
     self.wait_time = wait_time
     self._generator = generator
     if os.name is 'nt' and use_multiprocessing is True:
@@ -668,57 +1004,70 @@ class GeneratorEnqueuer(SequenceEnqueuer):
                        ' use single thread/process or multithreading.')
     else:
       self._use_multiprocessing = use_multiprocessing
+    if sharded and not callable(generator):
+      raise ValueError('With `sharded=True`, `generator` should be a function'
+                       ' of `(worker_index, num_workers)` returning a'
+                       ' generator. Got: ' + str(generator))
+    self._sharded = sharded
     self._threads = []
     self._stop_event = None
-    self._manager = None
     self.queue = None
     self.seed = seed
+    self._num_workers = 0
+    self._start_time = None
+    self._batch_counts = None
+    self._busy_times = None
 
-  def _data_generator_task(self):
-    if self._use_multiprocessing is False:
-      while not self._stop_event.is_set():
-        with self.genlock:
-          try:
-            if (self.queue is not None and
-                self.queue.qsize() < self.max_queue_size):
-              # On all OSes, avoid **SYSTEMATIC** error
-              # in multithreading mode:
-              # `ValueError: generator already executing`
-              # => Serialize calls to
-              # infinite iterator/generator's next() function
-              generator_output = next(self._generator)
-              self.queue.put((True, generator_output))
-            else:
-              time.sleep(self.wait_time)
-          except StopIteration:
-            break
-          except Exception as e:  # pylint: disable=broad-except
-            # Can't pickle tracebacks.
-            # As a compromise, print the traceback and pickle None instead.
-            if not hasattr(e, '__traceback__'):
-              setattr(e, '__traceback__', sys.exc_info()[2])
-            self.queue.put((False, e))
-            self._stop_event.set()
-            break
+  def _put(self, item):
+    """Puts `item` in the queue, blocking while it is full.
+
+    Returns:
+        Whether `item` was enqueued; False if the enqueuer was stopped first.
+    """
+    while not self._stop_event.is_set():
+      try:
+        self.queue.put(item, block=True, timeout=self.wait_time)
+        return True
+      except queue.Full:
+        pass
+    return False
+
+  def _data_generator_task(self, worker_index):
+    if self._sharded:
+      generator = self._generator(worker_index, self._num_workers)
+      genlock = None
     else:
-      while not self._stop_event.is_set():
-        try:
-          if (self.queue is not None and
-              self.queue.qsize() < self.max_queue_size):
-            generator_output = next(self._generator)
-            self.queue.put((True, generator_output))
-          else:
-            time.sleep(self.wait_time)
-        except StopIteration:
+      generator = self._generator
+      # On all OSes, avoid **SYSTEMATIC** error in multithreading mode:
+      # `ValueError: generator already executing`
+      # => Serialize calls to infinite iterator/generator's next() function
+      genlock = None if self._use_multiprocessing else self.genlock
+
+    while not self._stop_event.is_set():
+      try:
+        start_time = time.time()
+        if genlock is None:
+          generator_output = next(generator)
+        else:
+          with genlock:
+            generator_output = next(generator)
+        self._busy_times[worker_index] += time.time() - start_time
+        self._batch_counts[worker_index] += 1
+        if not self._put((True, generator_output)):
           break
-        except Exception as e:  # pylint: disable=broad-except
-          # Can't pickle tracebacks.
-          # As a compromise, print the traceback and pickle None instead.
+      except StopIteration:
+        break
+      except Exception as e:  # pylint: disable=broad-except
+        # Can't pickle tracebacks.
+        # As a compromise, print the traceback and pickle None instead.
+        if self._use_multiprocessing:
           traceback.print_exc()
           setattr(e, '__traceback__', None)
-          self.queue.put((False, e))
-          self._stop_event.set()
-          break
+        elif not hasattr(e, '__traceback__'):
+          setattr(e, '__traceback__', sys.exc_info()[2])
+        self._put((False, e))
+        self._stop_event.set()
+        break
 
   def start(self, workers=1, max_queue_size=10):
     """Kicks off threads which add data from the generator into the queue.
@@ -730,29 +1079,34 @@ class GeneratorEnqueuer(SequenceEnqueuer):
     """
     try:
       self.max_queue_size = max_queue_size
+      self._num_workers = workers
       if self._use_multiprocessing:
-        self._manager = multiprocessing.Manager()
-        self.queue = self._manager.Queue(maxsize=max_queue_size)
+        self.queue = multiprocessing.Queue(maxsize=max_queue_size)
         self._stop_event = multiprocessing.Event()
+        # Each worker only updates its own entry, so no lock is needed.
+        self._batch_counts = multiprocessing.RawArray('l', workers)
+        self._busy_times = multiprocessing.RawArray('d', workers)
       else:
-        # On all OSes, avoid **SYSTEMATIC** error in multithreading mode:
-        # `ValueError: generator already executing`
-        # => Serialize calls to infinite iterator/generator's next() function
         self.genlock = threading.Lock()
         self.queue = queue.Queue(maxsize=max_queue_size)
         self._stop_event = threading.Event()
+        self._batch_counts = [0] * workers
+        self._busy_times = [0.] * workers
+      self._start_time = time.time()
 
-      for _ in range(workers):
+      for worker_index in range(workers):
         if self._use_multiprocessing:
           # Reset random seed else all children processes
           # share the same seed
           np.random.seed(self.seed)
-          thread = multiprocessing.Process(target=self._data_generator_task)
+          thread = multiprocessing.Process(
+              target=self._data_generator_task, args=(worker_index,))
           thread.daemon = True
           if self.seed is not None:
             self.seed += 1
         else:
-          thread = threading.Thread(target=self._data_generator_task)
+          thread = threading.Thread(
+              target=self._data_generator_task, args=(worker_index,))
         self._threads.append(thread)
         thread.start()
     except:
@@ -762,6 +1116,24 @@ class GeneratorEnqueuer(SequenceEnqueuer):
   def is_running(self):
     return self._stop_event is not None and not self._stop_event.is_set()
 
+  def get_worker_stats(self):
+    """Returns throughput counters of the workers started by `start()`.
+
+    Returns:
+        A list with one dict per worker, with keys:
+            `batches`: number of outputs produced by the worker.
+            `busy_time`: seconds spent producing them in the generator.
+            `batches_per_second`: outputs produced per second since `start()`.
+    """
+    if self._batch_counts is None:
+      return []
+    elapsed = max(time.time() - self._start_time, 1e-9)
+    return [{
+        'batches': self._batch_counts[i],
+        'busy_time': self._busy_times[i],
+        'batches_per_second': self._batch_counts[i] / elapsed
+    } for i in range(self._num_workers)]
+
   def stop(self, timeout=None):
     """Stops running threads and wait for them to exit, if necessary.
 
@@ -784,9 +1156,6 @@ class GeneratorEnqueuer(SequenceEnqueuer):
         # always, which is ok no matter what the status of the thread.
         thread.join(timeout)
 
-    if self._manager:
-      self._manager.shutdown()
-
     self._threads = []
     self._stop_event = None
     self.queue = None
@@ -801,24 +1170,17 @@ class GeneratorEnqueuer(SequenceEnqueuer):
         `(inputs, targets)` or
         `(inputs, targets, sample_weights)`.
     """
-    while self.is_running():
-      if not self.queue.empty():
-        success, value = self.queue.get()
-        # Rethrow any exceptions found in the queue
-        if not success:
-          six.reraise(value.__class__, value, value.__traceback__)
-        # Yield regular values
-        if value is not None:
-          yield value
-      else:
+    while True:
+      try:
+        success, value = self.queue.get(block=True, timeout=self.wait_time)
+      except queue.Empty:
         all_finished = all([not thread.is_alive() for thread in self._threads])
         if all_finished and self.queue.empty():
-          raise StopIteration()
-        else:
-          time.sleep(self.wait_time)
-
-    # Make sure to rethrow the first exception in the queue, if any
-    while not self.queue.empty():
-      success, value = self.queue.get()
+          return
+        continue
+      # Rethrow any exceptions found in the queue
       if not success:
         six.reraise(value.__class__, value, value.__traceback__)
+      # Once stopped, only drain the queue to rethrow exceptions, if any
+      if value is not None and self.is_running():
+        yield value
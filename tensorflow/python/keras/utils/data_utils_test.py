@@ -88,6 +88,27 @@ class TestGetFileAndValidateIt(test.TestCase):
     self.assertTrue(keras.utils.data_utils.validate_file(path, hashval_sha256))
     self.assertTrue(keras.utils.data_utils.validate_file(path, hashval_md5))
 
+  def test_load_npy_cache(self):
+    cache_dir = self.get_temp_dir()
+    calls = []
+
+    def build_arrays():
+      calls.append(None)
+      return {'x': np.arange(12, dtype='uint8').reshape((3, 4)),
+              'y': np.ones((3,))}
+
+    for _ in range(2):
+      arrays = keras.utils.data_utils._load_npy_cache(
+          'test', build_arrays, cache_subdir=cache_dir)
+      self.assertEqual(sorted(arrays), ['x', 'y'])
+      self.assertIsInstance(arrays['x'], np.memmap)
+      self.assertAllEqual(arrays['x'], np.arange(12).reshape((3, 4)))
+      self.assertEqual(arrays['x'].dtype, np.uint8)
+      # Writes are copy-on-write and do not modify the cache.
+      arrays['x'][0, 0] = 42
+    self.assertEqual(len(calls), 1)
+    self.assertEqual(sorted(os.listdir(cache_dir)), ['test-npy'])
+
 
 class ThreadsafeIter(object):
 
@@ -150,6 +171,11 @@ def create_generator_from_sequence_pcs(ds):
     yield ds[i]
 
 
+def create_sharded_generator(worker_index, num_workers):
+  for i in range(worker_index, 100, num_workers):
+    yield np.ones([3, 10], dtype=np.uint32) * i
+
+
 class TestEnqueuers(test.TestCase):
 
   def test_generator_enqueuer_threads(self):
@@ -180,6 +206,29 @@ class TestEnqueuers(test.TestCase):
     self.assertNotEqual(acc, list(range(100)))
     enqueuer.stop()
 
+  def test_generator_enqueuer_sharded_threads(self):
+    enqueuer = keras.utils.data_utils.GeneratorEnqueuer(
+        create_sharded_generator, use_multiprocessing=False, sharded=True)
+    enqueuer.start(3, 10)
+    acc = [int(output[0, 0]) for output in enqueuer.get()]
+    self.assertEqual(sorted(acc), list(range(100)))
+    stats = enqueuer.get_worker_stats()
+    self.assertEqual([s['batches'] for s in stats], [34, 33, 33])
+    enqueuer.stop()
+
+  @unittest.skipIf(
+      os.name == 'nt',
+      'use_multiprocessing=True does not work on windows properly.')
+  def test_generator_enqueuer_sharded_processes(self):
+    enqueuer = keras.utils.data_utils.GeneratorEnqueuer(
+        create_sharded_generator, use_multiprocessing=True, sharded=True)
+    enqueuer.start(3, 10)
+    acc = [int(output[0, 0]) for output in enqueuer.get()]
+    self.assertEqual(sorted(acc), list(range(100)))
+    stats = enqueuer.get_worker_stats()
+    self.assertEqual([s['batches'] for s in stats], [34, 33, 33])
+    enqueuer.stop()
+
   def test_generator_enqueuer_fail_threads(self):
     enqueuer = keras.utils.data_utils.GeneratorEnqueuer(
         create_generator_from_sequence_threads(FaultSequence()),
@@ -223,6 +272,34 @@ class TestEnqueuers(test.TestCase):
     self.assertEqual(acc, list(range(100)))
     enqueuer.stop()
 
+  def test_ordered_enqueuer_shared_buffers(self):
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 200, 200, 3]),
+        use_multiprocessing=True,
+        shared_buffer_size=3 * 200 * 200 * 3 * 4)
+    enqueuer.start(3, 10)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(200):
+      acc.append(next(gen_output)[0, 0, 0, 0])
+    self.assertEqual(acc[:100], list(range(100)))
+    self.assertEqual(acc[100:], list([k * 5 for k in range(100)]))
+    enqueuer.stop()
+
+  def test_ordered_enqueuer_shared_buffers_fallback(self):
+    # Batches larger than the shared buffers are pickled as usual.
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 200, 200, 3]),
+        use_multiprocessing=True,
+        shared_buffer_size=1024)
+    enqueuer.start(3, 10)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(100):
+      acc.append(next(gen_output)[0, 0, 0, 0])
+    self.assertEqual(acc, list(range(100)))
+    enqueuer.stop()
+
   def test_ordered_enqueuer_fail_threads(self):
     enqueuer = keras.utils.data_utils.OrderedEnqueuer(
         FaultSequence(), use_multiprocessing=False)
@@ -298,6 +375,50 @@ class TestEnqueuers(test.TestCase):
     enqueuer.stop()
 
 
+class PairSequence(keras.utils.data_utils.Sequence):
+
+  def __getitem__(self, item):
+    return ([np.ones((2, 3), dtype=np.float32) * item,
+             np.ones((2, 1), dtype=np.int64) * item],
+            np.ones((2,), dtype=np.float32) * item)
+
+  def __len__(self):
+    return 10
+
+
+class TestSequenceToDataset(test.TestCase):
+
+  def test_sequence_to_dataset(self):
+    with self.test_session() as sess:
+      dataset = keras.utils.data_utils.sequence_to_dataset(
+          PairSequence(), num_parallel_calls=4, prefetch_buffer_size=2)
+      (x1, x2), y = dataset.output_shapes
+      self.assertEqual(x1.as_list(), [None, 3])
+      self.assertEqual(x2.as_list(), [None, 1])
+      self.assertEqual(y.as_list(), [None])
+      next_element = dataset.make_one_shot_iterator().get_next()
+      acc = []
+      for _ in range(20):
+        (x1, x2), y = sess.run(next_element)
+        self.assertEqual(x1.dtype, np.float32)
+        self.assertEqual(x2.dtype, np.int64)
+        acc.append(int(y[0]))
+      self.assertEqual(acc, list(range(10)) * 2)
+
+  def test_sequence_to_dataset_shuffle(self):
+    with self.test_session() as sess:
+      dataset = keras.utils.data_utils.sequence_to_dataset(
+          PairSequence(), shuffle=True)
+      next_element = dataset.make_one_shot_iterator().get_next()
+      acc = [int(sess.run(next_element)[1][0]) for _ in range(10)]
+      self.assertEqual(sorted(acc), list(range(10)))
+
+  def test_sequence_to_dataset_shuffle_and_cache(self):
+    with self.assertRaises(ValueError):
+      keras.utils.data_utils.sequence_to_dataset(
+          PairSequence(), shuffle=True, cache=True)
+
+
 if __name__ == '__main__':
   # Bazel sets these environment variables to very long paths.
   # Tempfile uses them to create long paths, and in turn multiprocessing